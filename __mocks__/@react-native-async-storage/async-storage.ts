@@ -0,0 +1,21 @@
+/**
+ * テスト用の AsyncStorage（メモリ上のストア）
+ * vi.mock('@react-native-async-storage/async-storage') で読み込まれる。
+ * 中身は storage（テストファイルごとに別のインスタンス）で直接確認・準備できる。
+ */
+import { vi } from 'vitest';
+
+export const storage = new Map<string, string>();
+
+const AsyncStorage = {
+  getItem: vi.fn((key: string) => Promise.resolve(storage.get(key) ?? null)),
+  setItem: vi.fn((key: string, value: string) => Promise.resolve(void storage.set(key, value))),
+  removeItem: vi.fn((key: string) => Promise.resolve(void storage.delete(key))),
+  clear: vi.fn(() => Promise.resolve(storage.clear())),
+  getAllKeys: vi.fn(() => Promise.resolve(Array.from(storage.keys()))),
+  multiGet: vi.fn((keys: readonly string[]) => Promise.resolve(keys.map(k => [k, storage.get(k) ?? null] as [string, string | null]))),
+  multiSet: vi.fn((pairs: readonly (readonly [string, string])[]) => Promise.resolve(pairs.forEach(([k, v]) => storage.set(k, v)))),
+  multiRemove: vi.fn((keys: readonly string[]) => Promise.resolve(keys.forEach(k => storage.delete(k)))),
+};
+
+export default AsyncStorage;
@@ -4,13 +4,12 @@ import { useRouter, useFocusEffect } from 'expo-router';
 import { useCallback } from 'react';
 import { ScreenContainer } from '@/components/screen-container';
 import { IconSymbol } from '@/components/ui/icon-symbol';
-import { loadTerms, loadProgress, getReviewDueTerms, TOPICS } from '@/lib/data-store';
-import type { Term, LearningProgress } from '@/lib/types';
+import { loadStatistics, TOPICS } from '@/lib/data-store';
 
 export default function HomeScreen() {
   const router = useRouter();
-  const [terms, setTerms] = useState<Term[]>([]);
-  const [progress, setProgress] = useState<Record<string, LearningProgress>>({});
+  const [totalTerms, setTotalTerms] = useState(0);
+  const [learnedTerms, setLearnedTerms] = useState(0);
   const [reviewCount, setReviewCount] = useState(0);
   const [masteredCount, setMasteredCount] = useState(0);
 
@@ -26,20 +25,14 @@ export default function HomeScreen() {
   );
 
   async function loadData() {
-    const loadedTerms = await loadTerms();
-    const loadedProgress = await loadProgress();
-    setTerms(loadedTerms);
-    setProgress(loadedProgress);
-    
-    const reviewDue = getReviewDueTerms(loadedTerms, loadedProgress);
-    setReviewCount(reviewDue.length);
-    
-    const mastered = Object.values(loadedProgress).filter(p => p.repetitions >= 3).length;
-    setMasteredCount(mastered);
+    // 集計済みの統計を読むだけ（進捗の保存時に差分更新されている）
+    const stats = await loadStatistics();
+    setTotalTerms(stats.total);
+    setLearnedTerms(stats.learned);
+    setReviewCount(stats.reviewDue);
+    setMasteredCount(stats.mastered);
   }
 
-  const totalTerms = terms.length;
-  const learnedTerms = Object.keys(progress).length;
   const progressPercent = totalTerms > 0 ? Math.round((learnedTerms / totalTerms) * 100) : 0;
 
   return (
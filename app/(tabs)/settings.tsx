@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react';
 import { ScrollView, Text, View, Pressable, StyleSheet, Alert, Modal } from 'react-native';
 import { ScreenContainer } from '@/components/screen-container';
 import { IconSymbol } from '@/components/ui/icon-symbol';
-import { loadTerms, loadExamples, exportToAnkiTSV, loadSRSSettings, saveSRSSettings } from '@/lib/data-store';
+import { loadTerms, loadExamples, exportToAnkiTSV, exportReviewLog, loadSRSSettings, saveSRSSettings } from '@/lib/data-store';
 import { ALGORITHMS, type AlgorithmInfo } from '@/lib/srs-algorithms';
 import type { SRSAlgorithm } from '@/lib/types';
 import * as Clipboard from 'expo-clipboard';
@@ -43,6 +43,16 @@ export default function SettingsScreen() {
     }
   };
 
+  const handleExportReviewLog = async () => {
+    try {
+      const tsv = await exportReviewLog();
+      await Clipboard.setStringAsync(tsv);
+      Alert.alert('エクスポート完了', '復習履歴をクリップボードにコピーしました。');
+    } catch (error) {
+      Alert.alert('エラー', 'エクスポートに失敗しました。');
+    }
+  };
+
   const handleBackup = () => {
     Alert.alert('バックアップ', 'この機能は近日公開予定です。');
   };
@@ -135,6 +145,12 @@ export default function SettingsScreen() {
               description="TSV形式でクリップボードにコピー"
               onPress={handleExportAnki}
             />
+            <ActionRow
+              icon="paperplane.fill"
+              label="復習履歴エクスポート"
+              description="回答ごとの履歴をTSV形式でクリップボードにコピー"
+              onPress={handleExportReviewLog}
+            />
             <ActionRow
               icon="arrow.clockwise"
               label="バックアップ"
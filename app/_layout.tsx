@@ -19,6 +19,7 @@ import type { EdgeInsets, Metrics, Rect } from "react-native-safe-area-context";
 import { trpc, createTRPCClient } from "@/lib/trpc";
 import { initManusRuntime, subscribeSafeAreaInsets } from "@/lib/_core/manus-runtime";
 import { usePreloadSprites } from "@/hooks/use-preload-sprites";
+import { useFlushOnBackground } from "@/hooks/use-flush-on-background";
 
 const DEFAULT_WEB_INSETS: EdgeInsets = { top: 0, right: 0, bottom: 0, left: 0 };
 const DEFAULT_WEB_FRAME: Rect = { x: 0, y: 0, width: 0, height: 0 };
@@ -42,6 +43,9 @@ export default function RootLayout() {
   // 敵スプライトを事前読み込み
   usePreloadSprites();
 
+  // バックグラウンド移行時に未保存の学習進捗・ゲーム状態を書き込む
+  useFlushOnBackground();
+
   const handleSafeAreaUpdate = useCallback((metrics: Metrics) => {
     setInsets(metrics.insets);
     setFrame(metrics.frame);
@@ -11,7 +11,7 @@ export default function DeckScreen() {
   const router = useRouter();
   const colors = useColors();
   const [allCards, setAllCards] = useState<WordCard[]>([]);
-  const [deckCardIds, setDeckCardIds] = useState<string[]>([]);
+  const [deckCards, setDeckCards] = useState<WordCard[]>([]);
   const [deckCapacity, setDeckCapacity] = useState(5);
 
   useEffect(() => {
@@ -19,7 +19,7 @@ export default function DeckScreen() {
       await gameStore.loadState();
       const player = gameStore.getPlayer();
       setAllCards([...player.cards]);
-      setDeckCardIds([...player.currentDeck]);
+      setDeckCards(gameStore.getDeckCards());
       setDeckCapacity(player.deckCapacity);
     };
     loadData();
@@ -27,20 +27,16 @@ export default function DeckScreen() {
     const unsubscribe = gameStore.subscribe(() => {
       const player = gameStore.getPlayer();
       setAllCards([...player.cards]);
-      setDeckCardIds([...player.currentDeck]);
+      setDeckCards(gameStore.getDeckCards());
       setDeckCapacity(player.deckCapacity);
     });
     return unsubscribe;
   }, []);
 
-  const deckCards = deckCardIds
-    .map(id => allCards.find(c => c.id === id))
-    .filter((c): c is WordCard => c !== undefined);
-
-  const availableCards = allCards.filter(c => !deckCardIds.includes(c.id));
+  const availableCards = allCards.filter(c => !gameStore.isInDeck(c.id));
 
   const handleAddToDeck = (card: WordCard) => {
-    if (deckCardIds.length >= deckCapacity) {
+    if (deckCards.length >= deckCapacity) {
       Alert.alert('デッキ上限', `現在のレベルではデッキには最大${deckCapacity}枚までです`);
       return;
     }
@@ -3,7 +3,7 @@ import { Text, View, Pressable, TextInput, StyleSheet, ScrollView } from 'react-
 import { useRouter, useLocalSearchParams } from 'expo-router';
 import { ScreenContainer } from '@/components/screen-container';
 import { IconSymbol } from '@/components/ui/icon-symbol';
-import { loadTerms, loadExamples, loadProgress, saveProgress, createInitialProgress, TOPICS } from '@/lib/data-store';
+import { loadTerms, loadExamples, loadProgress, saveTermProgress, createInitialProgress, TOPICS } from '@/lib/data-store';
 import type { Term, Example, LearningProgress, TopicCode, QuizQuestion, QuizResult } from '@/lib/types';
 
 type QuizDirection = 'jp_to_en' | 'en_to_jp';
@@ -181,7 +181,7 @@ export default function QuizSessionScreen() {
       is_difficult: !isCorrect ? true : termProgress.is_difficult,
     };
     const newProgress = { ...progress, [currentQuestion.term_id]: updatedProgress };
-    await saveProgress(newProgress);
+    saveTermProgress(updatedProgress);
     setProgress(newProgress);
   };
 
@@ -4,7 +4,7 @@ import { useRouter } from 'expo-router';
 import { ScreenContainer } from '@/components/screen-container';
 import { IconSymbol } from '@/components/ui/icon-symbol';
 import { 
-  loadTerms, loadExamples, loadProgress, saveProgress, 
+  loadTerms, loadExamples, loadProgress, recordReview, 
   getReviewDueTerms, createInitialProgress, 
   TOPICS, loadSRSSettings, saveSRSSettings
 } from '@/lib/data-store';
@@ -71,7 +71,7 @@ export default function ReviewScreen() {
     const updatedProgress = calculateNextReviewWithButton(currentProgress, answer, algorithm);
     
     const newProgress = { ...progress, [currentTerm.term_id]: updatedProgress };
-    await saveProgress(newProgress);
+    recordReview(currentProgress, updatedProgress, answer, algorithm);
     setProgress(newProgress);
     
     // 次のカードへ
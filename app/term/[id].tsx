@@ -3,14 +3,14 @@ import { ScrollView, Text, View, Pressable, StyleSheet } from 'react-native';
 import { useRouter, useLocalSearchParams } from 'expo-router';
 import { ScreenContainer } from '@/components/screen-container';
 import { IconSymbol } from '@/components/ui/icon-symbol';
-import { loadTerms, loadExamples, loadRelations, loadProgress, saveProgress, createInitialProgress, TOPICS } from '@/lib/data-store';
+import { loadTerms, loadExamples, loadRelations, loadProgress, saveTermProgress, createInitialProgress, TOPICS } from '@/lib/data-store';
 import { useSpeech } from '@/hooks/use-speech';
 import type { Term, Example, Relation, LearningProgress } from '@/lib/types';
 
 export default function TermDetailScreen() {
   const router = useRouter();
   const { id } = useLocalSearchParams<{ id: string }>();
-  const { speakEnglish, speakJapanese, isSpeaking, stop, isAvailable } = useSpeech();
+  const { speakJapanese, speakTermText, isSpeaking, stop, isAvailable } = useSpeech();
   
   const [term, setTerm] = useState<Term | null>(null);
   const [example, setExample] = useState<Example | null>(null);
@@ -60,7 +60,7 @@ export default function TermDetailScreen() {
     const current = allProgress[id] || createInitialProgress(id);
     const updated = { ...current, is_bookmarked: !current.is_bookmarked };
     const newProgress = { ...allProgress, [id]: updated };
-    await saveProgress(newProgress);
+    saveTermProgress(updated);
     setProgress(updated);
     setAllProgress(newProgress);
   };
@@ -69,7 +69,7 @@ export default function TermDetailScreen() {
     if (isSpeaking) {
       stop();
     } else if (term) {
-      speakEnglish(term.en_canonical);
+      speakTermText(term.term_id, 'headword', term.en_canonical);
     }
   };
 
@@ -77,7 +77,7 @@ export default function TermDetailScreen() {
     if (isSpeaking) {
       stop();
     } else if (example?.example_en) {
-      speakEnglish(example.example_en);
+      speakTermText(example.term_id, 'example', example.example_en);
     }
   };
 
@@ -0,0 +1,39 @@
+CREATE TABLE `reviewEvents` (
+	`id` bigint AUTO_INCREMENT NOT NULL,
+	`userId` int NOT NULL,
+	`clientEventId` varchar(64) NOT NULL,
+	`termId` varchar(32) NOT NULL,
+	`rating` enum('again','hard','good','easy') NOT NULL,
+	`correct` boolean NOT NULL,
+	`elapsedMs` int,
+	`reviewedAt` timestamp(3) NOT NULL,
+	`createdAt` timestamp NOT NULL DEFAULT (now()),
+	CONSTRAINT `reviewEvents_id` PRIMARY KEY(`id`)
+);
+--> statement-breakpoint
+CREATE TABLE `termProgress` (
+	`userId` int NOT NULL,
+	`termId` varchar(32) NOT NULL,
+	`easeFactor` double NOT NULL,
+	`interval` double NOT NULL,
+	`repetitions` int NOT NULL,
+	`nextReview` varchar(32) NOT NULL,
+	`nextReviewTime` varchar(32),
+	`lastReview` varchar(32),
+	`correctCount` int NOT NULL,
+	`incorrectCount` int NOT NULL,
+	`isBookmarked` boolean NOT NULL,
+	`isDifficult` boolean NOT NULL,
+	`userNotes` text,
+	`phase` enum('new','learning','review','relearning'),
+	`learningStep` int,
+	`stability` double,
+	`difficulty` double,
+	`version` bigint NOT NULL,
+	`updatedAt` timestamp(3) NOT NULL DEFAULT (now(3)),
+	CONSTRAINT `termProgress_userId_termId` PRIMARY KEY(`userId`,`termId`)
+);
+--> statement-breakpoint
+CREATE UNIQUE INDEX `reviewEvents_userId_clientEventId_unique` ON `reviewEvents` (`userId`,`clientEventId`);--> statement-breakpoint
+CREATE INDEX `reviewEvents_termId_reviewedAt_idx` ON `reviewEvents` (`termId`,`reviewedAt`);--> statement-breakpoint
+CREATE INDEX `termProgress_userId_updatedAt_idx` ON `termProgress` (`userId`,`updatedAt`);
@@ -1,4 +1,18 @@
-import { int, mysqlEnum, mysqlTable, text, timestamp, varchar } from "drizzle-orm/mysql-core";
+import { sql } from "drizzle-orm";
+import {
+  bigint,
+  boolean,
+  double,
+  index,
+  int,
+  mysqlEnum,
+  mysqlTable,
+  primaryKey,
+  text,
+  timestamp,
+  uniqueIndex,
+  varchar,
+} from "drizzle-orm/mysql-core";
 
 /**
  * Core user table backing auth flow.
@@ -25,4 +39,70 @@ export const users = mysqlTable("users", {
 export type User = typeof users.$inferSelect;
 export type InsertUser = typeof users.$inferInsert;
 
-// TODO: Add your tables here
+/**
+ * Latest learning progress per (user, term), mirrored from the on-device LearningProgress.
+ * Devices sync batched deltas; the row with the higher `version` wins (last-writer-wins).
+ */
+export const termProgress = mysqlTable(
+  "termProgress",
+  {
+    userId: int("userId").notNull(),
+    termId: varchar("termId", { length: 32 }).notNull(),
+    easeFactor: double("easeFactor").notNull(),
+    interval: double("interval").notNull(),
+    repetitions: int("repetitions").notNull(),
+    nextReview: varchar("nextReview", { length: 32 }).notNull(),
+    nextReviewTime: varchar("nextReviewTime", { length: 32 }),
+    lastReview: varchar("lastReview", { length: 32 }),
+    correctCount: int("correctCount").notNull(),
+    incorrectCount: int("incorrectCount").notNull(),
+    isBookmarked: boolean("isBookmarked").notNull(),
+    isDifficult: boolean("isDifficult").notNull(),
+    userNotes: text("userNotes"),
+    phase: mysqlEnum("phase", ["new", "learning", "review", "relearning"]),
+    learningStep: int("learningStep"),
+    stability: double("stability"),
+    difficulty: double("difficulty"),
+    /** Server write time (set by the sync upsert); the cursor for pulling changes from other devices. */
+    updatedAt: timestamp("updatedAt", { fsp: 3 }).default(sql`(now(3))`).notNull(),
+    /**
+     * Client-side modification time (ms since epoch) of this record. Higher wins.
+     * Declared last on purpose: ON DUPLICATE KEY UPDATE assignments are emitted in column order,
+     * and every other assignment must compare against the stored version (see lastWriterWinsSet).
+     */
+    version: bigint("version", { mode: "number" }).notNull(),
+  },
+  (table) => [
+    primaryKey({ name: "termProgress_userId_termId", columns: [table.userId, table.termId] }),
+    index("termProgress_userId_updatedAt_idx").on(table.userId, table.updatedAt),
+  ],
+);
+
+export type TermProgress = typeof termProgress.$inferSelect;
+export type InsertTermProgress = typeof termProgress.$inferInsert;
+
+/**
+ * Append-only log of answered reviews, for cohort analytics.
+ * `clientEventId` is generated on the device so that retried uploads are ignored.
+ */
+export const reviewEvents = mysqlTable(
+  "reviewEvents",
+  {
+    id: bigint("id", { mode: "number" }).autoincrement().primaryKey(),
+    userId: int("userId").notNull(),
+    clientEventId: varchar("clientEventId", { length: 64 }).notNull(),
+    termId: varchar("termId", { length: 32 }).notNull(),
+    rating: mysqlEnum("rating", ["again", "hard", "good", "easy"]).notNull(),
+    correct: boolean("correct").notNull(),
+    elapsedMs: int("elapsedMs"),
+    reviewedAt: timestamp("reviewedAt", { fsp: 3 }).notNull(),
+    createdAt: timestamp("createdAt").defaultNow().notNull(),
+  },
+  (table) => [
+    uniqueIndex("reviewEvents_userId_clientEventId_unique").on(table.userId, table.clientEventId),
+    index("reviewEvents_termId_reviewedAt_idx").on(table.termId, table.reviewedAt),
+  ],
+);
+
+export type ReviewEvent = typeof reviewEvents.$inferSelect;
+export type InsertReviewEvent = typeof reviewEvents.$inferInsert;
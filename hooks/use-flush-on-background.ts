@@ -0,0 +1,20 @@
+import { useEffect } from 'react';
+import { AppState } from 'react-native';
+import { flushProgress } from '@/lib/data-store';
+import { textbookStore } from '@/lib/textbook-store';
+import { gameStore } from '@/lib/game-store';
+
+/**
+ * アプリがバックグラウンドに移る前に、まとめ書き待ちの進捗とゲーム状態を保存する
+ */
+export function useFlushOnBackground() {
+  useEffect(() => {
+    const subscription = AppState.addEventListener('change', (state) => {
+      if (state !== 'background' && state !== 'inactive') return;
+      Promise.all([flushProgress(), textbookStore.flush(), gameStore.flush()]).catch((error) => {
+        console.error('Failed to flush progress:', error);
+      });
+    });
+    return () => subscription.remove();
+  }, []);
+}
@@ -1,6 +1,8 @@
-import { useState, useCallback, useEffect } from 'react';
+import { useState, useCallback, useEffect, useRef } from 'react';
 import * as Speech from 'expo-speech';
+import { createAudioPlayer, type AudioPlayer } from 'expo-audio';
 import { Platform } from 'react-native';
+import { getAudioClip, type AudioClipKind } from '@/lib/audio-clips';
 
 export interface SpeechOptions {
   language?: string;
@@ -11,6 +13,15 @@ export interface SpeechOptions {
 export function useSpeech() {
   const [isSpeaking, setIsSpeaking] = useState(false);
   const [isAvailable, setIsAvailable] = useState(true);
+  // ビルド時に合成したクリップの再生中のプレイヤー
+  const playerRef = useRef<AudioPlayer | null>(null);
+
+  const releasePlayer = useCallback(() => {
+    playerRef.current?.remove();
+    playerRef.current = null;
+  }, []);
+
+  useEffect(() => releasePlayer, [releasePlayer]);
 
   useEffect(() => {
     // Web環境でのSpeech API対応確認
@@ -23,6 +34,7 @@ export function useSpeech() {
     if (!isAvailable || !text) return;
 
     // 既に再生中の場合は停止
+    releasePlayer();
     if (isSpeaking) {
       await Speech.stop();
     }
@@ -42,14 +54,33 @@ export function useSpeech() {
       console.error('Speech error:', error);
       setIsSpeaking(false);
     }
-  }, [isSpeaking, isAvailable]);
+  }, [isSpeaking, isAvailable, releasePlayer]);
+
+  const playClip = useCallback(async (source: number) => {
+    releasePlayer();
+    if (isSpeaking) {
+      await Speech.stop();
+    }
+
+    const player = createAudioPlayer(source);
+    playerRef.current = player;
+    player.addListener('playbackStatusUpdate', status => {
+      if (status.didJustFinish && playerRef.current === player) {
+        releasePlayer();
+        setIsSpeaking(false);
+      }
+    });
+    setIsSpeaking(true);
+    player.play();
+  }, [isSpeaking, releasePlayer]);
 
   const stop = useCallback(async () => {
+    releasePlayer();
     if (isSpeaking) {
       await Speech.stop();
       setIsSpeaking(false);
     }
-  }, [isSpeaking]);
+  }, [isSpeaking, releasePlayer]);
 
   const speakEnglish = useCallback((text: string) => {
     speak(text, { language: 'en-US', rate: 0.85 });
@@ -59,11 +90,26 @@ export function useSpeech() {
     speak(text, { language: 'ja-JP', rate: 0.9 });
   }, [speak]);
 
+  // 用語の見出し語・例文: 合成済みの音声があればそれを再生し、なければ端末で合成する
+  const speakTermText = useCallback((termId: string, kind: AudioClipKind, text: string) => {
+    const clip = getAudioClip(termId, kind, text);
+    if (clip === null) {
+      speakEnglish(text);
+      return;
+    }
+    playClip(clip).catch(error => {
+      console.error('Audio playback error:', error);
+      releasePlayer();
+      speakEnglish(text);
+    });
+  }, [playClip, releasePlayer, speakEnglish]);
+
   return {
     speak,
     stop,
     speakEnglish,
     speakJapanese,
+    speakTermText,
     isSpeaking,
     isAvailable,
   };
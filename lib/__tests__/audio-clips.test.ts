@@ -0,0 +1,42 @@
+import { describe, it, expect, vi } from 'vitest';
+
+vi.mock('@react-native-async-storage/async-storage');
+
+// fnv1a32 は lib/content-patch.ts の contentChecksum で求めた値
+vi.mock('../generated-audio', async () => {
+  const { contentChecksum } = await import('../content-patch');
+  return {
+    GENERATED_AUDIO_CLIPS: {
+      TERM0001: {
+        headword: { checksum: contentChecksum('Bid-Ask Spread'), source: 101 },
+        example: { checksum: contentChecksum('A narrow spread indicates high liquidity.'), source: 102 },
+      },
+      TERM0002: {
+        headword: { checksum: contentChecksum('Market Order'), source: 201 },
+      },
+    },
+  };
+});
+
+import { getAudioClip } from '../audio-clips';
+
+describe('getAudioClip', () => {
+  it('should return the pre-rendered clip when the text matches', () => {
+    expect(getAudioClip('TERM0001', 'headword', 'Bid-Ask Spread')).toBe(101);
+    expect(getAudioClip('TERM0001', 'example', 'A narrow spread indicates high liquidity.')).toBe(102);
+  });
+
+  it('should ignore differences in whitespace', () => {
+    expect(getAudioClip('TERM0001', 'example', '  A narrow spread\nindicates  high liquidity. ')).toBe(102);
+  });
+
+  it('should not play a stale clip after the text was patched', () => {
+    expect(getAudioClip('TERM0001', 'example', 'A wide spread indicates low liquidity.')).toBeNull();
+  });
+
+  it('should return null for missing clips', () => {
+    expect(getAudioClip('TERM0002', 'example', 'A market order executes immediately.')).toBeNull();
+    expect(getAudioClip('TERM9999', 'headword', 'Unknown')).toBeNull();
+    expect(getAudioClip('TERM0002', 'headword', '')).toBeNull();
+  });
+});
@@ -0,0 +1,59 @@
+import { describe, it, expect, beforeEach } from 'vitest';
+import { CardInventory } from '../card-inventory';
+import { INITIAL_PLAYER_STATE, type WordCard } from '../game-types';
+
+function makeCard(id: string, termId: string): WordCard {
+  return {
+    id, termId, term: termId, termJa: termId, rarity: 'common',
+    attackPower: 10, healPower: 5, acquired: true, usageCount: 0, successCount: 0, upgradeLevel: 0,
+  };
+}
+
+describe('CardInventory', () => {
+  let inventory: CardInventory;
+
+  beforeEach(() => {
+    inventory = new CardInventory();
+    inventory.rebuild({
+      ...INITIAL_PLAYER_STATE,
+      cards: [makeCard('c1', 'T1'), makeCard('c2', 'T2'), makeCard('c3', 'T1')],
+      currentDeck: ['c1', 'c2'],
+    });
+  });
+
+  it('should index cards by id and term', () => {
+    expect(inventory.size).toBe(3);
+    expect(inventory.get('c3')?.termId).toBe('T1');
+    expect(inventory.countByTerm('T1')).toBe(2);
+    expect(inventory.countByTerm('T9')).toBe(0);
+    expect(inventory.getByTerm('T1').map(c => c.id)).toEqual(['c1', 'c3']);
+  });
+
+  it('should list terms with two or more cards as fusion candidates', () => {
+    expect(inventory.getFusionCandidates().map(c => [c.termId, c.cards.length])).toEqual([['T1', 2]]);
+
+    inventory.add(makeCard('c4', 'T2'));
+    expect(inventory.getFusionCandidates().map(c => c.termId).sort()).toEqual(['T1', 'T2']);
+  });
+
+  it('should update the indexes when cards are removed', () => {
+    inventory.remove('c1');
+    expect(inventory.get('c1')).toBeUndefined();
+    expect(inventory.isInDeck('c1')).toBe(false);
+    expect(inventory.countByTerm('T1')).toBe(1);
+    expect(inventory.getFusionCandidates()).toEqual([]);
+
+    inventory.remove('c3');
+    expect(inventory.getByTerm('T1')).toEqual([]);
+    expect(inventory.remove('c3')).toBeUndefined();
+  });
+
+  it('should track deck membership', () => {
+    expect(inventory.isInDeck('c2')).toBe(true);
+    expect(inventory.isInDeck('c3')).toBe(false);
+    inventory.addToDeck('c3');
+    inventory.removeFromDeck('c2');
+    expect(inventory.isInDeck('c3')).toBe(true);
+    expect(inventory.isInDeck('c2')).toBe(false);
+  });
+});
@@ -0,0 +1,74 @@
+import { describe, it, expect, vi } from 'vitest';
+import type { CFAQuestion } from '../game-types';
+
+function makeQuestions(prefix: string, topic: string, difficulty: CFAQuestion['difficulty'], count: number): CFAQuestion[] {
+  return Array.from({ length: count }, (_, i) => ({
+    id: `${prefix}_${i}`,
+    question: `Q${i}`,
+    options: ['1', '2', '3'],
+    correctAnswer: '1',
+    explanation: '',
+    topic,
+    difficulty,
+  }));
+}
+
+const load = vi.hoisted(() => vi.fn());
+vi.mock('../generated-questions', () => ({
+  GENERATED_QUESTION_SHARDS: [
+    { topic: 'Derivatives', difficulty: 'medium', count: 30, load: () => load('DER_medium') },
+    { topic: 'Derivatives', difficulty: 'hard', count: 10, load: () => load('DER_hard') },
+  ],
+}));
+load.mockImplementation((key: string) =>
+  key === 'DER_medium'
+    ? makeQuestions('gen_der_m', 'Derivatives', 'medium', 30)
+    : makeQuestions('gen_der_h', 'Derivatives', 'hard', 10)
+);
+
+import {
+  CFA_QUESTIONS,
+  getRandomCFAQuestion,
+  getCFAQuestionByDifficulty,
+  getCFAQuestionByTopic,
+} from '../cfa-questions';
+
+describe('CFA question pool', () => {
+  it('should load a shard only when it is first drawn from', () => {
+    expect(load).not.toHaveBeenCalled();
+    getCFAQuestionByDifficulty('hard');
+    expect(load).toHaveBeenCalledWith('DER_hard');
+    expect(load).not.toHaveBeenCalledWith('DER_medium');
+  });
+
+  it('should not repeat a question until the pool is exhausted', () => {
+    // ミディアムのシャード（30問）はまだ一度も引いていない
+    const generated: string[] = [];
+    for (let i = 0; i < 30; i++) {
+      const question = getCFAQuestionByDifficulty('medium')!;
+      expect(question.difficulty).toBe('medium');
+      if (question.id.startsWith('gen_')) generated.push(question.id);
+    }
+    expect(generated.length).toBeGreaterThan(0);
+    expect(new Set(generated).size).toBe(generated.length);
+  });
+
+  it('should mix handwritten and generated questions', () => {
+    const ids = new Set<string>();
+    for (let i = 0; i < 200; i++) {
+      ids.add(getRandomCFAQuestion().id);
+    }
+    expect(Array.from(ids).some(id => id.startsWith('gen_'))).toBe(true);
+    expect(Array.from(ids).some(id => CFA_QUESTIONS.some(q => q.id === id))).toBe(true);
+  });
+
+  it('should filter handwritten questions by difficulty', () => {
+    for (let i = 0; i < 20; i++) {
+      expect(getCFAQuestionByDifficulty('easy')?.difficulty).toBe('easy');
+    }
+  });
+
+  it('should return null for an unknown topic', () => {
+    expect(getCFAQuestionByTopic('Astrology')).toBeNull();
+  });
+});
@@ -0,0 +1,122 @@
+import { describe, it, expect, beforeEach, vi } from 'vitest';
+
+vi.mock('@react-native-async-storage/async-storage');
+
+import { storage } from '@/__mocks__/@react-native-async-storage/async-storage';
+import {
+  contentChecksum,
+  parseContentPatch,
+  applyOverrides,
+  applyContentPatch,
+  loadContentOverrides,
+  getInstalledContentVersion,
+} from '../content-patch';
+import { installContentPatch } from '../data-store';
+import { textbookStore } from '../textbook-store';
+import textbookSample from '../../data/textbook-sample.json';
+
+function makePatch(changes: object, base = '1.0.0', target = '1.0.1'): string {
+  const body = JSON.stringify(changes);
+  return JSON.stringify({
+    format: 1,
+    base_version: base,
+    target_version: target,
+    checksum: contentChecksum(body),
+    changes: body,
+  });
+}
+
+describe('contentChecksum', () => {
+  it('should match scripts/content_patch.py', () => {
+    expect(contentChecksum('')).toBe('fnv1a32:811c9dc5');
+    expect(contentChecksum('{"terms":{"upsert":[],"delete":["TERM0001"]}}')).toBe('fnv1a32:79733c03');
+    expect(contentChecksum('倫理規範🙂')).toBe('fnv1a32:3ef3fadc');
+  });
+});
+
+describe('parseContentPatch', () => {
+  it('should reject a corrupted patch', () => {
+    const patch = JSON.parse(makePatch({ terms: { upsert: [], delete: ['TERM0001'] } }));
+    patch.changes = patch.changes.replace('TERM0001', 'TERM0002');
+    expect(() => parseContentPatch(JSON.stringify(patch), '1.0.0')).toThrow('checksum');
+  });
+
+  it('should reject a patch for another version', () => {
+    expect(() => parseContentPatch(makePatch({}, '0.9.0'), '1.0.0')).toThrow('expects 0.9.0');
+  });
+});
+
+describe('applyOverrides', () => {
+  const terms = [{ term_id: 'T1', v: 1 }, { term_id: 'T2', v: 2 }, { term_id: 'T3', v: 3 }];
+
+  it('should return the same array when there are no overrides', () => {
+    expect(applyOverrides(terms, 'terms', new Map())).toBe(terms);
+  });
+
+  it('should replace, delete and append while keeping order', () => {
+    const overrides = new Map<string, any>([
+      ['T2', { term_id: 'T2', v: 20 }],
+      ['T3', null],
+      ['T4', { term_id: 'T4', v: 4 }],
+    ]);
+    expect(applyOverrides(terms, 'terms', overrides).map(t => [t.term_id, t.v])).toEqual([
+      ['T1', 1], ['T2', 20], ['T4', 4],
+    ]);
+  });
+
+  it('should key relations by both term ids', () => {
+    const relations = [{ term_id: 'T1', related_term_id: 'T2' }, { term_id: 'T1', related_term_id: 'T3' }];
+    const result = applyOverrides(relations, 'relations', new Map([['T1|T3', null]]));
+    expect(result).toEqual([{ term_id: 'T1', related_term_id: 'T2' }]);
+  });
+});
+
+describe('applyContentPatch', () => {
+  beforeEach(() => storage.clear());
+
+  it('should store one key per changed record plus the version', async () => {
+    const raw = makePatch({ terms: { upsert: [{ term_id: 'TERM0001', jp_headword: '修正' }], delete: [] } });
+    const result = await applyContentPatch(raw, '1.0.0');
+
+    expect(result).toEqual({ version: '1.0.1', changed: 1 });
+    expect(storage.size).toBe(3);
+    expect(await getInstalledContentVersion('1.0.0')).toBe('1.0.1');
+
+    const overrides = await loadContentOverrides('1.0.0');
+    expect(overrides.get('terms')!.get('TERM0001')).toEqual({ term_id: 'TERM0001', jp_headword: '修正' });
+  });
+
+  it('should record deletes as tombstones', async () => {
+    await applyContentPatch(makePatch({ 'textbook.textContents': { upsert: [], delete: ['EQ_MOS_1'] } }), '1.0.0');
+    const overrides = await loadContentOverrides('1.0.0');
+    expect(overrides.get('textbook.textContents')!.get('EQ_MOS_1')).toBeNull();
+  });
+
+  it('should discard overrides when the embedded data version changes', async () => {
+    await applyContentPatch(makePatch({ terms: { upsert: [{ term_id: 'TERM0001' }], delete: [] } }), '1.0.0');
+    const overrides = await loadContentOverrides('1.1.0');
+    expect(overrides.size).toBe(0);
+    expect(storage.size).toBe(0);
+    expect(await getInstalledContentVersion('1.1.0')).toBe('1.1.0');
+  });
+});
+
+describe('installContentPatch', () => {
+  beforeEach(() => {
+    storage.clear();
+    storage.set('@cfa_textbook_data', JSON.stringify(textbookSample));
+  });
+
+  it('should show patched textbook records without re-initialising', async () => {
+    await textbookStore.initialize();
+    const original = textbookStore.getTextContent('EQ_MOS_1')!;
+
+    const raw = makePatch({
+      'textbook.textContents': { upsert: [{ ...original, titleJa: '市場の仕組み（改訂）' }], delete: [] },
+    });
+    expect(await installContentPatch(raw)).toEqual({ version: '1.0.1', changed: 1 });
+
+    expect(textbookStore.getTextContent('EQ_MOS_1')!.titleJa).toBe('市場の仕組み（改訂）');
+    expect(textbookStore.getTextContent('EQ_MOS_1')!.updatedAt).toBeInstanceOf(Date);
+  });
+});
@@ -0,0 +1,63 @@
+import { bench, describe, vi } from 'vitest';
+
+vi.mock('@react-native-async-storage/async-storage');
+
+import { storage } from '@/__mocks__/@react-native-async-storage/async-storage';
+import AsyncStorage from '@react-native-async-storage/async-storage';
+import { GamePersistence, LEGACY_GAME_STATE_KEY, type PersistedGameState } from '../game-persistence';
+import { INITIAL_PLAYER_STATE, type WordCard } from '../game-types';
+
+function makeState(cardCount: number): PersistedGameState {
+  const cards: WordCard[] = Array.from({ length: cardCount }, (_, i) => ({
+    id: `card_TERM${String(i % 384).padStart(4, '0')}_${1700000000000 + i}`,
+    termId: `TERM${String(i % 384).padStart(4, '0')}`,
+    term: 'Weighted average cost of capital',
+    termJa: '加重平均資本コスト',
+    rarity: 'rare',
+    attackPower: 35,
+    healPower: 20,
+    acquired: true,
+    acquiredAt: 1700000000000 + i,
+    usageCount: i % 17,
+    successCount: i % 11,
+    upgradeLevel: i % 5,
+  }));
+  return {
+    player: { ...INITIAL_PLAYER_STATE, cards, currentDeck: cards.slice(0, 15).map(c => c.id), items: [] },
+    unlockedStages: [1, 2, 3],
+    currentStage: 3,
+    dailyMissions: { missions: [], lastResetDate: '2026-01-01', totalCompleted: 0 },
+    bossDefeated: [],
+  };
+}
+
+// 1回の保存にかかる時間を、以前の一括保存と比較する
+for (const cardCount of [100, 1_000, 10_000]) {
+  describe(`save with ${cardCount} cards`, () => {
+    const state = makeState(cardCount);
+    const persistence = new GamePersistence(() => state);
+
+    bench('legacy: whole state', async () => {
+      const { player, unlockedStages, currentStage, dailyMissions, bossDefeated } = state;
+      await AsyncStorage.setItem(
+        LEGACY_GAME_STATE_KEY,
+        JSON.stringify({ player, unlockedStages, currentStage, dailyMissions, bossDefeated })
+      );
+    });
+
+    bench('sliced: deck edit', async () => {
+      persistence.markDirty('deck');
+      await persistence.flush();
+    });
+
+    bench('sliced: mission update', async () => {
+      persistence.markDirty('missions');
+      await persistence.flush();
+    });
+
+    bench('sliced: battle end (profile + cards + stages)', async () => {
+      persistence.markDirty('profile', 'cards', 'stages');
+      await persistence.flush();
+    });
+  });
+}
@@ -0,0 +1,121 @@
+import { describe, it, expect, beforeEach, vi } from 'vitest';
+
+vi.mock('@react-native-async-storage/async-storage');
+
+import { storage } from '@/__mocks__/@react-native-async-storage/async-storage';
+import AsyncStorage from '@react-native-async-storage/async-storage';
+import { GamePersistence, LEGACY_GAME_STATE_KEY, sliceKey, type PersistedGameState } from '../game-persistence';
+import { INITIAL_PLAYER_STATE } from '../game-types';
+
+function makeState(): PersistedGameState {
+  return {
+    player: {
+      ...INITIAL_PLAYER_STATE,
+      gold: 120,
+      cards: [{
+        id: 'card_1', termId: 'TERM0001', term: 'Ethics', termJa: '倫理', rarity: 'common',
+        attackPower: 10, healPower: 5, acquired: true, usageCount: 0, successCount: 0, upgradeLevel: 0,
+      }],
+      currentDeck: ['card_1'],
+      items: [],
+    },
+    unlockedStages: [1, 2],
+    currentStage: 2,
+    dailyMissions: { missions: [], lastResetDate: '2026-01-01', totalCompleted: 3 },
+    bossDefeated: ['boss_ethics'],
+  };
+}
+
+describe('GamePersistence', () => {
+  beforeEach(() => {
+    storage.clear();
+    vi.mocked(AsyncStorage.multiSet).mockClear();
+  });
+
+  it('should write only the dirty slices in one batch', async () => {
+    const state = makeState();
+    const persistence = new GamePersistence(() => state);
+    persistence.markDirty('deck');
+    persistence.markDirty('deck', 'missions');
+    await persistence.flush();
+
+    expect(AsyncStorage.multiSet).toHaveBeenCalledTimes(1);
+    expect(Array.from(storage.keys()).sort()).toEqual([sliceKey('deck'), sliceKey('missions')]);
+    expect(persistence.hasPendingWrites()).toBe(false);
+  });
+
+  it('should write pending edits before loading so they are not lost', async () => {
+    const state = makeState();
+    const persistence = new GamePersistence(() => state);
+    persistence.markDirty('deck', 'profile');
+    await persistence.flush();
+
+    // 編集して、まとめ書きの前に読み込む（画面遷移で loadState が呼ばれた場合）
+    state.player.currentDeck = [];
+    state.player.gold = 20;
+    persistence.markDirty('deck', 'profile');
+    const loaded = await persistence.load();
+    expect(loaded?.player?.currentDeck).toEqual([]);
+    expect(loaded?.player?.gold).toBe(20);
+
+    await persistence.flush();
+    expect(JSON.parse(storage.get(sliceKey('deck'))!)).toEqual([]);
+    expect(persistence.hasPendingWrites()).toBe(false);
+  });
+
+  it('should keep cards out of the profile slice', async () => {
+    const state = makeState();
+    const persistence = new GamePersistence(() => state);
+    persistence.markDirty('profile');
+    await persistence.flush();
+
+    const profile = JSON.parse(storage.get(sliceKey('profile'))!);
+    expect(profile.gold).toBe(120);
+    expect(profile.cards).toBeUndefined();
+    expect(profile.currentDeck).toBeUndefined();
+  });
+
+  it('should round-trip the state through the slices', async () => {
+    const state = makeState();
+    const persistence = new GamePersistence(() => state);
+    persistence.markDirty('profile', 'cards', 'deck', 'items', 'stages', 'missions');
+    await persistence.flush();
+
+    expect(await new GamePersistence(() => state).load()).toEqual(state);
+  });
+
+  it('should migrate the legacy single-key state on the next flush', async () => {
+    const state = makeState();
+    storage.set(LEGACY_GAME_STATE_KEY, JSON.stringify(state));
+    const persistence = new GamePersistence(() => state);
+
+    expect(await persistence.load()).toEqual(state);
+    expect(persistence.hasPendingWrites()).toBe(true);
+    await persistence.flush();
+
+    expect(storage.has(LEGACY_GAME_STATE_KEY)).toBe(false);
+    expect(JSON.parse(storage.get(sliceKey('cards'))!)).toEqual(state.player.cards);
+  });
+
+  it('should debounce writes', async () => {
+    const state = makeState();
+    const persistence = new GamePersistence(() => state, { flushDelayMs: 10 });
+    persistence.markDirty('cards');
+    persistence.markDirty('profile');
+    expect(storage.size).toBe(0);
+
+    await new Promise(resolve => setTimeout(resolve, 50));
+    expect(AsyncStorage.multiSet).toHaveBeenCalledTimes(1);
+    expect(storage.size).toBe(2);
+  });
+
+  it('should drop pending writes on clear', async () => {
+    const state = makeState();
+    const persistence = new GamePersistence(() => state);
+    persistence.markDirty('cards');
+    await persistence.clear();
+    await persistence.flush();
+
+    expect(storage.size).toBe(0);
+  });
+});
@@ -1,15 +1,21 @@
 import { describe, it, expect, beforeEach, vi } from 'vitest';
 import { LEVEL_LIMITS, RARITY_STATS, INITIAL_PLAYER_STATE, INITIAL_BATTLE_STATE } from '../game-types';
 
-// Mock AsyncStorage
-vi.mock('@react-native-async-storage/async-storage', () => ({
-  default: {
-    getItem: vi.fn(() => Promise.resolve(null)),
-    setItem: vi.fn(() => Promise.resolve()),
-    removeItem: vi.fn(() => Promise.resolve()),
+vi.mock('@react-native-async-storage/async-storage');
+
+import { storage } from '@/__mocks__/@react-native-async-storage/async-storage';
+
+vi.mock('../data-store', () => ({
+  dataStore: {
+    initialize: vi.fn(() => Promise.resolve()),
+    getTerms: vi.fn(() => []),
+    getTermById: vi.fn(() => undefined),
   },
 }));
 
+import { gameStore } from '../game-store';
+import { sliceKey } from '../game-persistence';
+
 describe('Game Types and Constants', () => {
   describe('LEVEL_LIMITS', () => {
     it('should calculate correct deck capacity for level 1', () => {
@@ -126,3 +132,24 @@ describe('Burst System Logic', () => {
     expect(selfDamage).toBe(10);
   });
 });
+
+describe('GameStore persistence', () => {
+  beforeEach(() => storage.clear());
+
+  it('should keep an edit when a screen calls loadState before the debounced write', async () => {
+    const { cards, currentDeck, items, ...profile } = INITIAL_PLAYER_STATE;
+    storage.set(sliceKey('profile'), JSON.stringify({ ...profile, gold: 1000 }));
+    await gameStore.loadState();
+    expect(gameStore.getPlayer().gold).toBe(1000);
+
+    // 購入直後に別の画面へ移動（マウント時に loadState が呼ばれる）
+    expect(gameStore.buyItem('schw_power')).toBe(true);
+    await gameStore.loadState();
+    expect(gameStore.getPlayer().gold).toBe(500);
+    expect(gameStore.getItemCount('schw_power')).toBe(1);
+
+    await gameStore.flush();
+    expect(JSON.parse(storage.get(sliceKey('profile'))!).gold).toBe(500);
+    expect(JSON.parse(storage.get(sliceKey('items'))!)).toHaveLength(1);
+  });
+});
@@ -0,0 +1,117 @@
+import { describe, it, expect, beforeEach, vi } from 'vitest';
+
+vi.mock('@react-native-async-storage/async-storage');
+
+import { storage } from '@/__mocks__/@react-native-async-storage/async-storage';
+import AsyncStorage from '@react-native-async-storage/async-storage';
+import { ProgressJournal } from '../progress-journal';
+
+interface Progress {
+  count: number;
+}
+
+const KEY = 'cfa_progress';
+
+function journalKeys(): string[] {
+  return Array.from(storage.keys()).filter(k => k.startsWith(`${KEY}:j:`));
+}
+
+describe('ProgressJournal', () => {
+  beforeEach(() => storage.clear());
+
+  it('should read an existing snapshot without migration', async () => {
+    storage.set(KEY, JSON.stringify({ T1: { count: 3 } }));
+    const journal = new ProgressJournal<Progress>(KEY);
+    expect(await journal.load()).toEqual({ T1: { count: 3 } });
+  });
+
+  it('should write only the changed records, coalesced per id', async () => {
+    storage.set(KEY, JSON.stringify({ T1: { count: 1 }, T2: { count: 1 } }));
+    const journal = new ProgressJournal<Progress>(KEY);
+    await journal.load();
+
+    journal.record('T1', { count: 2 });
+    journal.record('T1', { count: 3 });
+    journal.record('T3', { count: 1 });
+    await journal.flush();
+
+    expect(journalKeys()).toEqual([`${KEY}:j:0`]);
+    expect(JSON.parse(storage.get(`${KEY}:j:0`)!)).toEqual([['T1', { count: 3 }], ['T3', { count: 1 }]]);
+    expect(JSON.parse(storage.get(KEY)!)).toEqual({ T1: { count: 1 }, T2: { count: 1 } });
+  });
+
+  it('should replay the journal in order on load', async () => {
+    const first = new ProgressJournal<Progress>(KEY);
+    first.record('T1', { count: 1 });
+    await first.flush();
+    first.record('T1', { count: 2 });
+    first.record('T2', { count: 1 });
+    await first.flush();
+
+    const second = new ProgressJournal<Progress>(KEY);
+    expect(await second.load()).toEqual({ T1: { count: 2 }, T2: { count: 1 } });
+
+    // 連番は既存のジャーナルの続きから
+    second.record('T3', { count: 1 });
+    await second.flush();
+    expect(journalKeys().sort()).toEqual([`${KEY}:j:0`, `${KEY}:j:1`, `${KEY}:j:2`]);
+  });
+
+  it('should keep records made before the first load', async () => {
+    storage.set(KEY, JSON.stringify({ T1: { count: 1 } }));
+    const journal = new ProgressJournal<Progress>(KEY);
+    journal.record('T1', { count: 5 });
+    expect(await journal.load()).toEqual({ T1: { count: 5 } });
+  });
+
+  it('should compact the journal into the snapshot past the threshold', async () => {
+    const journal = new ProgressJournal<Progress>(KEY, { compactThreshold: 3 });
+    for (let i = 0; i < 3; i++) {
+      journal.record(`T${i}`, { count: i });
+      await journal.flush();
+    }
+
+    expect(journalKeys()).toEqual([]);
+    expect(JSON.parse(storage.get(KEY)!)).toEqual({ T0: { count: 0 }, T1: { count: 1 }, T2: { count: 2 } });
+  });
+
+  it('should replay to the snapshot when compaction stops before removing the journal', async () => {
+    const journal = new ProgressJournal<Progress>(KEY, { compactThreshold: 2 });
+    journal.record('T1', { count: 1 });
+    await journal.flush();
+
+    // 畳み込みの途中（ジャーナルの削除前）で中断し、その間に T1 の新しい値が未保存のまま残る
+    vi.mocked(AsyncStorage.multiRemove).mockRejectedValueOnce(new Error('interrupted'));
+    journal.record('T2', { count: 1 });
+    const flushing = journal.flush();
+    journal.record('T1', { count: 2 });
+    await expect(flushing).rejects.toThrow('interrupted');
+
+    const snapshot = JSON.parse(storage.get(KEY)!);
+    expect(snapshot).toEqual({ T1: { count: 1 }, T2: { count: 1 } });
+    expect(journalKeys().length).toBe(2);
+    expect(await new ProgressJournal<Progress>(KEY).load()).toEqual(snapshot);
+
+    // 未保存の T1 は次の書き込みでジャーナルに入る
+    await journal.flush();
+    expect(await new ProgressJournal<Progress>(KEY).load()).toEqual({ T1: { count: 2 }, T2: { count: 1 } });
+  });
+
+  it('should flush automatically after the debounce delay', async () => {
+    const journal = new ProgressJournal<Progress>(KEY, { flushDelayMs: 10 });
+    journal.record('T1', { count: 1 });
+    expect(journalKeys()).toEqual([]);
+    await new Promise(resolve => setTimeout(resolve, 50));
+    expect(journalKeys()).toEqual([`${KEY}:j:0`]);
+  });
+
+  it('should replace everything with a snapshot', async () => {
+    const journal = new ProgressJournal<Progress>(KEY);
+    journal.record('T1', { count: 1 });
+    await journal.flush();
+    await journal.replaceAll({ T2: { count: 2 } });
+
+    expect(journalKeys()).toEqual([]);
+    expect(await new ProgressJournal<Progress>(KEY).load()).toEqual({ T2: { count: 2 } });
+  });
+});
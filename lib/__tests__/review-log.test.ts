@@ -0,0 +1,83 @@
+import { describe, it, expect, beforeEach, vi } from 'vitest';
+
+vi.mock('@react-native-async-storage/async-storage');
+
+import { storage } from '@/__mocks__/@react-native-async-storage/async-storage';
+import { ReviewLog, type ReviewEvent } from '../review-log';
+
+const KEY = 'cfa_review_log';
+
+function event(n: number, overrides: Partial<ReviewEvent> = {}): ReviewEvent {
+  return {
+    term_id: `TERM${String(n).padStart(4, '0')}`,
+    reviewed_at: 1_700_000_000_000 + n * 1000,
+    button: 'good',
+    interval: 3,
+    last_interval: 1,
+    algorithm: 'sm2_anki',
+    ...overrides,
+  };
+}
+
+function chunkSizes(): number[] {
+  return Array.from(storage.keys())
+    .filter(k => k.startsWith(`${KEY}:`))
+    .sort()
+    .map(k => JSON.parse(storage.get(k)!).length);
+}
+
+describe('ReviewLog', () => {
+  beforeEach(() => storage.clear());
+
+  it('should round-trip events through storage', async () => {
+    const log = new ReviewLog(KEY);
+    log.append(event(1, { button: 'again', interval: 0.007, algorithm: 'fsrs' }));
+    log.append(event(2, { button: 'easy' }));
+    await log.flush();
+
+    const reopened = new ReviewLog(KEY);
+    expect(await reopened.load()).toEqual([
+      event(1, { button: 'again', interval: 0.007, algorithm: 'fsrs' }),
+      event(2, { button: 'easy' }),
+    ]);
+  });
+
+  it('should fill the tail chunk and roll over at chunkSize', async () => {
+    const log = new ReviewLog(KEY, { chunkSize: 3 });
+    log.append(event(1));
+    log.append(event(2));
+    await log.flush();
+    expect(chunkSizes()).toEqual([2]);
+
+    // 別のインスタンス（アプリ再起動）でも末尾のチャンクに続けて書く
+    const reopened = new ReviewLog(KEY, { chunkSize: 3 });
+    for (let n = 3; n <= 7; n++) reopened.append(event(n));
+    await reopened.flush();
+
+    expect(chunkSizes()).toEqual([3, 3, 1]);
+    expect((await reopened.load()).map(e => e.reviewed_at)).toEqual(
+      [1, 2, 3, 4, 5, 6, 7].map(n => event(n).reviewed_at)
+    );
+  });
+
+  it('should export TSV with a header row', async () => {
+    const log = new ReviewLog(KEY);
+    log.append(event(1, { button: 'hard' }));
+
+    const lines = (await log.exportTSV()).split('\n');
+    expect(lines).toEqual([
+      'term_id\treviewed_at\tbutton\tinterval\tlast_interval\talgorithm',
+      `TERM0001\t${event(1).reviewed_at}\thard\t3\t1\tsm2_anki`,
+    ]);
+  });
+
+  it('should remove every chunk on clear', async () => {
+    const log = new ReviewLog(KEY, { chunkSize: 2 });
+    for (let n = 1; n <= 5; n++) log.append(event(n));
+    await log.clear();
+
+    expect(chunkSizes()).toEqual([]);
+    log.append(event(6));
+    expect(await log.load()).toEqual([event(6)]);
+  });
+});
@@ -0,0 +1,100 @@
+import { describe, it, expect } from 'vitest';
+import { DueCounter, StudyStatistics } from '../study-stats';
+import type { LearningProgress, Term, TopicCode } from '../types';
+
+function makeTerm(term_id: string, topic_code: TopicCode): Term {
+  return {
+    term_id, topic_code, en_canonical: term_id, en_aliases: [], abbreviations: [],
+    jp_headword: term_id, jp_reading: '', jp_definition: '', key_points: [], pitfall: '', formula: '',
+  } as Term;
+}
+
+function makeProgress(term_id: string, next_review: string, repetitions = 0): LearningProgress {
+  return {
+    term_id, ease_factor: 2.5, interval: 1, repetitions, next_review,
+    correct_count: 0, incorrect_count: 0, is_bookmarked: false, is_difficult: false,
+  };
+}
+
+describe('DueCounter', () => {
+  it('should count items due before now', () => {
+    const counter = new DueCounter();
+    counter.set('a', Date.parse('2026-03-01T00:00:00Z'));
+    counter.set('b', Date.parse('2026-03-02T09:00:00Z'));
+    counter.set('c', Date.parse('2026-03-02T18:00:00Z'));
+    counter.set('d', Date.parse('2026-03-05T00:00:00Z'));
+
+    expect(counter.count(new Date('2026-03-02T12:00:00Z'))).toBe(2);
+    expect(counter.count(new Date('2026-03-02T20:00:00Z'))).toBe(3);
+  });
+
+  it('should roll buckets over at day boundaries', () => {
+    const counter = new DueCounter();
+    counter.set('a', Date.parse('2026-03-02T18:00:00Z'));
+    counter.set('b', Date.parse('2026-03-04T00:00:00Z'));
+    expect(counter.count(new Date('2026-03-02T12:00:00Z'))).toBe(0);
+    expect(counter.count(new Date('2026-03-03T00:00:00Z'))).toBe(1);
+    expect(counter.count(new Date('2026-03-04T12:00:00Z'))).toBe(2);
+  });
+
+  it('should move and remove items that were already rolled over', () => {
+    const counter = new DueCounter();
+    counter.set('a', Date.parse('2026-03-01T00:00:00Z'));
+    counter.set('b', Date.parse('2026-03-01T00:00:00Z'));
+    expect(counter.count(new Date('2026-03-03T00:00:00Z'))).toBe(2);
+
+    // 復習して期限が先に延びた
+    counter.set('a', Date.parse('2026-03-10T00:00:00Z'));
+    counter.delete('b');
+    expect(counter.count(new Date('2026-03-03T00:00:00Z'))).toBe(0);
+
+    // 繰り入れ済みの日付で追加
+    counter.set('c', Date.parse('2026-03-02T00:00:00Z'));
+    expect(counter.count(new Date('2026-03-03T00:00:00Z'))).toBe(1);
+  });
+});
+
+describe('StudyStatistics', () => {
+  const terms = [makeTerm('t1', 'ETH'), makeTerm('t2', 'ETH'), makeTerm('t3', 'QM')];
+  const now = new Date('2026-03-02T12:00:00Z');
+
+  it('should aggregate the initial progress', () => {
+    const stats = new StudyStatistics(terms, ['ETH', 'QM'], {
+      t1: makeProgress('t1', '2026-03-01', 3),
+      t3: makeProgress('t3', '2026-03-09'),
+      unknown: makeProgress('unknown', '2026-03-01'),
+    });
+    expect(stats.snapshot(now)).toEqual({
+      total: 3,
+      learned: 2,
+      mastered: 1,
+      reviewDue: 1,
+      byTopic: { ETH: { total: 2, learned: 1 }, QM: { total: 1, learned: 1 } },
+    });
+  });
+
+  it('should update incrementally when progress changes', () => {
+    const stats = new StudyStatistics(terms, ['ETH', 'QM'], { t1: makeProgress('t1', '2026-03-01', 3) });
+
+    stats.update(makeProgress('t1', '2026-03-20', 0));
+    stats.update(makeProgress('t2', '2026-03-02', 4));
+    const snapshot = stats.snapshot(now);
+    expect(snapshot.learned).toBe(2);
+    expect(snapshot.mastered).toBe(1);
+    expect(snapshot.reviewDue).toBe(1);
+    expect(snapshot.byTopic.ETH.learned).toBe(2);
+  });
+
+  it('should use the minute-level review time when present', () => {
+    const stats = new StudyStatistics(terms, ['ETH', 'QM']);
+    stats.update({ ...makeProgress('t1', '2026-03-02'), next_review_time: '2026-03-02T12:10:00Z' });
+    expect(stats.snapshot(now).reviewDue).toBe(0);
+    expect(stats.snapshot(new Date('2026-03-02T12:10:00Z')).reviewDue).toBe(1);
+  });
+
+  it('should reset to a new progress map', () => {
+    const stats = new StudyStatistics(terms, ['ETH', 'QM'], { t1: makeProgress('t1', '2026-03-01', 3) });
+    stats.reset({ t3: makeProgress('t3', '2026-03-01') });
+    expect(stats.snapshot(now)).toMatchObject({ learned: 1, mastered: 0, reviewDue: 1 });
+  });
+});
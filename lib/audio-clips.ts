@@ -0,0 +1,25 @@
+/**
+ * ビルド時に合成した読み上げ音声（scripts/render_audio.py）の検索
+ *
+ * クリップには合成した本文のチェックサムが付いている。コンテンツパッチで
+ * 見出し語や例文が変わった場合は古い音声を流さず、null を返して端末の合成に任せる。
+ */
+
+import { contentChecksum } from './content-patch';
+import { GENERATED_AUDIO_CLIPS } from './generated-audio';
+
+export type AudioClipKind = 'headword' | 'example';
+
+// render_audio.py の normalize_text と同じ（空白をまとめる）
+function normalizeText(text: string): string {
+  return text.trim().split(/\s+/).join(' ');
+}
+
+/**
+ * 表示中の本文に対応する音声クリップ（require したアセット）を返す。なければ null
+ */
+export function getAudioClip(termId: string, kind: AudioClipKind, text: string): number | null {
+  const clip = GENERATED_AUDIO_CLIPS[termId]?.[kind];
+  if (!clip || !text) return null;
+  return clip.checksum === contentChecksum(normalizeText(text)) ? clip.source : null;
+}
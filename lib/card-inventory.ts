@@ -0,0 +1,90 @@
+/**
+ * 所持カードの索引
+ *
+ * player.cards / player.currentDeck（保存形式の配列）と並行して、
+ * カードID・用語ID（枚数つき）・デッキ所属の索引を持ち、追加・削除のたびに差分更新する。
+ * 合成候補の取得やデッキ編成がカード総数に比例して遅くならないようにする。
+ */
+
+import type { PlayerState, WordCard } from './game-types';
+
+export class CardInventory {
+  private byId: Map<string, WordCard> = new Map();
+  // 用語ID → その用語のカード（取得順）
+  private byTerm: Map<string, Map<string, WordCard>> = new Map();
+  // 2枚以上所持している用語ID（合成候補）
+  private fusable: Set<string> = new Set();
+  private deck: Set<string> = new Set();
+
+  /**
+   * プレイヤー状態から索引を作り直す（読み込み・リセット時）
+   */
+  rebuild(player: PlayerState): void {
+    this.byId.clear();
+    this.byTerm.clear();
+    this.fusable.clear();
+    this.deck = new Set(player.currentDeck);
+    for (const card of player.cards) {
+      this.add(card);
+    }
+  }
+
+  get(cardId: string): WordCard | undefined {
+    return this.byId.get(cardId);
+  }
+
+  get size(): number {
+    return this.byId.size;
+  }
+
+  add(card: WordCard): void {
+    this.byId.set(card.id, card);
+    let cards = this.byTerm.get(card.termId);
+    if (!cards) {
+      cards = new Map();
+      this.byTerm.set(card.termId, cards);
+    }
+    cards.set(card.id, card);
+    if (cards.size >= 2) this.fusable.add(card.termId);
+  }
+
+  remove(cardId: string): WordCard | undefined {
+    const card = this.byId.get(cardId);
+    if (!card) return undefined;
+    this.byId.delete(cardId);
+    this.deck.delete(cardId);
+    const cards = this.byTerm.get(card.termId)!;
+    cards.delete(cardId);
+    if (cards.size < 2) this.fusable.delete(card.termId);
+    if (cards.size === 0) this.byTerm.delete(card.termId);
+    return card;
+  }
+
+  countByTerm(termId: string): number {
+    return this.byTerm.get(termId)?.size ?? 0;
+  }
+
+  getByTerm(termId: string): WordCard[] {
+    const cards = this.byTerm.get(termId);
+    return cards ? Array.from(cards.values()) : [];
+  }
+
+  /**
+   * 合成候補（同じ用語のカードが2枚以上）
+   */
+  getFusionCandidates(): { termId: string; cards: WordCard[] }[] {
+    return Array.from(this.fusable, termId => ({ termId, cards: this.getByTerm(termId) }));
+  }
+
+  isInDeck(cardId: string): boolean {
+    return this.deck.has(cardId);
+  }
+
+  addToDeck(cardId: string): void {
+    this.deck.add(cardId);
+  }
+
+  removeFromDeck(cardId: string): void {
+    this.deck.delete(cardId);
+  }
+}
@@ -1,5 +1,6 @@
 // CFA Level I 実問ストック（拡張可能な構造）
 import { CFAQuestion } from './game-types';
+import { GENERATED_QUESTION_SHARDS } from './generated-questions';
 
 // CFA実問データベース
 // 新しい問題を追加する場合は、このリストに追加するだけでOK
@@ -172,24 +173,91 @@ export const CFA_QUESTIONS: CFAQuestion[] = [
   },
 ];
 
+// ========== 出題プール ==========
+// 手書きの問題と、公式から生成した問題のシャード（lib/generated-questions.ts）をまとめて扱う。
+// シャードは最初に出題するときに読み込み、各プールはシャッフルした順に一巡するまで同じ問題を出さない。
+
+interface QuestionPool {
+  topic: string | null;  // null: 複数トピック（手書きの問題）
+  difficulty: CFAQuestion['difficulty'] | null;
+  count: number;
+  load: () => CFAQuestion[];
+}
+
+class QuestionBag {
+  private questions: CFAQuestion[] | null = null;
+  private order: number[] = [];
+
+  constructor(private readonly pool: QuestionPool) {}
+
+  draw(filter?: (question: CFAQuestion) => boolean): CFAQuestion | null {
+    if (!this.questions) this.questions = this.pool.load();
+    const questions = this.questions;
+    if (questions.length === 0) return null;
+
+    for (let attempt = 0; attempt <= questions.length; attempt++) {
+      if (this.order.length === 0) this.order = shuffledIndexes(questions.length);
+      const question = questions[this.order.pop()!];
+      if (!filter || filter(question)) return question;
+    }
+    return null;
+  }
+}
+
+function shuffledIndexes(length: number): number[] {
+  const indexes = Array.from({ length }, (_, i) => i);
+  for (let i = length - 1; i > 0; i--) {
+    const j = Math.floor(Math.random() * (i + 1));
+    [indexes[i], indexes[j]] = [indexes[j], indexes[i]];
+  }
+  return indexes;
+}
+
+const bags: { pool: QuestionPool; bag: QuestionBag }[] = [
+  { topic: null, difficulty: null, count: CFA_QUESTIONS.length, load: () => CFA_QUESTIONS },
+  ...GENERATED_QUESTION_SHARDS,
+].map(pool => ({ pool, bag: new QuestionBag(pool) }));
+
+/**
+ * 条件に合うプールを問題数の重みで選び、そのプールから1問出す
+ */
+function drawQuestion(
+  poolMatches: (pool: QuestionPool) => boolean,
+  questionMatches?: (question: CFAQuestion) => boolean
+): CFAQuestion | null {
+  const candidates = bags.filter(({ pool }) => poolMatches(pool));
+  while (candidates.length > 0) {
+    const total = candidates.reduce((sum, { pool }) => sum + pool.count, 0);
+    let r = Math.random() * total;
+    let index = 0;
+    while (index < candidates.length - 1 && r >= candidates[index].pool.count) {
+      r -= candidates[index].pool.count;
+      index++;
+    }
+    const question = candidates[index].bag.draw(questionMatches);
+    if (question) return question;
+    candidates.splice(index, 1);
+  }
+  return null;
+}
+
 // ランダムにCFA実問を取得
 export function getRandomCFAQuestion(): CFAQuestion {
-  const randomIndex = Math.floor(Math.random() * CFA_QUESTIONS.length);
-  return CFA_QUESTIONS[randomIndex];
+  return drawQuestion(() => true) ?? CFA_QUESTIONS[Math.floor(Math.random() * CFA_QUESTIONS.length)];
 }
 
 // 難易度別にCFA実問を取得
 export function getCFAQuestionByDifficulty(difficulty: 'easy' | 'medium' | 'hard'): CFAQuestion | null {
-  const filtered = CFA_QUESTIONS.filter(q => q.difficulty === difficulty);
-  if (filtered.length === 0) return null;
-  const randomIndex = Math.floor(Math.random() * filtered.length);
-  return filtered[randomIndex];
+  return drawQuestion(
+    pool => pool.difficulty === null || pool.difficulty === difficulty,
+    question => question.difficulty === difficulty
+  );
 }
 
 // トピック別にCFA実問を取得
 export function getCFAQuestionByTopic(topic: string): CFAQuestion | null {
-  const filtered = CFA_QUESTIONS.filter(q => q.topic === topic);
-  if (filtered.length === 0) return null;
-  const randomIndex = Math.floor(Math.random() * filtered.length);
-  return filtered[randomIndex];
+  return drawQuestion(
+    pool => pool.topic === null || pool.topic === topic,
+    question => question.topic === topic
+  );
 }
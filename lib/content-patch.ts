@@ -0,0 +1,173 @@
+/**
+ * コンテンツ差分パッチの適用
+ * scripts/content_patch.py が生成したパッチを検証し、変更されたレコードだけを
+ * AsyncStorage にレコード単位で保存する（組み込みデータ全体は書き換えない）
+ */
+
+import AsyncStorage from '@react-native-async-storage/async-storage';
+
+export const CONTENT_PATCH_FORMAT = 1;
+
+const STORAGE_KEYS = {
+  // data-store の STORAGE_KEYS.DATA_VERSION と同じキー
+  VERSION: 'cfa_data_version',
+  // 上書きレコードが前提としている組み込みデータの版
+  BASE: 'cfa_content_base',
+  OVERRIDE_PREFIX: 'cfa_content:',
+};
+
+// 複合キーの区切り（scripts/content_patch.py と同じ）
+const KEY_SEPARATOR = '|';
+
+export type ContentCollection =
+  | 'terms'
+  | 'examples'
+  | 'relations'
+  | 'textbook.subjects'
+  | 'textbook.readings'
+  | 'textbook.textContents'
+  | 'textbook.examples';
+
+const COLLECTION_KEYS: Record<ContentCollection, string[]> = {
+  'terms': ['term_id'],
+  'examples': ['term_id'],
+  'relations': ['term_id', 'related_term_id'],
+  'textbook.subjects': ['code'],
+  'textbook.readings': ['id'],
+  'textbook.textContents': ['id'],
+  'textbook.examples': ['id'],
+};
+
+export interface ContentPatch {
+  format: number;
+  base_version: string;
+  target_version: string;
+  checksum: string;
+  changes: string;
+}
+
+export interface CollectionChanges {
+  upsert: any[];
+  delete: string[];
+}
+
+export type ContentChanges = Partial<Record<ContentCollection, CollectionChanges>>;
+
+// レコードキー → 上書きレコード（null は削除）
+export type ContentOverrides = Map<string, any | null>;
+
+/**
+ * FNV-1a 32bit（UTF-16コード単位）
+ */
+export function contentChecksum(text: string): string {
+  let h = 0x811c9dc5;
+  for (let i = 0; i < text.length; i++) {
+    h ^= text.charCodeAt(i);
+    h = Math.imul(h, 0x01000193) >>> 0;
+  }
+  return `fnv1a32:${h.toString(16).padStart(8, '0')}`;
+}
+
+export function recordKey(collection: ContentCollection, record: any): string {
+  return COLLECTION_KEYS[collection].map(field => String(record[field])).join(KEY_SEPARATOR);
+}
+
+/**
+ * パッチを解析し、形式・チェックサム・適用元の版を検証する
+ */
+export function parseContentPatch(raw: string, installedVersion: string): { patch: ContentPatch; changes: ContentChanges } {
+  const patch: ContentPatch = JSON.parse(raw);
+  if (patch.format !== CONTENT_PATCH_FORMAT) {
+    throw new Error(`Unsupported content patch format: ${patch.format}`);
+  }
+  if (contentChecksum(patch.changes) !== patch.checksum) {
+    throw new Error('Content patch checksum mismatch');
+  }
+  if (patch.base_version !== installedVersion) {
+    throw new Error(`Content patch expects ${patch.base_version}, installed ${installedVersion}`);
+  }
+  return { patch, changes: JSON.parse(patch.changes) };
+}
+
+/**
+ * 配列に上書きを反映する（既存の並びを保ち、新しいレコードは末尾に追加）
+ */
+export function applyOverrides<T>(records: T[], collection: ContentCollection, overrides: ContentOverrides): T[] {
+  if (overrides.size === 0) return records;
+  const result: T[] = [];
+  const applied = new Set<string>();
+  for (const record of records) {
+    const key = recordKey(collection, record);
+    if (overrides.has(key)) {
+      applied.add(key);
+      const override = overrides.get(key);
+      if (override) result.push(override);
+    } else {
+      result.push(record);
+    }
+  }
+  overrides.forEach((override, key) => {
+    if (override && !applied.has(key)) result.push(override);
+  });
+  return result;
+}
+
+function overrideStorageKey(collection: ContentCollection, key: string): string {
+  return `${STORAGE_KEYS.OVERRIDE_PREFIX}${collection}:${key}`;
+}
+
+/**
+ * インストール済みのコンテンツ版を取得（パッチ未適用なら組み込みデータの版）
+ */
+export async function getInstalledContentVersion(embeddedVersion: string): Promise<string> {
+  const [[, base], [, version]] = await AsyncStorage.multiGet([STORAGE_KEYS.BASE, STORAGE_KEYS.VERSION]);
+  return base === embeddedVersion && version ? version : embeddedVersion;
+}
+
+/**
+ * 保存済みの上書きレコードをコレクション別に読み込む
+ * アプリ更新で組み込みデータの版が変わった場合、古い上書きは破棄する
+ */
+export async function loadContentOverrides(embeddedVersion: string): Promise<Map<ContentCollection, ContentOverrides>> {
+  const result = new Map<ContentCollection, ContentOverrides>();
+  const keys = (await AsyncStorage.getAllKeys()).filter(k => k.startsWith(STORAGE_KEYS.OVERRIDE_PREFIX));
+  if (keys.length === 0) return result;
+
+  const base = await AsyncStorage.getItem(STORAGE_KEYS.BASE);
+  if (base !== embeddedVersion) {
+    await AsyncStorage.multiRemove([...keys, STORAGE_KEYS.BASE, STORAGE_KEYS.VERSION]);
+    return result;
+  }
+
+  for (const [storageKey, value] of await AsyncStorage.multiGet(keys)) {
+    const rest = storageKey.slice(STORAGE_KEYS.OVERRIDE_PREFIX.length);
+    const sep = rest.indexOf(':');
+    const collection = rest.slice(0, sep) as ContentCollection;
+    if (!result.has(collection)) result.set(collection, new Map());
+    result.get(collection)!.set(rest.slice(sep + 1), value ? JSON.parse(value) : null);
+  }
+  return result;
+}
+
+/**
+ * パッチを検証して、変更レコードと新しい版を1回の multiSet で保存する
+ */
+export async function applyContentPatch(raw: string, embeddedVersion: string): Promise<{ version: string; changed: number }> {
+  const installed = await getInstalledContentVersion(embeddedVersion);
+  const { patch, changes } = parseContentPatch(raw, installed);
+
+  const pairs: [string, string][] = [];
+  for (const [collection, c] of Object.entries(changes) as [ContentCollection, CollectionChanges][]) {
+    for (const key of c.delete) {
+      pairs.push([overrideStorageKey(collection, key), '']);
+    }
+    for (const record of c.upsert) {
+      pairs.push([overrideStorageKey(collection, recordKey(collection, record)), JSON.stringify(record)]);
+    }
+  }
+  const changed = pairs.length;
+  pairs.push([STORAGE_KEYS.BASE, embeddedVersion], [STORAGE_KEYS.VERSION, patch.target_version]);
+  await AsyncStorage.multiSet(pairs);
+
+  return { version: patch.target_version, changed };
+}
@@ -11,6 +11,11 @@ import {
   getReviewUrgency,
   type AnswerButton,
 } from './srs-algorithms';
+import { applyContentPatch, applyOverrides, loadContentOverrides } from './content-patch';
+import { ProgressJournal } from './progress-journal';
+import { ReviewLog } from './review-log';
+import { StudyStatistics, type StudyStatisticsSnapshot } from './study-stats';
+import { textbookStore } from './textbook-store';
 
 // JSONデータをインポート
 import termsData from '@/assets/data/terms.json';
@@ -28,9 +33,11 @@ const STORAGE_KEYS = {
   DATA_VERSION: 'cfa_data_version',
   SRS_SETTINGS: 'cfa_srs_settings',
   DISPLAY_SETTINGS: 'cfa_display_settings',
+  REVIEW_LOG: 'cfa_review_log',
 };
 
-const CURRENT_DATA_VERSION = '1.0.0';
+// 組み込みデータの版（差分パッチの適用元）
+export const CURRENT_DATA_VERSION = '1.0.0';
 
 // 科目マスターデータのベース情報
 const TOPIC_BASE: Omit<Topic, 'term_count'>[] = [
@@ -68,6 +75,34 @@ const EMBEDDED_TERMS: Term[] = termsData as Term[];
 const EMBEDDED_EXAMPLES: Example[] = examplesData as Example[];
 const EMBEDDED_RELATIONS: Relation[] = relationsData as Relation[];
 
+// 組み込みデータに差分パッチの上書きレコードを反映したもの（初回読み込み時に1度だけ計算）
+let patchedContent: Promise<{ terms: Term[]; examples: Example[]; relations: Relation[] }> | null = null;
+
+function loadPatchedContent() {
+  if (!patchedContent) {
+    patchedContent = loadContentOverrides(CURRENT_DATA_VERSION)
+      .then(overrides => ({
+        terms: applyOverrides(EMBEDDED_TERMS, 'terms', overrides.get('terms') ?? new Map()),
+        examples: applyOverrides(EMBEDDED_EXAMPLES, 'examples', overrides.get('examples') ?? new Map()),
+        relations: applyOverrides(EMBEDDED_RELATIONS, 'relations', overrides.get('relations') ?? new Map()),
+      }))
+      .catch(error => {
+        console.error('Failed to load content overrides:', error);
+        return { terms: EMBEDDED_TERMS, examples: EMBEDDED_EXAMPLES, relations: EMBEDDED_RELATIONS };
+      });
+  }
+  return patchedContent;
+}
+
+// 差分パッチを適用（変更レコードのみ保存し、用語・教材の両方を読み直して反映）
+export async function installContentPatch(raw: string): Promise<{ version: string; changed: number }> {
+  const result = await applyContentPatch(raw, CURRENT_DATA_VERSION);
+  patchedContent = null;
+  progressStats = null;
+  await Promise.all([dataStore.reloadContent(), textbookStore.reloadContent()]);
+  return result;
+}
+
 // データ保存
 export async function saveTerms(terms: Term[]): Promise<void> {
   await AsyncStorage.setItem(STORAGE_KEYS.TERMS, JSON.stringify(terms));
@@ -81,28 +116,69 @@ export async function saveRelations(relations: Relation[]): Promise<void> {
   await AsyncStorage.setItem(STORAGE_KEYS.RELATIONS, JSON.stringify(relations));
 }
 
+// 学習進捗（回答ごとの保存は変更された用語だけをジャーナルに追記）
+const progressJournal = new ProgressJournal<LearningProgress>(STORAGE_KEYS.PROGRESS);
+
+// 学習統計の集計値（初回の loadStatistics で作成し、以降は進捗の保存ごとに差分更新）
+let progressStats: StudyStatistics | null = null;
+
 export async function saveProgress(progress: Record<string, LearningProgress>): Promise<void> {
-  await AsyncStorage.setItem(STORAGE_KEYS.PROGRESS, JSON.stringify(progress));
+  await progressJournal.replaceAll(progress);
+  progressStats?.reset(progress);
+}
+
+export function saveTermProgress(progress: LearningProgress): void {
+  progressJournal.record(progress.term_id, progress);
+  progressStats?.update(progress);
+}
+
+// 復習履歴（回答ごとに1件追記し、分析用にエクスポートする）
+const reviewLog = new ReviewLog(STORAGE_KEYS.REVIEW_LOG);
+
+// 回答結果を保存（進捗の更新と復習履歴の追記）
+export function recordReview(
+  previous: LearningProgress,
+  updated: LearningProgress,
+  answer: AnswerButton,
+  algorithm: SRSAlgorithm
+): void {
+  saveTermProgress(updated);
+  reviewLog.append({
+    term_id: updated.term_id,
+    reviewed_at: Date.now(),
+    button: answer,
+    interval: updated.interval,
+    last_interval: previous.interval,
+    algorithm,
+  });
+}
+
+// 復習履歴を TSV で書き出す
+export async function exportReviewLog(): Promise<string> {
+  return reviewLog.exportTSV();
+}
+
+// 未保存の学習進捗を書き込む（バックグラウンド移行時など）
+export async function flushProgress(): Promise<void> {
+  await Promise.all([progressJournal.flush(), reviewLog.flush()]);
 }
 
 // データ読み込み
 export async function loadTerms(): Promise<Term[]> {
-  // 常に組み込みデータを返す（200語）
-  return EMBEDDED_TERMS;
+  // 組み込みデータ（差分パッチの上書きを反映）
+  return (await loadPatchedContent()).terms;
 }
 
 export async function loadExamples(): Promise<Example[]> {
-  return EMBEDDED_EXAMPLES;
+  return (await loadPatchedContent()).examples;
 }
 
 export async function loadRelations(): Promise<Relation[]> {
-  return EMBEDDED_RELATIONS;
+  return (await loadPatchedContent()).relations;
 }
 
 export async function loadProgress(): Promise<Record<string, LearningProgress>> {
-  const data = await AsyncStorage.getItem(STORAGE_KEYS.PROGRESS);
-  if (data) return JSON.parse(data);
-  return {};
+  return progressJournal.load();
 }
 
 // 学習進捗の初期化
@@ -270,55 +346,21 @@ export function exportToAnkiTSV(terms: Term[], examples: Example[]): string {
   return lines.join('\n');
 }
 
-// 統計情報を取得
+// 統計情報を取得（与えられた進捗から集計）
 export function getStatistics(
   terms: Term[],
   progress: Record<string, LearningProgress>
-): {
-  total: number;
-  learned: number;
-  mastered: number;
-  reviewDue: number;
-  byTopic: Record<TopicCode, { total: number; learned: number }>;
-} {
-  const today = new Date().toISOString().split('T')[0];
-  const byTopic: Record<string, { total: number; learned: number }> = {};
-  
-  for (const topic of TOPICS) {
-    byTopic[topic.code] = { total: 0, learned: 0 };
-  }
-  
-  let learned = 0;
-  let mastered = 0;
-  let reviewDue = 0;
-  
-  for (const term of terms) {
-    byTopic[term.topic_code].total++;
-    
-    const p = progress[term.term_id];
-    if (p) {
-      learned++;
-      byTopic[term.topic_code].learned++;
-      
-      if (p.repetitions >= 3) {
-        mastered++;
-      }
-      
-      // 復習期限を過ぎた学習済み単語のみカウント
-      if (p.next_review <= today) {
-        reviewDue++;
-      }
-    }
-    // 未学習は復習対象に含めない（新規学習が必要）
+): StudyStatisticsSnapshot {
+  return new StudyStatistics(terms, TOPICS.map(t => t.code), progress).snapshot();
+}
+
+// 保存済みの進捗の統計情報を取得（集計値を読むだけで、全件は走査しない）
+export async function loadStatistics(): Promise<StudyStatisticsSnapshot> {
+  if (!progressStats) {
+    const [terms, progress] = await Promise.all([loadTerms(), loadProgress()]);
+    progressStats ??= new StudyStatistics(terms, TOPICS.map(t => t.code), progress);
   }
-  
-  return {
-    total: terms.length,
-    learned,
-    mastered,
-    reviewDue,
-    byTopic: byTopic as Record<TopicCode, { total: number; learned: number }>,
-  };
+  return progressStats.snapshot();
 }
 
 // Term型を再エクスポート
@@ -353,12 +395,20 @@ class DataStore {
 
   async initialize(): Promise<void> {
     if (this.initialized) return;
+    await this.reloadContent();
     this.progress = await loadProgress();
     const srsSettings = await loadSRSSettings();
     this.srsAlgorithm = srsSettings.algorithm;
     this.initialized = true;
   }
 
+  async reloadContent(): Promise<void> {
+    const content = await loadPatchedContent();
+    this.terms = content.terms;
+    this.examples = content.examples;
+    this.relations = content.relations;
+  }
+
   getTerms(): Term[] {
     return this.terms;
   }
@@ -414,8 +464,8 @@ class DataStore {
 
     this.progress[id] = result;
     console.log('[DataStore] Saving progress for term:', id, 'result:', result);
-    await saveProgress(this.progress);
-    console.log('[DataStore] Progress saved successfully');
+    recordReview(progress, result, answer, this.srsAlgorithm);
+    console.log('[DataStore] Progress recorded');
   }
 }
 
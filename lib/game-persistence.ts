@@ -0,0 +1,169 @@
+/**
+ * RPGミニゲームの状態保存
+ *
+ * ゲーム状態をスライス（プロフィール・カード・デッキ・アイテム・ステージ・ミッション）ごとに別キーへ保存する。
+ * 変更のあったスライスだけを dirty として記録し、短時間の変更はまとめて1回の multiSet で書き込む。
+ * カードが数千枚になっても、デッキ編成やミッション更新のたびにカード全体を書き直さない。
+ */
+
+import AsyncStorage from '@react-native-async-storage/async-storage';
+import type { GameState, PlayerState } from './game-types';
+
+export type GameSlice = 'profile' | 'cards' | 'deck' | 'items' | 'stages' | 'missions';
+
+export const GAME_SLICES: GameSlice[] = ['profile', 'cards', 'deck', 'items', 'stages', 'missions'];
+
+// 以前の一括保存キー（読み込み時にスライスへ移行する）
+export const LEGACY_GAME_STATE_KEY = 'cfa_game_state';
+
+const SLICE_KEY_PREFIX = `${LEGACY_GAME_STATE_KEY}:`;
+
+export function sliceKey(slice: GameSlice): string {
+  return `${SLICE_KEY_PREFIX}${slice}`;
+}
+
+// 保存対象の状態（バトル状態は保存しない）
+export type PersistedGameState = Pick<GameState, 'player' | 'unlockedStages' | 'currentStage' | 'dailyMissions' | 'bossDefeated'>;
+
+/**
+ * スライス1つ分の保存内容
+ */
+export function serializeSlice(state: PersistedGameState, slice: GameSlice): unknown {
+  switch (slice) {
+    case 'profile': {
+      const { cards, currentDeck, items, ...profile } = state.player;
+      return profile;
+    }
+    case 'cards':
+      return state.player.cards;
+    case 'deck':
+      return state.player.currentDeck;
+    case 'items':
+      return state.player.items;
+    case 'stages':
+      return {
+        unlockedStages: state.unlockedStages,
+        currentStage: state.currentStage,
+        bossDefeated: state.bossDefeated,
+      };
+    case 'missions':
+      return state.dailyMissions;
+  }
+}
+
+/**
+ * スライスから以前の一括保存と同じ形の状態を組み立てる
+ */
+function assembleSlices(slices: Partial<Record<GameSlice, any>>): Partial<PersistedGameState> {
+  const player: Partial<PlayerState> = { ...slices.profile };
+  if (slices.cards) player.cards = slices.cards;
+  if (slices.deck) player.currentDeck = slices.deck;
+  if (slices.items) player.items = slices.items;
+  return {
+    player: player as PlayerState,
+    ...slices.stages,
+    dailyMissions: slices.missions,
+  };
+}
+
+export interface GamePersistenceOptions {
+  flushDelayMs: number;
+}
+
+export class GamePersistence {
+  private dirty: Set<GameSlice> = new Set();
+  private timer: ReturnType<typeof setTimeout> | null = null;
+  private writes: Promise<void> = Promise.resolve();
+  // 以前の一括保存から読み込んだ場合、次の書き込みでスライスへ移行して削除する
+  private dropLegacy = false;
+  private readonly options: GamePersistenceOptions;
+
+  constructor(
+    private readonly getState: () => PersistedGameState,
+    options: Partial<GamePersistenceOptions> = {}
+  ) {
+    this.options = { flushDelayMs: 500, ...options };
+  }
+
+  /**
+   * 変更のあったスライスを記録し、まとめ書きを予約する
+   */
+  markDirty(...slices: GameSlice[]): void {
+    for (const slice of slices) {
+      this.dirty.add(slice);
+    }
+    if (!this.timer && this.dirty.size > 0) {
+      this.timer = setTimeout(() => {
+        this.timer = null;
+        this.flush().catch(error => console.error('Failed to save game state:', error));
+      }, this.options.flushDelayMs);
+    }
+  }
+
+  hasPendingWrites(): boolean {
+    return this.dirty.size > 0;
+  }
+
+  /**
+   * dirty なスライスを1回の multiSet で書き込む
+   */
+  async flush(): Promise<void> {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+    if (this.dirty.size > 0) {
+      const state = this.getState();
+      const pairs: [string, string][] = Array.from(this.dirty, slice => [
+        sliceKey(slice),
+        JSON.stringify(serializeSlice(state, slice)),
+      ]);
+      this.dirty.clear();
+      const dropLegacy = this.dropLegacy;
+      this.dropLegacy = false;
+      // 前回の書き込みが失敗しても、以降の書き込みは続ける
+      this.writes = this.writes.catch(() => undefined).then(async () => {
+        await AsyncStorage.multiSet(pairs);
+        if (dropLegacy) await AsyncStorage.removeItem(LEGACY_GAME_STATE_KEY);
+      });
+    }
+    await this.writes;
+  }
+
+  /**
+   * 保存済みの状態を読み込む
+   * 未書き込みの変更と書き込み中の multiSet を先に済ませるので、読み込む状態がメモリより古くなることはない。
+   * 以前の一括保存しかない場合は全スライスを dirty にし、次の flush でスライスへ移行する
+   */
+  async load(): Promise<Partial<PersistedGameState> | null> {
+    await this.flush();
+    const stored = await AsyncStorage.multiGet(GAME_SLICES.map(sliceKey));
+    const slices: Partial<Record<GameSlice, any>> = {};
+    stored.forEach(([, value], i) => {
+      if (value) slices[GAME_SLICES[i]] = JSON.parse(value);
+    });
+    if (Object.keys(slices).length > 0) {
+      return assembleSlices(slices);
+    }
+
+    const legacy = await AsyncStorage.getItem(LEGACY_GAME_STATE_KEY);
+    if (!legacy) return null;
+    this.dropLegacy = true;
+    this.markDirty(...GAME_SLICES);
+    return JSON.parse(legacy);
+  }
+
+  /**
+   * 保存済みの状態を全て削除（未書き込みの変更も破棄）
+   */
+  async clear(): Promise<void> {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+    this.dirty.clear();
+    this.dropLegacy = false;
+    await this.writes;
+    await AsyncStorage.multiRemove([LEGACY_GAME_STATE_KEY, ...GAME_SLICES.map(sliceKey)]);
+  }
+}
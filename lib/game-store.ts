@@ -1,5 +1,4 @@
 // RPGミニゲームのストア
-import AsyncStorage from '@react-native-async-storage/async-storage';
 import {
   GameState,
   PlayerState,
@@ -24,8 +23,8 @@ import {
 import { dataStore } from './data-store';
 import type { Term } from './types';
 import { getRandomCFAQuestion } from './cfa-questions';
-
-const GAME_STATE_KEY = 'cfa_game_state';
+import { GamePersistence, GAME_SLICES, type GameSlice } from './game-persistence';
+import { CardInventory } from './card-inventory';
 
 // ステージ定義（拡張可能な構造）
 // 新しい分野を追加する場合は、このリストに追加するだけでOK
@@ -162,6 +161,11 @@ export const STAGES: Stage[] = [
 class GameStore {
   private state: GameState;
   private listeners: Set<() => void> = new Set();
+  private persistence = new GamePersistence(() => this.state);
+  // 読み込みは最初の1回だけ（以降はメモリ上の状態が最新なので、保存済みの状態で上書きしない）
+  private loading: Promise<void> | null = null;
+  // 所持カード・デッキの索引（player.cards / currentDeck と常に同期）
+  private inventory = new CardInventory();
 
   constructor() {
     this.state = {
@@ -178,15 +182,21 @@ class GameStore {
     };
   }
 
-  // 状態の読み込み
+  // 状態の読み込み（各画面のマウント時に呼ばれる。2回目以降は最初の読み込みを待つだけ）
   async loadState(): Promise<void> {
+    if (!this.loading) {
+      this.loading = this.restoreState();
+    }
+    await this.loading;
+  }
+
+  private async restoreState(): Promise<void> {
     try {
       // dataStoreを初期化（忘却曲線連携のため）
       await dataStore.initialize();
       
-      const saved = await AsyncStorage.getItem(GAME_STATE_KEY);
-      if (saved) {
-        const parsed = JSON.parse(saved);
+      const parsed = await this.persistence.load();
+      if (parsed) {
         // 新しいプロパティがない場合はデフォルト値を使用
         const player = {
           ...INITIAL_PLAYER_STATE,
@@ -212,23 +222,25 @@ class GameStore {
           },
           bossDefeated: parsed.bossDefeated || [],
         };
+        this.inventory.rebuild(this.state.player);
       }
     } catch (error) {
       console.error('Failed to load game state:', error);
+      // 次の loadState で読み込みをやり直す
+      this.loading = null;
     }
   }
 
-  // 状態の保存
-  async saveState(): Promise<void> {
+  // 状態の保存（変更したスライスを指定、省略時は全て）
+  // 書き込みはまとめて後で行うため、操作中に待たされることはない
+  async saveState(...slices: GameSlice[]): Promise<void> {
+    this.persistence.markDirty(...(slices.length > 0 ? slices : GAME_SLICES));
+  }
+
+  // 未保存の変更を書き込む（バックグラウンド移行時など）
+  async flush(): Promise<void> {
     try {
-      const toSave = {
-        player: this.state.player,
-        unlockedStages: this.state.unlockedStages,
-        currentStage: this.state.currentStage,
-        dailyMissions: this.state.dailyMissions,
-        bossDefeated: this.state.bossDefeated,
-      };
-      await AsyncStorage.setItem(GAME_STATE_KEY, JSON.stringify(toSave));
+      await this.persistence.flush();
     } catch (error) {
       console.error('Failed to save game state:', error);
     }
@@ -299,9 +311,7 @@ class GameStore {
     const enemy = stage.enemies[Math.floor(Math.random() * stage.enemies.length)];
     
     // デッキから手札をランダムに引く
-    const deckCards = this.state.player.currentDeck
-      .map(id => this.state.player.cards.find(c => c.id === id))
-      .filter((c): c is WordCard => c !== undefined);
+    const deckCards = this.getDeckCards();
     const shuffled = [...deckCards].sort(() => Math.random() - 0.5);
     const handSize = this.state.player.handSize;
     const currentHand = shuffled.slice(0, handSize);
@@ -516,21 +526,21 @@ class GameStore {
     }
 
     // カードの使用回数を更新
-    const cardIndex = player.cards.findIndex((c) => c.id === card.id);
-    if (cardIndex >= 0) {
-      player.cards[cardIndex].usageCount++;
+    const ownedCard = this.inventory.get(card.id);
+    if (ownedCard) {
+      ownedCard.usageCount++;
       if (correct) {
-        player.cards[cardIndex].successCount++;
+        ownedCard.successCount++;
       }
     }
     
     // バーストの場合、2枚目のカードも更新
     if (isBurst && battle.selectedBurstCards) {
-      const card2Index = player.cards.findIndex((c) => c.id === battle.selectedBurstCards![1].id);
-      if (card2Index >= 0) {
-        player.cards[card2Index].usageCount++;
+      const ownedCard2 = this.inventory.get(battle.selectedBurstCards[1].id);
+      if (ownedCard2) {
+        ownedCard2.usageCount++;
         if (correct) {
-          player.cards[card2Index].successCount++;
+          ownedCard2.successCount++;
         }
       }
     }
@@ -579,7 +589,8 @@ class GameStore {
     battle.quizQuestion = null;
 
     this.notify();
-    await this.saveState();
+    // カードの使用回数（ミッション進捗は updateMissionProgress で保存）
+    await this.saveState('cards');
 
     return { correct, damage, heal };
   }
@@ -694,6 +705,7 @@ class GameStore {
           const randomTerm = terms[Math.floor(Math.random() * terms.length)];
           const newCard = this.createCardFromTerm(randomTerm);
           player.cards.push(newCard);
+          this.inventory.add(newCard);
           battle.earnedCards.push(newCard);
         }
       }
@@ -732,7 +744,7 @@ class GameStore {
     player.hp = victory ? player.maxHp : Math.floor(player.maxHp * 0.5);
 
     this.notify();
-    await this.saveState();
+    await this.saveState('profile', 'cards', 'stages');
   }
 
   // バトルログ追加
@@ -757,9 +769,10 @@ class GameStore {
   addToDeck(cardId: string): boolean {
     // レベルに応じたデッキ上限を使用
     if (this.state.player.currentDeck.length >= this.state.player.deckCapacity) return false;
-    if (this.state.player.currentDeck.includes(cardId)) return false;
+    if (!this.inventory.get(cardId) || this.inventory.isInDeck(cardId)) return false;
     this.state.player.currentDeck.push(cardId);
-    this.saveState();
+    this.inventory.addToDeck(cardId);
+    this.saveState('deck');
     this.notify();
     return true;
   }
@@ -767,17 +780,28 @@ class GameStore {
   // デッキからカードを削除
   removeFromDeck(cardId: string): void {
     this.state.player.currentDeck = this.state.player.currentDeck.filter((id) => id !== cardId);
-    this.saveState();
+    this.inventory.removeFromDeck(cardId);
+    this.saveState('deck');
     this.notify();
   }
 
   // デッキのカードを取得
   getDeckCards(): WordCard[] {
     return this.state.player.currentDeck
-      .map((id) => this.state.player.cards.find((c) => c.id === id))
+      .map((id) => this.inventory.get(id))
       .filter((c): c is WordCard => c !== undefined);
   }
 
+  // デッキに組み込み済みか
+  isInDeck(cardId: string): boolean {
+    return this.inventory.isInDeck(cardId);
+  }
+
+  // カードIDから所持カードを取得
+  getCard(cardId: string): WordCard | undefined {
+    return this.inventory.get(cardId);
+  }
+
   // 初期カードを付与
   async grantStarterCards(): Promise<void> {
     if (this.state.player.cards.length > 0) return;
@@ -790,9 +814,11 @@ class GameStore {
       card.healPower = RARITY_STATS.common.heal;
       this.state.player.cards.push(card);
       this.state.player.currentDeck.push(card.id);
+      this.inventory.add(card);
+      this.inventory.addToDeck(card.id);
     }
 
-    await this.saveState();
+    await this.saveState('cards', 'deck');
     this.notify();
   }
 
@@ -810,7 +836,8 @@ class GameStore {
       },
       bossDefeated: [],
     };
-    await AsyncStorage.removeItem(GAME_STATE_KEY);
+    this.inventory.rebuild(this.state.player);
+    await this.persistence.clear();
     this.notify();
   }
 
@@ -835,7 +862,7 @@ class GameStore {
       this.state.player.items.push(newItem);
     }
 
-    this.saveState();
+    this.saveState('profile', 'items');
     this.notify();
     return true;
   }
@@ -853,7 +880,7 @@ class GameStore {
       this.state.player.items = this.state.player.items.filter(i => i.type !== itemType);
     }
 
-    this.saveState();
+    this.saveState('profile', 'items');
     this.notify();
     return true;
   }
@@ -894,10 +921,9 @@ class GameStore {
     console.log('[GameStore] upgradeCard called for:', cardId);
     console.log('[GameStore] Current gold:', this.state.player.gold);
     
-    const cardIndex = this.state.player.cards.findIndex(c => c.id === cardId);
-    if (cardIndex === -1) return { success: false, message: 'カードが見つかりません' };
+    const card = this.inventory.get(cardId);
+    if (!card) return { success: false, message: 'カードが見つかりません' };
     
-    const card = this.state.player.cards[cardIndex];
     console.log('[GameStore] Card found:', card.termJa, 'upgradeLevel:', card.upgradeLevel);
 
     const maxUpgradeLevel = 5;
@@ -920,40 +946,40 @@ class GameStore {
     const oldLevel = card.upgradeLevel;
     
     this.state.player.gold -= cost;
-    this.state.player.cards[cardIndex].upgradeLevel++;
+    card.upgradeLevel++;
     
     // ステータスアップ
     const baseStats = RARITY_STATS[card.rarity];
-    this.state.player.cards[cardIndex].attackPower = Math.floor(baseStats.attack * (1 + UPGRADE_BONUS.attackMultiplier * this.state.player.cards[cardIndex].upgradeLevel));
-    this.state.player.cards[cardIndex].healPower = Math.floor(baseStats.heal * (1 + UPGRADE_BONUS.healMultiplier * this.state.player.cards[cardIndex].upgradeLevel));
+    card.attackPower = Math.floor(baseStats.attack * (1 + UPGRADE_BONUS.attackMultiplier * card.upgradeLevel));
+    card.healPower = Math.floor(baseStats.heal * (1 + UPGRADE_BONUS.healMultiplier * card.upgradeLevel));
     
     console.log('[GameStore] Upgrade complete:');
     console.log('  Gold:', oldGold, '->', this.state.player.gold);
-    console.log('  Level:', oldLevel, '->', this.state.player.cards[cardIndex].upgradeLevel);
-    console.log('  Attack:', oldAttack, '->', this.state.player.cards[cardIndex].attackPower);
-    console.log('  Heal:', oldHeal, '->', this.state.player.cards[cardIndex].healPower);
+    console.log('  Level:', oldLevel, '->', card.upgradeLevel);
+    console.log('  Attack:', oldAttack, '->', card.attackPower);
+    console.log('  Heal:', oldHeal, '->', card.healPower);
 
     // レアリティアップ判定（強化レベル3と5でレアリティが上がる可能性）
-    const updatedCard = this.state.player.cards[cardIndex];
+    const updatedCard = card;
     if ((updatedCard.upgradeLevel === 3 || updatedCard.upgradeLevel === 5) && Math.random() < 0.3) {
       const rarityOrder: CardRarity[] = ['common', 'uncommon', 'rare', 'epic', 'legendary'];
       const currentIndex = rarityOrder.indexOf(updatedCard.rarity);
       if (currentIndex < rarityOrder.length - 1) {
-        this.state.player.cards[cardIndex].rarity = rarityOrder[currentIndex + 1];
-        this.saveState();
+        card.rarity = rarityOrder[currentIndex + 1];
+        this.saveState('profile', 'cards');
         this.notify();
         return { success: true, message: `強化成功！レアリティが上がりました！` };
       }
     }
 
-    this.saveState();
+    this.saveState('profile', 'cards');
     this.notify();
     return { success: true, message: `強化成功！Lv.${updatedCard.upgradeLevel}になりました` };
   }
 
   // カード強化コストを取得
   getUpgradeCost(cardId: string): number | null {
-    const card = this.state.player.cards.find(c => c.id === cardId);
+    const card = this.inventory.get(cardId);
     if (!card || card.upgradeLevel >= 5) return null;
     return UPGRADE_COSTS[card.rarity][card.upgradeLevel];
   }
@@ -979,9 +1005,7 @@ class GameStore {
     const boss = stage.boss;
     
     // デッキから手札をランダムに引く
-    const deckCards = this.state.player.currentDeck
-      .map(id => this.state.player.cards.find(c => c.id === id))
-      .filter((c): c is WordCard => c !== undefined);
+    const deckCards = this.getDeckCards();
     const shuffled = [...deckCards].sort(() => Math.random() - 0.5);
     const handSize = this.state.player.handSize;
     const currentHand = shuffled.slice(0, handSize);
@@ -1018,7 +1042,7 @@ class GameStore {
     if (!this.state.bossDefeated.includes(bossId)) {
       this.state.bossDefeated.push(bossId);
       this.updateMissionProgress('boss_defeat', 1);
-      this.saveState();
+      this.saveState('stages');
     }
   }
 
@@ -1046,7 +1070,7 @@ class GameStore {
         lastResetDate: today,
         totalCompleted: this.state.dailyMissions.totalCompleted,
       };
-      this.saveState();
+      this.saveState('missions');
       this.notify();
     }
   }
@@ -1097,7 +1121,7 @@ class GameStore {
         }
       }
     }
-    this.saveState();
+    this.saveState('missions');
     this.notify();
   }
 
@@ -1125,7 +1149,7 @@ class GameStore {
       player.handSize = LEVEL_LIMITS.getHandSize(player.level);
     }
 
-    this.saveState();
+    this.saveState('profile', 'missions');
     this.notify();
     return { success: true, gold: mission.rewardGold, exp: mission.rewardExp };
   }
@@ -1140,18 +1164,7 @@ class GameStore {
 
   // 合成可能なカードペアを取得（同じtermIdのカードが2枚以上）
   getFusionCandidates(): { termId: string; cards: WordCard[] }[] {
-    const cardsByTerm: Record<string, WordCard[]> = {};
-    
-    for (const card of this.state.player.cards) {
-      if (!cardsByTerm[card.termId]) {
-        cardsByTerm[card.termId] = [];
-      }
-      cardsByTerm[card.termId].push(card);
-    }
-
-    return Object.entries(cardsByTerm)
-      .filter(([, cards]) => cards.length >= 2)
-      .map(([termId, cards]) => ({ termId, cards }));
+    return this.inventory.getFusionCandidates();
   }
 
   // カード合成実行
@@ -1163,7 +1176,7 @@ class GameStore {
       return { success: false, consumedCards: [] };
     }
 
-    const cards = cardIds.map(id => this.state.player.cards.find(c => c.id === id)).filter((c): c is WordCard => c !== undefined);
+    const cards = cardIds.map(id => this.inventory.get(id)).filter((c): c is WordCard => c !== undefined);
     console.log('[GameStore] Found cards:', cards.length);
     
     if (cards.length < 2) {
@@ -1244,15 +1257,18 @@ class GameStore {
 
     // 素材カードを削除
     const consumedIds = cards.map(c => c.id);
-    this.state.player.cards = this.state.player.cards.filter(c => !consumedIds.includes(c.id));
+    const consumed = new Set(consumedIds);
+    consumedIds.forEach(id => this.inventory.remove(id));
+    this.state.player.cards = this.state.player.cards.filter(c => !consumed.has(c.id));
     
     // デッキからも削除
-    this.state.player.currentDeck = this.state.player.currentDeck.filter(id => !consumedIds.includes(id));
+    this.state.player.currentDeck = this.state.player.currentDeck.filter(id => !consumed.has(id));
 
     // 新カードを追加
     this.state.player.cards.push(newCard);
+    this.inventory.add(newCard);
 
-    this.saveState();
+    this.saveState('cards', 'deck', 'items');
     this.notify();
 
     return {
@@ -0,0 +1,15 @@
+// 自動生成ファイル（scripts/render_audio.py）。直接編集しないこと
+
+export interface GeneratedAudioClip {
+  // 読み上げた本文の contentChecksum（lib/content-patch.ts）
+  checksum: string;
+  source: number;
+}
+
+export interface GeneratedAudioClips {
+  headword?: GeneratedAudioClip;
+  example?: GeneratedAudioClip;
+}
+
+export const GENERATED_AUDIO_CLIPS: Record<string, GeneratedAudioClips> = {
+};
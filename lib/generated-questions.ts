@@ -0,0 +1,30 @@
+// 自動生成ファイル（scripts/generate_numeric_questions.py）。直接編集しないこと
+import type { CFAQuestion } from './game-types';
+
+export interface GeneratedQuestionShard {
+  topic: string;
+  difficulty: CFAQuestion['difficulty'];
+  count: number;
+  load: () => CFAQuestion[];
+}
+
+export const GENERATED_QUESTION_SHARDS: GeneratedQuestionShard[] = [
+  { topic: 'Corporate Issuers', difficulty: 'easy', count: 120, load: () => require('@/assets/data/questions/CI_easy.json') },
+  { topic: 'Corporate Issuers', difficulty: 'medium', count: 160, load: () => require('@/assets/data/questions/CI_medium.json') },
+  { topic: 'Corporate Issuers', difficulty: 'hard', count: 40, load: () => require('@/assets/data/questions/CI_hard.json') },
+  { topic: 'Derivatives', difficulty: 'medium', count: 80, load: () => require('@/assets/data/questions/DER_medium.json') },
+  { topic: 'Economics', difficulty: 'easy', count: 80, load: () => require('@/assets/data/questions/ECON_easy.json') },
+  { topic: 'Economics', difficulty: 'hard', count: 40, load: () => require('@/assets/data/questions/ECON_hard.json') },
+  { topic: 'Equity Investments', difficulty: 'easy', count: 800, load: () => require('@/assets/data/questions/EQ_easy.json') },
+  { topic: 'Equity Investments', difficulty: 'medium', count: 280, load: () => require('@/assets/data/questions/EQ_medium.json') },
+  { topic: 'Equity Investments', difficulty: 'hard', count: 40, load: () => require('@/assets/data/questions/EQ_hard.json') },
+  { topic: 'Fixed Income', difficulty: 'easy', count: 80, load: () => require('@/assets/data/questions/FI_easy.json') },
+  { topic: 'Fixed Income', difficulty: 'hard', count: 40, load: () => require('@/assets/data/questions/FI_hard.json') },
+  { topic: 'Financial Statement Analysis', difficulty: 'easy', count: 400, load: () => require('@/assets/data/questions/FSA_easy.json') },
+  { topic: 'Financial Statement Analysis', difficulty: 'medium', count: 120, load: () => require('@/assets/data/questions/FSA_medium.json') },
+  { topic: 'Portfolio Management', difficulty: 'easy', count: 40, load: () => require('@/assets/data/questions/PM_easy.json') },
+  { topic: 'Portfolio Management', difficulty: 'medium', count: 200, load: () => require('@/assets/data/questions/PM_medium.json') },
+  { topic: 'Quantitative Methods', difficulty: 'easy', count: 40, load: () => require('@/assets/data/questions/QM_easy.json') },
+  { topic: 'Quantitative Methods', difficulty: 'medium', count: 80, load: () => require('@/assets/data/questions/QM_medium.json') },
+  { topic: 'Quantitative Methods', difficulty: 'hard', count: 120, load: () => require('@/assets/data/questions/QM_hard.json') },
+];
@@ -0,0 +1,165 @@
+/**
+ * 学習進捗のジャーナル付き永続化
+ *
+ * 進捗マップ全体を回答ごとに保存する代わりに、変更されたレコードだけを小さなジャーナルとして追記する。
+ * - スナップショット: 従来どおり `${snapshotKey}` に進捗マップ全体（既存データとの互換あり）
+ * - ジャーナル: `${snapshotKey}:j:${連番}` に [id, レコード] の配列
+ * - 短時間の連続回答は flushDelayMs の間まとめ、同じidへの書き込みは最後の1件にする
+ * - ジャーナルが compactThreshold 件を超えたらスナップショットに畳み込む
+ * 読み込みはスナップショット + ジャーナルの再生で行う。
+ */
+
+import AsyncStorage from '@react-native-async-storage/async-storage';
+
+export interface ProgressJournalOptions {
+  flushDelayMs: number;
+  compactThreshold: number;
+}
+
+const DEFAULT_OPTIONS: ProgressJournalOptions = {
+  flushDelayMs: 300,
+  compactThreshold: 200,
+};
+
+export class ProgressJournal<T> {
+  private records: Record<string, T> = {};
+  // ストレージにある状態（スナップショット + ジャーナル）。pending の値は含まない
+  private journaled: Record<string, T> = {};
+  private pending: Map<string, T> = new Map();
+  private journalKeys: string[] = [];
+  private journalEntries = 0;
+  private nextSeq = 0;
+  private timer: ReturnType<typeof setTimeout> | null = null;
+  private writes: Promise<void> = Promise.resolve();
+  private loading: Promise<void> | null = null;
+  private readonly options: ProgressJournalOptions;
+
+  constructor(private readonly snapshotKey: string, options: Partial<ProgressJournalOptions> = {}) {
+    this.options = { ...DEFAULT_OPTIONS, ...options };
+  }
+
+  private get journalPrefix(): string {
+    return `${this.snapshotKey}:j:`;
+  }
+
+  /**
+   * 進捗マップを取得（初回のみストレージから読み込み、以降はメモリ上の状態を返す）
+   */
+  async load(): Promise<Record<string, T>> {
+    if (!this.loading) {
+      this.loading = this.restore();
+    }
+    await this.loading;
+    return { ...this.records };
+  }
+
+  private async restore(): Promise<void> {
+    const snapshot = await AsyncStorage.getItem(this.snapshotKey);
+    const stored: Record<string, T> = snapshot ? JSON.parse(snapshot) : {};
+
+    const keys = (await AsyncStorage.getAllKeys())
+      .filter(key => key.startsWith(this.journalPrefix))
+      .sort((a, b) => this.seqOf(a) - this.seqOf(b));
+    if (keys.length > 0) {
+      for (const [, value] of await AsyncStorage.multiGet(keys)) {
+        if (!value) continue;
+        const entries: [string, T][] = JSON.parse(value);
+        for (const [id, record] of entries) {
+          stored[id] = record;
+        }
+        this.journalEntries += entries.length;
+      }
+      this.nextSeq = this.seqOf(keys[keys.length - 1]) + 1;
+    }
+    this.journalKeys = keys;
+    this.journaled = { ...stored };
+
+    // 読み込み前に記録されたレコードを優先する
+    this.records = { ...stored, ...this.records };
+  }
+
+  private seqOf(key: string): number {
+    return parseInt(key.slice(this.journalPrefix.length), 10);
+  }
+
+  /**
+   * 1件のレコードを記録（書き込みはまとめて後で行う）
+   */
+  record(id: string, value: T): void {
+    this.records[id] = value;
+    this.pending.set(id, value);
+    if (!this.timer) {
+      this.timer = setTimeout(() => {
+        this.timer = null;
+        this.flush().catch(error => console.error('Failed to flush progress journal:', error));
+      }, this.options.flushDelayMs);
+    }
+  }
+
+  /**
+   * 進捗マップ全体を置き換え、スナップショットとして保存
+   */
+  async replaceAll(records: Record<string, T>): Promise<void> {
+    // 既存のジャーナルを把握してから置き換える（残ると次回の読み込みで再生されてしまう）
+    await this.load();
+    this.records = { ...records };
+    this.pending.clear();
+    this.enqueue(async () => {
+      // 先に積まれたジャーナルの書き込みより後で置き換える
+      this.journaled = { ...records };
+      await this.compact();
+    });
+    await this.writes;
+  }
+
+  /**
+   * 未保存のレコードをジャーナルに書き込む
+   */
+  async flush(): Promise<void> {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+    if (this.pending.size > 0) {
+      const batch = Array.from(this.pending.entries());
+      this.pending.clear();
+
+      this.enqueue(async () => {
+        // 読み込み前に書き込むと連番が衝突するため、先に復元を済ませる
+        await this.load();
+        const key = `${this.journalPrefix}${this.nextSeq++}`;
+        await AsyncStorage.setItem(key, JSON.stringify(batch));
+        this.journalKeys.push(key);
+        this.journalEntries += batch.length;
+        for (const [id, value] of batch) {
+          this.journaled[id] = value;
+        }
+        if (this.journalEntries >= this.options.compactThreshold) {
+          await this.compact();
+        }
+      });
+    }
+    await this.writes;
+  }
+
+  /**
+   * スナップショットを書き、畳み込んだジャーナルを削除する
+   *
+   * スナップショットにはジャーナルに書き込み済みの状態だけを書く（pending の値は含めない）。
+   * 各idのジャーナル上の最後の値がスナップショットの値と同じなので、削除前に中断しても
+   * スナップショットの上にジャーナルを再生した結果はスナップショットと一致する。
+   */
+  private async compact(): Promise<void> {
+    const compacted = this.journalKeys;
+    await AsyncStorage.setItem(this.snapshotKey, JSON.stringify(this.journaled));
+    if (compacted.length > 0) {
+      await AsyncStorage.multiRemove(compacted);
+    }
+    this.journalKeys = this.journalKeys.slice(compacted.length);
+    this.journalEntries = 0;
+  }
+
+  private enqueue(task: () => Promise<void>): void {
+    this.writes = this.writes.then(task, task);
+  }
+}
@@ -0,0 +1,197 @@
+/**
+ * 復習履歴（1回の回答 = 1イベント）の追記専用ログ
+ *
+ * LearningProgress は累計の正誤数しか持たないため、分野別の定着率や忘却曲線の分析には回答ごとの履歴が要る。
+ * - イベントは `${keyPrefix}:${連番}` のチャンクに [term_id, 時刻, ボタン, 間隔, 前回の間隔, アルゴリズム] の配列で保存
+ * - 書き込むのは末尾のチャンクだけ（chunkSize 件で次のチャンクへ）。回答ごとのコストは履歴の長さによらない
+ * - 短時間の連続回答は flushDelayMs の間まとめて書く
+ * エクスポートは TSV（scripts/review_events.py の import がそのまま読める形式）。
+ */
+
+import AsyncStorage from '@react-native-async-storage/async-storage';
+import type { AnswerButton } from './srs-algorithms';
+import type { SRSAlgorithm } from './types';
+
+export interface ReviewEvent {
+  term_id: string;
+  reviewed_at: number; // UNIX時刻（ミリ秒）
+  button: AnswerButton;
+  interval: number; // 回答後の復習間隔（日数、分単位の場合は小数）
+  last_interval: number; // 回答前の復習間隔
+  algorithm: SRSAlgorithm;
+}
+
+export interface ReviewLogOptions {
+  flushDelayMs: number;
+  chunkSize: number;
+}
+
+type StoredEvent = [string, number, number, number, number, number];
+
+const DEFAULT_OPTIONS: ReviewLogOptions = {
+  flushDelayMs: 300,
+  chunkSize: 256,
+};
+
+// 保存・エクスポート時のコード（Anki の ease 番号に合わせる）
+const BUTTONS: AnswerButton[] = ['again', 'hard', 'good', 'easy'];
+const ALGORITHMS: SRSAlgorithm[] = ['sm2', 'sm2_anki', 'fsrs'];
+
+export const REVIEW_LOG_COLUMNS = ['term_id', 'reviewed_at', 'button', 'interval', 'last_interval', 'algorithm'];
+
+function encode(event: ReviewEvent): StoredEvent {
+  return [
+    event.term_id,
+    event.reviewed_at,
+    BUTTONS.indexOf(event.button) + 1,
+    event.interval,
+    event.last_interval,
+    ALGORITHMS.indexOf(event.algorithm),
+  ];
+}
+
+function decode([term_id, reviewed_at, button, interval, last_interval, algorithm]: StoredEvent): ReviewEvent {
+  return {
+    term_id,
+    reviewed_at,
+    button: BUTTONS[button - 1],
+    interval,
+    last_interval,
+    algorithm: ALGORITHMS[algorithm],
+  };
+}
+
+export class ReviewLog {
+  private pending: StoredEvent[] = [];
+  private tail: StoredEvent[] = [];
+  private nextSeq = 0;
+  private timer: ReturnType<typeof setTimeout> | null = null;
+  private writes: Promise<void> = Promise.resolve();
+  private loading: Promise<void> | null = null;
+  private readonly options: ReviewLogOptions;
+
+  constructor(private readonly keyPrefix: string, options: Partial<ReviewLogOptions> = {}) {
+    this.options = { ...DEFAULT_OPTIONS, ...options };
+  }
+
+  private chunkKey(seq: number): string {
+    return `${this.keyPrefix}:${seq}`;
+  }
+
+  private async chunkKeys(): Promise<string[]> {
+    const prefix = `${this.keyPrefix}:`;
+    return (await AsyncStorage.getAllKeys())
+      .filter(key => key.startsWith(prefix) && /^\d+$/.test(key.slice(prefix.length)))
+      .sort((a, b) => parseInt(a.slice(prefix.length), 10) - parseInt(b.slice(prefix.length), 10));
+  }
+
+  /**
+   * 末尾のチャンクを把握する（追記先の連番と、まだ埋まっていないチャンクの中身）
+   */
+  private async restore(): Promise<void> {
+    const keys = await this.chunkKeys();
+    if (keys.length === 0) return;
+    const last = keys[keys.length - 1];
+    const value = await AsyncStorage.getItem(last);
+    const events: StoredEvent[] = value ? JSON.parse(value) : [];
+    const seq = parseInt(last.slice(this.keyPrefix.length + 1), 10);
+    if (events.length < this.options.chunkSize) {
+      this.tail = events;
+      this.nextSeq = seq;
+    } else {
+      this.nextSeq = seq + 1;
+    }
+  }
+
+  /**
+   * 1件のイベントを記録（書き込みはまとめて後で行う）
+   */
+  append(event: ReviewEvent): void {
+    this.pending.push(encode(event));
+    if (!this.timer) {
+      this.timer = setTimeout(() => {
+        this.timer = null;
+        this.flush().catch(error => console.error('Failed to flush review log:', error));
+      }, this.options.flushDelayMs);
+    }
+  }
+
+  /**
+   * 未保存のイベントを末尾のチャンクに書き込む
+   */
+  async flush(): Promise<void> {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+    if (this.pending.length > 0) {
+      const batch = this.pending;
+      this.pending = [];
+
+      this.enqueue(async () => {
+        if (!this.loading) {
+          this.loading = this.restore();
+        }
+        await this.loading;
+        const pairs: [string, string][] = [];
+        let events = batch;
+        while (events.length > 0) {
+          const room = this.options.chunkSize - this.tail.length;
+          this.tail = this.tail.concat(events.slice(0, room));
+          events = events.slice(room);
+          pairs.push([this.chunkKey(this.nextSeq), JSON.stringify(this.tail)]);
+          if (this.tail.length >= this.options.chunkSize) {
+            this.tail = [];
+            this.nextSeq++;
+          }
+        }
+        await AsyncStorage.multiSet(pairs);
+      });
+    }
+    await this.writes;
+  }
+
+  /**
+   * 記録済みのイベントを古い順にすべて返す
+   */
+  async load(): Promise<ReviewEvent[]> {
+    await this.flush();
+    const keys = await this.chunkKeys();
+    const events: ReviewEvent[] = [];
+    for (const [, value] of await AsyncStorage.multiGet(keys)) {
+      if (!value) continue;
+      for (const stored of JSON.parse(value) as StoredEvent[]) {
+        events.push(decode(stored));
+      }
+    }
+    return events;
+  }
+
+  /**
+   * TSV（1行目は列名）で書き出す
+   */
+  async exportTSV(): Promise<string> {
+    const rows = (await this.load()).map(event =>
+      REVIEW_LOG_COLUMNS.map(column => String(event[column as keyof ReviewEvent])).join('\t')
+    );
+    return [REVIEW_LOG_COLUMNS.join('\t'), ...rows].join('\n');
+  }
+
+  /**
+   * すべてのイベントを削除する
+   */
+  async clear(): Promise<void> {
+    await this.flush();
+    this.enqueue(async () => {
+      await AsyncStorage.multiRemove(await this.chunkKeys());
+      this.tail = [];
+      this.nextSeq = 0;
+      this.loading = Promise.resolve();
+    });
+    await this.writes;
+  }
+
+  private enqueue(task: () => Promise<void>): void {
+    this.writes = this.writes.then(task, task);
+  }
+}
@@ -0,0 +1,202 @@
+/**
+ * 学習統計の差分集計
+ *
+ * 進捗が変わるたびに集計値（学習済み・習得・分野別・復習期限）を更新しておき、
+ * ダッシュボードの表示では全件を走査せずに集計値を読むだけにする。
+ * 復習期限は日（UTC）ごとのバケットで数え、日付が変わった時点で期限到来分を繰り入れる。
+ */
+
+import type { LearningProgress, Term, TopicCode } from './types';
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+function dayIndex(time: number): number {
+  return Math.floor(time / DAY_MS);
+}
+
+/**
+ * 復習期限の件数を日単位のバケットで管理するカウンター
+ * - 前日以前が期限のものは overdue にまとめて数える（日付が変わるたびに繰り入れる）
+ * - 当日が期限のものだけ時刻まで比較する
+ */
+export class DueCounter {
+  private dueAt: Map<string, number> = new Map();
+  private buckets: Map<number, Map<string, number>> = new Map();
+  private overdue = 0;
+  // overdue に繰り入れ済みの日（この日より前のバケットは存在しない）
+  private rolledDay = -Infinity;
+
+  set(id: string, time: number): void {
+    this.delete(id);
+    this.dueAt.set(id, time);
+    const day = dayIndex(time);
+    if (day < this.rolledDay) {
+      this.overdue++;
+      return;
+    }
+    let bucket = this.buckets.get(day);
+    if (!bucket) {
+      bucket = new Map();
+      this.buckets.set(day, bucket);
+    }
+    bucket.set(id, time);
+  }
+
+  delete(id: string): void {
+    const time = this.dueAt.get(id);
+    if (time === undefined) return;
+    this.dueAt.delete(id);
+    const day = dayIndex(time);
+    if (day < this.rolledDay) {
+      this.overdue--;
+      return;
+    }
+    const bucket = this.buckets.get(day)!;
+    bucket.delete(id);
+    if (bucket.size === 0) this.buckets.delete(day);
+  }
+
+  /**
+   * now の時点で期限を過ぎている件数
+   */
+  count(now: Date = new Date()): number {
+    const today = dayIndex(now.getTime());
+    if (today > this.rolledDay) {
+      this.buckets.forEach((bucket, day) => {
+        if (day < today) {
+          this.overdue += bucket.size;
+          this.buckets.delete(day);
+        }
+      });
+      this.rolledDay = today;
+    }
+
+    let due = this.overdue;
+    const todayBucket = this.buckets.get(today);
+    if (todayBucket) {
+      const time = now.getTime();
+      todayBucket.forEach(t => {
+        if (t <= time) due++;
+      });
+    }
+    return due;
+  }
+
+  clear(): void {
+    this.dueAt.clear();
+    this.buckets.clear();
+    this.overdue = 0;
+  }
+}
+
+/**
+ * 進捗レコードごとの習得判定と復習期限をまとめて数える
+ */
+export class ReviewCounters<T> {
+  private masteredIds: Set<string> = new Set();
+  private due = new DueCounter();
+
+  constructor(
+    private readonly isMastered: (progress: T) => boolean,
+    private readonly dueAt: (progress: T) => number
+  ) {}
+
+  update(id: string, progress: T): void {
+    if (this.isMastered(progress)) {
+      this.masteredIds.add(id);
+    } else {
+      this.masteredIds.delete(id);
+    }
+    this.due.set(id, this.dueAt(progress));
+  }
+
+  get mastered(): number {
+    return this.masteredIds.size;
+  }
+
+  dueCount(now: Date = new Date()): number {
+    return this.due.count(now);
+  }
+
+  clear(): void {
+    this.masteredIds.clear();
+    this.due.clear();
+  }
+}
+
+export interface StudyStatisticsSnapshot {
+  total: number;
+  learned: number;
+  mastered: number;
+  reviewDue: number;
+  byTopic: Record<TopicCode, { total: number; learned: number }>;
+}
+
+/**
+ * 単語帳の学習統計
+ * 復習期限は isReviewDue と同じ基準（分単位の next_review_time があればその時刻、なければ next_review の日付）
+ */
+export class StudyStatistics {
+  private topicOf: Map<string, TopicCode> = new Map();
+  private learnedIds: Set<string> = new Set();
+  private byTopic: Record<string, { total: number; learned: number }> = {};
+  private counters = new ReviewCounters<LearningProgress>(
+    progress => progress.repetitions >= 3,
+    progress => Date.parse(progress.next_review_time ?? progress.next_review)
+  );
+
+  constructor(terms: Term[], topicCodes: TopicCode[], progress: Record<string, LearningProgress> = {}) {
+    for (const code of topicCodes) {
+      this.byTopic[code] = { total: 0, learned: 0 };
+    }
+    for (const term of terms) {
+      this.topicOf.set(term.term_id, term.topic_code);
+      this.byTopic[term.topic_code].total++;
+    }
+    for (const id in progress) {
+      this.update(progress[id]);
+    }
+  }
+
+  /**
+   * 1件の進捗の変更を反映
+   */
+  update(next: LearningProgress): void {
+    const topic = this.topicOf.get(next.term_id);
+    if (!topic) return;
+
+    if (!this.learnedIds.has(next.term_id)) {
+      this.learnedIds.add(next.term_id);
+      this.byTopic[topic].learned++;
+    }
+    this.counters.update(next.term_id, next);
+  }
+
+  /**
+   * 進捗全体を置き換える
+   */
+  reset(progress: Record<string, LearningProgress>): void {
+    this.learnedIds.clear();
+    this.counters.clear();
+    for (const code in this.byTopic) {
+      this.byTopic[code].learned = 0;
+    }
+    for (const id in progress) {
+      this.update(progress[id]);
+    }
+  }
+
+  snapshot(now: Date = new Date()): StudyStatisticsSnapshot {
+    const byTopic: Record<string, { total: number; learned: number }> = {};
+    for (const code in this.byTopic) {
+      byTopic[code] = { ...this.byTopic[code] };
+    }
+    return {
+      total: this.topicOf.size,
+      learned: this.learnedIds.size,
+      mastered: this.counters.mastered,
+      reviewDue: this.counters.dueCount(now),
+      byTopic: byTopic as Record<TopicCode, { total: number; learned: number }>,
+    };
+  }
+}
@@ -16,6 +16,10 @@ import {
   TextbookProgressBase,
 } from './textbook-types';
 import type { SRSAlgorithm } from './types';
+import { CURRENT_DATA_VERSION } from './data-store';
+import { loadContentOverrides, type ContentOverrides } from './content-patch';
+import { ProgressJournal } from './progress-journal';
+import { ReviewCounters } from './study-stats';
 
 export interface SRSSettings {
   algorithm: SRSAlgorithm;
@@ -161,6 +165,30 @@ function isTextbookReviewDue(progress: TextbookProgressBase, now: Date): boolean
   return progress.next_review <= now;
 }
 
+/**
+ * 習得済みか（反復3回以上かつ間隔21日以上）
+ */
+function isTextbookMastered(progress: TextbookProgressBase): boolean {
+  return progress.repetitions >= 3 && progress.interval >= 21;
+}
+
+/**
+ * 上書きレコードをMapに反映（null は削除）
+ */
+function applyRecordOverrides<T>(
+  map: Map<string, T>,
+  overrides: ContentOverrides | undefined,
+  revive: (record: any) => T = record => record
+): void {
+  overrides?.forEach((record, key) => {
+    if (record) {
+      map.set(key, revive(record));
+    } else {
+      map.delete(key);
+    }
+  });
+}
+
 /**
  * テキストブックデータストアクラス
  */
@@ -171,6 +199,12 @@ export class TextbookStore {
   private subjects: Map<string, SubjectInfo> = new Map();
   private textProgress: Map<string, TextProgress> = new Map();
   private exampleProgress: Map<string, ExampleProgress> = new Map();
+  // 進捗は変更されたレコードだけをジャーナルに追記する
+  private textJournal = new ProgressJournal<TextProgress>(STORAGE_KEYS.TEXT_PROGRESS);
+  private exampleJournal = new ProgressJournal<ExampleProgress>(STORAGE_KEYS.EXAMPLE_PROGRESS);
+  // 統計の集計値（進捗の記録ごとに差分更新）
+  private textCounters = new ReviewCounters<TextProgress>(isTextbookMastered, p => p.next_review.getTime());
+  private exampleCounters = new ReviewCounters<ExampleProgress>(isTextbookMastered, p => p.next_review.getTime());
 
   /**
    * 初期化：ストレージからデータを読み込む
@@ -181,6 +215,34 @@ export class TextbookStore {
       this.loadTextProgress(),
       this.loadExampleProgress(),
     ]);
+    this.rebuildCounters();
+  }
+
+  /**
+   * 教材データ（保存済みの教材 + 差分パッチの上書き）を読み直す
+   * installContentPatch の後に呼び、再起動せずにパッチの内容を表示に反映する
+   */
+  async reloadContent(): Promise<void> {
+    this.subjects.clear();
+    this.readings.clear();
+    this.textContents.clear();
+    this.examples.clear();
+    await this.loadTextbookData();
+    this.rebuildCounters();
+  }
+
+  /**
+   * 統計の集計値を作り直す（教材に存在する項目の進捗のみ数える）
+   */
+  private rebuildCounters(): void {
+    this.textCounters.clear();
+    this.textProgress.forEach((progress, id) => {
+      if (this.textContents.has(id)) this.textCounters.update(id, progress);
+    });
+    this.exampleCounters.clear();
+    this.exampleProgress.forEach((progress, id) => {
+      if (this.examples.has(id)) this.exampleCounters.update(id, progress);
+    });
   }
 
   /**
@@ -227,6 +289,8 @@ export class TextbookStore {
             });
           });
         }
+
+        await this.loadContentOverrides();
       } else {
         // 初回起動時：サンプルデータを読み込む
         await this.loadSampleData();
@@ -237,6 +301,22 @@ export class TextbookStore {
     }
   }
 
+  /**
+   * 差分パッチで更新されたレコードを反映する
+   */
+  private async loadContentOverrides(): Promise<void> {
+    const overrides = await loadContentOverrides(CURRENT_DATA_VERSION);
+    const reviveDates = (record: any) => ({
+      ...record,
+      createdAt: new Date(record.createdAt),
+      updatedAt: new Date(record.updatedAt),
+    });
+    applyRecordOverrides(this.subjects, overrides.get('textbook.subjects'));
+    applyRecordOverrides(this.readings, overrides.get('textbook.readings'));
+    applyRecordOverrides(this.textContents, overrides.get('textbook.textContents'), reviveDates);
+    applyRecordOverrides(this.examples, overrides.get('textbook.examples'), reviveDates);
+  }
+
   /**
    * サンプルデータを読み込む
    */
@@ -255,18 +335,15 @@ export class TextbookStore {
    */
   private async loadTextProgress(): Promise<void> {
     try {
-      const data = await AsyncStorage.getItem(STORAGE_KEYS.TEXT_PROGRESS);
-      if (data) {
-        const parsed = JSON.parse(data);
-        Object.entries(parsed).forEach(([id, progress]: [string, any]) => {
-          this.textProgress.set(id, {
-            ...progress,
-            last_reviewed: new Date(progress.last_reviewed),
-            next_review: new Date(progress.next_review),
-            reviewHistory: (progress.reviewHistory || []).map((d: string) => new Date(d)),
-          });
+      const parsed = await this.textJournal.load();
+      Object.entries(parsed).forEach(([id, progress]: [string, any]) => {
+        this.textProgress.set(id, {
+          ...progress,
+          last_reviewed: new Date(progress.last_reviewed),
+          next_review: new Date(progress.next_review),
+          reviewHistory: (progress.reviewHistory || []).map((d: string) => new Date(d)),
         });
-      }
+      });
     } catch (error) {
       console.error('Failed to load text progress:', error);
     }
@@ -277,43 +354,25 @@ export class TextbookStore {
    */
   private async loadExampleProgress(): Promise<void> {
     try {
-      const data = await AsyncStorage.getItem(STORAGE_KEYS.EXAMPLE_PROGRESS);
-      if (data) {
-        const parsed = JSON.parse(data);
-        Object.entries(parsed).forEach(([id, progress]: [string, any]) => {
-          this.exampleProgress.set(id, {
-            ...progress,
-            last_reviewed: new Date(progress.last_reviewed),
-            next_review: new Date(progress.next_review),
-            reviewHistory: (progress.reviewHistory || []).map((d: string) => new Date(d)),
-          });
+      const parsed = await this.exampleJournal.load();
+      Object.entries(parsed).forEach(([id, progress]: [string, any]) => {
+        this.exampleProgress.set(id, {
+          ...progress,
+          last_reviewed: new Date(progress.last_reviewed),
+          next_review: new Date(progress.next_review),
+          reviewHistory: (progress.reviewHistory || []).map((d: string) => new Date(d)),
         });
-      }
+      });
     } catch (error) {
       console.error('Failed to load example progress:', error);
     }
   }
 
   /**
-   * テキスト進捗を保存
+   * 未保存の進捗を書き込む（バックグラウンド移行時など）
    */
-  private async saveTextProgress(): Promise<void> {
-    const data: Record<string, TextProgress> = {};
-    this.textProgress.forEach((progress, id) => {
-      data[id] = progress;
-    });
-    await AsyncStorage.setItem(STORAGE_KEYS.TEXT_PROGRESS, JSON.stringify(data));
-  }
-
-  /**
-   * 例題進捗を保存
-   */
-  private async saveExampleProgress(): Promise<void> {
-    const data: Record<string, ExampleProgress> = {};
-    this.exampleProgress.forEach((progress, id) => {
-      data[id] = progress;
-    });
-    await AsyncStorage.setItem(STORAGE_KEYS.EXAMPLE_PROGRESS, JSON.stringify(data));
+  async flush(): Promise<void> {
+    await Promise.all([this.textJournal.flush(), this.exampleJournal.flush()]);
   }
 
   /**
@@ -439,8 +498,10 @@ export class TextbookStore {
     }
 
     const result = calculateTextbookNextReview(rating, progress, srsSettings.algorithm);
-    this.textProgress.set(contentId, { ...progress, ...result } as TextProgress);
-    await this.saveTextProgress();
+    const updated = { ...progress, ...result } as TextProgress;
+    this.textProgress.set(contentId, updated);
+    this.textCounters.update(contentId, updated);
+    this.textJournal.record(contentId, updated);
   }
 
   /**
@@ -475,47 +536,29 @@ export class TextbookStore {
     }
 
     const result = calculateTextbookNextReview(rating, progress, srsSettings.algorithm);
-    this.exampleProgress.set(exampleId, {
+    const updated = {
       ...progress,
       ...result,
       attempts: progress.attempts + 1,
       lastCorrect: rating === 'good' || rating === 'easy',
-    } as ExampleProgress);
-    await this.saveExampleProgress();
+    } as ExampleProgress;
+    this.exampleProgress.set(exampleId, updated);
+    this.exampleCounters.update(exampleId, updated);
+    this.exampleJournal.record(exampleId, updated);
   }
 
   /**
    * 統計情報を取得
    */
   getStatistics(srsSettings: SRSSettings): TextbookStatistics {
-    const totalTexts = this.textContents.size;
-    const totalExamples = this.examples.size;
-    
-    const reviewDueTexts = this.getReviewDueTexts(srsSettings).length;
-    const reviewDueExamples = this.getReviewDueExamples(srsSettings).length;
-    
-    let masteredTexts = 0;
-    let masteredExamples = 0;
-    
-    this.textProgress.forEach(progress => {
-      if (progress.repetitions >= 3 && progress.interval >= 21) {
-        masteredTexts++;
-      }
-    });
-    
-    this.exampleProgress.forEach(progress => {
-      if (progress.repetitions >= 3 && progress.interval >= 21) {
-        masteredExamples++;
-      }
-    });
-    
+    const now = new Date();
     return {
-      totalTexts,
-      totalExamples,
-      masteredTexts,
-      masteredExamples,
-      reviewDueTexts,
-      reviewDueExamples,
+      totalTexts: this.textContents.size,
+      totalExamples: this.examples.size,
+      masteredTexts: this.textCounters.mastered,
+      masteredExamples: this.exampleCounters.mastered,
+      reviewDueTexts: this.textCounters.dueCount(now),
+      reviewDueExamples: this.exampleCounters.dueCount(now),
       averageTextAccuracy: 0, // TODO: 実装
       averageExampleAccuracy: 0, // TODO: 実装
     };
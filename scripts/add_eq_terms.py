@@ -2,7 +2,7 @@
 import json
 import os
 
-BASE_DIR = "/home/ubuntu/cfa-vocab-app/assets/data"
+BASE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "data")
 
 new_terms = [
     {"term_id": "TERM0201", "topic_code": "EQ", "term_en": "Primary Market", "aliases": "New Issue Market", "abbrev": "", "term_ja": "発行市場", "reading": "はっこうしじょう", "definition": "企業が新規に証券を発行し、投資家に直接販売する市場。IPO（新規株式公開）や増資が行われる。", "key_points": "IPO・SEO（公募増資）の違い。引受業者の役割。", "pitfall": "Primary Market（発行市場）とSecondary Market（流通市場）の混同。", "formula": ""},
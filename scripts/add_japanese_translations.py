@@ -5,7 +5,7 @@
 import json
 from pathlib import Path
 
-EXAMPLES_FILE = Path('/home/ubuntu/cfa-vocab-app/assets/data/examples.json')
+EXAMPLES_FILE = Path(__file__).resolve().parent.parent / 'assets' / 'data' / 'examples.json'
 
 # 日本語訳を追加する例文
 JAPANESE_TRANSLATIONS = {
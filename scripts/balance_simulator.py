@@ -0,0 +1,701 @@
+#!/usr/bin/env python3
+"""
+RPGミニゲームのバランスシミュレーター（モンテカルロ）
+
+lib/game-store.ts / lib/game-types.ts / lib/srs-algorithms.ts の定数（STAGES・RARITY_STATS・
+UPGRADE_COSTS・UPGRADE_BONUS・デイリーミッション・FSRS_PARAMS）をソースから読み取り、
+バトル・ドロップ・合成・強化・ミッション報酬のルールを NumPy の配列演算で再現する。
+数十万人のプレイヤーを同時に進め、次を集計する。
+- ステージごとの解放・ボス撃破までのバトル数
+- 日ごとのゴールド・EXPの獲得量と所持ゴールドの推移（インフレ）
+- 合成の成功率（ベースのレアリティ別・合成触媒の有無別）
+
+クイズの正答率は FSRS の想起確率 R = 0.9^(t/S) から求める（4択なので不正解でも1/4で当たる）。
+正解・不正解に応じて安定性 S と難易度 D を srs-algorithms.ts と同じ式で更新する。
+
+簡略化している点:
+- 手札は山札の順に使う（手札内でのカード選択は考慮しない）
+- 合成は「ドロップしたカード」と「同じ用語の所持カード」の2枚で即時に行い、消費される所持カードは控えにあるものとみなす
+- 控えのカードはレアリティ別の枚数だけを持ち、デッキに空きができたら強い順に補充する
+
+使い方:
+    python scripts/balance_simulator.py                          # 2万人 × 30日
+    python scripts/balance_simulator.py --players 200000 --days 60
+    python scripts/balance_simulator.py --burst-rate 0.3 --fusion-boost --json result.json
+"""
+import argparse
+import json
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+
+from content_model import ROOT_DIR, load_content
+
+GAME_STORE = ROOT_DIR / 'lib' / 'game-store.ts'
+GAME_TYPES = ROOT_DIR / 'lib' / 'game-types.ts'
+SRS_ALGORITHMS = ROOT_DIR / 'lib' / 'srs-algorithms.ts'
+
+RARITIES = ['common', 'uncommon', 'rare', 'epic', 'legendary']
+MISSION_TYPES = ['battle_wins', 'quiz_correct', 'card_collect', 'gold_earn', 'boss_defeat']
+MAX_DECK = 15
+MAX_UPGRADE_LEVEL = 5
+MAX_TURNS = 200
+
+
+# ========== TypeScript の定数の読み取り ==========
+
+def extract_literal(source, marker):
+    """marker の後の `=` に続く配列/オブジェクトリテラルを文字列として取り出す（型注釈は読み飛ばす）"""
+    start = source.index('=', source.index(marker) + len(marker)) + 1
+    while source[start] not in '[{':
+        start += 1
+    depth = 0
+    quote = None
+    for i in range(start, len(source)):
+        c = source[i]
+        if quote:
+            if c == '\\':
+                continue
+            if c == quote:
+                quote = None
+        elif c in '\'"`':
+            quote = c
+        elif c in '[{':
+            depth += 1
+        elif c in ']}':
+            depth -= 1
+            if depth == 0:
+                return source[start:i + 1]
+    raise ValueError(f'リテラルが閉じていません: {marker}')
+
+
+def parse_ts_literal(text):
+    """JSON に近い TypeScript のリテラル（キーの引用符なし・単引用符・末尾カンマ・コメント）を読む"""
+    strings = []
+
+    def stash(match):
+        strings.append(match.group(0)[1:-1])
+        return f'"\x00{len(strings) - 1}"'
+
+    text = re.sub(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"", stash, text)
+    text = re.sub(r'//[^\n]*', '', text)
+    text = re.sub(r'\bas\s+\w+', '', text)
+    text = re.sub(r'([{,]\s*)([A-Za-z_]\w*)\s*:', r'\1"\2":', text)
+    text = re.sub(r',(\s*[}\]])', r'\1', text)
+    text = re.sub(r'"\x00(\d+)"', lambda m: json.dumps(strings[int(m.group(1))]), text)
+    return json.loads(text)
+
+
+class Rules:
+    """シミュレーションに使うゲームの定数"""
+
+    def __init__(self):
+        store = GAME_STORE.read_text(encoding='utf-8')
+        types = GAME_TYPES.read_text(encoding='utf-8')
+        srs = SRS_ALGORITHMS.read_text(encoding='utf-8')
+
+        self.stages = parse_ts_literal(extract_literal(store, 'export const STAGES'))
+        self.mission_templates = parse_ts_literal(extract_literal(store, 'const missionTemplates'))
+        rarity_stats = parse_ts_literal(extract_literal(types, 'export const RARITY_STATS'))
+        upgrade_costs = parse_ts_literal(extract_literal(types, 'export const UPGRADE_COSTS'))
+        self.upgrade_bonus = parse_ts_literal(extract_literal(types, 'export const UPGRADE_BONUS'))
+        self.fsrs = parse_ts_literal(extract_literal(srs, 'const FSRS_PARAMS'))
+        self.initial_player = parse_ts_literal(extract_literal(types, 'export const INITIAL_PLAYER_STATE'))
+        items = parse_ts_literal(extract_literal(types, 'export const ITEM_DEFINITIONS'))
+        self.fusion_boost_price = items['fusion_boost']['price']
+
+        self.base_attack = np.array([rarity_stats[r]['attack'] for r in RARITIES], dtype=np.int32)
+        self.base_heal = np.array([rarity_stats[r]['heal'] for r in RARITIES], dtype=np.int32)
+        # 強化レベル5は強化不可（コスト無限大）
+        costs = np.full((len(RARITIES), MAX_UPGRADE_LEVEL + 1), np.iinfo(np.int64).max // 4, dtype=np.int64)
+        for i, r in enumerate(RARITIES):
+            costs[i, :MAX_UPGRADE_LEVEL] = upgrade_costs[r]
+        self.upgrade_costs = costs
+
+        # 分野別の用語プール（用語IDは通し番号）と公式つき用語の割合
+        terms = load_content().terms
+        self.term_count = len(terms)
+        self.topic_terms = {}
+        self.topic_formula_rate = {}
+        for index, term in enumerate(terms):
+            self.topic_terms.setdefault(term.topic_code, []).append(index)
+        for topic, indexes in self.topic_terms.items():
+            self.topic_terms[topic] = np.array(indexes, dtype=np.int32)
+            self.topic_formula_rate[topic] = np.mean([bool(terms[i].formula) for i in indexes])
+
+    # LEVEL_LIMITS（lib/game-types.ts）
+    @staticmethod
+    def deck_capacity(level):
+        return np.minimum(5 + level // 2, MAX_DECK)
+
+    @staticmethod
+    def hand_size(level):
+        return np.minimum(2 + level // 3, 6)
+
+
+# ========== FSRS（lib/srs-algorithms.ts と同じ式） ==========
+
+def fsrs_update(rules, stability, difficulty, retrievability, correct):
+    w = rules.fsrs
+    grade = np.where(correct, 3, 1)
+    success = stability * (1 + np.exp(w['w8']) * (11 - difficulty) * np.power(stability, -w['w9'])
+                           * (np.exp(w['w10'] * (1 - retrievability)) - 1))
+    lapse = np.maximum(0.1, w['w11'] * np.power(difficulty, -w['w12'])
+                       * (np.power(stability + 1, w['w13']) - 1) * np.exp(w['w14'] * (1 - retrievability)))
+    new_difficulty = difficulty - w['w6'] * (grade - 3) + w['w7'] * (w['w4'] - difficulty)
+    return np.where(correct, success, lapse), np.clip(new_difficulty, 1, 10)
+
+
+# ========== シミュレーション ==========
+
+class Population:
+    """N人分のプレイヤー状態（すべて長さNの配列）"""
+
+    def __init__(self, rules, n, rng, args):
+        self.rules = rules
+        self.n = n
+        p = rules.initial_player
+        self.level = np.full(n, p['level'], dtype=np.int32)
+        self.exp = np.zeros(n, dtype=np.int64)
+        self.exp_to_next = np.full(n, p['expToNextLevel'], dtype=np.int64)
+        self.max_hp = np.full(n, p['maxHp'], dtype=np.int32)
+        self.hp = np.full(n, p['hp'], dtype=np.int32)
+        self.gold = np.zeros(n, dtype=np.int64)
+
+        # デッキ（レアリティ -1 は空き）。初期カードはコモン5枚（grantStarterCards）
+        self.deck_rarity = np.full((n, MAX_DECK), -1, dtype=np.int8)
+        self.deck_attack = np.zeros((n, MAX_DECK), dtype=np.int32)
+        self.deck_heal = np.zeros((n, MAX_DECK), dtype=np.int32)
+        self.deck_level = np.zeros((n, MAX_DECK), dtype=np.int8)
+        self.deck_rarity[:, :5] = 0
+        self.deck_attack[:, :5] = rules.base_attack[0]
+        self.deck_heal[:, :5] = rules.base_heal[0]
+        self.bench = np.zeros((n, len(RARITIES)), dtype=np.int32)
+        # 用語ごとに所持している最高レアリティ（-1 は未所持）
+        self.term_rarity = np.full((n, rules.term_count), -1, dtype=np.int8)
+
+        # 進行状況（ステージは0始まりの添字）
+        stage_count = len(rules.stages)
+        self.stage = np.zeros(n, dtype=np.int32)
+        self.unlocked = np.zeros(n, dtype=np.int32)
+        self.boss_defeated = np.zeros((n, stage_count), dtype=bool)
+        self.boss_cooldown = np.zeros(n, dtype=np.int32)
+
+        # 学習状態（現在のステージの分野の「典型的な用語」1つで代表させる）
+        self.stability = np.full(n, rules.fsrs['w2'], dtype=np.float64)
+        self.difficulty = np.clip(rng.normal(rules.fsrs['w4'], args.difficulty_spread, n), 1, 10)
+        self.topic = np.array([rules.stages[0]['topicCode']] * n, dtype=object)
+        self.quizzes_per_day = np.full(n, 30.0)
+
+
+class Simulator:
+    def __init__(self, rules, args):
+        self.rules = rules
+        self.args = args
+        self.rng = np.random.default_rng(args.seed)
+        self.pop = Population(rules, args.players, self.rng, args)
+        stages = rules.stages
+        self.stage_required = np.array([s['requiredLevel'] for s in stages], dtype=np.int32)
+        # 次のステージの必要レベル（最終ステージは解放なし）
+        self.next_required = np.append(self.stage_required[1:], np.iinfo(np.int32).max)
+        self.stage_topic = [s['topicCode'] for s in stages]
+        self.pool_size = np.array([len(rules.topic_terms[t]) for t in self.stage_topic], dtype=np.float64)
+        self.formula_rate = np.array([rules.topic_formula_rate[t] for t in self.stage_topic])
+
+        self.enemy_table = []
+        for s in stages:
+            enemies = s['enemies']
+            self.enemy_table.append({
+                key: np.array([e[key] for e in enemies] + [s['boss'][key]], dtype=np.float64)
+                for key in ('hp', 'attack', 'expReward', 'goldReward', 'cardDropRate')
+            })
+
+        n = args.players
+        battles = args.days * args.battles_per_day
+        self.unlock_battle = np.full((n, len(stages)), -1, dtype=np.int32)
+        self.unlock_battle[:, 0] = 0
+        self.boss_battle = np.full((n, len(stages)), -1, dtype=np.int32)
+        self.stage_battles = np.zeros(len(stages), dtype=np.int64)
+        self.stage_wins = np.zeros(len(stages), dtype=np.int64)
+        self.boss_attempts = np.zeros(len(stages), dtype=np.int64)
+        self.boss_wins = np.zeros(len(stages), dtype=np.int64)
+        self.daily = []
+        self.fusion_attempts = np.zeros((2, len(RARITIES)), dtype=np.int64)
+        self.fusion_successes = np.zeros((2, len(RARITIES)), dtype=np.int64)
+        self.fusions_per_player = np.zeros(n, dtype=np.int32)
+        self.total_battles = battles
+
+    # ---------- 1回のバトル ----------
+
+    def battle(self, index, day_counters):
+        pop, rules, rng, args = self.pop, self.rules, self.rng, self.args
+        n = pop.n
+        rows = np.arange(n)
+
+        # ボスに挑むか（必要レベル + margin を満たし、未撃破で、再挑戦待ちでない）
+        boss_ready = (~pop.boss_defeated[rows, pop.stage]
+                      & (pop.level >= self.stage_required[pop.stage] + args.boss_margin)
+                      & (pop.boss_cooldown == 0))
+        enemy_index = np.empty(n, dtype=np.int64)
+        hp = np.empty(n)
+        attack = np.empty(n)
+        exp_reward = np.empty(n)
+        gold_reward = np.empty(n)
+        drop_rate = np.empty(n)
+        for s, table in enumerate(self.enemy_table):
+            mask = pop.stage == s
+            if not mask.any():
+                continue
+            normal_count = len(table['hp']) - 1
+            choice = rng.integers(0, normal_count, mask.sum())
+            choice = np.where(boss_ready[mask], normal_count, choice)
+            enemy_index[mask] = choice
+            hp[mask] = table['hp'][choice]
+            attack[mask] = table['attack'][choice]
+            exp_reward[mask] = table['expReward'][choice]
+            gold_reward[mask] = table['goldReward'][choice]
+            drop_rate[mask] = table['cardDropRate'][choice]
+
+        # デッキを山札としてシャッフル（空きは末尾へ）
+        capacity = rules.deck_capacity(pop.level)
+        in_deck = (pop.deck_rarity >= 0) & (np.arange(MAX_DECK)[None, :] < capacity[:, None])
+        keys = np.where(in_deck, rng.random((n, MAX_DECK)), 2.0)
+        order = np.argsort(keys, axis=1)
+        deck_attack = np.take_along_axis(pop.deck_attack, order, axis=1)
+        deck_heal = np.take_along_axis(pop.deck_heal, order, axis=1)
+        deck_size = in_deck.sum(axis=1)
+
+        player_hp = pop.hp.astype(np.float64)
+        enemy_hp = hp.copy()
+        enemy_damage = np.maximum(1, attack - np.floor(pop.level * 0.5))
+        used = np.zeros(n, dtype=np.int64)
+        correct_count = np.zeros(n, dtype=np.int64)
+        quiz_count = np.zeros(n, dtype=np.int64)
+        victory = np.zeros(n, dtype=bool)
+        active = np.ones(n, dtype=bool)
+
+        for _ in range(MAX_TURNS):
+            idx = np.flatnonzero(active)
+            if idx.size == 0:
+                break
+            # カードが尽きたら敗北
+            out = used[idx] >= deck_size[idx]
+            active[idx[out]] = False
+            idx = idx[~out]
+            if idx.size == 0:
+                break
+
+            remaining = deck_size[idx] - used[idx]
+            burst = (remaining >= 2) & (rng.random(idx.size) < args.burst_rate)
+            heal_turn = player_hp[idx] < pop.max_hp[idx] * args.heal_threshold
+            card1 = used[idx]
+            card2 = np.minimum(card1 + 1, MAX_DECK - 1)
+            attack1 = deck_attack[idx, card1]
+            attack2 = np.where(burst, deck_attack[idx, card2], 0)
+            heal1 = deck_heal[idx, card1]
+            used[idx] += np.where(burst, 2, 1)
+
+            # 想起確率（同じ用語に再会するまでの日数 t = 用語数 / 1日のクイズ数）
+            elapsed = self.pool_size[pop.stage[idx]] / np.maximum(pop.quizzes_per_day[idx], 1.0)
+            retrievability = np.power(0.9, elapsed / np.maximum(pop.stability[idx], 0.1))
+            p_correct = retrievability + (1 - retrievability) * 0.25
+            # バーストは2つの概念を組み合わせた問題
+            p_correct = np.where(burst, p_correct ** 2, p_correct)
+            correct = rng.random(idx.size) < p_correct
+            # 代表の用語が出題されたとき（確率 1/用語数）だけ記憶状態を更新する
+            seen = rng.random(idx.size) < 1.0 / self.pool_size[pop.stage[idx]]
+            reviewed = idx[seen]
+            pop.stability[reviewed], pop.difficulty[reviewed] = fsrs_update(
+                rules, pop.stability[reviewed], pop.difficulty[reviewed], retrievability[seen], correct[seen])
+            quiz_count[idx] += 1
+            correct_count[idx] += correct
+
+            multiplier = np.where(burst, 2, 1)
+            damage = np.where(correct & ~heal_turn, (attack1 + attack2) * multiplier, 0)
+            heal = np.where(correct & heal_turn, heal1 * multiplier, 0)
+            self_damage = np.where(correct, 0, np.floor((attack1 + attack2) * 0.5 * multiplier))
+            enemy_hp[idx] = np.maximum(0, enemy_hp[idx] - damage)
+            player_hp[idx] = np.minimum(pop.max_hp[idx], player_hp[idx] + heal)
+            player_hp[idx] = np.maximum(0, player_hp[idx] - self_damage)
+
+            won = enemy_hp[idx] <= 0
+            lost = ~won & (player_hp[idx] <= 0)
+            victory[idx[won]] = True
+            active[idx[won | lost]] = False
+
+            # 敵のターン
+            idx = idx[~(won | lost)]
+            player_hp[idx] = np.maximum(0, player_hp[idx] - enemy_damage[idx])
+            active[idx[player_hp[idx] <= 0]] = False
+
+        self.finish_battle(index, victory, boss_ready, exp_reward, gold_reward, drop_rate,
+                           correct_count, quiz_count, day_counters)
+
+    # ---------- バトル終了（endBattle） ----------
+
+    def finish_battle(self, index, victory, boss, exp_reward, gold_reward, drop_rate,
+                      correct_count, quiz_count, day_counters):
+        pop, rules, rng, args = self.pop, self.rules, self.rng, self.args
+        n = pop.n
+        rows = np.arange(n)
+        stage = pop.stage.copy()
+
+        np.add.at(self.stage_battles, stage, 1)
+        np.add.at(self.stage_wins, stage[victory], 1)
+        np.add.at(self.boss_attempts, stage[boss], 1)
+        np.add.at(self.boss_wins, stage[boss & victory], 1)
+
+        pop.exp += np.where(victory, exp_reward, 0).astype(np.int64)
+        earned_gold = np.where(victory, gold_reward, 0).astype(np.int64)
+        pop.gold += earned_gold
+        self.level_up()
+
+        # カードドロップ
+        dropped = victory & (rng.random(n) < drop_rate)
+        self.drop_cards(np.flatnonzero(dropped))
+
+        # 次のステージの解放（勝利時、レベルが足りていれば）
+        can_unlock = victory & (stage + 1 < len(rules.stages)) & (pop.level >= self.next_required[stage])
+        newly = can_unlock & (pop.unlocked <= stage)
+        pop.unlocked = np.where(newly, stage + 1, pop.unlocked)
+        self.unlock_battle[rows[newly], stage[newly] + 1] = index + 1
+
+        # ボス撃破記録・再挑戦待ち
+        beaten = boss & victory
+        pop.boss_defeated[rows[beaten], stage[beaten]] = True
+        self.boss_battle[rows[beaten], stage[beaten]] = index + 1
+        pop.boss_cooldown = np.where(boss & ~victory, args.boss_cooldown, np.maximum(pop.boss_cooldown - 1, 0))
+
+        # ボスを倒し、次が解放済みなら先へ進む（分野が変わったら学習状態を初期化）
+        advance = pop.boss_defeated[rows, pop.stage] & (pop.unlocked > pop.stage)
+        if args.skip_bosses:
+            advance = pop.unlocked > pop.stage
+        pop.stage = np.where(advance, pop.stage + 1, pop.stage)
+        topic_changed = advance & (np.array(self.stage_topic)[pop.stage] != np.array(self.stage_topic)[stage])
+        pop.stability[topic_changed] = rules.fsrs['w2']
+
+        # HP回復（敗北時は半分）
+        pop.hp = np.where(victory, pop.max_hp, pop.max_hp // 2)
+
+        if args.upgrade:
+            self.upgrade_cards()
+
+        day_counters['battle_wins'] += victory
+        day_counters['quiz_correct'] += correct_count
+        day_counters['card_collect'] += dropped
+        day_counters['gold_earn'] += earned_gold
+        day_counters['boss_defeat'] += beaten
+        day_counters['quizzes'] += quiz_count
+        day_counters['gold_income'] += earned_gold
+        day_counters['exp_income'] += np.where(victory, exp_reward, 0).astype(np.int64)
+
+    def level_up(self):
+        pop, rules = self.pop, self.rules
+        while True:
+            up = pop.exp >= pop.exp_to_next
+            if not up.any():
+                break
+            pop.exp = np.where(up, pop.exp - pop.exp_to_next, pop.exp)
+            pop.level += up
+            pop.max_hp += np.where(up, 10, 0).astype(np.int32)
+            pop.hp = np.where(up, pop.max_hp, pop.hp)
+            pop.exp_to_next = np.where(up, np.floor(pop.exp_to_next * 1.2), pop.exp_to_next).astype(np.int64)
+        self.fill_deck()
+
+    # ---------- カード ----------
+
+    def drop_cards(self, idx):
+        """ドロップしたカード（determineRarity）を同じ用語の所持カードと合成し、デッキに入れる"""
+        if idx.size == 0:
+            return
+        pop, rules, rng, args = self.pop, self.rules, self.rng, self.args
+        stage = pop.stage[idx]
+        boost = np.where(rng.random(idx.size) < self.formula_rate[stage], 0.1, 0.0)
+        roll = rng.random(idx.size)
+        rarity = np.select(
+            [roll < 0.01 + boost, roll < 0.05 + boost, roll < 0.20 + boost, roll < 0.50],
+            [4, 3, 2, 1], default=0).astype(np.int8)
+        attack = rules.base_attack[rarity] + rng.integers(0, 10, idx.size)
+        heal = rules.base_heal[rarity] + rng.integers(0, 5, idx.size)
+
+        term = np.empty(idx.size, dtype=np.int64)
+        for s in np.unique(stage):
+            mask = stage == s
+            pool = rules.topic_terms[self.stage_topic[s]]
+            term[mask] = pool[rng.integers(0, len(pool), mask.sum())]
+        owned = pop.term_rarity[idx, term]
+
+        if args.fuse:
+            # レジェンダリー同士は合成しても上がらないので合成しない
+            fuse = (owned >= 0) & (np.maximum(owned, rarity) < len(RARITIES) - 1)
+            f_idx = np.flatnonzero(fuse)
+            if f_idx.size:
+                players = idx[f_idx]
+                base = np.maximum(owned[f_idx], rarity[f_idx])
+                use_boost = np.zeros(f_idx.size, dtype=bool)
+                if args.fusion_boost:
+                    use_boost = pop.gold[players] >= rules.fusion_boost_price + args.gold_reserve
+                    pop.gold[players] -= np.where(use_boost, rules.fusion_boost_price, 0)
+                # calculateFusionChance（2枚合成）
+                chance = np.minimum(0.3 + np.where(use_boost, 0.3, 0.0), 1.0)
+                upgraded = (base < len(RARITIES) - 1) & (rng.random(f_idx.size) < chance)
+                result = (base + upgraded).astype(np.int8)
+                np.add.at(self.fusion_attempts, (use_boost.astype(int), base), 1)
+                np.add.at(self.fusion_successes, (use_boost.astype(int), base), upgraded)
+                np.add.at(self.fusions_per_player, players, 1)
+                # 消費した所持カードは控えから除く
+                np.subtract.at(pop.bench, (players, owned[f_idx]), 1)
+                np.maximum(pop.bench, 0, out=pop.bench)
+                # 合成後のカードは新しいレアリティの基本値
+                rarity[f_idx] = result
+                attack[f_idx] = rules.base_attack[result]
+                heal[f_idx] = rules.base_heal[result]
+            pop.term_rarity[idx, term] = np.maximum(owned, rarity)
+        else:
+            pop.term_rarity[idx, term] = np.maximum(owned, rarity)
+
+        self.insert_cards(idx, rarity, attack, heal)
+
+    def insert_cards(self, idx, rarity, attack, heal):
+        """デッキの空き、または最も弱いカードと入れ替える（外したカードは控えへ）"""
+        pop, rules = self.pop, self.rules
+        capacity = rules.deck_capacity(pop.level[idx])
+        slots = np.arange(MAX_DECK)[None, :] < capacity[:, None]
+        strength = np.where(slots, np.where(pop.deck_rarity[idx] >= 0, pop.deck_attack[idx], -1), np.iinfo(np.int32).max)
+        weakest = np.argmin(strength, axis=1)
+        weakest_attack = strength[np.arange(idx.size), weakest]
+        replace = attack > weakest_attack
+
+        old_rarity = pop.deck_rarity[idx, weakest]
+        benched = np.where(replace, old_rarity, rarity)
+        keep = benched >= 0
+        np.add.at(pop.bench, (idx[keep], benched[keep]), 1)
+
+        r_idx, r_slot = idx[replace], weakest[replace]
+        pop.deck_rarity[r_idx, r_slot] = rarity[replace]
+        pop.deck_attack[r_idx, r_slot] = attack[replace]
+        pop.deck_heal[r_idx, r_slot] = heal[replace]
+        pop.deck_level[r_idx, r_slot] = 0
+
+    def fill_deck(self):
+        """レベルアップでデッキ上限が増えたら、控えの強いカードで埋める"""
+        pop, rules = self.pop, self.rules
+        capacity = rules.deck_capacity(pop.level)
+        for _ in range(2):
+            empty = (pop.deck_rarity < 0) & (np.arange(MAX_DECK)[None, :] < capacity[:, None])
+            has_bench = pop.bench.sum(axis=1) > 0
+            need = empty.any(axis=1) & has_bench
+            if not need.any():
+                break
+            idx = np.flatnonzero(need)
+            slot = np.argmax(empty[idx], axis=1)
+            best = (len(RARITIES) - 1) - np.argmax(pop.bench[idx, ::-1] > 0, axis=1)
+            pop.bench[idx, best] -= 1
+            pop.deck_rarity[idx, slot] = best
+            # 控えのカードは乱数部分の平均値で近似
+            pop.deck_attack[idx, slot] = rules.base_attack[best] + 4
+            pop.deck_heal[idx, slot] = rules.base_heal[best] + 2
+            pop.deck_level[idx, slot] = 0
+
+    def upgrade_cards(self):
+        """所持金の範囲で、デッキ内の最も安く強化できるカードを1枚強化（upgradeCard）"""
+        pop, rules, rng, args = self.pop, self.rules, self.rng, self.args
+        rarity = np.maximum(pop.deck_rarity, 0)
+        cost = rules.upgrade_costs[rarity, pop.deck_level]
+        cost = np.where(pop.deck_rarity >= 0, cost, np.iinfo(np.int64).max // 4)
+        slot = np.argmin(cost, axis=1)
+        rows = np.arange(pop.n)
+        price = cost[rows, slot]
+        buy = pop.gold >= price + args.gold_reserve
+        if not buy.any():
+            return
+        idx, slot, price = rows[buy], slot[buy], price[buy]
+        pop.gold[idx] -= price
+        level = pop.deck_level[idx, slot] + 1
+        pop.deck_level[idx, slot] = level
+        r = pop.deck_rarity[idx, slot]
+        pop.deck_attack[idx, slot] = np.floor(rules.base_attack[r] * (1 + rules.upgrade_bonus['attackMultiplier'] * level))
+        pop.deck_heal[idx, slot] = np.floor(rules.base_heal[r] * (1 + rules.upgrade_bonus['healMultiplier'] * level))
+        # 強化レベル3と5で30%の確率でレアリティアップ（ステータスは次の強化で反映）
+        rarity_up = ((level == 3) | (level == 5)) & (r < len(RARITIES) - 1) & (rng.random(idx.size) < 0.3)
+        pop.deck_rarity[idx[rarity_up], slot[rarity_up]] = r[rarity_up] + 1
+
+    # ---------- デイリーミッション ----------
+
+    def settle_missions(self, counters):
+        """1日の終わりに3つのミッションの達成を判定し、報酬を受け取る"""
+        pop, rules, rng = self.pop, self.rules, self.rng
+        templates = rules.mission_templates
+        n = pop.n
+        reward_gold = np.zeros(n, dtype=np.int64)
+        reward_exp = np.zeros(n, dtype=np.int64)
+        picks = np.argsort(rng.random((n, len(templates))), axis=1)[:, :3]
+        for k in range(3):
+            for t, template in enumerate(templates):
+                mask = picks[:, k] == t
+                if not mask.any():
+                    continue
+                targets = np.array(template['targets'])
+                target_index = rng.integers(0, len(targets), mask.sum())
+                difficulty = target_index + 1
+                done = counters[template['type']][mask] >= targets[target_index]
+                reward_gold[mask] += np.where(done, template['goldBase'] * difficulty, 0)
+                reward_exp[mask] += np.where(done, template['expBase'] * difficulty, 0)
+        pop.gold += reward_gold
+        pop.exp += reward_exp
+        self.level_up()
+        return reward_gold, reward_exp
+
+    # ---------- 実行 ----------
+
+    def run(self):
+        args, pop = self.args, self.pop
+        index = 0
+        for day in range(args.days):
+            counters = {key: np.zeros(pop.n, dtype=np.int64) for key in
+                        MISSION_TYPES + ['quizzes', 'gold_income', 'exp_income']}
+            for _ in range(args.battles_per_day):
+                self.battle(index, counters)
+                index += 1
+            mission_gold, mission_exp = self.settle_missions(counters)
+            pop.quizzes_per_day = np.maximum(counters['quizzes'], 1).astype(np.float64)
+
+            gold_income = counters['gold_income'] + mission_gold
+            self.daily.append({
+                'day': day + 1,
+                'level_mean': float(pop.level.mean()),
+                'gold_mean': float(pop.gold.mean()),
+                'gold_p50': float(np.median(pop.gold)),
+                'gold_p90': float(np.percentile(pop.gold, 90)),
+                'gold_income_mean': float(gold_income.mean()),
+                'exp_income_mean': float((counters['exp_income'] + mission_exp).mean()),
+                'mission_gold_share': float(mission_gold.sum() / max(gold_income.sum(), 1)),
+                'accuracy': float(counters['quiz_correct'].sum() / max(counters['quizzes'].sum(), 1)),
+                'stage_mean': float(pop.stage.mean() + 1),
+            })
+
+    # ---------- 集計 ----------
+
+    def report(self):
+        rules = self.rules
+        stages = []
+        for s, stage in enumerate(rules.stages):
+            unlock = self.unlock_battle[:, s]
+            boss = self.boss_battle[:, s]
+
+            def percentiles(values):
+                reached = values[values >= 0]
+                if reached.size == 0:
+                    return None
+                return {f'p{q}': int(np.percentile(reached, q)) for q in (10, 50, 90)}
+
+            stages.append({
+                'stage': stage['id'],
+                'name': stage['nameJa'],
+                'required_level': stage['requiredLevel'],
+                'unlocked_rate': float((unlock >= 0).mean()),
+                'battles_to_unlock': percentiles(unlock),
+                'boss_cleared_rate': float((boss >= 0).mean()),
+                'battles_to_boss': percentiles(boss),
+                'win_rate': float(self.stage_wins[s] / self.stage_battles[s]) if self.stage_battles[s] else None,
+                'boss_win_rate': float(self.boss_wins[s] / self.boss_attempts[s]) if self.boss_attempts[s] else None,
+            })
+
+        fusion = {}
+        for boost in (0, 1):
+            for r, name in enumerate(RARITIES):
+                attempts = int(self.fusion_attempts[boost, r])
+                if attempts:
+                    key = f"{name}{'+boost' if boost else ''}"
+                    fusion[key] = {
+                        'attempts': attempts,
+                        'success_rate': float(self.fusion_successes[boost, r] / attempts),
+                    }
+        per_player = np.bincount(self.fusions_per_player)
+        return {
+            'players': self.pop.n,
+            'days': self.args.days,
+            'battles_per_day': self.args.battles_per_day,
+            'stages': stages,
+            'daily': self.daily,
+            'fusion': {
+                'by_base_rarity': fusion,
+                'per_player': {
+                    'mean': float(self.fusions_per_player.mean()),
+                    'p90': float(np.percentile(self.fusions_per_player, 90)),
+                    'histogram': per_player[:20].tolist(),
+                },
+            },
+            'final': {
+                'level_mean': float(self.pop.level.mean()),
+                'gold_mean': float(self.pop.gold.mean()),
+                'deck_attack_mean': float(np.where(self.pop.deck_rarity >= 0, self.pop.deck_attack, 0).sum(axis=1).mean()),
+            },
+        }
+
+
+def format_percentiles(p):
+    return f"{p['p10']:>4} /{p['p50']:>4} /{p['p90']:>4}" if p else '     -     -     -'
+
+
+def print_report(result, elapsed):
+    print(f"プレイヤー {result['players']:,}人 × {result['days']}日"
+          f"（1日{result['battles_per_day']}戦） {elapsed:.1f}秒\n")
+
+    print('ステージ               必要Lv 解放率 解放までの戦闘数(p10/50/90) ボス撃破率 撃破までの戦闘数(p10/50/90) 勝率  ボス勝率')
+    for s in result['stages']:
+        win = f"{s['win_rate']:.0%}" if s['win_rate'] is not None else '-'
+        boss_win = f"{s['boss_win_rate']:.0%}" if s['boss_win_rate'] is not None else '-'
+        print(f"{s['stage']:>2} {s['name']:<16} {s['required_level']:>4} {s['unlocked_rate']:>6.0%}  "
+              f"{format_percentiles(s['battles_to_unlock']):>22}       {s['boss_cleared_rate']:>6.0%}  "
+              f"{format_percentiles(s['battles_to_boss']):>22}      {win:>4}  {boss_win:>4}")
+
+    print('\n日   平均Lv  平均所持G  所持G中央値  所持G p90  獲得G/日  獲得EXP/日  ミッション比率  正答率  平均ステージ')
+    for d in result['daily']:
+        print(f"{d['day']:>3} {d['level_mean']:>7.1f} {d['gold_mean']:>10.0f} {d['gold_p50']:>12.0f} {d['gold_p90']:>10.0f} "
+              f"{d['gold_income_mean']:>9.0f} {d['exp_income_mean']:>11.0f} {d['mission_gold_share']:>14.0%} "
+              f"{d['accuracy']:>7.0%} {d['stage_mean']:>12.2f}")
+
+    print('\n合成（ベースのレアリティ別）')
+    for key, f in result['fusion']['by_base_rarity'].items():
+        print(f"  {key:<18} {f['attempts']:>10,}回  成功率 {f['success_rate']:.1%}")
+    per_player = result['fusion']['per_player']
+    print(f"  1人あたり 平均 {per_player['mean']:.1f}回, p90 {per_player['p90']:.0f}回")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='RPGミニゲームのバランスシミュレーター')
+    parser.add_argument('--players', type=int, default=20_000, help='シミュレーションする人数')
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--battles-per-day', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--burst-rate', type=float, default=0.2, help='バーストを選ぶ確率')
+    parser.add_argument('--heal-threshold', type=float, default=0.4, help='HPがこの割合を下回ったら回復を選ぶ')
+    parser.add_argument('--boss-margin', type=int, default=1, help='ステージの必要レベル + margin でボスに挑む')
+    parser.add_argument('--boss-cooldown', type=int, default=3, help='ボスに負けた後、再挑戦までの通常戦闘数')
+    parser.add_argument('--skip-bosses', action='store_true', help='ボスを倒さなくても次のステージへ進む')
+    parser.add_argument('--no-fuse', dest='fuse', action='store_false', help='カード合成をしない')
+    parser.add_argument('--fusion-boost', action='store_true', help='合成時に合成触媒を買って使う')
+    parser.add_argument('--no-upgrade', dest='upgrade', action='store_false', help='カード強化をしない')
+    parser.add_argument('--gold-reserve', type=int, default=0, help='強化・購入で残しておくゴールド')
+    parser.add_argument('--difficulty-spread', type=float, default=1.5, help='FSRS難易度の個人差（標準偏差）')
+    parser.add_argument('--json', type=Path, help='結果をJSONで保存')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    simulator = Simulator(Rules(), args)
+    simulator.run()
+    result = simulator.report()
+    elapsed = time.perf_counter() - start
+
+    print_report(result, elapsed)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"\n結果を保存しました: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
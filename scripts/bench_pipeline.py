@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+データ・スプライトパイプラインのベンチマーク
+
+synthetic_content.py で生成した合成データに対して、既存スクリプトの処理を計測する。
+- data.convert      CSV → JSON 変換（convert-csv-to-json.py）
+- data.parse_pasted 貼り付け形式の単語集の解析（update_examples.py）
+- data.matching     用語名の正規化と照合（update_examples.py）
+- data.merge        例文の照合・更新・保存（update_examples.py）
+- data.content_load 用語・例文・関連語をレコードとして読み込む（content_model.py）
+- data.bundle_lookup バンドルを開いて term_id で用語と例文を引く（content_model.py）
+- sprites.grid      グリッド線の検出（extract_effects_v2.py）
+- sprites.strips    PNG を横帯ごとに展開しながらのグリッド線の検出（sprite_strips.py）
+- sprites.keying    白・グレー背景の透過（extract_effects_v2.py）
+- sprites.trimming  透明部分のトリミング（extract_effects_correct.py）
+- reviews.retention 復習イベントの分野 × 間隔ごとの定着率（review_events.py）
+
+結果はベースライン（既定: scripts/bench_baseline.json、既定の規模のみ記録済み）と比較し、しきい値を
+超えて遅くなったものを回帰として報告する（回帰があれば終了コード1）。ベースラインは計測したマシンに
+依存するので、別のマシンでは先に --save-baseline で記録し直してから比べる。ベースラインのファイルが
+なければ比較できないので終了コード1。
+
+使い方:
+    python scripts/bench_pipeline.py                    # 小〜中規模のみ
+    python scripts/bench_pipeline.py --full             # 100万語・4K/8Kシート・1億件の復習イベントも含める
+    python scripts/bench_pipeline.py -k sprites         # 名前で絞り込み
+    python scripts/bench_pipeline.py --save-baseline    # 結果をベースラインとして保存
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import synthetic_content
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = SCRIPTS_DIR / 'bench_baseline.json'
+
+DATA_SIZES = [384, 10_000, 100_000]
+DATA_SIZES_FULL = DATA_SIZES + [1_000_000]
+SHEET_SIZES = [1024]
+SHEET_SIZES_FULL = [1024, 4096, 8192]
+REVIEW_SIZES = [1_000_000]
+REVIEW_SIZES_FULL = [1_000_000, 10_000_000, 100_000_000]
+
+BENCHMARKS = []
+
+
+def benchmark(name, kind):
+    """ベンチマークを登録するデコレーター
+
+    登録する関数は (size, workdir) を受け取り、(計測対象の関数, 処理件数, 単位) を返す。
+    計測対象が入力を書き換える場合は、各回の前に入力を戻す関数（計測には含めない）を4つ目に返す。
+    """
+    def register(setup):
+        BENCHMARKS.append((name, kind, setup))
+        return setup
+    return register
+
+
+def load_script(filename):
+    path = SCRIPTS_DIR / filename
+    spec = importlib.util.spec_from_file_location(path.stem.replace('-', '_'), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def prepare_data(size, workdir):
+    """合成CSVと、それを変換したJSONを workdir に用意する"""
+    data_dir = os.path.join(workdir, f'data_{size}')
+    if not os.path.exists(os.path.join(data_dir, 'terms.json')):
+        synthetic_content.write_content(data_dir, size)
+        convert = load_script('convert-csv-to-json.py')
+        convert.DATA_DIR = data_dir
+        with contextlib.redirect_stdout(io.StringIO()):
+            convert.convert_terms()
+            convert.convert_examples()
+            convert.convert_relations()
+    return data_dir
+
+
+def prepare_sheet(size, workdir, cache={}):
+    if size not in cache:
+        cache[size] = synthetic_content.generate_spritesheet(size)
+    return cache[size]
+
+
+@benchmark('data.convert', 'data')
+def bench_convert(size, workdir):
+    data_dir = prepare_data(size, workdir)
+    convert = load_script('convert-csv-to-json.py')
+    convert.DATA_DIR = data_dir
+
+    def run():
+        convert.convert_terms()
+        convert.convert_examples()
+        convert.convert_relations()
+    return run, size, 'rows'
+
+
+def update_examples_module(data_dir):
+    module = load_script('update_examples.py')
+    module.PROVIDED_FILE = Path(data_dir) / 'Pasted_content.txt'
+    module.TERMS_FILE = Path(data_dir) / 'terms.json'
+    module.EXAMPLES_FILE = Path(data_dir) / 'examples.json'
+    return module
+
+
+@benchmark('data.parse_pasted', 'data')
+def bench_parse_pasted(size, workdir):
+    module = update_examples_module(prepare_data(size, workdir))
+    return module.extract_examples_from_provided_file, size, 'entries'
+
+
+@benchmark('data.matching', 'data')
+def bench_matching(size, workdir):
+    module = update_examples_module(prepare_data(size, workdir))
+    with open(module.TERMS_FILE, 'r', encoding='utf-8') as f:
+        terms = json.load(f)
+    provided = module.extract_examples_from_provided_file()
+
+    def run():
+        # update_examples() と同じ build_term_mapping で索引を作り、単語集の見出し語を引く
+        term_mapping = module.build_term_mapping(terms)
+        return sum(1 for key in provided if key in term_mapping)
+    return run, size, 'terms'
+
+
+@benchmark('data.merge', 'data')
+def bench_merge(size, workdir):
+    data_dir = prepare_data(size, workdir)
+    module = update_examples_module(data_dir)
+    # update_examples() は例文ファイルを書き換えるので、毎回元の例文をコピーした作業用ファイルに対して実行する
+    original = module.EXAMPLES_FILE
+    module.EXAMPLES_FILE = Path(data_dir) / 'examples.merge.json'
+    return module.update_examples, size, 'examples', lambda: shutil.copyfile(original, module.EXAMPLES_FILE)
+
+
+def prepare_content_root(size, workdir):
+    """prepare_data の出力をリポジトリと同じ配置（assets/data/）で見せる"""
+    root = os.path.join(workdir, f'content_{size}')
+    data_dir = os.path.join(root, 'assets', 'data')
+    if not os.path.exists(data_dir):
+        os.makedirs(os.path.dirname(data_dir), exist_ok=True)
+        os.symlink(os.path.abspath(prepare_data(size, workdir)), data_dir)
+    return root
+
+
+@benchmark('data.content_load', 'data')
+def bench_content_load(size, workdir):
+    module = load_script('content_model.py')
+    root = prepare_content_root(size, workdir)
+
+    def run():
+        content = module.Content(root)
+        return len(content.terms), len(content.examples), len(content.relations)
+    return run, size, 'terms'
+
+
+@benchmark('data.bundle_lookup', 'data')
+def bench_bundle_lookup(size, workdir):
+    module = load_script('content_model.py')
+    root = prepare_content_root(size, workdir)
+    module.open_bundle(root).close()
+    with open(os.path.join(root, 'assets', 'data', 'terms.json'), 'r', encoding='utf-8') as f:
+        term_ids = [term['term_id'] for term in json.load(f)][::max(1, size // 1000)]
+
+    def run():
+        # バンドルを開くところから（スクリプトの起動時と同じ）
+        with module.open_bundle(root) as bundle:
+            for term_id in term_ids:
+                bundle.term(term_id)
+                bundle.examples_for(term_id)
+    return run, len(term_ids), 'lookups'
+
+
+@benchmark('sprites.grid', 'sprites')
+def bench_grid(size, workdir):
+    module = load_script('extract_effects_v2.py')
+    img, _ = prepare_sheet(size, workdir)
+    return (lambda: module.find_grid_lines(img)), size * size, 'px'
+
+
+@benchmark('sprites.strips', 'sprites')
+def bench_strips(size, workdir):
+    module = load_script('sprite_strips.py')
+    img, _ = prepare_sheet(size, workdir)
+    path = os.path.join(workdir, f'spritesheet_{size}.png')
+    if not os.path.exists(path):
+        img.save(path)
+    return (lambda: module.find_grid_lines(path)), size * size, 'px'
+
+
+@benchmark('sprites.keying', 'sprites')
+def bench_keying(size, workdir):
+    module = load_script('extract_effects_v2.py')
+    img, _ = prepare_sheet(size, workdir)
+    return (lambda: module.make_transparent(img)), size * size, 'px'
+
+
+@benchmark('sprites.trimming', 'sprites')
+def bench_trimming(size, workdir):
+    v2 = load_script('extract_effects_v2.py')
+    correct = load_script('extract_effects_correct.py')
+    img, (v_lines, h_lines) = prepare_sheet(size, workdir)
+    keyed = v2.make_transparent(img)
+    cells = [
+        keyed.crop((left, top, right, bottom))
+        for top, bottom in zip(h_lines, h_lines[1:])
+        for left, right in zip(v_lines, v_lines[1:])
+    ]
+    return (lambda: [correct.trim_transparent(c) for c in cells]), size * size, 'px'
+
+
+@benchmark('reviews.retention', 'reviews')
+def bench_retention(size, workdir):
+    module = load_script('review_events.py')
+    store = module.ReviewEventStore(os.path.join(workdir, f'review-events-{size}'))
+    if store.count() == 0:
+        module.generate(store, size, days=30, users=1000, seed=1, start_day=module.date(2026, 1, 1))
+    return (lambda: module.retention(store)), size, 'events'
+
+
+def measure(fn, repeat, reset=None):
+    """repeat 回実行して最小時間（秒）を返す（スクリプトの print は捨てる）"""
+    best = float('inf')
+    for _ in range(repeat):
+        if reset:
+            reset()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='パイプラインのベンチマーク')
+    parser.add_argument('-k', dest='pattern', default='', help='名前に含まれる文字列で絞り込み')
+    parser.add_argument('--full', action='store_true', help='100万語・4K/8Kシート・1億件の復習イベントも計測')
+    parser.add_argument('--repeat', type=int, default=3, help='各ベンチマークの繰り返し回数（最小値を採用）')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE, help='ベースラインのJSON')
+    parser.add_argument('--save-baseline', action='store_true', help='今回の結果をベースラインとして保存')
+    parser.add_argument('--threshold', type=float, default=0.2, help='回帰とみなす遅延の割合（既定: 20%%）')
+    args = parser.parse_args()
+
+    sizes = {
+        'data': DATA_SIZES_FULL if args.full else DATA_SIZES,
+        'sprites': SHEET_SIZES_FULL if args.full else SHEET_SIZES,
+        'reviews': REVIEW_SIZES_FULL if args.full else REVIEW_SIZES,
+    }
+    baseline = {}
+    if args.baseline.exists():
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    elif not args.save_baseline:
+        print(f"警告: ベースライン {args.baseline} がありません（--save-baseline で記録）。回帰は判定できません\n")
+
+    results = {}
+    regressions = []
+    unrecorded = []
+    print(f"{'benchmark':28} {'size':>9} {'time ms':>11} {'throughput':>16} {'baseline':>11} {'ratio':>7}")
+    with tempfile.TemporaryDirectory(prefix='cfa-bench-') as workdir:
+        for name, kind, setup in BENCHMARKS:
+            if args.pattern not in name:
+                continue
+            for size in sizes[kind]:
+                key = f'{name}@{size}'
+                try:
+                    fn, items, unit, *reset = setup(size, workdir)
+                except ImportError as e:
+                    print(f"{key:38} スキップ（{e.name} がありません）")
+                    break
+                seconds = measure(fn, args.repeat, *reset)
+                results[key] = seconds
+
+                line = f"{name:28} {size:>9} {seconds * 1000:>11.2f} {items / seconds:>11.0f} {unit}/s"
+                if key in baseline:
+                    ratio = seconds / baseline[key]
+                    line = f"{line:<67} {baseline[key] * 1000:>11.2f} {ratio:>6.2f}x"
+                    if ratio > 1 + args.threshold:
+                        line += '  ← 回帰'
+                        regressions.append(key)
+                else:
+                    unrecorded.append(key)
+                print(line)
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"\nベースラインを保存しました: {args.baseline}")
+
+    if baseline and unrecorded and not args.save_baseline:
+        print(f"\nベースラインにないため比較していません: {', '.join(unrecorded)}")
+    if regressions:
+        print(f"\n回帰: {', '.join(regressions)}（しきい値 {args.threshold:.0%}）")
+        sys.exit(1)
+    if not baseline and not args.save_baseline:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
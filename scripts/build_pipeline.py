@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+コンテンツパイプライン全体のビルドオーケストレーター
+
+各ステージの入力・出力ファイルを宣言し、依存関係（DAG）に従って実行する。
+- 入力・出力ファイルの内容ハッシュが前回ビルドから変わっていないステージはスキップ
+- 互いに独立したステージ（データ・スプライトなど）はCPUコア数まで並列に実行
+- 同じファイルを読み書きするステージは宣言順に直列化
+
+assets/data/*.json が用語・例文・関連語の正本（SOURCE_FILES）で、ビルドはこれを作り直さない。
+- CSV（terms.csv など）は初期データの書き出しで、JSONより古い。CSV → JSON 変換（convert-csv-to-json.py）や
+  add_eq_terms.py などの移行スクリプトは適用済み（MIGRATIONS）として記録するだけで、ビルドでは実行しない
+- 正本に書き込む取り込みステージ（update_examples.py）は、正本の編集では再実行しない
+
+使い方:
+    python scripts/build_pipeline.py               # 変更のあるステージのみ実行
+    python scripts/build_pipeline.py --force       # 全ステージを再実行
+    python scripts/build_pipeline.py --dry-run     # 実行予定のステージを表示
+    python scripts/build_pipeline.py --mark-clean  # 現在のファイル状態をビルド済みとして記録
+    python scripts/build_pipeline.py data:numeric_questions  # 指定ステージ（と依存先）のみ
+    python scripts/build_pipeline.py --trace trace.json  # 各ステージの計測結果をChromeトレースに出力
+
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from content_model import PASTED_CONTENT_FILE
+from instrument import TRACE_ENV, merge_traces, tracer
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = ROOT_DIR / 'scripts'
+CACHE_FILE = ROOT_DIR / '.pipeline-cache.json'
+
+DATA_DIR = 'assets/data'
+EFFECTS_DIR = 'assets/sprites/effects'
+GOLDEN_DIR = 'tests/golden/effects'
+
+EFFECT_NAMES = ['hit', 'slash', 'explosion', 'fire', 'lightning', 'ice', 'spark', 'burn', 'freeze']
+
+# 正本のデータ（手で編集・import_deck.py で追記する。ビルドの出力ではない）
+SOURCE_FILES = {f'{DATA_DIR}/terms.json', f'{DATA_DIR}/examples.json', f'{DATA_DIR}/relations.json'}
+
+
+@dataclass
+class Stage:
+    """パイプラインの1ステージ（1スクリプトの実行）"""
+    name: str
+    script: str
+    inputs: list = field(default_factory=list)
+    outputs: list = field(default_factory=list)
+    args: list = field(default_factory=list)
+
+    @property
+    def group(self):
+        return self.name.split(':', 1)[0]
+
+    def files(self):
+        """フィンガープリント対象のファイル（スクリプト自体も含む）
+
+        正本に書き込む取り込みステージでは正本を除く（正本の編集で取り込みをやり直して上書きしないように）。
+        """
+        paths = [f'scripts/{self.script}', *self.inputs, *self.outputs]
+        if SOURCE_FILES & set(self.outputs):
+            paths = [p for p in paths if p not in SOURCE_FILES]
+        return list(dict.fromkeys(paths))
+
+
+# 適用済みのデータ移行（正本の JSON に反映済み。ビルドでは実行しない）
+# convert-csv-to-json.py は古い CSV で JSON を上書きし、add_eq_terms.py（追記）と fix_term_format.py
+# （フィールド名の付け替え）は冪等ではないため、再実行するとデータが失われるか壊れる。
+MIGRATIONS = [
+    Stage(
+        'data:convert', 'convert-csv-to-json.py',
+        inputs=[f'{DATA_DIR}/terms.csv', f'{DATA_DIR}/examples.csv', f'{DATA_DIR}/relations.csv'],
+        outputs=[f'{DATA_DIR}/terms.json', f'{DATA_DIR}/examples.json', f'{DATA_DIR}/relations.json'],
+    ),
+    Stage(
+        'data:add_eq_terms', 'add_eq_terms.py',
+        inputs=[f'{DATA_DIR}/terms.json', f'{DATA_DIR}/examples.json'],
+        outputs=[f'{DATA_DIR}/terms.json', f'{DATA_DIR}/examples.json'],
+    ),
+    Stage(
+        'data:fix_term_format', 'fix_term_format.py',
+        inputs=[f'{DATA_DIR}/terms.json'],
+        outputs=[f'{DATA_DIR}/terms.json'],
+    ),
+    Stage(
+        'data:japanese_translations', 'add_japanese_translations.py',
+        inputs=[f'{DATA_DIR}/examples.json'],
+        outputs=[f'{DATA_DIR}/examples.json'],
+    ),
+]
+
+# ステージ定義（宣言順が同一ファイルに対する実行順になる）
+STAGES = [
+    # データ: 貼り付け形式の単語集から例文を取り込む（単語集がなければスキップ）
+    Stage(
+        'data:update_examples', 'update_examples.py',
+        inputs=[str(PASTED_CONTENT_FILE), f'{DATA_DIR}/terms.json', f'{DATA_DIR}/examples.json'],
+        outputs=[f'{DATA_DIR}/examples.json'],
+    ),
+    # 問題: 用語の公式から数値計算問題のシャードを生成（シャードの一覧は lib/generated-questions.ts）
+    Stage(
+        'data:numeric_questions', 'generate_numeric_questions.py',
+        inputs=[f'{DATA_DIR}/terms.json'],
+        outputs=['lib/generated-questions.ts'],
+    ),
+    # 音声: 見出し語・例文の読み上げをオフライン TTS で合成（TTS エンジンか ffmpeg がない環境では何もしない）
+    Stage(
+        'audio:speech', 'render_audio.py',
+        inputs=[f'{DATA_DIR}/terms.json', f'{DATA_DIR}/examples.json'],
+        outputs=['assets/audio/manifest.json', 'lib/generated-audio.ts'],
+        args=['--skip-if-unavailable'],
+    ),
+    # レポート: 定義・例文・教科書段落の重複・類似テキスト検出
+    Stage(
+        'report:near_duplicates', 'near_duplicates.py',
+        inputs=[
+            f'{DATA_DIR}/terms.json', f'{DATA_DIR}/examples.json', 'data/textbook-sample.json',
+            'data/textbooks/bilingual/all_sections.json', 'translations/all_sections.json',
+        ],
+        outputs=['.pipeline-reports/near_duplicates.json'],
+    ),
+    # スプライト: エフェクトシートの切り出し（現行の出力を生成しているのは extract_effects_correct.py）
+    Stage(
+        'sprites:effects', 'extract_effects_correct.py',
+        inputs=[f'{EFFECTS_DIR}/effects_spritesheet.png'],
+        outputs=[f'{EFFECTS_DIR}/{name}_{i}.png' for name in EFFECT_NAMES for i in range(1, 4)],
+    ),
+    # 検査: 切り出したフレームをゴールデン画像（tests/golden/effects）と比較
+    Stage(
+        'check:sprite_golden', 'sprite_golden.py',
+        inputs=[
+            *(f'{EFFECTS_DIR}/{name}_{i}.png' for name in EFFECT_NAMES for i in range(1, 4)),
+            *(f'{GOLDEN_DIR}/{name}_{i}.png' for name in EFFECT_NAMES for i in range(1, 4)),
+            f'{GOLDEN_DIR}/manifest.json',
+        ],
+        outputs=['.pipeline-reports/sprite_golden.json'],
+        args=['check'],
+    ),
+]
+
+
+def resolve(path):
+    """リポジトリ相対パス（または絶対パス）を解決"""
+    return ROOT_DIR / path
+
+
+def build_graph(stages):
+    """読み書きするファイルの重なりからステージ間の依存関係を求める
+
+    後のステージは、前のステージが書くファイルを読む・書く場合（RAW/WAW）、
+    または前のステージが読むファイルを書く場合（WAR）に前のステージへ依存する。
+    """
+    deps = {stage.name: set() for stage in stages}
+    for j, later in enumerate(stages):
+        later_reads, later_writes = set(later.inputs), set(later.outputs)
+        for earlier in stages[:j]:
+            earlier_reads, earlier_writes = set(earlier.inputs), set(earlier.outputs)
+            if earlier_writes & (later_reads | later_writes) or earlier_reads & later_writes:
+                deps[later.name].add(earlier.name)
+    return deps
+
+
+def select_stages(stages, deps, targets):
+    """指定ステージとその推移的な依存先のみを残す"""
+    if not targets:
+        return stages
+    known = {stage.name for stage in stages}
+    applied = [t for t in targets if t in {m.name for m in MIGRATIONS}]
+    if applied:
+        raise SystemExit(f"適用済みの移行はビルドでは実行しません: {', '.join(applied)}")
+    unknown = [t for t in targets if t not in known and not any(s.group == t for s in stages)]
+    if unknown:
+        raise SystemExit(f"不明なステージ: {', '.join(unknown)}")
+
+    wanted = set()
+    stack = [s.name for s in stages if s.name in targets or s.group in targets]
+    while stack:
+        name = stack.pop()
+        if name not in wanted:
+            wanted.add(name)
+            stack.extend(deps[name])
+    return [stage for stage in stages if stage.name in wanted]
+
+
+class HashCache:
+    """ファイル内容ハッシュのキャッシュ（サイズとmtimeが同じなら再計算しない）"""
+
+    def __init__(self, entries=None):
+        self.entries = entries or {}
+
+    def digest(self, path):
+        full = resolve(path)
+        try:
+            st = full.stat()
+        except FileNotFoundError:
+            return None
+        cached = self.entries.get(path)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+
+        h = hashlib.blake2b(digest_size=16)
+        with open(full, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        digest = h.hexdigest()
+        self.entries[path] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    def fingerprint(self, stage):
+        return {path: self.digest(path) for path in stage.files()}
+
+
+def load_cache():
+    if CACHE_FILE.exists():
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return HashCache(data.get('files')), data.get('stages', {})
+    return HashCache(), {}
+
+
+def save_cache(hashes, records):
+    with open(CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'files': hashes.entries, 'stages': records}, f, ensure_ascii=False, indent=2)
+
+
+def stage_trace_path(trace, stage):
+    return f"{trace}.{stage.name.replace(':', '_')}.json"
+
+
+def run_stage(stage, verbose=False, trace=None):
+    """ステージのスクリプトを別プロセスで実行"""
+    env = None
+    if trace:
+        env = dict(os.environ, **{TRACE_ENV: stage_trace_path(trace, stage)})
+    start = time.perf_counter()
+    with tracer.span(stage.name, cat='stage', script=stage.script):
+        proc = subprocess.run(
+            [sys.executable, str(SCRIPTS_DIR / stage.script), *stage.args],
+            cwd=ROOT_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+    elapsed = time.perf_counter() - start
+    if verbose or proc.returncode != 0:
+        output = (proc.stdout + proc.stderr).rstrip()
+        if output:
+            print('\n'.join(f'  [{stage.name}] {line}' for line in output.splitlines()))
+    return proc.returncode, elapsed
+
+
+def build(stages, deps, hashes, records, force=False, dry_run=False, jobs=None, verbose=False, trace=None):
+    """DAGに従ってステージを実行し、各ステージの結果（ran/skipped/failed/blocked/missing）を返す"""
+    names = {stage.name for stage in stages}
+    by_name = {stage.name: stage for stage in stages}
+    produced = {path for stage in stages for path in stage.outputs}
+    pending = {stage.name: deps[stage.name] & names for stage in stages}
+    results = {}
+    running = {}
+
+    def finish(name, status):
+        results[name] = status
+        for waiting in pending.values():
+            waiting.discard(name)
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        while pending or running:
+            for name in [n for n, waiting in pending.items() if not waiting]:
+                del pending[name]
+                stage = by_name[name]
+                upstream = [results[d] for d in deps[name] if d in names]
+
+                if any(s in ('failed', 'blocked') for s in upstream):
+                    print(f"中止: {name}（依存ステージが失敗）")
+                    finish(name, 'blocked')
+                    continue
+
+                missing = [p for p in stage.inputs if p not in produced and not resolve(p).exists()]
+                if missing:
+                    print(f"スキップ: {name}（入力なし: {', '.join(missing)}）")
+                    finish(name, 'missing')
+                    continue
+
+                dirty = force or 'ran' in upstream or hashes.fingerprint(stage) != records.get(name)
+                if not dirty:
+                    finish(name, 'skipped')
+                    continue
+                if dry_run:
+                    print(f"実行予定: {name} ({stage.script})")
+                    finish(name, 'ran')
+                    continue
+
+                print(f"実行: {name} ({stage.script})")
+                running[pool.submit(run_stage, stage, verbose, trace)] = name
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                returncode, elapsed = future.result()
+                if returncode == 0:
+                    print(f"完了: {name} ({elapsed:.2f}s)")
+                    finish(name, 'ran')
+                else:
+                    print(f"失敗: {name} (終了コード {returncode})")
+                    finish(name, 'failed')
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='コンテンツパイプラインのビルド')
+    parser.add_argument('targets', nargs='*', help='実行するステージ名またはグループ名（data, sprites など）')
+    parser.add_argument('--force', action='store_true', help='変更の有無にかかわらず全ステージを実行')
+    parser.add_argument('--dry-run', action='store_true', help='実行せずに実行予定のステージを表示')
+    parser.add_argument('--mark-clean', action='store_true', help='現在のファイル状態をビルド済みとして記録')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='並列実行数（既定: CPUコア数）')
+    parser.add_argument('-v', '--verbose', action='store_true', help='各スクリプトの出力を表示')
+    parser.add_argument('--list', action='store_true', help='ステージと依存関係を表示')
+    parser.add_argument('--trace', metavar='PATH', help='計測を有効にしてChromeトレースJSONを出力')
+    args = parser.parse_args()
+
+    deps = build_graph(STAGES)
+    stages = select_stages(STAGES, deps, args.targets)
+
+    if args.list:
+        for stage in stages:
+            after = ', '.join(sorted(deps[stage.name])) or '-'
+            print(f"{stage.name:32} {stage.script:32} 依存: {after}")
+        for migration in MIGRATIONS:
+            print(f"{migration.name:32} {migration.script:32} 適用済み（実行しない）")
+        return
+
+    hashes, records = load_cache()
+    start = time.perf_counter()
+
+    if args.mark_clean:
+        for stage in stages:
+            records[stage.name] = hashes.fingerprint(stage)
+        save_cache(hashes, records)
+        print(f"{len(stages)}ステージをビルド済みとして記録しました")
+        return
+
+    if args.trace:
+        tracer.enable(f'{args.trace}.build_pipeline.json')
+
+    results = build(stages, deps, hashes, records, force=args.force, dry_run=args.dry_run,
+                    jobs=args.jobs, verbose=args.verbose, trace=args.trace)
+
+    if args.trace:
+        tracer.finish()
+        parts = [tracer.path] + [stage_trace_path(args.trace, s) for s in stages]
+        merge_traces(parts, args.trace, names=['build_pipeline'] + [s.name for s in stages])
+        for part in parts:
+            if os.path.exists(part):
+                os.remove(part)
+
+    if not args.dry_run:
+        # 後続ステージが同じファイルを書き換えるため、指紋はビルド完了後の状態で記録する
+        for name, status in results.items():
+            if status in ('ran', 'skipped'):
+                records[name] = hashes.fingerprint(next(s for s in stages if s.name == name))
+            elif status == 'failed':
+                records.pop(name, None)
+        save_cache(hashes, records)
+
+    counts = {}
+    for status in results.values():
+        counts[status] = counts.get(status, 0) + 1
+    summary = ', '.join(f'{k}={v}' for k, v in sorted(counts.items()))
+    print(f"\nビルド完了 ({time.perf_counter() - start:.2f}s): {summary}")
+
+    if counts.get('failed') or counts.get('blocked'):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
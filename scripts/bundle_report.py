@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+アプリに同梱するコンテンツ・アセットのサイズと起動時コストの分析
+
+app/ の各画面から import と require（@/・@shared/・相対パス）をたどり、
+どのアセットがいつ読み込まれるかを求める:
+- startup     起動時に評価されるモジュール（ルートレイアウト・タブレイアウト・最初のタブ）から静的にたどれるもの
+- navigation  ほかの画面から静的にたどれるもの（その画面を開いたときに評価される）
+- on-demand   関数の中の require() や import() でだけ読まれるもの
+- native      app.config.ts のアイコン・スプラッシュ画像
+アセットごとにファイルサイズ、JSON の解析コストの見積もり、画像の展開後のメモリ（幅 × 高さ × 4）を求め、
+分類（data, questions, textbook, enemies, effects, images, audio）ごとに集計して予算と比べる。
+assets/ と data/ にあってどこからも参照されないファイルは、パイプライン（build_pipeline.py）の
+入力・出力かどうかで「ソース」「未使用の生成物」「残骸」に分けて報告する。
+
+JSON の解析コストは Hermes（中位の Android 端末）での概算: 値1個あたり PARSE_NS_PER_VALUE、
+1バイトあたり PARSE_NS_PER_BYTE。絶対値より、変更前後の比較に使う。
+
+使い方:
+    python scripts/bundle_report.py                      # 表を表示（予算超過・参照切れがあれば終了コード1）
+    python scripts/bundle_report.py --top 30 --json .pipeline-reports/bundle.json
+    python scripts/bundle_report.py --strict             # 残骸のファイルがあっても失敗にする
+    python scripts/bundle_report.py --budgets budgets.json   # 予算の上書き（DEFAULT_BUDGETS と同じ形）
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from PIL import Image
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+ASSET_DIRS = ['assets', 'data']
+APP_CONFIG = 'app.config.ts'
+
+# expo-router: 起動時に描画されるルート（タブは最初に表示するものだけ。ほかのタブは初めて開いたときに評価）
+STARTUP_ROUTES = ['app/_layout.tsx', 'app/(tabs)/_layout.tsx', 'app/(tabs)/index.tsx']
+
+SOURCE_EXTENSIONS = ['.tsx', '.ts', '.jsx', '.js']
+RESOLVE_EXTENSIONS = SOURCE_EXTENSIONS + ['.json']
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.bmp'}
+SCALE_SUFFIX = re.compile(r'@(\d(?:\.\d)?)x$')
+
+PARSE_NS_PER_VALUE = 150
+PARSE_NS_PER_BYTE = 8
+
+# 前から順に最初に一致したものを使う
+CATEGORY_RULES = [
+    ('questions', 'assets/data/questions/'),
+    ('data', 'assets/data/'),
+    ('textbook', 'data/'),
+    ('audio', 'assets/audio/'),
+    ('enemies', 'assets/sprites/enemies/'),
+    ('effects', 'assets/sprites/effects/'),
+    ('sprites', 'assets/sprites/'),
+    ('images', 'assets/images/'),
+]
+
+# 予算（超えたら失敗）。bytes は同梱するファイルの合計、decoded_mb は画像を展開したときのメモリ。
+# 現状に3〜5割の余裕を持たせた値。意図して増やすときはここを更新する
+DEFAULT_BUDGETS = {
+    'startup': {'json_bytes': 500_000, 'parse_ms': 8, 'decoded_mb': 24, 'modules': 50},
+    'categories': {
+        'data': {'bytes': 500_000},
+        'questions': {'bytes': 1_200_000},
+        'textbook': {'bytes': 200_000},
+        'audio': {'bytes': 40_000_000},
+        'enemies': {'bytes': 6_000_000, 'decoded_mb': 24},
+        'effects': {'bytes': 700_000, 'decoded_mb': 2},
+        'images': {'bytes': 200_000, 'decoded_mb': 4},
+    },
+}
+
+PHASES = ['startup', 'navigation', 'on-demand', 'native']
+
+
+# ========== ソースの解析 ==========
+
+TOKEN_RE = re.compile(r'''
+    (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*"|`(?:\\.|[^`\\])*`)
+  | (?P<open>\{)
+  | (?P<close>\})
+  | (?P<call>\b(?:require|import)\s*\(\s*(?P<quote>['"])(?P<target>[^'"]+)(?P=quote)\s*\))
+  | (?P<static>\b(?:import|export)\b(?P<clause>[^;'"]*?)\bfrom\s*(?P<fquote>['"])(?P<from>[^'"]+)(?P=fquote))
+  | (?P<bare>\bimport\s*(?P<bquote>['"])(?P<side>[^'"]+)(?P=bquote))
+''', re.S | re.X)
+
+# この直前で開く { はオブジェクトリテラル（それ以外はブロック = 関数の本体など）
+OBJECT_BRACE_BEFORE = re.compile(r'(?:[=:,(\[?]|&&|\|\||\breturn)\s*$')
+ARROW_BEFORE = re.compile(r'=>\s*\(?\s*$')
+
+
+@dataclass
+class Reference:
+    target: str
+    lazy: bool
+
+
+def parse_references(text):
+    """ソース中の import / require の参照先と、それが関数の中（遅延）かどうか"""
+    references = []
+    braces = []  # True ならブロック
+    for match in TOKEN_RE.finditer(text):
+        kind = match.lastgroup if match.lastgroup in ('comment', 'string', 'open', 'close') else None
+        if kind in ('comment', 'string'):
+            continue
+        if kind == 'open':
+            before = text[max(0, match.start() - 40):match.start()]
+            braces.append(not OBJECT_BRACE_BEFORE.search(before))
+            continue
+        if kind == 'close':
+            if braces:
+                braces.pop()
+            continue
+        if match.group('call'):
+            before = text[max(0, match.start() - 40):match.start()]
+            lazy = any(braces) or bool(ARROW_BEFORE.search(before)) or match.group('call').startswith('import')
+            references.append(Reference(match.group('target'), lazy))
+        elif match.group('static'):
+            # 型だけの import / export は実行時には消える
+            if re.match(r'\s+type\b', match.group('clause')):
+                continue
+            references.append(Reference(match.group('from'), False))
+        elif match.group('bare'):
+            references.append(Reference(match.group('side'), False))
+    return references
+
+
+def resolve(specifier, importer, platform):
+    """import の指定子をリポジトリ相対パスにする（パッケージなら None、見つからなければ '!' 付き）"""
+    if specifier.startswith('@/'):
+        base = ROOT_DIR / specifier[2:]
+    elif specifier.startswith('@shared/'):
+        base = ROOT_DIR / 'shared' / specifier[len('@shared/'):]
+    elif specifier.startswith('.'):
+        base = (ROOT_DIR / importer).parent / specifier
+    else:
+        return None
+    base = Path(os.path.normpath(base))
+
+    candidates = [base]
+    for ext in RESOLVE_EXTENSIONS:
+        candidates += [base.with_name(f'{base.name}.{platform}{ext}'),
+                       base.with_name(f'{base.name}.native{ext}'),
+                       base.with_name(f'{base.name}{ext}')]
+    for ext in SOURCE_EXTENSIONS:
+        candidates.append(base / f'index{ext}')
+    for candidate in candidates:
+        if candidate.is_file():
+            return candidate.relative_to(ROOT_DIR).as_posix()
+    try:
+        return '!' + base.relative_to(ROOT_DIR).as_posix()
+    except ValueError:
+        return '!' + str(base)
+
+
+class ModuleGraph:
+    def __init__(self, platform):
+        self.platform = platform
+        self.edges = defaultdict(list)  # モジュール → [(参照先, 遅延か)]
+        self.importers = defaultdict(set)
+        self.missing = []  # (参照元, 参照先)
+
+    def add(self, path):
+        if path in self.edges or Path(path).suffix not in SOURCE_EXTENSIONS:
+            self.edges.setdefault(path, [])
+            return
+        text = (ROOT_DIR / path).read_text(encoding='utf-8')
+        self.edges[path] = []
+        for reference in parse_references(text):
+            target = resolve(reference.target, path, self.platform)
+            if target is None:
+                continue
+            if target.startswith('!'):
+                self.missing.append((path, target[1:]))
+                continue
+            self.edges[path].append((target, reference.lazy))
+            self.importers[target].add(path)
+            self.add(target)
+
+    def closure(self, roots, follow_lazy):
+        seen = set()
+        stack = [r for r in roots if r in self.edges]
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            stack.extend(t for t, lazy in self.edges[node] if follow_lazy or not lazy)
+        return seen
+
+
+def route_files():
+    return sorted(p.relative_to(ROOT_DIR).as_posix() for p in (ROOT_DIR / 'app').rglob('*')
+                  if p.suffix in SOURCE_EXTENSIONS and p.is_file())
+
+
+def app_config_assets():
+    path = ROOT_DIR / APP_CONFIG
+    if not path.exists():
+        return []
+    text = path.read_text(encoding='utf-8')
+    return [m.group(1) for m in re.finditer(r'["\']\./((?:assets|data)/[^"\']+)["\']', text)]
+
+
+# ========== アセットのコスト ==========
+
+@dataclass
+class Asset:
+    path: str
+    phase: str
+    category: str
+    bytes: int = 0
+    parse_ms: float = 0.0
+    decoded_bytes: int = 0
+    size: tuple = None
+    referenced_by: list = field(default_factory=list)
+
+
+def category_of(path):
+    for name, prefix in CATEGORY_RULES:
+        if path.startswith(prefix):
+            return name
+    return 'other'
+
+
+def count_json_values(value):
+    count = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        count += 1
+        if isinstance(item, dict):
+            stack.extend(item.values())
+            count += len(item)  # キー
+        elif isinstance(item, list):
+            stack.extend(item)
+    return count
+
+
+def scale_variants(path):
+    """Metro が同梱する @2x / @3x の画像（端末の倍率に合う1枚だけが読まれる）"""
+    p = ROOT_DIR / path
+    return sorted(p.parent.glob(f'{p.stem}@*x{p.suffix}'))
+
+
+def measure_asset(asset, scale):
+    path = ROOT_DIR / asset.path
+    asset.bytes = path.stat().st_size
+    suffix = path.suffix.lower()
+    if suffix == '.json':
+        with open(path, 'rb') as f:
+            raw = f.read()
+        values = count_json_values(json.loads(raw))
+        asset.parse_ms = (values * PARSE_NS_PER_VALUE + len(raw) * PARSE_NS_PER_BYTE) / 1e6
+    elif suffix in IMAGE_EXTENSIONS:
+        chosen = path
+        for variant in scale_variants(asset.path):
+            asset.bytes += variant.stat().st_size
+            m = SCALE_SUFFIX.search(variant.stem)
+            if m and float(m.group(1)) <= scale:
+                chosen = variant
+        with Image.open(chosen) as img:
+            asset.size = img.size
+            asset.decoded_bytes = img.size[0] * img.size[1] * 4
+
+
+# ========== 集計 ==========
+
+def analyze(platform, scale):
+    graph = ModuleGraph(platform)
+    routes = route_files()
+    for route in routes:
+        graph.add(route)
+
+    startup = graph.closure(STARTUP_ROUTES, follow_lazy=False)
+    eager = graph.closure(routes, follow_lazy=False)
+    reachable = graph.closure(routes, follow_lazy=True)
+
+    def phase_of(node):
+        return 'startup' if node in startup else 'navigation' if node in eager else 'on-demand'
+
+    modules = {node: phase_of(node) for node in reachable if Path(node).suffix in SOURCE_EXTENSIONS}
+    assets = {}
+    for node in reachable:
+        if Path(node).suffix in SOURCE_EXTENSIONS:
+            continue
+        assets[node] = Asset(node, phase_of(node), category_of(node),
+                             referenced_by=sorted(graph.importers[node]))
+    for path in app_config_assets():
+        if not (ROOT_DIR / path).is_file():
+            graph.missing.append((APP_CONFIG, path))
+        elif path not in assets:
+            assets[path] = Asset(path, 'native', category_of(path), referenced_by=[APP_CONFIG])
+    for asset in assets.values():
+        measure_asset(asset, scale)
+
+    code_bytes = {phase: 0 for phase in PHASES}
+    code_count = {phase: 0 for phase in PHASES}
+    for node, phase in modules.items():
+        code_bytes[phase] += (ROOT_DIR / node).stat().st_size
+        code_count[phase] += 1
+    return graph, modules, assets, code_bytes, code_count
+
+
+def unreferenced_files(assets):
+    """どこからも参照されないファイルを、パイプラインとの関係で分ける"""
+    try:
+        from build_pipeline import MIGRATIONS, SOURCE_FILES, STAGES
+        sources = {p for stage in STAGES + MIGRATIONS for p in stage.inputs}
+        outputs = {p for stage in STAGES for p in stage.outputs} - SOURCE_FILES
+    except ImportError:
+        sources, outputs = set(), set()
+    bundled = set(assets)
+    for path in list(bundled):
+        bundled.update(v.relative_to(ROOT_DIR).as_posix() for v in scale_variants(path))
+
+    groups = {'leftover': [], 'unused-output': [], 'source': []}
+    for directory in ASSET_DIRS:
+        for path in sorted((ROOT_DIR / directory).rglob('*')):
+            rel = path.relative_to(ROOT_DIR).as_posix()
+            if not path.is_file() or rel in bundled or path.name.startswith('.'):
+                continue
+            kind = 'unused-output' if rel in outputs else 'source' if rel in sources else 'leftover'
+            groups[kind].append((rel, path.stat().st_size))
+    return groups
+
+
+def summarize(assets):
+    by_phase = {phase: defaultdict(float) for phase in PHASES}
+    by_category = defaultdict(lambda: defaultdict(float))
+    for asset in assets.values():
+        for bucket in (by_phase[asset.phase], by_category[asset.category]):
+            bucket['files'] += 1
+            bucket['bytes'] += asset.bytes
+            bucket['parse_ms'] += asset.parse_ms
+            bucket['decoded_mb'] += asset.decoded_bytes / 1024 / 1024
+            if asset.path.endswith('.json'):
+                bucket['json_bytes'] += asset.bytes
+            if asset.decoded_bytes:
+                bucket['images'] += 1
+    return by_phase, by_category
+
+
+def check_budgets(budgets, by_phase, by_category, code_count):
+    violations = []
+    startup = dict(by_phase['startup'], modules=code_count['startup'])
+    for metric, limit in budgets.get('startup', {}).items():
+        if startup.get(metric, 0) > limit:
+            violations.append((f'startup.{metric}', startup.get(metric, 0), limit))
+    for category, limits in budgets.get('categories', {}).items():
+        for metric, limit in limits.items():
+            value = by_category.get(category, {}).get(metric, 0)
+            if value > limit:
+                violations.append((f'{category}.{metric}', value, limit))
+    return violations
+
+
+def fmt_bytes(n):
+    return f'{n / 1024 / 1024:.2f}MB' if n >= 1024 * 1024 else f'{n / 1024:.1f}KB'
+
+
+def fmt_value(metric, value):
+    if metric.endswith('bytes'):
+        return fmt_bytes(value)
+    if metric.endswith('_ms'):
+        return f'{value:.1f}ms'
+    if metric.endswith('_mb'):
+        return f'{value:.1f}MB'
+    return f'{value:.0f}'
+
+
+def print_report(modules, assets, code_bytes, code_count, by_phase, by_category, unreferenced,
+                 missing, violations, top):
+    print(f"{'phase':11} {'modules':>8} {'code':>10} {'json':>10} {'parse':>9} {'images':>7} {'image files':>12} {'decoded':>9}")
+    for phase in PHASES:
+        s = by_phase[phase]
+        print(f"{phase:11} {code_count[phase]:>8} {fmt_bytes(code_bytes[phase]):>10} {fmt_bytes(s['json_bytes']):>10} "
+              f"{s['parse_ms']:>7.1f}ms {int(s['images']):>7} {fmt_bytes(s['bytes'] - s['json_bytes']):>12} "
+              f"{s['decoded_mb']:>7.1f}MB")
+
+    print(f"\n{'category':11} {'files':>6} {'bytes':>10} {'parse':>9} {'decoded':>9}  phases")
+    for category in sorted(by_category, key=lambda c: -by_category[c]['bytes']):
+        s = by_category[category]
+        phases = sorted({a.phase for a in assets.values() if a.category == category}, key=PHASES.index)
+        print(f"{category:11} {int(s['files']):>6} {fmt_bytes(s['bytes']):>10} {s['parse_ms']:>7.1f}ms "
+              f"{s['decoded_mb']:>7.1f}MB  {', '.join(phases)}")
+
+    if top:
+        print(f"\n起動時コストの大きいアセット（上位{top}件）")
+        ranked = sorted(assets.values(), key=lambda a: (PHASES.index(a.phase), -(a.parse_ms + a.decoded_bytes / 4e6)))
+        for asset in ranked[:top]:
+            detail = f'{asset.parse_ms:.1f}ms' if asset.parse_ms else (
+                f'{asset.size[0]}x{asset.size[1]} → {asset.decoded_bytes / 1024 / 1024:.1f}MB' if asset.size else '')
+            source = asset.referenced_by[0] if asset.referenced_by else ''
+            more = f' 他{len(asset.referenced_by) - 1}' if len(asset.referenced_by) > 1 else ''
+            print(f'  {asset.phase:10} {fmt_bytes(asset.bytes):>9}  {detail:22} {asset.path}  ← {source}{more}')
+
+    labels = {'leftover': '残骸（参照もパイプラインでの利用もない）', 'unused-output': '未使用の生成物（パイプラインの出力だがアプリから参照されない）',
+              'source': 'ソース（パイプラインの入力。同梱はされない）'}
+    for kind in ('leftover', 'unused-output', 'source'):
+        files = unreferenced[kind]
+        if files:
+            print(f'\n{labels[kind]}: {len(files)}件 ({fmt_bytes(sum(size for _, size in files))})')
+            for path, size in files:
+                print(f'  {fmt_bytes(size):>9}  {path}')
+
+    if missing:
+        print(f'\n参照切れ: {len(missing)}件')
+        for importer, target in missing:
+            print(f'  {target}  ← {importer}')
+    if violations:
+        print(f'\n予算超過: {len(violations)}件')
+        for metric, value, limit in violations:
+            print(f'  {metric}: {fmt_value(metric, value)}（予算 {fmt_value(metric, limit)}）')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='同梱アセットのサイズと起動時コストの分析')
+    parser.add_argument('--platform', choices=['android', 'ios', 'web'], default='android',
+                        help='プラットフォーム別のファイル（*.ios.tsx など）の選び方')
+    parser.add_argument('--scale', type=float, default=3, help='画像の倍率（@2x/@3x のどれを展開するか）')
+    parser.add_argument('--top', type=int, default=15, help='コストの大きいアセットを何件表示するか')
+    parser.add_argument('--budgets', type=Path, help='予算の JSON（DEFAULT_BUDGETS と同じ形）')
+    parser.add_argument('--json', type=Path, help='結果を JSON で書き出す')
+    parser.add_argument('--strict', action='store_true', help='残骸のファイルがあっても失敗にする')
+    args = parser.parse_args()
+
+    budgets = DEFAULT_BUDGETS
+    if args.budgets:
+        with open(args.budgets, encoding='utf-8') as f:
+            budgets = json.load(f)
+
+    graph, modules, assets, code_bytes, code_count = analyze(args.platform, args.scale)
+    by_phase, by_category = summarize(assets)
+    unreferenced = unreferenced_files(assets)
+    violations = check_budgets(budgets, by_phase, by_category, code_count)
+    missing = sorted(set(graph.missing))
+    print_report(modules, assets, code_bytes, code_count, by_phase, by_category, unreferenced,
+                 missing, violations, args.top)
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        report = {
+            'phases': {p: dict(by_phase[p], modules=code_count[p], code_bytes=code_bytes[p]) for p in PHASES},
+            'categories': {c: dict(s) for c, s in by_category.items()},
+            'assets': [
+                {'path': a.path, 'phase': a.phase, 'category': a.category, 'bytes': a.bytes,
+                 'parse_ms': round(a.parse_ms, 3), 'decoded_bytes': a.decoded_bytes, 'referenced_by': a.referenced_by}
+                for a in sorted(assets.values(), key=lambda a: a.path)
+            ],
+            'unreferenced': {kind: [path for path, _ in files] for kind, files in unreferenced.items()},
+            'missing': [{'importer': i, 'path': p} for i, p in missing],
+            'violations': [{'metric': m, 'value': v, 'budget': b} for m, v, b in violations],
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f'\n保存: {args.json}')
+
+    if violations or missing or (args.strict and unreferenced['leftover']):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
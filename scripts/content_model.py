@@ -0,0 +1,637 @@
+#!/usr/bin/env python3
+"""
+コンテンツ（用語・例文・関連語・教科書セクション）の共通モデルと読み込み
+
+scripts/ の各スクリプトがそれぞれパスを定義し、JSON を丸ごと読んで dict のまま扱っていたものを1か所にまとめる。
+- レコードは __slots__ のクラス（Term / Example / Relation / Section）。フィールド名は lib/types.ts に合わせた
+  正規の名前だけで、移行途中の旧名（term_en, example_ja など）は読み込み時に正規の名前へ寄せる
+- topic_code・relation_type は sys.intern した文字列を共有する（同じ値は同じオブジェクト）
+- Content はソースファイルを最初に参照したときに1回だけ読む
+- ContentBundle は全レコードを1ファイルにまとめたバンドル（.content-bundle.bin）を mmap で開き、
+  term_id などのハッシュ索引から必要なレコードだけをデコードする（件数によらず O(1)）
+バンドルはソースファイルのサイズ・更新時刻を持ち、open_bundle() はソースが変わっていれば作り直す。
+
+使い方:
+    python scripts/content_model.py check           # 旧フィールド名・未知の分野・参照切れなどを表示
+    python scripts/content_model.py bundle          # バンドルを作り直す
+    python scripts/content_model.py get TERM0001    # 用語と例文・関連語を表示（バンドル経由）
+
+他のスクリプトからは:
+    from content_model import load_content, open_bundle
+    content = load_content()
+    for term in content.terms:
+        print(term.term_id, term.en_canonical, len(content.examples_for(term.term_id)))
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from functools import cached_property
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = ROOT_DIR / 'assets' / 'data'
+EFFECTS_DIR = ROOT_DIR / 'assets' / 'sprites' / 'effects'
+# update_examples.py が読む単語集（貼り付けたマークダウン）の置き場所
+PASTED_CONTENT_FILE = Path.home() / 'upload' / 'Pasted_content.txt'
+
+# ソースファイル（リポジトリ相対）
+TERMS_FILE = 'assets/data/terms.json'
+EXAMPLES_FILE = 'assets/data/examples.json'
+RELATIONS_FILE = 'assets/data/relations.json'
+SECTIONS_FILE = 'data/textbooks/bilingual/all_sections.json'
+BUNDLE_FILE = '.content-bundle.bin'
+
+# lib/types.ts の TopicCode
+TOPIC_CODES = ('ETH', 'QM', 'ECON', 'FSA', 'CI', 'EQ', 'FI', 'DER', 'AI', 'PM')
+RELATION_TYPES = ('related', 'contrast')
+
+# 旧フィールド名 → 正規のフィールド名（正規の名前に値があればそちらを優先）
+LEGACY_FIELDS = {
+    'term_en': 'en_canonical',
+    'aliases': 'en_aliases',
+    'abbrev': 'abbreviations',
+    'term_ja': 'jp_headword',
+    'reading': 'jp_reading',
+    'definition': 'jp_definition',
+    'example_ja': 'example_jp',
+}
+
+
+# ========== レコード ==========
+
+def split_list(value):
+    """リスト列の値を文字列のタプルに（CSV のセミコロン区切りの文字列も受け付ける）"""
+    if not value:
+        return ()
+    if isinstance(value, str):
+        return tuple(v.strip() for v in value.split(';') if v.strip())
+    return tuple(value)
+
+
+class Record:
+    """FIELDS の順に値を持つレコードの基底クラス
+
+    SOURCE_NAMES はソースファイル上の名前が正規の名前と異なるフィールド、
+    OPTIONAL_FIELDS は空なら to_dict() で省くフィールド、SYMBOL_FIELDS は intern する短い文字列。
+    """
+    __slots__ = ()
+    FIELDS = ()
+    LIST_FIELDS = frozenset()
+    OPTIONAL_FIELDS = frozenset()
+    SYMBOL_FIELDS = frozenset()
+    SOURCE_NAMES = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # from_dict で毎回引かないよう、ソース上の名前と旧名の対応をクラスごとに求めておく
+        cls._source_keys = tuple((name, cls.SOURCE_NAMES.get(name, name)) for name in cls.FIELDS)
+        cls._legacy_keys = tuple((legacy, name) for legacy, name in LEGACY_FIELDS.items() if name in cls.FIELDS)
+
+    def __init__(self, **fields):
+        for name in self.FIELDS:
+            value = fields.get(name)
+            if name in self.LIST_FIELDS:
+                value = split_list(value)
+            elif value is None:
+                value = ''
+            elif name in self.SYMBOL_FIELDS:
+                value = sys.intern(value)
+            setattr(self, name, value)
+
+    @classmethod
+    def from_dict(cls, data):
+        """JSON・CSV の1行から作る（旧フィールド名も受け付ける）"""
+        fields = {name: value for name, key in cls._source_keys if (value := data.get(key))}
+        for legacy, name in cls._legacy_keys:
+            if name not in fields and data.get(legacy):
+                fields[name] = data[legacy]
+        return cls(**fields)
+
+    def to_dict(self):
+        """ソースファイルと同じ形の dict（フィールド順も同じ）"""
+        data = {}
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if name in self.OPTIONAL_FIELDS and not value:
+                continue
+            data[self.SOURCE_NAMES.get(name, name)] = list(value) if name in self.LIST_FIELDS else value
+        return data
+
+    def to_row(self):
+        """バンドル用の値の並び（FIELDS の順）"""
+        return [list(v) if isinstance(v, tuple) else v for v in map(self.__getattribute__, self.FIELDS)]
+
+    @classmethod
+    def from_row(cls, row):
+        record = object.__new__(cls)
+        for name, value in zip(cls.FIELDS, row):
+            setattr(record, name, tuple(value) if name in cls.LIST_FIELDS else value)
+        return record
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, name) == getattr(other, name) for name in self.FIELDS
+        )
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.FIELDS[:3])
+        return f'{type(self).__name__}({fields}, ...)'
+
+
+class Term(Record):
+    """用語（lib/types.ts の Term）"""
+    FIELDS = (
+        'term_id', 'topic_code', 'en_canonical', 'en_aliases', 'abbreviations', 'jp_headword',
+        'jp_reading', 'jp_definition', 'key_points', 'pitfall', 'formula', 'notes',
+    )
+    __slots__ = FIELDS
+    LIST_FIELDS = frozenset({'en_aliases', 'abbreviations', 'key_points'})
+    OPTIONAL_FIELDS = frozenset({'notes'})
+    SYMBOL_FIELDS = frozenset({'topic_code'})
+
+
+class Example(Record):
+    """例文（lib/types.ts の Example）"""
+    FIELDS = ('term_id', 'example_en', 'example_jp')
+    __slots__ = FIELDS
+
+
+class Relation(Record):
+    """関連語（lib/types.ts の Relation）"""
+    FIELDS = ('term_id', 'related_term_id', 'relation_type')
+    __slots__ = FIELDS
+    SYMBOL_FIELDS = frozenset({'relation_type'})
+
+
+class Paragraph(Record):
+    """教科書セクションの段落（英語・日本語の対訳）"""
+    FIELDS = ('paragraph_id', 'en', 'jp')
+    __slots__ = FIELDS
+    SOURCE_NAMES = {'paragraph_id': 'id', 'en': 'english', 'jp': 'japanese'}
+
+
+class Section(Record):
+    """教科書のセクション（data/textbooks/bilingual/all_sections.json の1要素）"""
+    FIELDS = ('section_id', 'number', 'title_en', 'title_jp', 'paragraphs', 'key_terms')
+    __slots__ = FIELDS
+    LIST_FIELDS = frozenset({'paragraphs', 'key_terms'})
+    SOURCE_NAMES = {
+        'section_id': 'id', 'number': 'sectionNumber', 'title_en': 'title', 'title_jp': 'titleJapanese',
+        'key_terms': 'keyTerms',
+    }
+
+    def __init__(self, **fields):
+        super().__init__(**fields)
+        self.paragraphs = tuple(
+            p if isinstance(p, Paragraph) else Paragraph.from_dict(p) for p in self.paragraphs
+        )
+
+    def to_dict(self):
+        data = super().to_dict()
+        data['paragraphs'] = [p.to_dict() for p in self.paragraphs]
+        return data
+
+    def to_row(self):
+        row = super().to_row()
+        row[self.FIELDS.index('paragraphs')] = [p.to_row() for p in self.paragraphs]
+        return row
+
+    @classmethod
+    def from_row(cls, row):
+        record = super().from_row(row)
+        record.paragraphs = tuple(Paragraph.from_row(p) for p in record.paragraphs)
+        return record
+
+
+# ========== ソースファイル ==========
+
+# 種類ごとのソースファイル・レコードのクラス・キー（索引を作るフィールド）・グループ化するフィールド
+KINDS = {
+    'terms': (TERMS_FILE, Term, 'term_id', None),
+    'examples': (EXAMPLES_FILE, Example, None, 'term_id'),
+    'relations': (RELATIONS_FILE, Relation, None, 'term_id'),
+    'sections': (SECTIONS_FILE, Section, 'section_id', None),
+}
+
+
+def read_records(path, cls):
+    """JSON 配列のファイルをレコードのリストとして読む（ファイルがなければ空）"""
+    path = Path(path)
+    if not path.exists():
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [cls.from_dict(item) for item in json.load(f)]
+
+
+def write_records(path, records):
+    """レコードを JSON 配列で書き出す（既存のデータファイルと同じ書式）"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([r.to_dict() for r in records], f, ensure_ascii=False, indent=2)
+
+
+def source_stamps(root=ROOT_DIR):
+    """バンドルの鮮度判定に使う各ソースファイルのサイズと更新時刻"""
+    stamps = {}
+    for path, _, _, _ in KINDS.values():
+        full = Path(root) / path
+        if full.exists():
+            st = full.stat()
+            stamps[path] = [st.st_size, st.st_mtime_ns]
+    return stamps
+
+
+class Content:
+    """ソースファイルから読んだ全コンテンツ（各ファイルは最初に参照したときに1回だけ読む）"""
+
+    def __init__(self, root=ROOT_DIR):
+        self.root = Path(root)
+
+    def _read(self, kind):
+        path, cls, _, _ = KINDS[kind]
+        return read_records(self.root / path, cls)
+
+    @cached_property
+    def terms(self):
+        return self._read('terms')
+
+    @cached_property
+    def examples(self):
+        return self._read('examples')
+
+    @cached_property
+    def relations(self):
+        return self._read('relations')
+
+    @cached_property
+    def sections(self):
+        return self._read('sections')
+
+    @cached_property
+    def _term_index(self):
+        return {term.term_id: term for term in self.terms}
+
+    @cached_property
+    def _section_index(self):
+        return {section.section_id: section for section in self.sections}
+
+    @cached_property
+    def _examples_by_term(self):
+        groups = {}
+        for example in self.examples:
+            groups.setdefault(example.term_id, []).append(example)
+        return groups
+
+    @cached_property
+    def _relations_by_term(self):
+        groups = {}
+        for relation in self.relations:
+            groups.setdefault(relation.term_id, []).append(relation)
+        return groups
+
+    def term(self, term_id):
+        return self._term_index.get(term_id)
+
+    def section(self, section_id):
+        return self._section_index.get(section_id)
+
+    def examples_for(self, term_id):
+        return self._examples_by_term.get(term_id, [])
+
+    def relations_for(self, term_id):
+        return self._relations_by_term.get(term_id, [])
+
+
+_loaded = {}
+
+
+def load_content(root=ROOT_DIR):
+    """プロセス内で共有する Content（同じルートなら同じインスタンスを返す）"""
+    root = Path(root).resolve()
+    if root not in _loaded:
+        _loaded[root] = Content(root)
+    return _loaded[root]
+
+
+# ========== バンドル ==========
+#
+# [MAGIC 8バイト][ヘッダー長 uint32][ヘッダー JSON][8バイト境界までの詰め物][配列・レコード本体]
+# ヘッダーには各配列のファイル内の位置を持つ。レコード本体は FIELDS 順の値の JSON 配列を連結したもので、
+# SYMBOL_FIELDS の値は symbols 表の添字に置き換えてある。
+# - offsets: レコード i の本体は [offsets[i], offsets[i + 1])（uint64）
+# - index:   キーの crc32 を下位ビットで切った位置から線形探索するハッシュ表（値は行番号 + 1、0 は空き、uint32）
+# - groups:  term_id でまとめたレコードの行番号（members）と、用語の行番号ごとの範囲（ranges、用語数 + 1）
+
+MAGIC = b'CFACONT1'
+BUNDLE_VERSION = 1
+
+
+def _hash(key):
+    return zlib.crc32(key.encode('utf-8'))
+
+
+class _BundleWriter:
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+
+    def add(self, data):
+        """本体に data を追加して位置を返す（8バイト境界に揃える）"""
+        offset = self.size
+        self.chunks.append(data)
+        self.size += len(data)
+        padding = -self.size % 8
+        if padding:
+            self.chunks.append(b'\0' * padding)
+            self.size += padding
+        return offset
+
+    def add_array(self, fmt, values):
+        return {'offset': self.add(struct.pack(f'<{len(values)}{fmt}', *values)), 'count': len(values)}
+
+
+def build_index(keys):
+    slots = 8
+    while slots < len(keys) * 2:
+        slots *= 2
+    table = [0] * slots
+    for row, key in enumerate(keys):
+        slot = _hash(key) & (slots - 1)
+        while table[slot]:
+            slot = (slot + 1) & (slots - 1)
+        table[slot] = row + 1
+    return table
+
+
+def build_bundle(content, path, sources=None):
+    """Content をバンドルファイルに書き出す（一時ファイルに書いてから置き換える）"""
+    symbols = {}
+    writer = _BundleWriter()
+    tables = {}
+    term_rows = {term.term_id: i for i, term in enumerate(content.terms)}
+
+    for kind, (_, cls, key, group) in KINDS.items():
+        records = getattr(content, kind)
+        symbol_columns = [cls.FIELDS.index(name) for name in cls.SYMBOL_FIELDS]
+        offsets = []
+        body = bytearray()
+        for record in records:
+            row = record.to_row()
+            for column in symbol_columns:
+                row[column] = symbols.setdefault(row[column], len(symbols))
+            offsets.append(len(body))
+            body += json.dumps(row, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        offsets.append(len(body))
+        table = {
+            'count': len(records),
+            'data': writer.add(bytes(body)),
+            'offsets': writer.add_array('Q', offsets),
+        }
+        if key:
+            table['index'] = writer.add_array('I', build_index([getattr(r, key) for r in records]))
+        if group:
+            # 用語の並び順でまとめる（同じ用語の中ではソースファイルの順）
+            members = sorted(
+                (i for i, r in enumerate(records) if getattr(r, group) in term_rows),
+                key=lambda i: term_rows[getattr(records[i], group)],
+            )
+            counts = [0] * (len(term_rows) + 1)
+            for i in members:
+                counts[term_rows[getattr(records[i], group)] + 1] += 1
+            for i in range(len(term_rows)):
+                counts[i + 1] += counts[i]
+            table['members'] = writer.add_array('I', members)
+            table['ranges'] = writer.add_array('I', counts)
+        tables[kind] = table
+
+    header = json.dumps({
+        'version': BUNDLE_VERSION,
+        'sources': sources if sources is not None else source_stamps(content.root),
+        'symbols': list(symbols),
+        'tables': tables,
+    }, ensure_ascii=False).encode('utf-8')
+    prefix = MAGIC + struct.pack('<I', len(header)) + header
+    prefix += b'\0' * (-len(prefix) % 8)
+
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(prefix)
+        for chunk in writer.chunks:
+            f.write(chunk)
+    os.replace(tmp_path, path)
+
+
+class BundleError(Exception):
+    pass
+
+
+class _BundleTable:
+    """バンドル内の1種類のレコード（添字アクセス時にその行だけをデコードするシーケンス）"""
+
+    def __init__(self, bundle, cls, table):
+        self.bundle = bundle
+        self.cls = cls
+        self.table = table
+        self.count = table['count']
+        self.symbol_columns = [cls.FIELDS.index(name) for name in cls.SYMBOL_FIELDS]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += self.count
+        if not 0 <= row < self.count:
+            raise IndexError(row)
+        mm = self.bundle.mm
+        start, end = struct.unpack_from('<QQ', mm, self.bundle.base + self.table['offsets']['offset'] + 8 * row)
+        data = self.bundle.base + self.table['data']
+        values = json.loads(mm[data + start:data + end])
+        for column in self.symbol_columns:
+            values[column] = self.bundle.symbols[values[column]]
+        return self.cls.from_row(values)
+
+    def __iter__(self):
+        for row in range(self.count):
+            yield self[row]
+
+    def find_row(self, key):
+        """キーの行番号（なければ None）"""
+        index = self.table['index']
+        slots = index['count']
+        mm = self.bundle.mm
+        base = self.bundle.base + index['offset']
+        slot = _hash(key) & (slots - 1)
+        while True:
+            (value,) = struct.unpack_from('<I', mm, base + 4 * slot)
+            if not value:
+                return None
+            record = self[value - 1]
+            if getattr(record, record.FIELDS[0]) == key:
+                return value - 1
+            slot = (slot + 1) & (slots - 1)
+
+    def find(self, key):
+        row = self.find_row(key)
+        return None if row is None else self[row]
+
+    def group(self, term_row):
+        """用語の行番号に属するレコード"""
+        mm = self.bundle.mm
+        start, end = struct.unpack_from('<II', mm, self.bundle.base + self.table['ranges']['offset'] + 4 * term_row)
+        members = self.bundle.base + self.table['members']['offset']
+        return [self[struct.unpack_from('<I', mm, members + 4 * i)[0]] for i in range(start, end)]
+
+
+class ContentBundle:
+    """mmap で開いたバンドル（Content と同じ参照用メソッドを持つ）"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.mm[:len(MAGIC)] != MAGIC:
+            self.mm.close()
+            raise BundleError(f'{self.path}: バンドルではありません')
+        (header_length,) = struct.unpack_from('<I', self.mm, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(self.mm[start:start + header_length])
+        if header['version'] != BUNDLE_VERSION:
+            self.mm.close()
+            raise BundleError(f'{self.path}: 未対応のバージョン {header["version"]}')
+        self.base = start + header_length + (-(start + header_length) % 8)
+        self.sources = header['sources']
+        self.symbols = [sys.intern(s) for s in header['symbols']]
+        for kind, (_, cls, _, _) in KINDS.items():
+            setattr(self, kind, _BundleTable(self, cls, header['tables'][kind]))
+
+    def term(self, term_id):
+        return self.terms.find(term_id)
+
+    def section(self, section_id):
+        return self.sections.find(section_id)
+
+    def examples_for(self, term_id):
+        row = self.terms.find_row(term_id)
+        return [] if row is None else self.examples.group(row)
+
+    def relations_for(self, term_id):
+        row = self.terms.find_row(term_id)
+        return [] if row is None else self.relations.group(row)
+
+    def close(self):
+        self.mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_bundle(root=ROOT_DIR, path=None):
+    """バンドルを開く（ないか、ソースファイルが変わっていれば作り直す）"""
+    root = Path(root)
+    path = Path(path) if path else root / BUNDLE_FILE
+    sources = source_stamps(root)
+    if path.exists():
+        try:
+            bundle = ContentBundle(path)
+        except BundleError:
+            bundle = None
+        if bundle and bundle.sources == sources:
+            return bundle
+        if bundle:
+            bundle.close()
+    build_bundle(Content(root), path, sources)
+    return ContentBundle(path)
+
+
+# ========== 検査 ==========
+
+def check(root=ROOT_DIR):
+    """正規のスキーマから外れている箇所の一覧: [(ファイル, ID, 内容)]"""
+    problems = []
+    for kind, (path, cls, key, _) in KINDS.items():
+        full = Path(root) / path
+        if not full.exists():
+            continue
+        with open(full, 'r', encoding='utf-8') as f:
+            items = json.load(f)
+        source_names = {cls.SOURCE_NAMES.get(name, name) for name in cls.FIELDS}
+        seen = set()
+        for item in items:
+            record_id = item.get(cls.SOURCE_NAMES.get(cls.FIELDS[0], cls.FIELDS[0]), '?')
+            for name in item:
+                if name in LEGACY_FIELDS and LEGACY_FIELDS[name] in cls.FIELDS:
+                    problems.append((path, record_id, f'旧フィールド名 {name}（→ {LEGACY_FIELDS[name]}）'))
+                elif name not in source_names:
+                    problems.append((path, record_id, f'未知のフィールド {name}'))
+            if key:
+                if record_id in seen:
+                    problems.append((path, record_id, 'ID の重複'))
+                seen.add(record_id)
+
+    content = Content(root)
+    for term in content.terms:
+        if term.topic_code not in TOPIC_CODES:
+            problems.append((TERMS_FILE, term.term_id, f'未知の分野 {term.topic_code!r}'))
+        if not term.en_canonical or not term.jp_headword:
+            problems.append((TERMS_FILE, term.term_id, '見出し語（en_canonical / jp_headword）が空'))
+    for example in content.examples:
+        if content.term(example.term_id) is None:
+            problems.append((EXAMPLES_FILE, example.term_id, '存在しない用語の例文'))
+    for relation in content.relations:
+        if content.term(relation.related_term_id) is None or content.term(relation.term_id) is None:
+            problems.append((RELATIONS_FILE, relation.term_id, f'参照切れ {relation.related_term_id}'))
+        if relation.relation_type not in RELATION_TYPES:
+            problems.append((RELATIONS_FILE, relation.term_id, f'未知の関係 {relation.relation_type!r}'))
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='コンテンツの共通モデル（検査・バンドル作成・参照）')
+    parser.add_argument('--root', type=Path, default=ROOT_DIR, help='コンテンツを読むディレクトリ')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('check', help='正規のスキーマから外れている箇所を表示')
+    p_bundle = sub.add_parser('bundle', help='バンドルを作り直す')
+    p_bundle.add_argument('--output', type=Path, help=f'出力先（既定: {BUNDLE_FILE}）')
+    p_get = sub.add_parser('get', help='用語と例文・関連語を表示')
+    p_get.add_argument('term_ids', nargs='+')
+    args = parser.parse_args()
+
+    if args.command == 'check':
+        problems = check(args.root)
+        for path, record_id, message in problems:
+            print(f'{path}: {record_id}: {message}')
+        print(f'{len(problems)}件')
+        sys.exit(1 if problems else 0)
+
+    if args.command == 'bundle':
+        output = args.output or args.root / BUNDLE_FILE
+        start = time.perf_counter()
+        content = Content(args.root)
+        build_bundle(content, output)
+        elapsed = time.perf_counter() - start
+        counts = ', '.join(f'{kind} {len(getattr(content, kind))}' for kind in KINDS)
+        print(f'{output}: {os.path.getsize(output):,} バイト（{counts}）, {elapsed * 1000:.0f}ms')
+        return
+
+    with open_bundle(args.root) as bundle:
+        for term_id in args.term_ids:
+            term = bundle.term(term_id)
+            if term is None:
+                print(f'{term_id}: 見つかりません', file=sys.stderr)
+                continue
+            data = term.to_dict()
+            data['examples'] = [e.to_dict() for e in bundle.examples_for(term_id)]
+            data['relations'] = [r.to_dict() for r in bundle.relations_for(term_id)]
+            print(json.dumps(data, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+コンテンツ配信用の差分パッチ生成・適用
+
+2つのコンテンツ版（リポジトリのディレクトリまたは git のリビジョン）を term_id / セクション id などの
+キーで突き合わせ、追加・変更（upsert）と削除（delete）だけを含むパッチを線形時間で生成する。
+用語・例文・関連語は content_model のレコード（正規のフィールド名）で比べるので、旧フィールド名だけの違いは差分にならない。
+アプリ側では lib/content-patch.ts がパッチを検証し、変更レコードだけを AsyncStorage に書き込む。
+
+パッチ形式（コンパクトなJSON）:
+    {
+      "format": 1,
+      "base_version": "1.0.0",          # 適用前のコンテンツ版
+      "target_version": "1.0.1",        # 適用後のコンテンツ版
+      "checksum": "fnv1a32:xxxxxxxx",   # changes 文字列の FNV-1a（UTF-16コード単位）
+      "changes": "{\"terms\":{\"upsert\":[...],\"delete\":[...]}, ...}"
+    }
+
+使い方:
+    python scripts/content_patch.py diff git:HEAD~1 . --from-version 1.0.0 --to-version 1.0.1 -o patch.json
+    python scripts/content_patch.py apply patch.json .     # パッチを作業ツリーに適用（検証用）
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from content_model import (
+    EXAMPLES_FILE, RELATIONS_FILE, ROOT_DIR, TERMS_FILE, Example, Relation, Term, load_content, read_records,
+    write_records,
+)
+
+PATCH_FORMAT = 1
+
+# コレクション名: (ファイル, ファイル内のキー（配列直下ならNone）, レコードのキー列, レコードのクラス)
+# クラスのないもの（教科書サンプル）は dict のまま扱う
+COLLECTIONS = {
+    'terms': (TERMS_FILE, None, ('term_id',), Term),
+    'examples': (EXAMPLES_FILE, None, ('term_id',), Example),
+    'relations': (RELATIONS_FILE, None, ('term_id', 'related_term_id'), Relation),
+    'textbook.subjects': ('data/textbook-sample.json', 'subjects', ('code',), None),
+    'textbook.readings': ('data/textbook-sample.json', 'readings', ('id',), None),
+    'textbook.textContents': ('data/textbook-sample.json', 'textContents', ('id',), None),
+    'textbook.examples': ('data/textbook-sample.json', 'examples', ('id',), None),
+}
+
+# 複合キーの区切り（lib/content-patch.ts と同じ）
+KEY_SEPARATOR = '|'
+
+
+def checksum(text):
+    """FNV-1a 32bit（UTF-16コード単位）。アプリ側で追加ライブラリなしに同じ値を計算できる"""
+    h = 0x811c9dc5
+    data = text.encode('utf-16-le')
+    for i in range(0, len(data), 2):
+        h ^= data[i] | (data[i + 1] << 8)
+        h = (h * 0x01000193) & 0xffffffff
+    return f'fnv1a32:{h:08x}'
+
+
+def record_key(record, fields):
+    return KEY_SEPARATOR.join(str(record[f]) for f in fields)
+
+
+def canonical(record):
+    return json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+
+class ContentSource:
+    """コンテンツ版の読み出し元（ディレクトリ、または git:REF）"""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self._files = {}
+
+    def read(self, path):
+        if path not in self._files:
+            if self.spec.startswith('git:'):
+                ref = self.spec[4:]
+                proc = subprocess.run(['git', 'show', f'{ref}:{path}'], cwd=ROOT_DIR, capture_output=True)
+                self._files[path] = json.loads(proc.stdout) if proc.returncode == 0 else None
+            else:
+                full = Path(self.spec) / path
+                if full.exists():
+                    with open(full, 'r', encoding='utf-8') as f:
+                        self._files[path] = json.load(f)
+                else:
+                    self._files[path] = None
+        return self._files[path]
+
+    def records(self, collection):
+        """コレクションのレコードを dict で（モデルのあるものは正規の形に寄せて）返す"""
+        path, field, _, cls = COLLECTIONS[collection]
+        if cls is not None:
+            if self.spec.startswith('git:'):
+                records = [cls.from_dict(item) for item in self.read(path) or []]
+            else:
+                records = getattr(load_content(self.spec), collection)
+            return [record.to_dict() for record in records]
+        data = self.read(path)
+        if data is None:
+            return []
+        return data.get(field, []) if field else data
+
+
+def diff_collection(old_records, new_records, fields):
+    """キーで突き合わせて upsert / delete を求める（O(n)）"""
+    old = {record_key(r, fields): canonical(r) for r in old_records}
+    upsert = []
+    seen = set()
+    for record in new_records:
+        key = record_key(record, fields)
+        seen.add(key)
+        if old.get(key) != canonical(record):
+            upsert.append(record)
+    delete = [key for key in old if key not in seen]
+    return upsert, delete
+
+
+def make_patch(old, new, base_version, target_version):
+    changes = {}
+    for collection, (_, _, fields, _) in COLLECTIONS.items():
+        upsert, delete = diff_collection(old.records(collection), new.records(collection), fields)
+        if upsert or delete:
+            changes[collection] = {'upsert': upsert, 'delete': delete}
+
+    body = json.dumps(changes, ensure_ascii=False, separators=(',', ':'))
+    patch = {
+        'format': PATCH_FORMAT,
+        'base_version': base_version,
+        'target_version': target_version,
+        'checksum': checksum(body),
+        'changes': body,
+    }
+    return patch, changes
+
+
+def load_patch(path):
+    """パッチを読み込み、形式とチェックサムを検証して changes を返す"""
+    with open(path, 'r', encoding='utf-8') as f:
+        patch = json.load(f)
+    if patch.get('format') != PATCH_FORMAT:
+        raise ValueError(f"未対応のパッチ形式です: {patch.get('format')}")
+    if checksum(patch['changes']) != patch['checksum']:
+        raise ValueError('チェックサムが一致しません')
+    return patch, json.loads(patch['changes'])
+
+
+def apply_collection(records, changes, fields):
+    """既存の並びを保ったまま置き換え・削除し、新しいレコードは末尾に追加"""
+    merged = {record_key(r, fields): r for r in records}
+    for key in changes.get('delete', []):
+        merged.pop(key, None)
+    for record in changes.get('upsert', []):
+        merged[record_key(record, fields)] = record
+    return list(merged.values())
+
+
+def apply_patch(changes, root):
+    root = Path(root)
+    files = {}
+    written = []
+    for collection, collection_changes in changes.items():
+        path, field, fields, cls = COLLECTIONS[collection]
+        if cls is not None:
+            records = [r.to_dict() for r in read_records(root / path, cls)]
+            merged = apply_collection(records, collection_changes, fields)
+            write_records(root / path, [cls.from_dict(r) for r in merged])
+            written.append(path)
+            continue
+        if path not in files:
+            with open(root / path, 'r', encoding='utf-8') as f:
+                files[path] = json.load(f)
+        data = files[path]
+        if field:
+            data[field] = apply_collection(data.get(field, []), collection_changes, fields)
+        else:
+            files[path] = apply_collection(data, collection_changes, fields)
+
+    for path, data in files.items():
+        with open(root / path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    return written + list(files)
+
+
+def summarize(changes):
+    for collection, c in changes.items():
+        print(f"  {collection}: upsert {len(c['upsert'])}件, delete {len(c['delete'])}件")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='コンテンツの差分パッチ')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_diff = sub.add_parser('diff', help='2つの版の差分パッチを生成')
+    p_diff.add_argument('old', help='旧版（ディレクトリまたは git:REF）')
+    p_diff.add_argument('new', help='新版（ディレクトリまたは git:REF）')
+    p_diff.add_argument('--from-version', required=True)
+    p_diff.add_argument('--to-version', required=True)
+    p_diff.add_argument('-o', '--output', required=True)
+
+    p_apply = sub.add_parser('apply', help='パッチをディレクトリに適用')
+    p_apply.add_argument('patch')
+    p_apply.add_argument('root', nargs='?', default=str(ROOT_DIR))
+
+    args = parser.parse_args()
+
+    if args.command == 'diff':
+        patch, changes = make_patch(ContentSource(args.old), ContentSource(args.new),
+                                    args.from_version, args.to_version)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(patch, f, ensure_ascii=False, separators=(',', ':'))
+        print(f"パッチ生成: {args.output} ({Path(args.output).stat().st_size} bytes, "
+              f"{args.from_version} -> {args.to_version})")
+        summarize(changes)
+    else:
+        try:
+            patch, changes = load_patch(args.patch)
+        except ValueError as e:
+            print(f"エラー: {e}")
+            sys.exit(1)
+        written = apply_patch(changes, args.root)
+        print(f"適用: {patch['base_version']} -> {patch['target_version']} ({', '.join(written)})")
+        summarize(changes)
+
+
+if __name__ == '__main__':
+    main()
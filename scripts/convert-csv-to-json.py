@@ -4,66 +4,84 @@ import csv
 import json
 import os
 
-DATA_DIR = '/home/ubuntu/cfa-vocab-app/assets/data'
+from instrument import tracer
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets', 'data')
+
+def split_list(value):
+    """セミコロン区切りの列をリストに変換"""
+    return [v.strip() for v in value.split(';') if v.strip()] if value else []
+
+def term_from_row(row):
+    return {
+        'term_id': row['term_id'],
+        'topic_code': row['topic_code'],
+        'en_canonical': row['en_canonical'],
+        'en_aliases': split_list(row.get('en_aliases')),
+        'abbreviations': split_list(row.get('abbreviations')),
+        'jp_headword': row['jp_headword'],
+        'jp_reading': row.get('jp_reading', ''),
+        'jp_definition': row['jp_definition'],
+        'key_points': split_list(row.get('key_points')),
+        'pitfall': row.get('pitfall', ''),
+        'formula': row.get('formula', ''),
+    }
+
+def example_from_row(row):
+    return {
+        'term_id': row['term_id'],
+        'example_en': row['example_en'],
+        'example_jp': row['example_jp'],
+    }
+
+def relation_from_row(row):
+    return {
+        'term_id': row['term_id'],
+        'related_term_id': row['related_term_id'],
+        'relation_type': row['relation_type'],
+    }
+
+def write_json(path, records):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+    tracer.count('rows_converted', len(records))
+    tracer.count('bytes_written', os.path.getsize(path))
 
 def convert_terms():
     terms = []
-    with open(f'{DATA_DIR}/terms.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            term = {
-                'term_id': row['term_id'],
-                'topic_code': row['topic_code'],
-                'en_canonical': row['en_canonical'],
-                'en_aliases': [a.strip() for a in row['en_aliases'].split(';') if a.strip()] if row.get('en_aliases') else [],
-                'abbreviations': [a.strip() for a in row['abbreviations'].split(';') if a.strip()] if row.get('abbreviations') else [],
-                'jp_headword': row['jp_headword'],
-                'jp_reading': row.get('jp_reading', ''),
-                'jp_definition': row['jp_definition'],
-                'key_points': [p.strip() for p in row['key_points'].split(';') if p.strip()] if row.get('key_points') else [],
-                'pitfall': row.get('pitfall', ''),
-                'formula': row.get('formula', ''),
-            }
-            terms.append(term)
-    
-    with open(f'{DATA_DIR}/terms.json', 'w', encoding='utf-8') as f:
-        json.dump(terms, f, ensure_ascii=False, indent=2)
+    with tracer.span('convert_terms', cat='data'):
+        with open(f'{DATA_DIR}/terms.csv', 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                terms.append(term_from_row(row))
+        
+        write_json(f'{DATA_DIR}/terms.json', terms)
     
     print(f'Converted {len(terms)} terms')
     return terms
 
 def convert_examples():
     examples = []
-    with open(f'{DATA_DIR}/examples.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            example = {
-                'term_id': row['term_id'],
-                'example_en': row['example_en'],
-                'example_jp': row['example_jp'],
-            }
-            examples.append(example)
-    
-    with open(f'{DATA_DIR}/examples.json', 'w', encoding='utf-8') as f:
-        json.dump(examples, f, ensure_ascii=False, indent=2)
+    with tracer.span('convert_examples', cat='data'):
+        with open(f'{DATA_DIR}/examples.csv', 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                examples.append(example_from_row(row))
+        
+        write_json(f'{DATA_DIR}/examples.json', examples)
     
     print(f'Converted {len(examples)} examples')
     return examples
 
 def convert_relations():
     relations = []
-    with open(f'{DATA_DIR}/relations.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            relation = {
-                'term_id': row['term_id'],
-                'related_term_id': row['related_term_id'],
-                'relation_type': row['relation_type'],
-            }
-            relations.append(relation)
-    
-    with open(f'{DATA_DIR}/relations.json', 'w', encoding='utf-8') as f:
-        json.dump(relations, f, ensure_ascii=False, indent=2)
+    with tracer.span('convert_relations', cat='data'):
+        with open(f'{DATA_DIR}/relations.csv', 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                relations.append(relation_from_row(row))
+        
+        write_json(f'{DATA_DIR}/relations.json', relations)
     
     print(f'Converted {len(relations)} relations')
     return relations
@@ -4,14 +4,90 @@
 分析結果: 最初の行はタイトル、エフェクトは2行目から
 """
 
-from PIL import Image
+import argparse
 import os
 
-def extract_effects_correct():
-    sheet_path = '/home/ubuntu/cfa-vocab-app/assets/sprites/effects/effects_spritesheet.png'
-    output_dir = '/home/ubuntu/cfa-vocab-app/assets/sprites/effects'
+from instrument import tracer
+from sprite_strips import StripReader, crop_cells
+
+def trim_transparent(image):
+    """透明部分をトリミング"""
+    bbox = image.getbbox()
+    if bbox:
+        return image.crop(bbox)
+    return image
+
+# グループ1 (Physical Effects) - 上段
+# 実際のエフェクトは y=126 から始まる
+EFFECTS_GROUP1 = {
+    'hit': [
+        (52, 126, 187, 229),   # 行1
+        (195, 126, 332, 229),
+        (339, 126, 462, 229),
+    ],
+    'slash': [
+        (52, 236, 187, 337),   # 行2
+        (195, 236, 332, 337),
+        (339, 236, 462, 337),
+    ],
+    'explosion': [
+        (52, 344, 187, 449),   # 行3
+        (195, 344, 332, 449),
+        (339, 344, 462, 449),
+    ],
+}
+
+# グループ2 (Elemental Effects) - 上段
+# x=562-700, 707-843, 850-974
+EFFECTS_GROUP2 = {
+    'fire': [
+        (562, 126, 700, 229),
+        (707, 126, 843, 229),
+        (850, 126, 974, 229),
+    ],
+    'lightning': [
+        (562, 236, 700, 337),
+        (707, 236, 843, 337),
+        (850, 236, 974, 337),
+    ],
+    'ice': [
+        (562, 344, 700, 449),
+        (707, 344, 843, 449),
+        (850, 344, 974, 449),
+    ],
+}
+
+# グループ3 (Status Effects) - 上段
+# x=1076-1211, 1219-1340, 1348-1481
+EFFECTS_GROUP3 = {
+    'spark': [
+        (1076, 126, 1211, 229),
+        (1219, 126, 1340, 229),
+        (1348, 126, 1481, 229),
+    ],
+    'burn': [
+        (1076, 236, 1211, 337),
+        (1219, 236, 1340, 337),
+        (1348, 236, 1481, 337),
+    ],
+    'freeze': [
+        (1076, 344, 1211, 449),
+        (1219, 344, 1340, 449),
+        (1348, 344, 1481, 449),
+    ],
+}
+
+EFFECT_CELLS = {**EFFECTS_GROUP1, **EFFECTS_GROUP2, **EFFECTS_GROUP3}
+
+def extract_effects_correct(output_dir=None):
+    sheet_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets', 'sprites', 'effects')
+    sheet_path = os.path.join(sheet_dir, 'effects_spritesheet.png')
+    # 出力先を変えれば、現在のフレームを上書きせずに sprite_golden.py で確かめられる
+    output_dir = output_dir or sheet_dir
     
-    img = Image.open(sheet_path)
+    # シート全体は展開せず、横帯ごとに読む（ここで読むのはヘッダーだけ）
+    with tracer.span('load_sheet', cat='sprites'):
+        img = StripReader(sheet_path)
     width, height = img.size
     print(f"スプライトシートサイズ: {width}x{height}")
     
@@ -30,92 +106,36 @@ def extract_effects_correct():
     # 上段（y=0-450）と下段（y=512-）に分かれている
     # 下段のグリッド線: y=572-578, 686-692, 802-807, 912-917
     
-    def trim_transparent(image):
-        """透明部分をトリミング"""
-        bbox = image.getbbox()
-        if bbox:
-            return image.crop(bbox)
-        return image
-    
-    # グループ1 (Physical Effects) - 上段
-    # 実際のエフェクトは y=126 から始まる
-    effects_group1 = {
-        'hit': [
-            (52, 126, 187, 229),   # 行1
-            (195, 126, 332, 229),
-            (339, 126, 462, 229),
-        ],
-        'slash': [
-            (52, 236, 187, 337),   # 行2
-            (195, 236, 332, 337),
-            (339, 236, 462, 337),
-        ],
-        'explosion': [
-            (52, 344, 187, 449),   # 行3
-            (195, 344, 332, 449),
-            (339, 344, 462, 449),
-        ],
+    boxes = {
+        f'{effect_name}_{i+1}': bounds
+        for effect_name, cells in EFFECT_CELLS.items()
+        for i, bounds in enumerate(cells)
     }
+    for name, bounds in boxes.items():
+        print(f"{name}: bounds={bounds}")
     
-    # グループ2 (Elemental Effects) - 上段
-    # x=562-700, 707-843, 850-974
-    effects_group2 = {
-        'fire': [
-            (562, 126, 700, 229),
-            (707, 126, 843, 229),
-            (850, 126, 974, 229),
-        ],
-        'lightning': [
-            (562, 236, 700, 337),
-            (707, 236, 843, 337),
-            (850, 236, 974, 337),
-        ],
-        'ice': [
-            (562, 344, 700, 449),
-            (707, 344, 843, 449),
-            (850, 344, 974, 449),
-        ],
-    }
-    
-    # グループ3 (Status Effects) - 上段
-    # x=1076-1211, 1219-1340, 1348-1481
-    effects_group3 = {
-        'spark': [
-            (1076, 126, 1211, 229),
-            (1219, 126, 1340, 229),
-            (1348, 126, 1481, 229),
-        ],
-        'burn': [
-            (1076, 236, 1211, 337),
-            (1219, 236, 1340, 337),
-            (1348, 236, 1481, 337),
-        ],
-        'freeze': [
-            (1076, 344, 1211, 449),
-            (1219, 344, 1340, 449),
-            (1348, 344, 1481, 449),
-        ],
-    }
-    
-    all_effects = {**effects_group1, **effects_group2, **effects_group3}
-    
-    for effect_name, cells in all_effects.items():
-        for i, bounds in enumerate(cells):
-            print(f"{effect_name}_{i+1}: bounds={bounds}")
-            
-            # 切り出し
-            cropped = img.crop(bounds)
+    # 各セルが重なる帯だけを使って切り出し、下端まで読めたセルから保存する
+    for name, cropped in crop_cells(img, boxes):
+        with tracer.span('extract_cell', cat='sprites', cell=name):
+            bounds = boxes[name]
+            tracer.count('pixels_processed', (bounds[2] - bounds[0]) * (bounds[3] - bounds[1]))
             
             # 透明部分をトリミング
             cropped = trim_transparent(cropped)
             
             if cropped:
                 # 保存
-                output_path = os.path.join(output_dir, f'{effect_name}_{i+1}.png')
+                output_path = os.path.join(output_dir, f'{name}.png')
                 cropped.save(output_path)
+                tracer.count('bytes_written', os.path.getsize(output_path))
                 print(f"保存: {output_path} (サイズ: {cropped.size})")
             else:
-                print(f"警告: {effect_name}_{i+1} は空です")
+                print(f"警告: {name} は空です")
 
 if __name__ == '__main__':
-    extract_effects_correct()
+    parser = argparse.ArgumentParser(description='エフェクトスプライトシートから個別のエフェクト画像を切り出す')
+    parser.add_argument('--output-dir', help='出力先（既定: スプライトシートと同じディレクトリ）')
+    args = parser.parse_args()
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    extract_effects_correct(args.output_dir)
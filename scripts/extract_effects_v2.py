@@ -4,43 +4,35 @@
 グリッド線を正確に検出して切り出す
 """
 
-from PIL import Image
 import os
-import numpy as np
 
-def find_grid_lines(img):
-    """グリッド線の位置を検出"""
-    data = np.array(img.convert('RGB'))
-    height, width = data.shape[:2]
-    
-    # グレーのグリッド線を検出（RGB値が近く、100-180の範囲）
-    def is_grid_color(pixel):
-        r, g, b = pixel[0], pixel[1], pixel[2]
-        return abs(int(r) - int(g)) < 15 and abs(int(g) - int(b)) < 15 and 80 < r < 200
-    
-    # 縦線の検出
-    vertical_lines = []
-    for x in range(width):
-        col = data[:, x]
-        grid_count = sum(1 for pixel in col if is_grid_color(pixel))
-        if grid_count > height * 0.3:  # 30%以上がグリッド色なら線
-            vertical_lines.append(x)
-    
-    # 横線の検出
-    horizontal_lines = []
-    for y in range(height):
-        row = data[y, :]
-        grid_count = sum(1 for pixel in row if is_grid_color(pixel))
-        if grid_count > width * 0.3:
-            horizontal_lines.append(y)
-    
-    return vertical_lines, horizontal_lines
+from content_model import EFFECTS_DIR
+from sprite_strips import StripReader, crop_cells, find_grid_lines
+
+def make_transparent(image):
+    """白/グレー背景を透明にする"""
+    image = image.convert('RGBA')
+    data = list(image.getdata())
+    new_data = []
+    for item in data:
+        r, g, b, a = item
+        # 白を透明に
+        if r > 245 and g > 245 and b > 245:
+            new_data.append((255, 255, 255, 0))
+        # グレー（グリッド線）を透明に
+        elif abs(r - g) < 15 and abs(g - b) < 15 and 80 < r < 200:
+            new_data.append((255, 255, 255, 0))
+        else:
+            new_data.append(item)
+    image.putdata(new_data)
+    return image
 
 def extract_effects_v2():
-    sheet_path = '/home/ubuntu/cfa-vocab-app/assets/sprites/effects/effects_spritesheet.png'
-    output_dir = '/home/ubuntu/cfa-vocab-app/assets/sprites/effects'
+    sheet_path = str(EFFECTS_DIR / 'effects_spritesheet.png')
+    output_dir = str(EFFECTS_DIR)
     
-    img = Image.open(sheet_path)
+    # シート全体は展開せず、横帯ごとに読む
+    img = StripReader(sheet_path)
     width, height = img.size
     print(f"スプライトシートサイズ: {width}x{height}")
     
@@ -87,24 +79,6 @@ def extract_effects_v2():
         (1050, 25),  # Status Effects (右上)
     ]
     
-    def make_transparent(image):
-        """白/グレー背景を透明にする"""
-        image = image.convert('RGBA')
-        data = list(image.getdata())
-        new_data = []
-        for item in data:
-            r, g, b, a = item
-            # 白を透明に
-            if r > 245 and g > 245 and b > 245:
-                new_data.append((255, 255, 255, 0))
-            # グレー（グリッド線）を透明に
-            elif abs(r - g) < 15 and abs(g - b) < 15 and 80 < r < 200:
-                new_data.append((255, 255, 255, 0))
-            else:
-                new_data.append(item)
-        image.putdata(new_data)
-        return image
-    
     # エフェクト定義（グループインデックス, 行, 列）
     effects_config = {
         'hit': (0, 0),       # Physical Effects, 1行目
@@ -118,6 +92,7 @@ def extract_effects_v2():
     # グリッド線の幅
     grid_line_width = 6
     
+    boxes = {}
     for effect_name, (group_idx, row) in effects_config.items():
         group_x, group_y = groups[group_idx]
         
@@ -125,18 +100,17 @@ def extract_effects_v2():
             # セルの位置を計算（グリッド線を避ける）
             x = group_x + col * (cell_size + grid_line_width) + grid_line_width
             y = group_y + row * (cell_size + grid_line_width) + grid_line_width
-            
-            # 切り出し
-            crop_box = (x, y, x + cell_size - grid_line_width, y + cell_size - grid_line_width)
-            cropped = img.crop(crop_box)
-            
-            # 透過処理
-            cropped = make_transparent(cropped)
-            
-            # 保存
-            output_path = os.path.join(output_dir, f'{effect_name}_{col+1}.png')
-            cropped.save(output_path)
-            print(f"保存: {output_path}")
+            boxes[f'{effect_name}_{col+1}'] = (x, y, x + cell_size - grid_line_width, y + cell_size - grid_line_width)
+    
+    # 切り出し（各セルが重なる帯だけを使う）
+    for name, cropped in crop_cells(img, boxes):
+        # 透過処理
+        cropped = make_transparent(cropped)
+        
+        # 保存
+        output_path = os.path.join(output_dir, f'{name}.png')
+        cropped.save(output_path)
+        print(f"保存: {output_path}")
 
 if __name__ == '__main__':
     extract_effects_v2()
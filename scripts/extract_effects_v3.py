@@ -7,9 +7,11 @@
 from PIL import Image
 import os
 
+from content_model import EFFECTS_DIR
+
 def extract_effects_v3():
-    sheet_path = '/home/ubuntu/cfa-vocab-app/assets/sprites/effects/effects_spritesheet.png'
-    output_dir = '/home/ubuntu/cfa-vocab-app/assets/sprites/effects'
+    sheet_path = str(EFFECTS_DIR / 'effects_spritesheet.png')
+    output_dir = str(EFFECTS_DIR)
     
     img = Image.open(sheet_path)
     width, height = img.size
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 """新規追加用語のフィールド名を既存フォーマットに合わせて修正"""
 import json
+import os
 
-BASE_DIR = "/home/ubuntu/cfa-vocab-app/assets/data"
+BASE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "data")
 
 with open(f"{BASE_DIR}/terms.json", 'r', encoding='utf-8') as f:
     terms = json.load(f)
@@ -0,0 +1,744 @@
+#!/usr/bin/env python3
+"""
+用語の公式（formula）から数値計算問題を生成する
+
+terms.json の formula を安全な式木（四則演算・べき乗・√・Max/Min のみ）に変換し、
+入力値を変数ごとの範囲から NumPy で数千件まとめて生成・評価する。
+比率・収益率・1株当たりの値には現実的な値域を与え、入力の組み合わせ（売上原価 < 売上高、r > g など）と
+答えの範囲も公式ごとに絞る（OVERRIDES）。
+誤答の選択肢は、よくある間違い（比の逆数・符号の取り違え・項の入れ忘れ・単利と複利の混同・
+べき指数のずれ・(1-T) と T の取り違え）を式木に適用して同じ入力で評価したもの。正答と桁が違うもの・0 は使わず、
+足りなければ正答の近くの値で補う。選択肢はすべて正答と同じ桁数で表示する。
+出力はトピック × 難易度ごとのシャード（assets/data/questions/{topic}_{difficulty}.json）と、
+アプリからシャードを読み込むための lib/generated-questions.ts。
+
+Σ を含む式や文章の式（「NPV = 0 となる r を求める」など）は変換できないのでスキップする。
+
+使い方:
+    python scripts/generate_numeric_questions.py                   # 公式ごとに40問
+    python scripts/generate_numeric_questions.py --per-formula 200 --seed 1
+    python scripts/generate_numeric_questions.py --dry-run         # 変換結果と件数だけ表示
+"""
+import argparse
+import json
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+from content_model import DATA_DIR, ROOT_DIR, Term, load_content
+
+OUTPUT_DIR = DATA_DIR / 'questions'
+INDEX_FILE = ROOT_DIR / 'lib' / 'generated-questions.ts'
+
+# lib/data-store.ts の TOPICS の name_en
+TOPIC_NAMES = {
+    'ETH': 'Ethics & Professional Standards',
+    'QM': 'Quantitative Methods',
+    'ECON': 'Economics',
+    'FSA': 'Financial Statement Analysis',
+    'CI': 'Corporate Issuers',
+    'EQ': 'Equity Investments',
+    'FI': 'Fixed Income',
+    'DER': 'Derivatives',
+    'AI': 'Alternative Investments',
+    'PM': 'Portfolio Management',
+}
+DIFFICULTIES = ['easy', 'medium', 'hard']
+OPTION_COUNT = 3  # CFA Level I と同じ3択
+
+
+# ========== 式のパース ==========
+
+class FormulaError(ValueError):
+    """式木に変換できない公式"""
+
+
+FUNCTIONS = {'max': 2, 'min': 2, 'sqrt': 1}
+# 演算子の文字を含むが1つの変数として扱う名前
+LITERAL_NAMES = ['P/E', 'FCFn+1']
+SYMBOLS = {'×': '*', '·': '*', '÷': '/', '−': '-', '[': '(', ']': ')', '√': ' sqrt ', '²': '^2', '³': '^3'}
+NAME_CHARS = set('_&%\'')
+
+
+def is_name_char(c):
+    return c.isalpha() or c.isdigit() or c in NAME_CHARS
+
+
+def tokenize(text):
+    """
+    式の文字列をトークン列にする
+    - 空白で区切られた単語の並びは1つの変数名（"Net Income"）
+    - 名前の直後の括弧が演算子を含まなければ名前の一部（"Cov(X;Y)", "Var(Rm)"）、含めば暗黙の掛け算（"β(Rm - Rf)"）
+    """
+    if 'Σ' in text:
+        raise FormulaError('Σ（総和）は変換できません')
+    for symbol, replacement in SYMBOLS.items():
+        text = text.replace(symbol, replacement)
+
+    tokens = []
+    i = 0
+    while i < len(text):
+        c = text[i]
+        if c.isspace():
+            i += 1
+            continue
+        literal = next((name for name in LITERAL_NAMES if text.startswith(name, i)), None)
+        if literal:
+            tokens.append(('name', literal))
+            i += len(literal)
+            continue
+        if c.isdigit() or (c == '.' and i + 1 < len(text) and text[i + 1].isdigit()):
+            match = re.match(r'\d*\.?\d+', text[i:])
+            tokens.append(('num', float(match.group(0))))
+            i += len(match.group(0))
+            continue
+        if is_name_char(c):
+            j = i
+            while j < len(text) and is_name_char(text[j]):
+                j += 1
+            name = text[i:j]
+            if re.search(r'[\u3040-\u309f]', name):
+                raise FormulaError('文章で書かれた式です')
+            # 名前の直後の括弧（空白なし）
+            if j < len(text) and text[j] == '(' and name.lower() not in FUNCTIONS:
+                close = text.find(')', j)
+                inner = text[j + 1:close] if close >= 0 else ''
+                if close >= 0 and inner and all(is_name_char(ch) or ch in '; ' for ch in inner):
+                    name = text[i:close + 1]
+                    j = close + 1
+            if tokens and tokens[-1][0] == 'name' and tokens[-1][1].lower() not in FUNCTIONS:
+                tokens[-1] = ('name', f'{tokens[-1][1]} {name}')
+            else:
+                tokens.append(('name', name))
+            i = j
+            continue
+        if c in '+-*/^();,':
+            tokens.append(('op', ',' if c == ';' else c))
+            i += 1
+            continue
+        raise FormulaError(f'使えない文字: {c!r}')
+    return tokens
+
+
+class Parser:
+    """
+    再帰下降パーサー
+    式木のノードはタプル: ('num', v) / ('var', name) / ('neg', x) / (演算子, a, b) / ('call', 関数名, 引数...)
+    """
+
+    BINARY = {'+': 'add', '-': 'sub', '*': 'mul', '/': 'div'}
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self, value=None):
+        token = self.peek()
+        if token[0] is None or (value is not None and token[1] != value):
+            raise FormulaError(f'{value or "トークン"} が必要です')
+        self.pos += 1
+        return token
+
+    def parse(self):
+        node = self.expression()
+        if self.pos != len(self.tokens):
+            raise FormulaError(f'解釈できないトークン: {self.peek()[1]!r}')
+        return node
+
+    def expression(self):
+        node = self.term()
+        while self.peek() in (('op', '+'), ('op', '-')):
+            op = self.take()[1]
+            node = (self.BINARY[op], node, self.term())
+        return node
+
+    def term(self):
+        node = self.unary()
+        while True:
+            kind, value = self.peek()
+            if kind == 'op' and value in '*/':
+                self.take()
+                node = (self.BINARY[value], node, self.unary())
+            elif kind in ('num', 'name') or (kind, value) == ('op', '('):
+                # 暗黙の掛け算: "β(Rm - Rf)", "EBIT(1-T)", "0.5 Convexity"
+                node = ('mul', node, self.unary())
+            else:
+                return node
+
+    def unary(self):
+        if self.peek() == ('op', '-'):
+            self.take()
+            return ('neg', self.unary())
+        return self.power()
+
+    def power(self):
+        node = self.atom()
+        if self.peek() == ('op', '^'):
+            self.take()
+            node = ('pow', node, self.unary())
+        return node
+
+    def atom(self):
+        kind, value = self.take()
+        if kind == 'num':
+            return ('num', value)
+        if kind == 'name':
+            function = value.lower()
+            if function in FUNCTIONS:
+                if function == 'sqrt' and self.peek() != ('op', '('):
+                    return ('call', 'sqrt', self.power())
+                self.take('(')
+                args = [self.expression()]
+                while self.peek() == ('op', ','):
+                    self.take()
+                    args.append(self.expression())
+                self.take(')')
+                if len(args) != FUNCTIONS[function]:
+                    raise FormulaError(f'{value} の引数の数が違います')
+                return ('call', function, *args)
+            return ('var', value)
+        if value == '(':
+            node = self.expression()
+            self.take(')')
+            return node
+        raise FormulaError(f'解釈できないトークン: {value!r}')
+
+
+def variables(node, found=None):
+    """式に出てくる変数名（出現順）"""
+    found = [] if found is None else found
+    if node[0] == 'var':
+        if node[1] not in found:
+            found.append(node[1])
+    elif node[0] == 'call':
+        for arg in node[2:]:
+            variables(arg, found)
+    elif node[0] != 'num':
+        for child in node[1:]:
+            variables(child, found)
+    return found
+
+
+def count_ops(node, ops):
+    if node[0] in ('num', 'var'):
+        return 0
+    children = node[2:] if node[0] == 'call' else node[1:]
+    own = 1 if node[0] in ops or (node[0] == 'call' and node[1] in ops) else 0
+    return own + sum(count_ops(child, ops) for child in children)
+
+
+# ========== 変数の値域 ==========
+
+@dataclass
+class Domain:
+    low: float
+    high: float
+    step: float
+    kind: str = 'number'  # number / percent / integer
+    choices: tuple = ()
+
+    def sample(self, rng, size):
+        if self.choices:
+            return rng.choice(np.array(self.choices, dtype=np.float64), size)
+        steps = int(round((self.high - self.low) / self.step))
+        return self.low + rng.integers(0, steps + 1, size) * self.step
+
+    def format(self, value):
+        if self.kind == 'percent':
+            return f"{value * 100:.2f}".rstrip('0').rstrip('.') + '%'
+        if self.step >= 1 or float(value).is_integer():
+            decimals = 0
+        else:
+            decimals = len(f'{self.step:.6f}'.rstrip('0').split('.')[1])
+        return f'{value:,.{decimals}f}'
+
+
+# 変数名のパターン → 値域（先に一致したものを使う）
+# 比率・収益率は % の値域、1株当たりの値は株価より小さい値域、金額（残り）は DEFAULT_DOMAIN
+DOMAINS = [
+    (r'^T$|Tax', Domain(0.15, 0.40, 0.01, 'percent')),
+    (r'^m$', Domain(1, 12, 1, 'integer', choices=(1, 2, 4, 12))),
+    (r'^(n|t)$', Domain(1, 30, 1, 'integer')),
+    (r'^N$', Domain(2, 50, 1, 'integer')),
+    (r'^b$|Retention', Domain(0.2, 0.9, 0.05)),
+    (r'β', Domain(0.5, 1.8, 0.05)),
+    (r'^Δy$', Domain(-0.02, 0.02, 0.0025, 'percent')),
+    (r'^σ', Domain(0.05, 0.40, 0.005, 'percent')),
+    (r'^TE$', Domain(0.01, 0.10, 0.0025, 'percent')),
+    (r'^Var\(', Domain(0.01, 0.06, 0.0025)),
+    (r'^Cov\(', Domain(-0.02, 0.04, 0.0025)),
+    (r'^MD$', Domain(2, 12, 0.1)),
+    (r'Convexity', Domain(20, 200, 1)),
+    (r'Growth Rate', Domain(2, 25, 0.5)),
+    (r'^(DOH|DSO|DPO)$', Domain(10, 120, 1)),
+    (r'^P/E$', Domain(8, 35, 0.5)),
+    (r'^%', Domain(1, 40, 0.5)),
+    (r'^RO[EA]$', Domain(0.02, 0.30, 0.0025, 'percent')),
+    (r'^Rf$', Domain(0.005, 0.06, 0.0025, 'percent')),
+    (r'^Rm$', Domain(0.05, 0.14, 0.0025, 'percent')),
+    (r'^g$', Domain(0.005, 0.06, 0.0025, 'percent')),
+    (r'^(r|R|Re|Rd|Rp|Rb|Ri|S1|S2)$|Return|Yield|金利|インフレ率', Domain(0.01, 0.15, 0.0025, 'percent')),
+    (r'^(D1|DPS)$', Domain(0.2, 6, 0.05)),
+    (r'EPS', Domain(0.5, 12, 0.05)),
+    (r'per (Share|Unit)', Domain(2, 80, 0.5)),
+    (r'Price|^(P|S|X|Ask|Bid|Coupon)$', Domain(5, 150, 0.5)),
+    (r'Shares', Domain(100, 5000, 10)),
+]
+DEFAULT_DOMAIN = Domain(100, 20000, 10)
+
+
+def ratio(numerator, denominator, low, high):
+    """numerator / denominator が [low, high] に入る組だけを使う（金額どうしの現実的な比率）"""
+    def where(env):
+        value = env[numerator] / env[denominator]
+        return (value >= low) & (value <= high)
+    return where
+
+
+def difference(a, b, low, high):
+    """a - b が [low, high] に入る組だけを使う（リスクプレミアム・r - g など）"""
+    def where(env):
+        value = env[a] - env[b]
+        return (value >= low) & (value <= high)
+    return where
+
+
+market_premium = difference('Rm', 'Rf', 0.02, 0.10)
+growth_spread = difference('r', 'g', 0.02, 0.12)
+
+
+# 公式ごとの上書き
+# - 変数名: 他の公式と同じ名前で桁の違う変数の値域
+# - derived: 他の変数から決まる変数（WACC の V = E + D など）
+# - where: 入力の組み合わせの条件（すべて満たす組だけを使う）
+# - result: 答えの範囲（現実的な値の問題だけを使う）
+OVERRIDES = {
+    'TERM0019': {'r': Domain(0.02, 0.12, 0.0025, 'percent')},
+    'TERM0023': {'result': (-1.0, 1.0)},
+    'TERM0033': {'result': (0.1, 5.0)},
+    'TERM0037': {
+        'C': Domain(5000, 20000, 10), 'I': Domain(1000, 5000, 10), 'G': Domain(1000, 6000, 10),
+        'X': Domain(500, 4000, 10), 'M': Domain(500, 4000, 10),
+    },
+    'TERM0042': {
+        '実質金利': Domain(0.005, 0.04, 0.0025, 'percent'), '期待インフレ率': Domain(0.01, 0.06, 0.0025, 'percent'),
+    },
+    'TERM0055': {'where': (ratio('COGS', 'Revenue', 0.3, 0.85),)},
+    'TERM0058': {'result': (0.5, 15.0)},
+    'TERM0059': {'Depreciation': Domain(10, 2000, 10), 'Amortization': Domain(10, 1000, 10)},
+    'TERM0062': {'where': (ratio('CA', 'CL', 0.5, 3.0),)},
+    'TERM0063': {'result': (0.5, 4.0)},
+    'TERM0064': {'where': (ratio('Inventory', 'CA', 0.05, 0.5),), 'result': (0.3, 3.0)},
+    'TERM0065': {'result': (0.1, 3.0)},
+    'TERM0066': {'result': (0.02, 0.35)},
+    'TERM0067': {'result': (0.01, 0.20)},
+    'TERM0068': {
+        'where': (ratio('NI', 'Sales', 0.02, 0.25), ratio('Sales', 'Assets', 0.3, 2.5), ratio('Assets', 'Equity', 1.2, 5.0)),
+        'result': (0.02, 0.35),
+    },
+    'TERM0069': {'result': (2.0, 15.0)},
+    'TERM0070': {'result': (3.0, 15.0)},
+    'TERM0071': {'where': (ratio('CapEx', 'CFO', 0.1, 0.9),)},
+    'TERM0085': {
+        'derived': {'V': lambda env: env['E'] + env['D']},
+        'Re': Domain(0.06, 0.15, 0.0025, 'percent'), 'Rd': Domain(0.02, 0.09, 0.0025, 'percent'),
+        'result': (0.03, 0.15),
+    },
+    'TERM0086': {'where': (market_premium,)},
+    'TERM0090': {'where': (ratio('Interest', 'EBIT', 0.05, 0.6),)},
+    'TERM0091': {'where': (ratio('VC', 'Sales', 0.3, 0.8), ratio('FC', 'Sales', 0.05, 0.4)), 'result': (1.0, 6.0)},
+    'TERM0092': {'P': Domain(20, 100, 1), 'VC': Domain(5, 60, 1), 'FC': Domain(10000, 500000, 1000)},
+    'TERM0099': {'result': (0.6, 2.0)},
+    'TERM0105': {'where': (ratio('Debt', 'Market Cap', 0.0, 1.5), ratio('Cash', 'Market Cap', 0.01, 0.5))},
+    'TERM0106': {'result': (5.0, 40.0)},
+    'TERM0107': {'result': (0.5, 8.0)},
+    'TERM0108': {'where': (growth_spread,), 'result': (5.0, 300.0)},
+    'TERM0110': {'where': (ratio('CapEx', 'CFO', 0.1, 0.9),), 'Net Borrowing': Domain(-2000, 3000, 10)},
+    'TERM0111': {'D&A': Domain(10, 2000, 10), 'CapEx': Domain(10, 5000, 10), 'ΔWC': Domain(-1000, 2000, 10)},
+    'TERM0120': {'result': (0.005, 0.08)},
+    'TERM0125': {'Coupon': Domain(2, 10, 0.25), 'Price': Domain(80, 120, 0.5)},
+    'TERM0150': {'where': (ratio('S', 'X', 0.7, 1.3),)},
+    'TERM0151': {'where': (ratio('S', 'X', 0.7, 1.3),)},
+    'TERM0185': {'result': (0.2, 2.5)},
+    'TERM0186': {'where': (market_premium,)},
+    'TERM0190': {'result': (0.1, 1.5)},
+    'TERM0191': {'result': (0.005, 0.15)},
+    'TERM0192': {'where': (market_premium,), 'result': (-0.05, 0.05)},
+    'TERM0193': {'result': (0.05, 1.5)},
+    'TERM0206': {'Ask': Domain(20, 80, 0.01), 'Bid': Domain(20, 80, 0.01), 'where': (ratio('Ask', 'Bid', 1.0005, 1.02),)},
+    'TERM0210': {'result': (1.0, 10.0)},
+    'TERM0215': {'result': (0.5, 15.0)},
+    'TERM0216': {'result': (2.0, 100.0)},
+    'TERM0217': {'result': (0.3, 10.0)},
+    'TERM0218': {'result': (2.0, 30.0)},
+    'TERM0219': {'result': (4.0, 20.0)},
+    'TERM0220': {'result': (0.3, 3.0)},
+    'TERM0221': {'where': (growth_spread,), 'result': (5.0, 40.0)},
+    'TERM0222': {'where': (growth_spread,)},
+    'TERM0223': {'where': (market_premium,)},
+    'TERM0224': {'result': (0.01, 0.25)},
+    'TERM0233': {'where': (difference('Portfolio Return', 'Benchmark Return', -0.05, 0.05),)},
+    'TERM0256': {
+        'where': (ratio('Total Liabilities', 'Total Assets', 0.3, 0.85), ratio('Preferred Stock', 'Total Assets', 0.0, 0.1)),
+    },
+    'TERM0273': {'where': (ratio('Variable Cost per Unit', 'Price', 0.2, 0.9),)},
+    'TERM0285': {'result': (1.0, 5.0)},
+    'TERM0286': {'result': (1.0, 5.0)},
+    'TERM0297': {'where': (ratio('Actual EPS', 'Expected EPS', 0.8, 1.2),)},
+    'TERM0360': {'result': (0.01, 0.6)},
+}
+# result の指定がない % の答えは ±100% 以内
+PERCENT_RESULT_LIMIT = 1.0
+
+# 誤答は正答の 1/4〜4 倍（絶対値）の範囲だけを使う（桁違いの選択肢は計算せずに消去できてしまう）
+DISTRACTOR_SCALE = (0.25, 4.0)
+# 式の間違いで足りないときの予備（正答の近くの値）
+NEAR_MISSES = (1.1, 0.9, 1.25, 0.8, 1.5, 0.67)
+
+# 答えを % で表示する公式の左辺
+PERCENT_RESULT = re.compile(
+    r'^(r|Re|E\(R\)|EAR|WACC|ROE|ROA|SGR|α|Weight|Market Share|ΔP/P|Active Return|名目金利)$'
+    r'|Rd|Yield|Return$')
+# 負の値になりうる答え（それ以外は正の値の問題だけを使う）
+SIGNED_RESULT = re.compile(r'Δ|α|ρ|β|Active Return|Surprise|Payoff|Working Capital|Value$')
+
+
+def domain_for(term_id, name):
+    override = OVERRIDES.get(term_id, {})
+    if name in override:
+        return override[name]
+    for pattern, domain in DOMAINS:
+        if re.search(pattern, name):
+            return domain
+    return DEFAULT_DOMAIN
+
+
+# ========== 評価 ==========
+
+def evaluate(node, env, valid):
+    """
+    式木を配列でまとめて評価する
+    分母が正でない・√の中が負・非整数乗の底が正でない行は valid を False にする
+    """
+    op = node[0]
+    if op == 'num':
+        return np.full(valid.shape, node[1])
+    if op == 'var':
+        return env[node[1]]
+    if op == 'neg':
+        return -evaluate(node[1], env, valid)
+    if op == 'call':
+        args = [evaluate(arg, env, valid) for arg in node[2:]]
+        if node[1] == 'sqrt':
+            valid &= args[0] >= 0
+            return np.sqrt(np.abs(args[0]))
+        return np.maximum(*args) if node[1] == 'max' else np.minimum(*args)
+
+    a = evaluate(node[1], env, valid)
+    b = evaluate(node[2], env, valid)
+    if op == 'add':
+        return a + b
+    if op == 'sub':
+        return a - b
+    if op == 'mul':
+        return a * b
+    if op == 'div':
+        valid &= b > 1e-9
+        return a / np.where(valid, b, 1.0)
+    if op == 'pow':
+        integral = np.equal(np.round(b), b)
+        valid &= integral | (a > 0)
+        return np.power(np.where(valid, a, 1.0), np.where(valid, b, 1.0))
+    raise FormulaError(f'未知のノード: {op}')
+
+
+# ========== よくある間違い（誤答の生成） ==========
+
+def mutations(node):
+    """式木に1か所だけ「よくある間違い」を適用した式を列挙する"""
+    op = node[0]
+    if op in ('num', 'var'):
+        return
+    if op == 'div':
+        yield ('div', node[2], node[1])                       # 比を逆にする
+    if op == 'sub':
+        yield ('add', node[1], node[2])                       # 符号の取り違え
+        yield node[1]                                         # 調整項の入れ忘れ
+        if node[1] == ('num', 1.0):
+            yield node[2]                                     # (1 - T) を T にする
+    if op == 'add':
+        yield ('sub', node[1], node[2])
+        yield node[1]
+    if op == 'pow':
+        base, exponent = node[1], node[2]
+        if base[0] == 'add' and base[1] == ('num', 1.0):
+            yield ('add', base[1], ('mul', base[2], exponent))  # 複利を単利で計算
+        yield ('pow', base, ('sub', exponent, ('num', 1.0)))  # べき指数のずれ
+
+    children = node[2:] if op == 'call' else node[1:]
+    head = node[:2] if op == 'call' else node[:1]
+    for i, child in enumerate(children):
+        for mutated in mutations(child):
+            yield (*head, *children[:i], mutated, *children[i + 1:])
+
+
+# ========== 表示 ==========
+
+PRECEDENCE = {'add': 1, 'sub': 1, 'mul': 2, 'div': 2, 'neg': 3, 'pow': 4}
+OP_SYMBOLS = {'add': '+', 'sub': '-', 'mul': '×', 'div': '/', 'pow': '^'}
+
+
+def render(node, values=None, parent=None, right=False):
+    """式木を文字列に戻す（values があれば変数を値に置き換える）"""
+    op = node[0]
+    if op == 'num':
+        return f'{node[1]:g}'
+    if op == 'var':
+        if not values:
+            return node[1]
+        # 負の値とべき乗の底は括弧で囲む
+        text = values[node[1]]
+        return f'({text})' if text.startswith('-') or (parent == 'pow' and not right) else text
+    if op == 'call':
+        name = {'max': 'Max', 'min': 'Min', 'sqrt': '√'}[node[1]]
+        return f"{name}({', '.join(render(arg, values) for arg in node[2:])})"
+    if op == 'neg':
+        text = f'-{render(node[1], values, op)}'
+    else:
+        left = render(node[1], values, op)
+        right_text = render(node[2], values, op, right=True)
+        text = f'{left}{OP_SYMBOLS[op]}{right_text}' if op == 'pow' else f'{left} {OP_SYMBOLS[op]} {right_text}'
+    if parent is None:
+        return text
+    # 優先順位が低い式と、引き算・割り算の右側（同じ優先順位）は括弧で囲む
+    p, q = PRECEDENCE[op], PRECEDENCE[parent]
+    if p < q or (right and p == q and parent in ('sub', 'div')) or (parent == 'pow' and op != 'pow'):
+        return f'({text})'
+    return text
+
+
+def result_decimals(value, percent):
+    """答えの表示桁数（同じ問題の選択肢はすべて正答と同じ桁数で表示する）"""
+    if percent:
+        return 2
+    return 4 if abs(value) < 0.1 else 2
+
+
+def format_result(value, percent, decimals):
+    if percent:
+        return f'{value * 100:.{decimals}f}%'
+    return f'{value:,.{decimals}f}'
+
+
+def is_zero(text):
+    return float(text.rstrip('%').replace(',', '')) == 0
+
+
+# ========== 問題の生成 ==========
+
+@dataclass
+class Formula:
+    term: Term
+    label: str
+    tree: tuple
+    names: list
+    domains: dict
+    percent: bool
+    difficulty: str
+
+    @property
+    def topic(self):
+        return self.term.topic_code
+
+
+def compile_formula(term):
+    """用語の公式を式木に変換する（変換できなければ FormulaError）"""
+    text = term.formula
+    parts = re.split(r'\s*[=≈]\s*', text, maxsplit=1)
+    if len(parts) != 2:
+        raise FormulaError('「=」がありません')
+    label, expression = parts
+    if '+' in label:
+        raise FormulaError('左辺が式です')
+    tree = Parser(tokenize(expression)).parse()
+    names = variables(tree)
+    if not names:
+        raise FormulaError('変数がありません')
+
+    # 難易度: 変数の数と、べき乗・√・Max などの数
+    score = len(names) + 2 * count_ops(tree, ('pow', 'sqrt', 'max', 'min'))
+    difficulty = 'easy' if score <= 2 else 'medium' if score <= 4 else 'hard'
+    return Formula(
+        term=term,
+        label=label,
+        tree=tree,
+        names=names,
+        domains={name: domain_for(term.term_id, name) for name in names},
+        percent=bool(PERCENT_RESULT.search(label)),
+        difficulty=difficulty,
+    )
+
+
+def generate(formula, count, rng, batch_size):
+    """1つの公式から重複しない問題を最大 count 件作る"""
+    term_id = formula.term.term_id
+    override = OVERRIDES.get(term_id, {})
+    result_range = override.get('result')
+    signed = bool(SIGNED_RESULT.search(formula.label))
+    mutants = list(dict.fromkeys(mutations(formula.tree)))
+
+    questions = []
+    seen = set()
+    for _ in range(20):
+        if len(questions) >= count:
+            break
+        env = {name: formula.domains[name].sample(rng, batch_size) for name in formula.names}
+        for name, derive in override.get('derived', {}).items():
+            env[name] = derive(env)
+        valid = np.ones(batch_size, dtype=bool)
+        with np.errstate(all='ignore'):
+            for where in override.get('where', ()):
+                valid &= where(env)
+            answer = evaluate(formula.tree, env, valid)
+            valid &= np.isfinite(answer)
+            if result_range:
+                valid &= (answer >= result_range[0]) & (answer <= result_range[1])
+            elif not signed:
+                valid &= answer > 0
+            if formula.percent and not result_range:
+                valid &= np.abs(answer) <= PERCENT_RESULT_LIMIT
+            wrong = []
+            for mutant in mutants:
+                mutant_valid = np.ones(batch_size, dtype=bool)
+                value = evaluate(mutant, env, mutant_valid)
+                wrong.append(np.where(mutant_valid & np.isfinite(value), value, np.nan))
+            # 桁違いの誤答は使わない
+            scale = np.abs(np.stack(wrong)) / np.abs(answer) if wrong else np.empty((0, batch_size))
+            in_scale = (scale >= DISTRACTOR_SCALE[0]) & (scale <= DISTRACTOR_SCALE[1])
+        wrong = [np.where(ok, value, np.nan) for value, ok in zip(wrong, in_scale)]
+        wrong += [answer * factor for factor in NEAR_MISSES]
+
+        for row in np.flatnonzero(valid):
+            values = {name: formula.domains[name].format(env[name][row]) for name in formula.names}
+            key = tuple(values.values())
+            if key in seen:
+                continue
+            decimals = result_decimals(answer[row], formula.percent)
+            correct = format_result(answer[row], formula.percent, decimals)
+            if is_zero(correct):
+                continue
+            # 式の間違いは順番を混ぜて使う
+            order = list(rng.permutation(len(mutants))) + list(range(len(mutants), len(wrong)))
+            options = [correct]
+            for k in order:
+                value = wrong[k][row]
+                text = format_result(value, formula.percent, decimals) if np.isfinite(value) else None
+                # 0 の選択肢と、正の値の問題の負の選択肢は出さない
+                if text and text not in options and not is_zero(text) and (signed or not text.startswith('-')):
+                    options.append(text)
+                if len(options) == OPTION_COUNT:
+                    break
+            if len(options) < OPTION_COUNT:
+                continue
+            seen.add(key)
+            questions.append(build_question(formula, len(questions), values, correct, options, rng))
+            if len(questions) >= count:
+                break
+    return questions
+
+
+def build_question(formula, index, values, correct, options, rng):
+    term = formula.term
+    givens = ', '.join(f'{name} = {value}' for name, value in values.items())
+    expression = render(formula.tree)
+    substituted = render(formula.tree, values)
+    return {
+        'id': f"gen_{term.term_id.lower()}_{index:04d}",
+        'question': f"{term.en_canonical}: given {givens}, {formula.label} is closest to:",
+        'options': [options[i] for i in rng.permutation(len(options))],
+        'correctAnswer': correct,
+        'explanation': f'{formula.label} = {expression} = {substituted} = {correct}',
+        'topic': TOPIC_NAMES[formula.topic],
+        'difficulty': formula.difficulty,
+    }
+
+
+# ========== 出力 ==========
+
+def write_index(shards):
+    """シャードを読み込む lib/generated-questions.ts を書き出す（Metro は静的な require しか解決できない）"""
+    lines = [
+        '// 自動生成ファイル（scripts/generate_numeric_questions.py）。直接編集しないこと',
+        "import type { CFAQuestion } from './game-types';",
+        '',
+        'export interface GeneratedQuestionShard {',
+        '  topic: string;',
+        "  difficulty: CFAQuestion['difficulty'];",
+        '  count: number;',
+        '  load: () => CFAQuestion[];',
+        '}',
+        '',
+        'export const GENERATED_QUESTION_SHARDS: GeneratedQuestionShard[] = [',
+    ]
+    order = sorted(shards, key=lambda key: (key[0], DIFFICULTIES.index(key[1])))
+    for topic, difficulty in order:
+        questions = shards[(topic, difficulty)]
+        lines.append(
+            f"  {{ topic: '{TOPIC_NAMES[topic]}', difficulty: '{difficulty}', count: {len(questions)}, "
+            f"load: () => require('@/assets/data/questions/{topic}_{difficulty}.json') }},"
+        )
+    lines += ['];', '']
+    INDEX_FILE.write_text('\n'.join(lines), encoding='utf-8')
+
+
+def write_shards(shards):
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    for old in OUTPUT_DIR.glob('*.json'):
+        old.unlink()
+    for (topic, difficulty), questions in shards.items():
+        with open(OUTPUT_DIR / f'{topic}_{difficulty}.json', 'w', encoding='utf-8') as f:
+            json.dump(questions, f, ensure_ascii=False, separators=(',', ':'))
+    write_index(shards)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='公式から数値計算問題を生成')
+    parser.add_argument('--per-formula', type=int, default=40, help='公式1つあたりの問題数')
+    parser.add_argument('--batch-size', type=int, default=4096, help='一度に評価する入力の組数')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--dry-run', action='store_true', help='書き出さずに変換結果と件数を表示')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    shards = {}
+    skipped = []
+    for term in load_content().terms:
+        if not term.formula:
+            continue
+        try:
+            formula = compile_formula(term)
+        except FormulaError as e:
+            skipped.append((term.term_id, term.formula, str(e)))
+            continue
+        questions = generate(formula, args.per_formula, rng, args.batch_size)
+        if args.dry_run:
+            print(f"{term.term_id} [{formula.topic}/{formula.difficulty}] {formula.label} = "
+                  f"{render(formula.tree)}  → {len(questions)}問")
+        if questions:
+            shards.setdefault((formula.topic, formula.difficulty), []).extend(questions)
+
+    total = sum(len(q) for q in shards.values())
+    print(f'生成: {total}問（{len(shards)}シャード）, スキップした公式: {len(skipped)}件')
+    for term_id, text, reason in skipped:
+        print(f'  {term_id}: {text} （{reason}）')
+    if not args.dry_run:
+        write_shards(shards)
+        print(f'出力: {OUTPUT_DIR.relative_to(ROOT_DIR)}/, {INDEX_FILE.relative_to(ROOT_DIR)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+外部の単語帳（Anki の TSV・.apkg、CSV、貼り付け形式のマークダウン）を用語データに一括で取り込む
+
+新しい語彙が届くたびに専用のスクリプト（add_eq_terms.py など）を書いていたのを、形式ごとのリーダーに置き換える。
+- リーダーはレコードを1件ずつ返すジェネレーター（@reader で登録）。ファイル全体をメモリに載せない
+- 各行は content_model の Term / Example に写し（旧フィールド名も可）、term_id は既存の最大番号の続きから振る
+- 重複は英語の見出し語（と別名）を正規化した 64 ビットハッシュの索引で判定する。索引は既存の用語をバンドルから
+  1件ずつ読んで作り、取り込んだ用語も追加していく（同じファイル内の重複も除く）
+- 書き込みは batch-size 件ごとに terms.json / examples.json の配列の末尾へ追記する。既存部分は読み直さず、
+  結果は json.dump(..., ensure_ascii=False, indent=2) で全体を書き直した場合と同じになる
+- 取り込み先の JSON が正本で、CSV には書き戻さない。build_pipeline.py は JSON を CSV から作り直さず、
+  watch_content.py は JSON が書き換えられていれば読み直してから書くので、取り込んだ用語は消えない
+
+使い方:
+    python scripts/import_deck.py deck.apkg --topic EQ
+    python scripts/import_deck.py notes.txt --fields en_canonical,jp_headword,example_en --topic FI
+    python scripts/import_deck.py assets/data/new_eq_terms.csv --dry-run
+    python scripts/import_deck.py Pasted_content.txt --topic EQ --duplicates dups.tsv
+
+Anki のタグに分野コード（EQ, FI など。"CFA::EQ" のような階層タグの末尾も可）があればそれを使い、
+なければ --topic を使う。分野が決まらない行は取り込まない。
+"""
+import argparse
+import csv
+import hashlib
+import html
+import json
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import unicodedata
+import zipfile
+from json.encoder import encode_basestring
+from pathlib import Path
+
+from content_model import (
+    EXAMPLES_FILE, LEGACY_FIELDS, ROOT_DIR, TERMS_FILE, TOPIC_CODES, Example, Term, open_bundle,
+)
+
+DEFAULT_BATCH_SIZE = 5000
+# Anki のノートのフィールドに名前で対応が取れないときの並び（--fields で変更）
+DEFAULT_NOTE_FIELDS = ('en_canonical', 'jp_headword', 'jp_definition', 'example_en', 'example_jp')
+# Anki のフィールド名（小文字）→ 正規のフィールド名
+NOTE_FIELD_NAMES = {
+    'front': 'en_canonical', 'english': 'en_canonical', 'term': 'en_canonical',
+    'back': 'jp_headword', 'japanese': 'jp_headword', 'meaning': 'jp_definition',
+    'example': 'example_en',
+}
+# 貼り付け形式のラベル → 正規のフィールド名
+MARKDOWN_LABELS = {'英語例文': 'example_en', '日本語例文': 'example_jp'}
+TERM_ID_RE = re.compile(r'^TERM(\d+)$')
+
+
+class DeckError(Exception):
+    pass
+
+
+class Rejected(Exception):
+    """取り込めない行（理由つき）"""
+
+
+class Duplicate(Exception):
+    """既存の用語（または先に取り込んだ行）と同じ見出し語"""
+
+    def __init__(self, term_id, en_canonical):
+        super().__init__(term_id)
+        self.term_id = term_id
+        self.en_canonical = en_canonical
+
+
+# ========== リーダー ==========
+
+READERS = {}
+
+
+def reader(name, *extensions):
+    """形式ごとのリーダーを登録するデコレーター
+
+    登録する関数は (path, options) を受け取り、フィールド名 → 値の dict を1件ずつ返す。
+    """
+    def register(fn):
+        READERS[name] = (fn, extensions)
+        return fn
+    return register
+
+
+SOUND_RE = re.compile(r'\[sound:[^\]]*\]')
+BREAK_RE = re.compile(r'<br\s*/?>|</div>|</p>', re.IGNORECASE)
+TAG_RE = re.compile(r'<[^>]+>')
+
+
+def clean_html(value):
+    """Anki のフィールドの HTML・音声タグを取り除く"""
+    if '<' not in value and '&' not in value and '[sound:' not in value:
+        return value.strip()
+    value = TAG_RE.sub('', BREAK_RE.sub('\n', SOUND_RE.sub('', value)))
+    return html.unescape(value).replace('\xa0', ' ').strip()
+
+
+def topic_from_tags(tags):
+    for tag in tags.split():
+        code = tag.rsplit('::', 1)[-1].upper()
+        if code in TOPIC_CODES:
+            return code
+    return None
+
+
+def note_row(values, names, tags):
+    row = {name: clean_html(value) for name, value in zip(names, values) if name and name != '-'}
+    topic = topic_from_tags(tags) if tags else None
+    if topic:
+        row['topic_code'] = topic
+    return row
+
+
+@reader('anki-tsv', '.tsv', '.txt')
+def read_anki_tsv(path, options):
+    """Anki の「テキストとして書き出し」（# で始まるヘッダー行つき）"""
+    separators = {'tab': '\t', 'comma': ',', 'semicolon': ';', 'pipe': '|', 'space': ' '}
+    delimiter = '\t'
+    tags_column = None
+    # GUID・ノートタイプ・デッキの列（書き出し時に選んだ場合だけある）はフィールドから除く
+    meta_columns = []
+    names = options.fields or DEFAULT_NOTE_FIELDS
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        # ヘッダー行（#separator:tab, #tags column:3 など）だけを先に読む
+        while True:
+            position = f.tell()
+            line = f.readline()
+            if not line.startswith('#'):
+                f.seek(position)
+                break
+            key, _, value = line[1:].strip().partition(':')
+            if key == 'separator':
+                delimiter = separators.get(value.lower(), value[:1] or '\t')
+            elif key == 'tags column':
+                tags_column = int(value) - 1
+            elif key in ('guid column', 'notetype column', 'deck column'):
+                meta_columns.append(int(value) - 1)
+        for values in csv.reader(f, delimiter=delimiter):
+            if not any(values):
+                continue
+            tags = values[tags_column] if tags_column is not None and tags_column < len(values) else ''
+            if tags_column is not None or meta_columns:
+                skip = {tags_column, *meta_columns}
+                values = [v for i, v in enumerate(values) if i not in skip]
+            yield note_row(values, names, tags)
+
+
+def note_type_fields(db):
+    """ノートタイプID → フィールド名の並び"""
+    tables = {row[0] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    fields = {}
+    if 'fields' in tables:
+        for ntid, name in db.execute('SELECT ntid, name FROM fields ORDER BY ntid, ord'):
+            fields.setdefault(ntid, []).append(name)
+    else:
+        (models,) = db.execute('SELECT models FROM col').fetchone()
+        for mid, model in json.loads(models).items():
+            fields[int(mid)] = [f['name'] for f in sorted(model['flds'], key=lambda f: f['ord'])]
+    return fields
+
+
+def map_note_fields(names, options):
+    """フィールド名から正規のフィールド名を決める（対応が取れなければ既定の並び）"""
+    if options.fields:
+        return options.fields
+    mapped = []
+    for name in names:
+        key = name.strip().lower().replace(' ', '_')
+        mapped.append(LEGACY_FIELDS.get(key) or NOTE_FIELD_NAMES.get(key) or
+                      (key if key in Term.FIELDS or key in Example.FIELDS else None))
+    if 'en_canonical' not in mapped:
+        return DEFAULT_NOTE_FIELDS
+    return mapped
+
+
+@reader('apkg', '.apkg', '.colpkg')
+def read_apkg(path, options):
+    """Anki のパッケージ（zip の中の SQLite コレクション）"""
+    with zipfile.ZipFile(path) as archive:
+        members = set(archive.namelist())
+        member = next((m for m in ('collection.anki21', 'collection.anki2') if m in members), None)
+        if member is None:
+            raise DeckError(
+                f'{path}: コレクションがありません（zstd 圧縮の collection.anki21b は未対応。'
+                'Anki の書き出しで「旧バージョンの Anki との互換性を保つ」を有効にしてください）'
+            )
+        with tempfile.TemporaryDirectory() as tmp:
+            collection = os.path.join(tmp, member)
+            with archive.open(member) as src, open(collection, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            db = sqlite3.connect(collection)
+            try:
+                names = {mid: map_note_fields(fields, options) for mid, fields in note_type_fields(db).items()}
+                for mid, flds, tags in db.execute('SELECT mid, flds, tags FROM notes ORDER BY id'):
+                    yield note_row(flds.split('\x1f'), names.get(mid, DEFAULT_NOTE_FIELDS), tags)
+            finally:
+                db.close()
+
+
+@reader('csv', '.csv')
+def read_csv(path, options):
+    """見出し行つきの CSV（列名は正規の名前・旧名のどちらでも可）"""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            yield {key: value for key, value in row.items() if key}
+
+
+@reader('markdown', '.md')
+def read_markdown(path, options):
+    """update_examples.py が読む貼り付け形式（"### 1. English（日本語）" で始まり --- で区切る）"""
+    entry = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line == '---':
+                if entry:
+                    yield entry
+                entry = {}
+                continue
+            heading = re.match(r'^###\s+\d+\.\s+([^（(]+?)\s*(?:[（(](.+?)[）)])?\s*$', line)
+            if heading:
+                entry['en_canonical'] = heading.group(1)
+                if heading.group(2):
+                    entry['jp_headword'] = heading.group(2)
+                continue
+            field = re.match(r'^\*\*(.+?)\*\*:\s*(.+)$', line)
+            if field:
+                label = field.group(1)
+                name = MARKDOWN_LABELS.get(label, label)
+                if name in Term.FIELDS or name in Example.FIELDS:
+                    entry[name] = field.group(2)
+    if entry:
+        yield entry
+
+
+def detect_format(path):
+    suffix = Path(path).suffix.lower()
+    if suffix in ('.txt', '.md'):
+        # .txt は Anki の書き出しと貼り付け形式のどちらもありうるので先頭を見て決める
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            for line in f:
+                if line.strip():
+                    if line.startswith('###'):
+                        return 'markdown'
+                    return 'anki-tsv' if line.startswith('#') or '\t' in line else 'markdown'
+        return 'markdown'
+    for name, (_, extensions) in READERS.items():
+        if suffix in extensions:
+            return name
+    raise DeckError(f'{path}: 形式を判定できません（--format で指定してください）')
+
+
+# ========== 重複判定 ==========
+
+NON_WORD_RE = re.compile(r'[\W_]+')
+
+
+def dedupe_key(text):
+    """大文字小文字・記号・全角半角の違いを無視した照合キー"""
+    return NON_WORD_RE.sub('', unicodedata.normalize('NFKC', text).lower())
+
+
+def key_hash(key):
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class TermIndex:
+    """見出し語・別名の照合キーのハッシュ → term_id（用語の本文は持たない）"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.max_number = 0
+
+    def add(self, term):
+        for text in (term.en_canonical, *term.en_aliases):
+            key = dedupe_key(text)
+            if key:
+                self.hashes.setdefault(key_hash(key), term.term_id)
+        match = TERM_ID_RE.match(term.term_id)
+        if match:
+            self.max_number = max(self.max_number, int(match.group(1)))
+
+    def find(self, term):
+        key = dedupe_key(term.en_canonical)
+        return self.hashes.get(key_hash(key)) if key else None
+
+    def next_term_id(self):
+        self.max_number += 1
+        return f'TERM{self.max_number:04d}'
+
+
+def load_index(root):
+    index = TermIndex()
+    with open_bundle(root) as bundle:
+        for term in bundle.terms:
+            index.add(term)
+    return index
+
+
+# ========== 書き込み ==========
+
+def format_record(data):
+    """配列の要素としてのレコードを json.dump(indent=2) と同じ書式で
+
+    indent を指定した json.dumps は C の高速化を使わないため、文字列と文字列のリストだけからなる
+    レコード（用語・例文）は字下げを自前で組み立てる。それ以外の値を含むときは json.dumps に任せる。
+    """
+    lines = []
+    for key, value in data.items():
+        if isinstance(value, str):
+            lines.append(f'    {encode_basestring(key)}: {encode_basestring(value)}')
+        elif isinstance(value, list) and all(isinstance(v, str) for v in value):
+            if value:
+                items = ',\n      '.join(map(encode_basestring, value))
+                lines.append(f'    {encode_basestring(key)}: [\n      {items}\n    ]')
+            else:
+                lines.append(f'    {encode_basestring(key)}: []')
+        else:
+            return '  ' + json.dumps(data, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+    if not lines:
+        return '  {}'
+    return '  {\n' + ',\n'.join(lines) + '\n  }'
+
+
+class JsonArrayAppender:
+    """json.dump(indent=2) で書かれた配列の末尾にレコードを追記する"""
+
+    def __init__(self, path):
+        self.path = path
+        self.f = open(path, 'r+b')
+        self.f.seek(0, os.SEEK_END)
+        size = self.f.tell()
+        self.f.seek(max(0, size - 64))
+        tail = self.f.read()
+        stripped = tail.rstrip()
+        if not stripped.endswith(b']'):
+            self.f.close()
+            raise DeckError(f'{path}: JSON 配列ではありません')
+        body = stripped[:-1].rstrip()
+        self.position = size - len(tail) + len(body)
+        self.empty = body.endswith(b'[')
+
+    def append(self, records):
+        if not records:
+            return
+        fragments = ',\n'.join(format_record(r.to_dict()) for r in records)
+        data = (('\n' if self.empty else ',\n') + fragments).encode('utf-8')
+        self.f.seek(self.position)
+        self.f.write(data + b'\n]')
+        self.f.truncate()
+        self.position += len(data)
+        self.empty = False
+
+    def close(self):
+        self.f.close()
+
+
+# ========== 取り込み ==========
+
+def to_records(row, index, topic):
+    """1行を (Term, Example | None) にして term_id を振る"""
+    term = Term.from_dict(row)
+    if not term.en_canonical:
+        raise Rejected('英語の見出し語がない')
+    if not term.topic_code:
+        if not topic:
+            raise Rejected('分野がない（--topic で指定）')
+        term.topic_code = sys.intern(topic)
+    elif term.topic_code not in TOPIC_CODES:
+        raise Rejected(f'未知の分野 {term.topic_code}')
+    existing = index.find(term)
+    if existing:
+        raise Duplicate(existing, term.en_canonical)
+    term.term_id = index.next_term_id()
+    index.add(term)
+    example = Example.from_dict(row)
+    if not example.example_en and not example.example_jp:
+        return term, None
+    example.term_id = term.term_id
+    return term, example
+
+
+def run_import(path, options):
+    fmt = options.format or detect_format(path)
+    read, _ = READERS[fmt]
+    start = time.perf_counter()
+    index = load_index(options.root)
+    print(f'既存の用語: {len(index.hashes):,}キー（最大 TERM{index.max_number:04d}）, '
+          f'{(time.perf_counter() - start) * 1000:.0f}ms')
+
+    writers = None
+    if not options.dry_run:
+        writers = (JsonArrayAppender(options.root / TERMS_FILE), JsonArrayAppender(options.root / EXAMPLES_FILE))
+    duplicates = open(options.duplicates, 'w', encoding='utf-8', newline='') if options.duplicates else None
+    counts = {'read': 0, 'imported': 0, 'examples': 0, 'duplicates': 0, 'rejected': 0}
+    rejected = {}
+    terms, examples = [], []
+
+    def flush():
+        if writers:
+            writers[0].append(terms)
+            writers[1].append(examples)
+        terms.clear()
+        examples.clear()
+
+    try:
+        for row in read(path, options):
+            counts['read'] += 1
+            try:
+                term, example = to_records(row, index, options.topic)
+            except Duplicate as e:
+                counts['duplicates'] += 1
+                if duplicates:
+                    duplicates.write(f'{e.term_id}\t{e.en_canonical}\n')
+                continue
+            except Rejected as e:
+                counts['rejected'] += 1
+                rejected[str(e)] = rejected.get(str(e), 0) + 1
+                continue
+            terms.append(term)
+            counts['imported'] += 1
+            if example:
+                examples.append(example)
+                counts['examples'] += 1
+            if options.dry_run and counts['imported'] <= 5:
+                print(f'  {term.term_id} [{term.topic_code}] {term.en_canonical} / {term.jp_headword}')
+            if len(terms) >= options.batch_size:
+                flush()
+        flush()
+    finally:
+        if writers:
+            for writer in writers:
+                writer.close()
+        if duplicates:
+            duplicates.close()
+
+    elapsed = time.perf_counter() - start
+    action = '取り込み予定' if options.dry_run else '取り込み'
+    print(f"{fmt}: {counts['read']:,}件を読み込み, {action} {counts['imported']:,}語（例文 {counts['examples']:,}件）, "
+          f"重複 {counts['duplicates']:,}件, 除外 {counts['rejected']:,}件, "
+          f"{elapsed:.2f}s（{counts['read'] / elapsed if elapsed else 0:,.0f}件/s）")
+    for reason, count in sorted(rejected.items(), key=lambda item: -item[1]):
+        print(f'  除外: {reason} {count:,}件')
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='外部の単語帳を用語データに一括で取り込む')
+    parser.add_argument('input', type=Path, help='取り込むファイル（.apkg, .tsv, .txt, .csv, .md）')
+    parser.add_argument('--format', choices=sorted(READERS), help='形式（既定: 拡張子と内容から判定）')
+    parser.add_argument('--topic', choices=TOPIC_CODES, help='分野コードのない行に使う分野')
+    parser.add_argument('--fields', type=lambda v: tuple(v.split(',')),
+                        help='Anki のフィールドの並び（例: en_canonical,jp_headword,-,example_en。- は読み飛ばす）')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='まとめて書き込む用語の数')
+    parser.add_argument('--duplicates', type=Path, help='重複として飛ばした行を TSV で書き出す')
+    parser.add_argument('--dry-run', action='store_true', help='書き込まずに件数と先頭の数件を表示')
+    parser.add_argument('--root', type=Path, default=ROOT_DIR, help='用語データのあるディレクトリ')
+    args = parser.parse_args()
+
+    if args.fields:
+        unknown = [f for f in args.fields if f != '-' and f not in Term.FIELDS and f not in Example.FIELDS]
+        if unknown:
+            parser.error(f'未知のフィールド: {", ".join(unknown)}')
+    try:
+        run_import(args.input, args)
+    except DeckError as e:
+        print(f'エラー: {e}', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+パイプラインスクリプト共通の計測レイヤー
+
+- ステージ単位・アイテム単位の処理時間（span）
+- tracemalloc による span ごとのピークメモリ（tracemalloc のピークはプロセス全体で1つなので、
+  別スレッドの span と重なった span のピークは他スレッドの確保も含むプロセス全体の値になる。
+  トレースでは args.peak_scope = 'process'、集計表では * 印で区別する）
+- 処理ピクセル数・変換行数・書き込みバイト数などのカウンター
+- Chrome トレースイベント形式のJSON出力（chrome://tracing や Perfetto で表示）と集計表
+
+既定では無効で、無効時の span() / count() は共有のno-opを返すだけなのでほぼコストがかからない。
+環境変数 CFA_TRACE に出力先のパスを指定すると有効になり、プロセス終了時に書き出す。
+
+使い方:
+    from instrument import tracer
+
+    with tracer.span('convert_terms', cat='data'):
+        ...
+        tracer.count('rows_converted', len(rows))
+
+    CFA_TRACE=trace.json python scripts/convert-csv-to-json.py
+"""
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+TRACE_ENV = 'CFA_TRACE'
+
+
+class _NullSpan:
+    """無効時に返す共有のno-op span"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.peak = 0
+        self.shared = False
+
+    def set(self, **args):
+        """span の引数（トレースの args 欄に表示される）を追加"""
+        self.args.update(args)
+
+    def __enter__(self):
+        self.tracer._push(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        self.tracer._pop(self, self.start, end)
+        return False
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.events = []
+        self.counters = {}
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._open = []  # 全スレッドの開いている span（ピークのリセットはプロセス全体に効く）
+
+    def enable(self, path):
+        """計測を有効にし、終了時に path へトレースを書き出す"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self.path = path
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        atexit.register(self.finish)
+
+    def span(self, name, cat='pipeline', **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def count(self, name, value=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            total = self.counters.get(name, 0) + value
+            self.counters[name] = total
+            self.events.append({
+                'name': name, 'ph': 'C', 'ts': self._ts(time.perf_counter_ns()),
+                'pid': os.getpid(), 'tid': threading.get_ident(), 'args': {name: total},
+            })
+
+    @staticmethod
+    def _ts(ns):
+        # perf_counter はプロセス間で共通の単調時計なので、マージしたトレースの時刻がそろう
+        return ns / 1000
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _push(self, span):
+        span.tid = threading.get_ident()
+        with self._lock:
+            # 開いている span のピークを保つため、リセット前のピークをすべての開いている span に反映する
+            peak = tracemalloc.get_traced_memory()[1]
+            for open_span in self._open:
+                open_span.peak = max(open_span.peak, peak)
+            tracemalloc.reset_peak()
+            self._open.append(span)
+            if any(open_span.tid != span.tid for open_span in self._open):
+                for open_span in self._open:
+                    open_span.shared = True
+        self._stack().append(span)
+
+    def _pop(self, span, start, end):
+        self._stack().pop()
+        with self._lock:
+            peak = tracemalloc.get_traced_memory()[1]
+            for open_span in self._open:
+                open_span.peak = max(open_span.peak, peak)
+            self._open.remove(span)
+
+            args = dict(span.args, peak_bytes=span.peak, peak_scope='process' if span.shared else 'span')
+            self.events.append({
+                'name': span.name, 'cat': span.cat, 'ph': 'X',
+                'ts': self._ts(start), 'dur': (end - start) / 1000,
+                'pid': os.getpid(), 'tid': threading.get_ident(), 'args': args,
+            })
+            stat = self.stats.setdefault(span.name, [0, 0, 0, 0, False])
+            stat[0] += 1
+            stat[1] += end - start
+            stat[2] = max(stat[2], end - start)
+            stat[3] = max(stat[3], span.peak)
+            stat[4] = stat[4] or span.shared
+
+    def summary(self):
+        """span ごとの集計表とカウンターの合計を文字列で返す"""
+        lines = [f"{'span':40} {'count':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'peak MB':>8}"]
+        for name, (n, total, longest, peak, shared) in sorted(self.stats.items(), key=lambda kv: -kv[1][1]):
+            lines.append(
+                f"{name[:40]:40} {n:>7} {total / 1e6:>10.2f} {total / n / 1e6:>9.3f} "
+                f"{longest / 1e6:>9.2f} {peak / 1e6:>8.2f}{'*' if shared else ''}"
+            )
+        for name, total in sorted(self.counters.items()):
+            lines.append(f"{name:40} {total:>7}")
+        if any(stat[4] for stat in self.stats.values()):
+            lines.append('* 別スレッドの span と重なったため、ピークはプロセス全体の値')
+        return '\n'.join(lines)
+
+    def finish(self):
+        """トレースを書き出して集計表を表示（atexit から呼ばれる）"""
+        if not self.enabled:
+            return
+        self.enabled = False
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f)
+        print(self.summary(), file=sys.stderr)
+        print(f"トレース出力: {self.path}", file=sys.stderr)
+
+
+def merge_traces(paths, output, names=None):
+    """複数プロセスのトレースを1つにまとめる（names があればプロセス名として付与）"""
+    events = []
+    for i, path in enumerate(paths):
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            part = json.load(f)['traceEvents']
+        if names:
+            pids = {e['pid'] for e in part}
+            events.extend(
+                {'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': names[i]}} for pid in pids
+            )
+        events.extend(part)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+tracer = Tracer()
+if os.environ.get(TRACE_ENV):
+    tracer.enable(os.environ[TRACE_ENV])
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+コンテンツ全体の重複・類似テキスト検出（MinHash + LSH）
+
+用語の定義（jp_definition）・例文（example_en / example_jp）・教科書の段落（英語・日本語）を対象に、
+追記を重ねるうちに紛れ込んだ重複や使い回しの文を見つける。
+- 英語は単語の3-gram、日本語は文字の3-gram をシングルにする
+- シングルのハッシュから MinHash シグネチャを NumPy でまとめて計算する（ハッシュ関数 × シングルの行列で最小値）
+- シグネチャを bands 個の帯に分け、どれかの帯が一致した組だけを候補にする（LSH、ほぼ線形時間）
+- 候補の組はシングル集合の Jaccard 係数で確かめ、類似度の高い順に並べて出力する
+- 教科書の段落は all_sections.json とその写し（translations/）の両方を読むため、同じ段落どうしの組は
+  類似の一覧に入れず、写しとの食い違い（mirror_drift）として別に出力する
+
+使い方:
+    python scripts/near_duplicates.py                              # .pipeline-reports/near_duplicates.json に出力
+    python scripts/near_duplicates.py --min-similarity 0.8 --top 50
+    python scripts/near_duplicates.py --root /tmp/old-checkout --output report.json
+"""
+import argparse
+import json
+import re
+import time
+import unicodedata
+import zlib
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from content_model import ROOT_DIR, SECTIONS_FILE, Section, load_content, read_records
+
+DEFAULT_OUTPUT = ROOT_DIR / '.pipeline-reports' / 'near_duplicates.json'
+MIRROR_FILE = 'translations/all_sections.json'
+
+# 2^32 より大きい素数（a, b < 2^32 なら a*x が uint64 に収まる）
+PRIME = np.uint64(4294967311)
+MAX_HASH = np.uint64(0xffffffff)
+EXCERPT_LENGTH = 120
+
+
+# ========== 対象テキストの読み込み ==========
+
+def read_json(root, path):
+    full = Path(root) / path
+    if not full.exists():
+        return None
+    with open(full, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def term_documents(root):
+    for term in load_content(root).terms:
+        yield 'terms', term.term_id, 'jp_definition', 'ja', term.jp_definition
+
+
+def example_documents(root):
+    for example in load_content(root).examples:
+        yield 'examples', example.term_id, 'example_en', 'en', example.example_en
+        yield 'examples', example.term_id, 'example_jp', 'ja', example.example_jp
+
+
+def section_documents(path):
+    def read(root):
+        for section in read_records(Path(root) / path, Section):
+            for paragraph in section.paragraphs:
+                record_id = f'{section.section_id}/{paragraph.paragraph_id}'
+                yield path, record_id, 'english', 'en', paragraph.en
+                yield path, record_id, 'japanese', 'ja', paragraph.jp
+    return read
+
+
+def textbook_sample_documents(root):
+    data = read_json(root, 'data/textbook-sample.json') or {}
+    for content in data.get('textContents', []):
+        yield 'textbook.textContents', content['id'], 'content', 'en', content.get('content', '')
+        yield 'textbook.textContents', content['id'], 'contentJa', 'ja', content.get('contentJa', '')
+    for example in data.get('examples', []):
+        yield 'textbook.examples', example['id'], 'problem', 'en', example.get('problem', '')
+        yield 'textbook.examples', example['id'], 'problemJa', 'ja', example.get('problemJa', '')
+
+
+# 同じ (record_id, field) が同じ内容を持つはずの元ファイルと写し
+MIRRORS = [(SECTIONS_FILE, MIRROR_FILE)]
+
+SOURCES = [
+    term_documents,
+    example_documents,
+    section_documents(SECTIONS_FILE),
+    section_documents(MIRROR_FILE),
+    textbook_sample_documents,
+]
+
+
+# ========== シングル ==========
+
+def normalize(text, lang):
+    text = unicodedata.normalize('NFKC', text).lower()
+    if lang == 'en':
+        # PDF 由来の改行ハイフン（"finan- cial"）をつなぐ
+        text = re.sub(r'(\w)- (\w)', r'\1\2', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def shingles(text, lang, size):
+    """正規化したテキストのシングル（文字列の集合）"""
+    if lang == 'en':
+        words = re.findall(r"[a-z0-9%$']+", text)
+        if len(words) < size:
+            return set(words)
+        return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    chars = re.sub(r'[\s、。，．・「」『』（）()]', '', text)
+    if len(chars) < size:
+        return {chars} if chars else set()
+    return {chars[i:i + size] for i in range(len(chars) - size + 1)}
+
+
+def hash_shingles(items):
+    return np.fromiter((zlib.crc32(s.encode('utf-8')) for s in items), dtype=np.uint64, count=len(items))
+
+
+# ========== MinHash ==========
+
+class MinHasher:
+    """h_i(x) = (a_i * x + b_i) mod p の num_perm 個のハッシュ関数による MinHash"""
+
+    def __init__(self, num_perm, seed):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, 1 << 32, num_perm, dtype=np.uint64)[:, None]
+        self.b = rng.integers(0, 1 << 32, num_perm, dtype=np.uint64)[:, None]
+        self.num_perm = num_perm
+
+    def signatures(self, shingle_hashes, batch_shingles=1 << 16):
+        """
+        文書ごとのシングルハッシュの配列から (文書数, num_perm) のシグネチャを作る
+        文書をまたいでハッシュを連結し、シングル数が batch_shingles 程度になる単位でまとめて計算する
+        """
+        count = len(shingle_hashes)
+        result = np.empty((count, self.num_perm), dtype=np.uint32)
+        start = 0
+        while start < count:
+            end = start
+            total = 0
+            while end < count and (total == 0 or total + len(shingle_hashes[end]) <= batch_shingles):
+                total += len(shingle_hashes[end])
+                end += 1
+            batch = shingle_hashes[start:end]
+            lengths = np.array([len(h) for h in batch])
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            values = np.concatenate(batch)
+            hashed = (self.a * values[None, :] % PRIME + self.b) % PRIME & MAX_HASH
+            result[start:end] = np.minimum.reduceat(hashed, offsets, axis=1).T
+            start = end
+        return result
+
+
+def lsh_candidates(signatures, bands, rows, max_bucket):
+    """
+    どれかの帯でシグネチャが一致する文書の組（i < j）を返す
+    帯ごとに r 個の値を1つの64bitキーにまとめ、ソートして同じキーの文書をグループにする
+    """
+    count = len(signatures)
+    pairs = []
+    skipped = 0
+    multipliers = np.uint64(0x9e3779b97f4a7c15) ** np.arange(rows, dtype=np.uint64)
+    for band in range(bands):
+        block = signatures[:, band * rows:(band + 1) * rows].astype(np.uint64)
+        keys = (block * multipliers[None, :]).sum(axis=1, dtype=np.uint64)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        boundaries = np.flatnonzero(np.diff(sorted_keys)) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [count]))
+        for s, e in zip(starts[ends - starts >= 2], ends[ends - starts >= 2]):
+            size = e - s
+            if size > max_bucket:
+                skipped += 1
+                continue
+            members = np.sort(order[s:e])
+            i, j = np.triu_indices(size, 1)
+            pairs.append(members[i].astype(np.int64) * count + members[j])
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64), skipped
+    encoded = np.unique(np.concatenate(pairs))
+    return np.stack((encoded // count, encoded % count), axis=1), skipped
+
+
+def lsh_probability(similarity, bands, rows):
+    """類似度 s の組が候補になる確率 1 - (1 - s^r)^b"""
+    return 1 - (1 - similarity ** rows) ** bands
+
+
+# ========== 検出 ==========
+
+class UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            self.parent[max(a, b)] = min(a, b)
+
+
+def describe(doc):
+    source, record_id, field, lang, text = doc
+    excerpt = text if len(text) <= EXCERPT_LENGTH else text[:EXCERPT_LENGTH] + '…'
+    return {'source': source, 'id': record_id, 'field': field, 'lang': lang, 'text': excerpt}
+
+
+def is_mirror_copy(doc_a, doc_b):
+    return doc_a[1:3] == doc_b[1:3] and ((doc_a[0], doc_b[0]) in MIRRORS or (doc_b[0], doc_a[0]) in MIRRORS)
+
+
+def mirror_drift(documents, args):
+    """
+    元ファイルと写しで同じ (record_id, field) の内容を比べる
+    戻り値は (一致した件数, 片方にしかない件数, [(similarity, index_a, index_b), ...])
+    """
+    matched = 0
+    missing = 0
+    drift = []
+    for primary, copy in MIRRORS:
+        by_key = {}
+        for index, doc in enumerate(documents):
+            if doc[0] in (primary, copy):
+                by_key.setdefault(doc[1:3], {})[doc[0]] = index
+        for indexes in by_key.values():
+            if len(indexes) < 2:
+                missing += 1
+                continue
+            a, b = indexes[primary], indexes[copy]
+            lang = documents[a][3]
+            text_a, text_b = normalize(documents[a][4], lang), normalize(documents[b][4], lang)
+            if text_a == text_b:
+                matched += 1
+                continue
+            set_a = shingles(text_a, lang, args.shingle_size)
+            set_b = shingles(text_b, lang, args.shingle_size)
+            similarity = len(set_a & set_b) / len(set_a | set_b) if set_a | set_b else 0.0
+            drift.append((similarity, a, b))
+    drift.sort()
+    return matched, missing, drift
+
+
+def find_duplicates(documents, args):
+    hasher = MinHasher(args.bands * args.rows, args.seed)
+    pairs = []
+    stats = {}
+    for lang in ('en', 'ja'):
+        indexes = []
+        shingle_sets = []
+        normalized = []
+        for index, doc in enumerate(documents):
+            if doc[3] != lang:
+                continue
+            text = normalize(doc[4], lang)
+            items = shingles(text, lang, args.shingle_size)
+            if len(items) < args.min_shingles:
+                continue
+            indexes.append(index)
+            shingle_sets.append(items)
+            normalized.append(text)
+        if not indexes:
+            continue
+
+        start = time.perf_counter()
+        signatures = hasher.signatures([hash_shingles(list(items)) for items in shingle_sets])
+        signature_time = time.perf_counter() - start
+        start = time.perf_counter()
+        candidates, skipped = lsh_candidates(signatures, args.bands, args.rows, args.max_bucket)
+        lsh_time = time.perf_counter() - start
+
+        for a, b in candidates:
+            doc_a, doc_b = documents[indexes[a]], documents[indexes[b]]
+            # 同じレコードの別フィールドと、写しの同じ段落は対象外
+            if doc_a[:2] == doc_b[:2] or is_mirror_copy(doc_a, doc_b):
+                continue
+            set_a, set_b = shingle_sets[a], shingle_sets[b]
+            similarity = len(set_a & set_b) / len(set_a | set_b)
+            if similarity < args.min_similarity:
+                continue
+            estimate = float(np.mean(signatures[a] == signatures[b]))
+            pairs.append((similarity, estimate, normalized[a] == normalized[b], indexes[a], indexes[b]))
+        stats[lang] = {
+            'documents': len(indexes),
+            'candidates': int(len(candidates)),
+            'skipped_buckets': skipped,
+            'signature_seconds': round(signature_time, 3),
+            'lsh_seconds': round(lsh_time, 3),
+        }
+    pairs.sort(key=lambda p: (-p[0], p[3], p[4]))
+    return pairs, stats
+
+
+def build_report(documents, pairs, stats, mirrors, args):
+    union = UnionFind(len(documents))
+    by_sources = Counter()
+    for _, _, _, a, b in pairs:
+        union.union(a, b)
+        by_sources[' ↔ '.join(sorted({documents[a][0], documents[b][0]}))] += 1
+
+    clusters = {}
+    for _, _, _, a, b in pairs:
+        for index in (a, b):
+            clusters.setdefault(union.find(index), set()).add(index)
+    cluster_list = sorted(clusters.values(), key=lambda members: (-len(members), min(members)))
+
+    return {
+        'params': {
+            'shingle_size': args.shingle_size,
+            'bands': args.bands,
+            'rows': args.rows,
+            'min_similarity': args.min_similarity,
+            # この類似度の組が候補に入る確率（見逃しの目安）
+            'recall_at_min_similarity': round(lsh_probability(args.min_similarity, args.bands, args.rows), 4),
+        },
+        'documents': dict(Counter(doc[0] for doc in documents)),
+        'stats': stats,
+        'summary': {
+            'pairs': len(pairs),
+            'exact_pairs': sum(1 for p in pairs if p[2]),
+            'clusters': len(cluster_list),
+            'by_sources': dict(by_sources.most_common()),
+        },
+        'mirror_drift': {
+            'matched': mirrors[0],
+            'missing': mirrors[1],
+            'drifted': len(mirrors[2]),
+            # 食い違いの大きい順
+            'records': [
+                {'similarity': round(similarity, 4), 'a': describe(documents[a]), 'b': describe(documents[b])}
+                for similarity, a, b in mirrors[2]
+            ],
+        },
+        'clusters': [
+            {'size': len(members), 'members': [describe(documents[i]) for i in sorted(members)[:args.cluster_members]]}
+            for members in cluster_list[:args.top]
+        ],
+        'pairs': [
+            {
+                'similarity': round(similarity, 4),
+                'estimate': round(estimate, 4),
+                'exact': exact,
+                'a': describe(documents[a]),
+                'b': describe(documents[b]),
+            }
+            for similarity, estimate, exact, a, b in pairs
+        ],
+    }
+
+
+def print_summary(report, elapsed, top):
+    summary = report['summary']
+    print(f"対象: {sum(report['documents'].values())}件（{', '.join(f'{k}: {v}' for k, v in report['documents'].items())}）")
+    for lang, s in report['stats'].items():
+        print(f"  [{lang}] {s['documents']}件, 候補 {s['candidates']}組, "
+              f"MinHash {s['signature_seconds']:.2f}s, LSH {s['lsh_seconds']:.2f}s"
+              + (f", 大きすぎるバケット {s['skipped_buckets']}件をスキップ" if s['skipped_buckets'] else ''))
+    print(f"類似 {summary['pairs']}組（完全一致 {summary['exact_pairs']}組）, クラスター {summary['clusters']}件 {elapsed:.2f}秒")
+    for sources, count in summary['by_sources'].items():
+        print(f'  {sources}: {count}組')
+    drift = report['mirror_drift']
+    print(f"写しとの比較: 一致 {drift['matched']}件, 食い違い {drift['drifted']}件, 片方のみ {drift['missing']}件")
+
+    if top:
+        print(f'\n類似度の高い順（上位{top}組）')
+        for pair in report['pairs'][:top]:
+            a, b = pair['a'], pair['b']
+            print(f"  {pair['similarity']:.3f} {a['source']}:{a['id']}.{a['field']} ↔ {b['source']}:{b['id']}.{b['field']}")
+            print(f"        {a['text'][:60]!r}")
+            print(f"        {b['text'][:60]!r}")
+        if drift['records']:
+            print(f'\n写しとの食い違い（上位{top}件）')
+            for record in drift['records'][:top]:
+                a, b = record['a'], record['b']
+                print(f"  {record['similarity']:.3f} {a['id']}.{a['field']} {a['source']} ↔ {b['source']}")
+                print(f"        {a['text'][:60]!r}")
+                print(f"        {b['text'][:60]!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='コンテンツの重複・類似テキスト検出（MinHash + LSH）')
+    parser.add_argument('--root', type=Path, default=ROOT_DIR, help='コンテンツを読むディレクトリ')
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT, help='レポートの出力先（JSON）')
+    parser.add_argument('--min-similarity', type=float, default=0.6, help='報告する Jaccard 係数の下限')
+    parser.add_argument('--shingle-size', type=int, default=3, help='英語は単語数、日本語は文字数')
+    parser.add_argument('--min-shingles', type=int, default=5, help='シングルがこれより少ない短文は対象外')
+    parser.add_argument('--bands', type=int, default=32)
+    parser.add_argument('--rows', type=int, default=4, help='帯あたりの行数（bands × rows がハッシュ関数の数）')
+    parser.add_argument('--max-bucket', type=int, default=2000, help='これより大きいバケットは候補を作らない')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--top', type=int, default=20, help='表示・出力するクラスター数と表示する組数')
+    parser.add_argument('--cluster-members', type=int, default=10, help='クラスターごとに出力するメンバー数')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    documents = [doc for source in SOURCES for doc in source(args.root) if doc[4]]
+    pairs, stats = find_duplicates(documents, args)
+    report = build_report(documents, pairs, stats, mirror_drift(documents, args), args)
+    elapsed = time.perf_counter() - start
+
+    print_summary(report, elapsed, args.top)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f'\nレポート: {args.output}')
+
+
+if __name__ == '__main__':
+    main()
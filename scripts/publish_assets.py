@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+ビルド済みアセット（データ・スプライト・音声など）をストレージプロキシへまとめて公開する
+
+server/storage.ts の storagePut は1ファイルごとに v1/storage/upload を呼ぶため、
+数千ファイルの配信を1件ずつ送ると往復遅延の合計で時間が決まってしまう。ここでは:
+- オブジェクトのキーを内容ハッシュにする（{prefix}/objects/ab/abcdef....png）。同じ内容は1回だけ送る
+- 送信済みのハッシュはローカルのマニフェスト（.publish-manifest.jsonl）に1件ずつ追記する。
+  中断しても、次の実行はマニフェストにないものだけを送る（再開）
+- 残りは asyncio の keep-alive 接続プールから --concurrency 本を同時に使って送る。
+  接続エラー・5xx・429 は指数バックオフで再試行する
+- 全オブジェクトが揃ってから、パス → URL の対応表（リリースインデックス）を最後に送る。
+  アプリ側はインデックスだけを見ればよく、途中まで送られた状態が見えることはない
+
+接続先は server/_core/env.ts と同じ環境変数（BUILT_IN_FORGE_API_URL, BUILT_IN_FORGE_API_KEY）。
+動作確認には storage_standin.py を使う。
+
+使い方:
+    python scripts/publish_assets.py                          # assets/ 以下を公開
+    python scripts/publish_assets.py assets/audio --release 1.0.1
+    python scripts/publish_assets.py --dry-run                # 送る件数と量だけ表示
+    python scripts/publish_assets.py --url http://127.0.0.1:8787 --api-key test --concurrency 32
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import mimetypes
+import os
+import random
+import ssl
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_ROOTS = ['assets']
+MANIFEST_FILE = ROOT_DIR / '.publish-manifest.jsonl'
+
+DEFAULT_PREFIX = 'content'
+DEFAULT_CONCURRENCY = 16
+DEFAULT_RETRIES = 5
+REQUEST_TIMEOUT = 120
+READ_CHUNK = 256 * 1024
+HASH_CHUNK = 1 << 20
+
+mimetypes.add_type('audio/mp4', '.m4a')
+
+
+# ========== HTTP クライアント ==========
+
+class HTTPError(Exception):
+    def __init__(self, status, body):
+        super().__init__(f'HTTP {status}: {body[:200].decode("utf-8", "replace")}')
+        self.status = status
+
+    @property
+    def retryable(self):
+        return self.status >= 500 or self.status in (408, 429)
+
+
+@dataclass
+class Response:
+    status: int
+    headers: dict
+    body: bytes
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class ConnectionPool:
+    """keep-alive の接続を使い回す最小限の HTTP/1.1 クライアント
+
+    同時に使う接続は size 本まで。使い終わった接続は idle に戻し、次のリクエストで再利用する
+    （接続・TLS ハンドシェイクの往復をリクエストごとに払わない）。
+    """
+
+    def __init__(self, base_url, size, timeout=REQUEST_TIMEOUT):
+        url = urlsplit(base_url)
+        if url.scheme not in ('http', 'https'):
+            raise ValueError(f'http(s) の URL を指定してください: {base_url}')
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == 'https' else 80)
+        self.ssl = ssl.create_default_context() if url.scheme == 'https' else None
+        self.base_path = url.path.rstrip('/')
+        self.timeout = timeout
+        self.slots = asyncio.Semaphore(size)
+        self.idle = []
+        self.opened = 0
+
+    async def request(self, method, path, headers, body=()):
+        """body は bytes か Path（ファイルを READ_CHUNK ずつ送る）の並び"""
+        async with self.slots:
+            while True:
+                reused = bool(self.idle)
+                reader, writer = self.idle.pop() if reused else await self._connect()
+                try:
+                    response, keep_alive = await asyncio.wait_for(
+                        self._exchange(reader, writer, method, path, headers, body), self.timeout
+                    )
+                    break
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    # 待機中にサーバー側で閉じられた keep-alive 接続なら、すぐに張り直す
+                    if not reused:
+                        raise
+                except BaseException:
+                    writer.close()
+                    raise
+            if keep_alive:
+                self.idle.append((reader, writer))
+            else:
+                writer.close()
+            return response
+
+    async def _connect(self):
+        self.opened += 1
+        return await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+
+    async def _exchange(self, reader, writer, method, path, headers, body):
+        length = sum(part.stat().st_size if isinstance(part, Path) else len(part) for part in body)
+        lines = [f'{method} {self.base_path}{path} HTTP/1.1', f'Host: {self.host}:{self.port}',
+                 f'Content-Length: {length}', 'Connection: keep-alive']
+        lines += [f'{name}: {value}' for name, value in headers.items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        for part in body:
+            if isinstance(part, Path):
+                with open(part, 'rb') as f:
+                    while chunk := f.read(READ_CHUNK):
+                        writer.write(chunk)
+                        await writer.drain()
+            else:
+                writer.write(part)
+        await writer.drain()
+        return await self._read_response(reader)
+
+    async def _read_response(self, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError('サーバーが接続を閉じました')
+        version, status = status_line.decode('latin-1').split(None, 2)[:2]
+        headers = {}
+        while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            body = bytearray()
+            while (size := int((await reader.readline()).split(b';')[0], 16)):
+                body += await reader.readexactly(size)
+                await reader.readexactly(2)
+            while await reader.readline() not in (b'\r\n', b'\n', b''):
+                pass
+            body = bytes(body)
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        else:
+            body = await reader.read()
+            headers['connection'] = 'close'
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' and (version != 'HTTP/1.0' or connection == 'keep-alive')
+        return Response(int(status), headers, body), keep_alive
+
+    def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle.clear()
+
+
+# ========== マニフェスト ==========
+
+class PublishManifest:
+    """送信済みオブジェクトの記録（接続先ごと）。1件送るたびに1行追記する"""
+
+    def __init__(self, path, remote):
+        self.path = Path(path)
+        self.remote = remote
+        self.objects = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # 書き込み途中で止まった最後の行
+                    if record.get('remote') == remote:
+                        self.objects[record['hash']] = record
+        self._file = None
+
+    def __contains__(self, digest):
+        return digest in self.objects
+
+    def record(self, digest, key, url, size):
+        record = {'remote': self.remote, 'hash': digest, 'key': key, 'url': url, 'size': size}
+        self.objects[digest] = record
+        if self._file is None:
+            self._file = open(self.path, 'a+', encoding='utf-8')
+            # 前回が行の途中で止まっていたら、その行とつながらないように改行してから追記する
+            if self._file.tell() > 0:
+                self._file.seek(self._file.tell() - 1)
+                if self._file.read(1) != '\n':
+                    self._file.write('\n')
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# ========== 公開 ==========
+
+@dataclass
+class Asset:
+    path: Path
+    rel: str
+    size: int
+    digest: str = ''
+
+
+def collect_assets(roots):
+    assets = []
+    for root in roots:
+        root = (ROOT_DIR / root).resolve()
+        files = [root] if root.is_file() else sorted(p for p in root.rglob('*') if p.is_file())
+        for path in files:
+            rel = path.relative_to(ROOT_DIR).as_posix()
+            if any(part.startswith('.') for part in Path(rel).parts):
+                continue
+            assets.append(Asset(path, rel, path.stat().st_size))
+    return assets
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(HASH_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def object_key(prefix, digest, rel):
+    return f'{prefix}/objects/{digest[:2]}/{digest}{Path(rel).suffix.lower()}'
+
+
+class Publisher:
+    def __init__(self, pool, api_key, manifest, retries):
+        self.pool = pool
+        self.auth = {'Authorization': f'Bearer {api_key}'}
+        self.manifest = manifest
+        self.retries = retries
+        self.boundary = uuid.uuid4().hex
+        self.sent_bytes = 0
+        self.retried = 0
+
+    async def upload(self, key, body, filename, content_type):
+        """1オブジェクトを送り、URL を返す（一時的な失敗は再試行）"""
+        head = (
+            f'--{self.boundary}\r\n'
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'
+        ).encode('utf-8')
+        tail = f'\r\n--{self.boundary}--\r\n'.encode('latin-1')
+        headers = dict(self.auth, **{'Content-Type': f'multipart/form-data; boundary={self.boundary}'})
+        path = f'/v1/storage/upload?path={quote(key)}'
+
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self.pool.request('POST', path, headers, [head, body, tail])
+                if response.status >= 400:
+                    raise HTTPError(response.status, response.body)
+                return response.json()['url']
+            except (HTTPError, OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as e:
+                if attempt == self.retries or (isinstance(e, HTTPError) and not e.retryable):
+                    raise
+                self.retried += 1
+                await asyncio.sleep(min(30, 0.5 * 2 ** attempt) * random.uniform(0.5, 1.5))
+
+    async def publish_object(self, asset, key):
+        content_type = mimetypes.guess_type(asset.rel)[0] or 'application/octet-stream'
+        url = await self.upload(key, asset.path, Path(asset.rel).name, content_type)
+        self.manifest.record(asset.digest, key, url, asset.size)
+        self.sent_bytes += asset.size
+
+    async def run(self, jobs, concurrency, progress_every=100):
+        """jobs（(Asset, キー) の並び）を concurrency 本のワーカーで送る。失敗したものを返す"""
+        queue = asyncio.Queue()
+        for job in jobs:
+            queue.put_nowait(job)
+        failed = []
+        done = 0
+        start = time.perf_counter()
+
+        async def worker():
+            nonlocal done
+            while not queue.empty():
+                asset, key = queue.get_nowait()
+                try:
+                    await self.publish_object(asset, key)
+                except (HTTPError, OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError) as e:
+                    failed.append((asset, e))
+                    print(f'失敗: {asset.rel}: {e}')
+                done += 1
+                if done % progress_every == 0:
+                    elapsed = time.perf_counter() - start
+                    print(f'  {done}/{len(jobs)} ({self.sent_bytes / 1024 / 1024 / elapsed:.1f}MB/s)')
+
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, len(jobs)))))
+        return failed
+
+
+def build_index(assets, manifest, release):
+    files = {}
+    for asset in assets:
+        record = manifest.objects[asset.digest]
+        files[asset.rel] = {'key': record['key'], 'url': record['url'], 'hash': asset.digest, 'size': asset.size}
+    return {'release': release, 'files': files}
+
+
+async def publish(args, assets, todo, manifest):
+    pool = ConnectionPool(args.url, args.concurrency)
+    publisher = Publisher(pool, args.api_key, manifest, args.retries)
+    try:
+        start = time.perf_counter()
+        failed = await publisher.run(todo, args.concurrency)
+        elapsed = time.perf_counter() - start
+        if todo:
+            print(f'送信: {len(todo) - len(failed)}件 ({publisher.sent_bytes / 1024 / 1024:.1f}MB, '
+                  f'{elapsed:.1f}s), 再試行: {publisher.retried}回, 接続: {pool.opened}本')
+        if failed:
+            print(f'エラー: {len(failed)}件の送信に失敗しました（もう一度実行すると残りだけを送ります）')
+            return 1
+
+        index = build_index(assets, manifest, args.release)
+        body = json.dumps(index, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        release = args.release or hashlib.sha256(body).hexdigest()[:16]
+        key = f'{args.prefix}/releases/{release}.json'
+        url = await publisher.upload(key, body, f'{release}.json', 'application/json')
+        print(f'リリースインデックス: {key}')
+        print(f'  {url}')
+        return 0
+    finally:
+        pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ビルド済みアセットをストレージプロキシへ公開')
+    parser.add_argument('roots', nargs='*', default=DEFAULT_ROOTS, help='公開するディレクトリ（リポジトリ相対）')
+    parser.add_argument('--url', default=os.environ.get('BUILT_IN_FORGE_API_URL'), help='ストレージプロキシの URL')
+    parser.add_argument('--api-key', default=os.environ.get('BUILT_IN_FORGE_API_KEY'), help='API キー')
+    parser.add_argument('--prefix', default=DEFAULT_PREFIX, help='オブジェクトキーの接頭辞')
+    parser.add_argument('--release', help='リリース名（既定: インデックスの内容ハッシュ）')
+    parser.add_argument('-c', '--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='同時に使う接続数')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES, help='一時的な失敗の再試行回数')
+    parser.add_argument('--manifest', default=str(MANIFEST_FILE), help='送信済みオブジェクトの記録')
+    parser.add_argument('--dry-run', action='store_true', help='送らずに件数と量だけ表示')
+    args = parser.parse_args()
+
+    if not args.dry_run and (not args.url or not args.api_key):
+        sys.exit('エラー: BUILT_IN_FORGE_API_URL と BUILT_IN_FORGE_API_KEY（または --url, --api-key）を指定してください')
+    remote = (args.url or '').rstrip('/')
+
+    assets = collect_assets(args.roots)
+    with ThreadPoolExecutor() as pool:
+        for asset, digest in zip(assets, pool.map(file_digest, [a.path for a in assets])):
+            asset.digest = digest
+
+    manifest = PublishManifest(args.manifest, remote)
+    todo = {}
+    for asset in assets:
+        if asset.digest not in manifest and asset.digest not in todo:
+            todo[asset.digest] = (asset, object_key(args.prefix, asset.digest, asset.rel))
+    todo = list(todo.values())
+    total = sum(a.size for a in assets)
+    pending = sum(asset.size for asset, _ in todo)
+    published = sum(1 for a in assets if a.digest in manifest)
+    print(f'アセット: {len(assets)}件 ({total / 1024 / 1024:.1f}MB), '
+          f'送信済み: {published}件, 送信が必要: {len(todo)}件 ({pending / 1024 / 1024:.1f}MB)')
+    if args.dry_run:
+        return
+
+    try:
+        status = asyncio.run(publish(args, assets, todo, manifest))
+    except KeyboardInterrupt:
+        status = f'中断しました（送信済みのものは {Path(args.manifest).name} に記録済み。もう一度実行すると続きから送ります）'
+    finally:
+        manifest.close()
+    sys.exit(status)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+用語の見出し語と例文の音声をビルド時に合成する（オフライン TTS）
+
+アプリは詳細画面で expo-speech により毎回その場で合成しているため、再生までに間があり、
+同じ文を何度も合成し直している。ここでは terms.json の en_canonical と examples.json の
+example_en をローカルの TTS エンジンで WAV にし、ffmpeg で AAC（モノラル・低ビットレート）に
+圧縮して assets/audio/ に置く。
+- クリップのファイル名は「エンジン・声・速度・ビットレート・本文」のハッシュ。本文が変わった文だけ作り直す
+- 同じ本文は1つのクリップを共有する。どこからも参照されなくなったクリップは削除する
+- 合成と圧縮はプロセスプールで並列に実行する
+- assets/audio/manifest.json（term_id → クリップ）と、アプリ用の lib/generated-audio.ts を書き出す
+
+lib/generated-audio.ts には本文のチェックサム（content_patch.py と同じ FNV-1a）も入れ、
+コンテンツパッチで本文が変わった場合はアプリ側で expo-speech に戻す。
+
+エンジン（最初に見つかったもの。--engine で指定も可）:
+- piper       ニューラル TTS。--voice に .onnx モデルのパス（または環境変数 PIPER_MODEL）
+- espeak-ng   --voice は言語・声（既定: en-us）
+- pico2wave   --voice は言語（既定: en-US）
+
+使い方:
+    python scripts/render_audio.py                          # 変更のあった文だけ合成
+    python scripts/render_audio.py --engine piper --voice voices/en_US-amy-medium.onnx
+    python scripts/render_audio.py --dry-run                # 合成が必要な件数だけ表示
+    python scripts/render_audio.py --skip-if-unavailable    # エンジンがなければ何もせず終了（build_pipeline 用）
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from content_model import ROOT_DIR, load_content
+from content_patch import checksum
+
+AUDIO_DIR = ROOT_DIR / 'assets' / 'audio'
+MANIFEST_FILE = AUDIO_DIR / 'manifest.json'
+INDEX_FILE = ROOT_DIR / 'lib' / 'generated-audio.ts'
+
+CLIP_EXT = '.m4a'
+SAMPLE_RATE = 22050
+BITRATE = '32k'
+# hooks/use-speech.ts の speakEnglish と同じ速さ
+DEFAULT_RATE = 0.85
+
+
+def piper_command(text_path, wav_path, voice, rate):
+    model = voice or os.environ.get('PIPER_MODEL')
+    if not model:
+        raise RuntimeError('piper には --voice（または PIPER_MODEL）で .onnx モデルを指定してください')
+    return ['piper', '--model', model, '--length_scale', f'{1 / rate:.3f}',
+            '--output_file', wav_path, '--input_file', text_path]
+
+
+def espeak_command(text_path, wav_path, voice, rate):
+    # espeak-ng の標準の速さは 175 語/分
+    return ['espeak-ng', '-v', voice or 'en-us', '-s', str(round(175 * rate)), '-w', wav_path, '-f', text_path]
+
+
+def pico_command(text_path, wav_path, voice, rate):
+    # pico2wave は速さを指定できず、本文は引数でしか渡せない
+    text = Path(text_path).read_text(encoding='utf-8')
+    return ['pico2wave', '-l', voice or 'en-US', '-w', wav_path, text]
+
+
+# エンジン名 → (実行ファイル, コマンドを組み立てる関数)。先にあるものを優先する
+ENGINES = {
+    'piper': ('piper', piper_command),
+    'espeak-ng': ('espeak-ng', espeak_command),
+    'pico2wave': ('pico2wave', pico_command),
+}
+
+
+def find_engine(name=None, voice=None):
+    """使える TTS エンジンの名前を返す（なければ None）"""
+    candidates = [name] if name else list(ENGINES)
+    for candidate in candidates:
+        if not shutil.which(ENGINES[candidate][0]):
+            continue
+        # モデルの指定がない piper は自動では選ばない
+        if candidate == 'piper' and not name and not (voice or os.environ.get('PIPER_MODEL')):
+            continue
+        return candidate
+    return None
+
+
+def normalize_text(text):
+    return ' '.join(text.split())
+
+
+def clip_name(engine, voice, rate, text):
+    """クリップのファイル名（合成条件と本文の内容ハッシュ）"""
+    key = '\0'.join([engine, voice or '', f'{rate:.3f}', BITRATE, str(SAMPLE_RATE), text])
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=10).hexdigest() + CLIP_EXT
+
+
+def render_clip(engine, voice, rate, text, output_path):
+    """1つの文を合成して AAC に圧縮する（プロセスプールのワーカーで実行）"""
+    with tempfile.TemporaryDirectory(prefix='tts-') as tmp:
+        text_path = os.path.join(tmp, 'text.txt')
+        wav_path = os.path.join(tmp, 'speech.wav')
+        encoded_path = os.path.join(tmp, 'speech' + CLIP_EXT)
+        Path(text_path).write_text(text, encoding='utf-8')
+
+        command = ENGINES[engine][1](text_path, wav_path, voice, rate)
+        subprocess.run(command, check=True, capture_output=True)
+        subprocess.run(
+            ['ffmpeg', '-y', '-loglevel', 'error', '-i', wav_path,
+             '-ac', '1', '-ar', str(SAMPLE_RATE), '-c:a', 'aac', '-b:a', BITRATE,
+             '-movflags', '+faststart', encoded_path],
+            check=True, capture_output=True,
+        )
+        # 途中で止まっても壊れたクリップが残らないよう、出来上がってから置き換える
+        shutil.move(encoded_path, output_path)
+    return os.path.getsize(output_path)
+
+
+def collect_texts():
+    """term_id ごとの読み上げ文: {term_id: {'headword': 本文, 'example': 本文}}"""
+    content = load_content()
+    texts = {}
+    for term in content.terms:
+        if term.en_canonical:
+            texts.setdefault(term.term_id, {})['headword'] = normalize_text(term.en_canonical)
+    for example in content.examples:
+        if example.example_en and example.term_id in texts:
+            texts[example.term_id]['example'] = normalize_text(example.example_en)
+    return texts
+
+
+def write_manifest(engine, voice, rate, clips):
+    manifest = {'engine': engine, 'voice': voice, 'rate': rate, 'clips': clips}
+    AUDIO_DIR.mkdir(parents=True, exist_ok=True)
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def write_index(clips):
+    """クリップを読み込む lib/generated-audio.ts を書き出す（Metro は静的な require しか解決できない）"""
+    lines = [
+        '// 自動生成ファイル（scripts/render_audio.py）。直接編集しないこと',
+        '',
+        'export interface GeneratedAudioClip {',
+        '  // 読み上げた本文の contentChecksum（lib/content-patch.ts）',
+        '  checksum: string;',
+        '  source: number;',
+        '}',
+        '',
+        'export interface GeneratedAudioClips {',
+        '  headword?: GeneratedAudioClip;',
+        '  example?: GeneratedAudioClip;',
+        '}',
+        '',
+        'export const GENERATED_AUDIO_CLIPS: Record<string, GeneratedAudioClips> = {',
+    ]
+    for term_id in sorted(clips):
+        entries = []
+        for kind in ('headword', 'example'):
+            if kind in clips[term_id]:
+                clip = clips[term_id][kind]
+                entries.append(
+                    f"{kind}: {{ checksum: '{clip['checksum']}', "
+                    f"source: require('@/assets/audio/{clip['file']}') }}"
+                )
+        lines.append(f"  {term_id}: {{ {', '.join(entries)} }},")
+    lines += ['};', '']
+    INDEX_FILE.write_text('\n'.join(lines), encoding='utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='見出し語と例文の音声をオフライン TTS で合成')
+    parser.add_argument('--engine', choices=list(ENGINES), help='TTS エンジン（既定: 見つかったもの）')
+    parser.add_argument('--voice', help='声・言語（piper はモデルのパス）')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help='読み上げの速さ（1.0 が標準）')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help='並列に合成する数')
+    parser.add_argument('--dry-run', action='store_true', help='合成が必要な件数だけ表示')
+    parser.add_argument('--skip-if-unavailable', action='store_true',
+                        help='TTS エンジンか ffmpeg がなければ何もせず終了する')
+    args = parser.parse_args()
+
+    engine = find_engine(args.engine, args.voice)
+    missing = [] if engine else [args.engine or '/'.join(ENGINES)]
+    if not shutil.which('ffmpeg'):
+        missing.append('ffmpeg')
+    if missing and not args.dry_run:
+        message = f"見つかりません: {', '.join(missing)}"
+        if args.skip_if_unavailable:
+            print(f'スキップ: {message}')
+            return
+        sys.exit(f'エラー: {message}')
+    engine = engine or args.engine or 'espeak-ng'
+    voice = args.voice or (os.environ.get('PIPER_MODEL') if engine == 'piper' else None)
+
+    texts = collect_texts()
+    clips = {}
+    jobs = {}
+    for term_id, kinds in texts.items():
+        for kind, text in kinds.items():
+            name = clip_name(engine, voice, args.rate, text)
+            clips.setdefault(term_id, {})[kind] = {'file': name, 'checksum': checksum(text)}
+            if not (AUDIO_DIR / name).exists():
+                jobs.setdefault(name, text)
+
+    total = sum(len(kinds) for kinds in clips.values())
+    unique = len({clip['file'] for kinds in clips.values() for clip in kinds.values()})
+    print(f'読み上げ文: {total}件（異なる本文 {unique}件）, 合成が必要: {len(jobs)}件 [{engine}]')
+    if args.dry_run:
+        return
+
+    AUDIO_DIR.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    failed = []
+    written = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {
+            pool.submit(render_clip, engine, voice, args.rate, text, str(AUDIO_DIR / name)): name
+            for name, text in jobs.items()
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            name = futures[future]
+            try:
+                written += future.result()
+            except (subprocess.CalledProcessError, RuntimeError, OSError) as e:
+                detail = getattr(e, 'stderr', b'') or b''
+                failed.append(name)
+                print(f'失敗: {jobs[name]!r}: {e} {detail.decode("utf-8", "replace").strip()}')
+            if done % 100 == 0:
+                print(f'  {done}/{len(jobs)}')
+
+    if failed:
+        sys.exit(f'エラー: {len(failed)}件の合成に失敗しました（マニフェストは更新していません）')
+
+    referenced = {clip['file'] for kinds in clips.values() for clip in kinds.values()}
+    removed = 0
+    for path in AUDIO_DIR.glob('*' + CLIP_EXT):
+        if path.name not in referenced:
+            path.unlink()
+            removed += 1
+
+    write_manifest(engine, voice, args.rate, clips)
+    write_index(clips)
+    elapsed = time.perf_counter() - start
+    print(f'合成: {len(jobs)}件 ({written / 1024:.0f}KB, {elapsed:.1f}s), 削除: {removed}件')
+    print(f'出力: {MANIFEST_FILE.relative_to(ROOT_DIR)}, {INDEX_FILE.relative_to(ROOT_DIR)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+復習イベント（1回の回答 = 1件）の列指向ストアと集計
+
+アプリの「復習履歴エクスポート」（lib/review-log.ts の TSV）を取り込み、分野別の定着率・忘却曲線・
+リーチ（何度も忘れる用語）を集計する。数億件でも全件をメモリに載せずに済むよう:
+- イベントは NumPy の構造化配列（固定長 26 バイト）で、日付（UTC）ごとのファイルに追記だけする
+  （.review-events/days/2026-10-19.bin）。既存のファイルを書き換えることはない
+- 集計は各ファイルを np.memmap で開き、CHUNK_ROWS 行ずつ np.bincount でまとめる。
+  使うメモリは1チャンク分だけで、期間を指定すれば対象の日のファイルしか読まない
+- term_id・ユーザー名は整数の添字にして列に持ち、対応表は meta.json に置く
+取り込みは (ユーザー, term, 回答時刻, ボタン) が同じイベントを既存のものと見なして飛ばすので、
+同じ履歴を何度取り込んでも、別の端末・別のエクスポートの履歴を同じユーザーに取り込んでも重複も欠落もしない。
+照合には取り込むイベントのある日のファイルだけを読む。
+
+使い方:
+    python scripts/review_events.py import review-log.tsv --user alice
+    python scripts/review_events.py retention                    # 分野 × 前回の間隔ごとの定着率
+    python scripts/review_events.py forgetting                   # 分野ごとの忘却曲線（安定度・半減期）
+    python scripts/review_events.py leeches --min-lapses 8
+    python scripts/review_events.py daily --since 2026-10-01
+    python scripts/review_events.py export --since 2026-10-01 -o events.csv
+    python scripts/review_events.py generate --events 100000000 --days 365   # 合成データ（計測用）
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+from content_model import ROOT_DIR, load_content, open_bundle
+
+STORE_DIR = ROOT_DIR / '.review-events'
+
+EVENT_DTYPE = np.dtype([
+    ('reviewed_at', '<i8'),    # UNIX時刻（ミリ秒）
+    ('term', '<u4'),           # meta.json の terms の添字
+    ('user', '<u4'),           # meta.json の users の添字
+    ('interval', '<f4'),       # 回答後の復習間隔（日）
+    ('last_interval', '<f4'),  # 回答前の復習間隔（日）
+    ('button', 'u1'),          # 1: again, 2: hard, 3: good, 4: easy
+    ('algorithm', 'u1'),       # ALGORITHMS の添字
+])
+
+# lib/review-log.ts と同じコード
+BUTTONS = ['again', 'hard', 'good', 'easy']
+ALGORITHMS = ['sm2', 'sm2_anki', 'fsrs']
+AGAIN = 1
+
+# 前回の間隔（日）の区切り。最後の区間は 365 日以上
+INTERVAL_EDGES = np.array([0, 1, 2, 4, 7, 14, 30, 60, 120, 365], dtype=np.float32)
+CHUNK_ROWS = 1 << 20
+IMPORT_BATCH = 100_000
+DAY_MS = 24 * 60 * 60 * 1000
+UNKNOWN_TOPIC = '?'
+
+
+def day_of(ms):
+    return datetime.fromtimestamp(ms / 1000, timezone.utc).date()
+
+
+def bucket_labels():
+    edges = [f'{e:g}' for e in INTERVAL_EDGES]
+    return [f'{a}-{b}d' for a, b in zip(edges, edges[1:])] + [f'{edges[-1]}d+']
+
+
+class ReviewEventStore:
+    """日付ごとのファイルに分けた追記専用のイベントストア"""
+
+    def __init__(self, path=STORE_DIR):
+        self.path = Path(path)
+        self.days_dir = self.path / 'days'
+        self.meta_path = self.path / 'meta.json'
+        if self.meta_path.exists():
+            with open(self.meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+        else:
+            meta = {'terms': [], 'topics': [], 'users': []}
+            for term in load_content().terms:
+                meta['terms'].append(term.term_id)
+                meta['topics'].append(term.topic_code or UNKNOWN_TOPIC)
+        self.terms = meta['terms']
+        self.topics = meta['topics']
+        self.users = meta['users']
+        self.term_index = {term_id: i for i, term_id in enumerate(self.terms)}
+        self.user_index = {name: i for i, name in enumerate(self.users)}
+
+    def save_meta(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp = self.meta_path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'terms': self.terms, 'topics': self.topics, 'users': self.users}, f, ensure_ascii=False)
+        os.replace(tmp, self.meta_path)
+
+    def term(self, term_id):
+        index = self.term_index.get(term_id)
+        if index is None:
+            index = self.term_index[term_id] = len(self.terms)
+            self.terms.append(term_id)
+            self.topics.append(UNKNOWN_TOPIC)
+        return index
+
+    def user(self, name):
+        index = self.user_index.get(name)
+        if index is None:
+            index = self.user_index[name] = len(self.users)
+            self.users.append(name)
+        return index
+
+    # ---------- 書き込み ----------
+
+    def append(self, events):
+        """構造化配列（EVENT_DTYPE）を日付ごとのファイルに追記する"""
+        if len(events) == 0:
+            return
+        self.days_dir.mkdir(parents=True, exist_ok=True)
+        days = events['reviewed_at'] // DAY_MS
+        order = np.argsort(days, kind='stable')
+        events, days = events[order], days[order]
+        starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+        for start, end in zip(starts, np.r_[starts[1:], len(events)]):
+            path = self.days_dir / f'{day_of(int(days[start]) * DAY_MS).isoformat()}.bin'
+            with open(path, 'ab') as f:
+                # 前回の書き込みが途中で止まっていたら、壊れた末尾のレコードを捨ててから追記する
+                torn = f.tell() % EVENT_DTYPE.itemsize
+                if torn:
+                    f.truncate(f.tell() - torn)
+                    f.seek(0, os.SEEK_END)
+                f.write(events[start:end].tobytes())
+
+    # ---------- 読み出し ----------
+
+    def partitions(self, since=None, until=None):
+        """対象期間の (日付, パス)。since・until は date（until を含む）"""
+        if not self.days_dir.exists():
+            return []
+        result = []
+        for path in sorted(self.days_dir.glob('*.bin')):
+            day = date.fromisoformat(path.stem)
+            if (since is None or day >= since) and (until is None or day <= until):
+                result.append((day, path))
+        return result
+
+    def scan(self, since=None, until=None, chunk_rows=CHUNK_ROWS):
+        """(日付, イベントのチャンク) を順に返す。チャンクは memmap のビュー（コピーしない）"""
+        for day, path in self.partitions(since, until):
+            rows = path.stat().st_size // EVENT_DTYPE.itemsize
+            if rows == 0:
+                continue
+            events = np.memmap(path, dtype=EVENT_DTYPE, mode='r', shape=(rows,))
+            for start in range(0, rows, chunk_rows):
+                yield day, events[start:start + chunk_rows]
+            del events
+
+    def keys(self, day, user):
+        """その日のファイルにある user のイベントの (term, reviewed_at, button) の集合"""
+        path = self.days_dir / f'{day.isoformat()}.bin'
+        if not path.exists():
+            return set()
+        rows = path.stat().st_size // EVENT_DTYPE.itemsize
+        if rows == 0:
+            return set()
+        events = np.memmap(path, dtype=EVENT_DTYPE, mode='r', shape=(rows,))
+        mine = events[events['user'] == user]
+        del events
+        return set(zip(mine['term'].tolist(), mine['reviewed_at'].tolist(), mine['button'].tolist()))
+
+    def count(self, since=None, until=None):
+        return sum(p.stat().st_size // EVENT_DTYPE.itemsize for _, p in self.partitions(since, until))
+
+
+# ========== 取り込み ==========
+
+def import_tsv(store, path, user_name):
+    """lib/review-log.ts の TSV を取り込む。同じユーザーの同じイベントがすでにあれば飛ばす
+
+    取り込み済みの最終時刻で切ると、同じユーザーに別の端末・エクスポートの履歴を取り込んだとき、
+    その時刻より前のイベントが落ちるため、イベントそのもの（term, 回答時刻, ボタン）で照合する。
+    """
+    user = store.user(user_name)
+    seen = {}  # 日付 -> この日のこのユーザーのイベントの集合（このファイルで追加した分も含む）
+    added = skipped = 0
+
+    def flush(rows):
+        nonlocal added
+        events = np.array(rows, dtype=EVENT_DTYPE)
+        store.append(events)
+        added += len(events)
+
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f, delimiter='\t')
+        missing = {'term_id', 'reviewed_at', 'button'} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f'{path}: 列がありません: {", ".join(sorted(missing))}')
+        rows = []
+        for record in reader:
+            reviewed_at = int(record['reviewed_at'])
+            term = store.term(record['term_id'])
+            button = BUTTONS.index(record['button']) + 1
+            day = day_of(reviewed_at)
+            if day not in seen:
+                seen[day] = store.keys(day, user)
+            key = (term, reviewed_at, button)
+            if key in seen[day]:
+                skipped += 1
+                continue
+            seen[day].add(key)
+            rows.append((
+                reviewed_at,
+                term,
+                user,
+                float(record.get('interval') or 0),
+                float(record.get('last_interval') or 0),
+                button,
+                ALGORITHMS.index(record['algorithm']) if record.get('algorithm') in ALGORITHMS else 0,
+            ))
+            if len(rows) >= IMPORT_BATCH:
+                flush(rows)
+                rows = []
+        if rows:
+            flush(rows)
+
+    store.save_meta()
+    return added, skipped
+
+
+def generate(store, events, days, users, seed, start_day):
+    """合成イベント（計測用）。分野ごとに安定度の違う指数関数の忘却曲線から正誤を引く"""
+    rng = np.random.default_rng(seed)
+    user_base = len(store.users)
+    for i in range(users):
+        store.user(f'synthetic-{user_base + i:06d}')
+    topics = sorted(set(store.topics))
+    topic_of_term = np.array([topics.index(t) for t in store.topics])
+    stability = rng.uniform(5, 60, len(topics))
+    per_day = np.full(days, events // days)
+    per_day[:events % days] += 1
+
+    for offset, n in enumerate(per_day):
+        day_start = (start_day - date(1970, 1, 1)).days * DAY_MS + offset * DAY_MS
+        chunk = np.empty(n, dtype=EVENT_DTYPE)
+        chunk['reviewed_at'] = np.sort(rng.integers(day_start, day_start + DAY_MS, n))
+        chunk['term'] = rng.integers(0, len(store.terms), n)
+        chunk['user'] = user_base + rng.integers(0, users, n)
+        last = rng.lognormal(1.5, 1.3, n).astype(np.float32)
+        last[rng.random(n) < 0.2] = 0
+        recall = np.exp(-last / stability[topic_of_term[chunk['term']]])
+        remembered = rng.random(n) < recall
+        chunk['button'] = np.where(remembered, rng.choice([2, 3, 4], n, p=[0.15, 0.7, 0.15]), AGAIN)
+        chunk['last_interval'] = last
+        chunk['interval'] = np.where(remembered, np.maximum(last, 1) * 2.5, 0)
+        chunk['algorithm'] = rng.integers(0, len(ALGORITHMS), n)
+        store.append(chunk)
+    store.save_meta()
+
+
+# ========== 集計 ==========
+
+class Filter:
+    """ユーザー・アルゴリズムでの絞り込み（None なら全件）"""
+
+    def __init__(self, store, user=None, algorithm=None):
+        self.user = None if user is None else store.user_index.get(user, -1)
+        self.algorithm = None if algorithm is None else ALGORITHMS.index(algorithm)
+
+    def apply(self, chunk):
+        mask = None
+        if self.user is not None:
+            mask = chunk['user'] == self.user
+        if self.algorithm is not None:
+            by_algorithm = chunk['algorithm'] == self.algorithm
+            mask = by_algorithm if mask is None else mask & by_algorithm
+        return chunk if mask is None else chunk[mask]
+
+
+def retention(store, since=None, until=None, where=None):
+    """分野 × 前回の間隔の区間ごとの (件数, 正答数, 前回の間隔の合計)"""
+    topics = sorted(set(store.topics))
+    topic_of_term = np.array([topics.index(t) for t in store.topics], dtype=np.int64)
+    buckets = len(INTERVAL_EDGES)
+    cells = len(topics) * buckets
+    total = np.zeros(cells, dtype=np.int64)
+    correct = np.zeros(cells, dtype=np.int64)
+    interval_sum = np.zeros(cells)
+    for _, chunk in store.scan(since, until):
+        if where:
+            chunk = where.apply(chunk)
+        bucket = np.searchsorted(INTERVAL_EDGES, chunk['last_interval'], side='right') - 1
+        key = topic_of_term[chunk['term']] * buckets + np.maximum(bucket, 0)
+        total += np.bincount(key, minlength=cells)
+        correct += np.bincount(key[chunk['button'] != AGAIN], minlength=cells)
+        interval_sum += np.bincount(key, weights=chunk['last_interval'], minlength=cells)
+    shape = (len(topics), buckets)
+    return topics, total.reshape(shape), correct.reshape(shape), interval_sum.reshape(shape)
+
+
+def fit_forgetting(total, correct, interval_sum, min_reviews=20):
+    """分野ごとに R(t) = exp(-t / S) を重み付き最小二乗で当てはめ、安定度 S（日）を返す
+
+    ln R = -t / S を原点を通る直線として、件数を重みに 1/S を求める（区間の t は前回の間隔の平均）。
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = interval_sum / total
+        r = correct / total
+    usable = (total >= min_reviews) & (t > 0) & (r > 0) & (r < 1)
+    w = np.where(usable, total, 0)
+    log_r = np.where(usable, np.log(np.where(usable, r, 1)), 0)
+    t = np.where(usable, t, 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        decay = -(w * t * log_r).sum(axis=1) / (w * t * t).sum(axis=1)
+        stability = np.where(decay > 0, 1 / decay, np.nan)
+    return stability, usable.sum(axis=1)
+
+
+def lapses_by_term(store, since=None, until=None, where=None):
+    """term ごとの (復習回数, again の回数)"""
+    size = len(store.terms)
+    reviews = np.zeros(size, dtype=np.int64)
+    lapses = np.zeros(size, dtype=np.int64)
+    for _, chunk in store.scan(since, until):
+        if where:
+            chunk = where.apply(chunk)
+        reviews += np.bincount(chunk['term'], minlength=size)
+        lapses += np.bincount(chunk['term'][chunk['button'] == AGAIN], minlength=size)
+    return reviews, lapses
+
+
+def daily(store, since=None, until=None, where=None):
+    """日付ごとのボタン別の件数"""
+    counts = {}
+    for day, chunk in store.scan(since, until):
+        if where:
+            chunk = where.apply(chunk)
+        counts[day] = counts.get(day, 0) + np.bincount(chunk['button'], minlength=len(BUTTONS) + 1)[1:]
+    return counts
+
+
+def export_csv(store, out, since=None, until=None, where=None):
+    writer = csv.writer(out)
+    writer.writerow(['term_id', 'user', 'reviewed_at', 'button', 'interval', 'last_interval', 'algorithm'])
+    terms = np.array(store.terms, dtype=object)
+    users = np.array(store.users, dtype=object)
+    buttons = np.array([''] + BUTTONS, dtype=object)
+    algorithms = np.array(ALGORITHMS, dtype=object)
+    written = 0
+    for _, chunk in store.scan(since, until):
+        if where:
+            chunk = where.apply(chunk)
+        writer.writerows(zip(
+            terms[chunk['term']], users[chunk['user']], chunk['reviewed_at'].tolist(),
+            buttons[chunk['button']], chunk['interval'].astype(np.float64).round(4).tolist(),
+            chunk['last_interval'].astype(np.float64).round(4).tolist(), algorithms[chunk['algorithm']],
+        ))
+        written += len(chunk)
+    return written
+
+
+# ========== CLI ==========
+
+def print_retention(topics, total, correct):
+    labels = bucket_labels()
+    print(f"{'topic':6}" + ''.join(f'{label:>10}' for label in labels) + f"{'reviews':>12}")
+    for topic, row_total, row_correct in zip(topics, total, correct):
+        if row_total.sum() == 0:
+            continue
+        cells = [f'{c / n:>10.1%}' if n else f"{'-':>10}" for n, c in zip(row_total, row_correct)]
+        print(f'{topic:6}' + ''.join(cells) + f'{row_total.sum():>12,}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='復習イベントの列指向ストアと集計')
+    parser.add_argument('--store', type=Path, default=STORE_DIR, help='ストアのディレクトリ')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_import = sub.add_parser('import', help='アプリの復習履歴 TSV を取り込む')
+    p_import.add_argument('files', nargs='+', type=Path)
+    p_import.add_argument('--user', required=True, help='イベントを記録したユーザー（端末）の名前')
+
+    p_generate = sub.add_parser('generate', help='合成イベントを追加する（計測用）')
+    p_generate.add_argument('--events', type=int, default=1_000_000)
+    p_generate.add_argument('--days', type=int, default=30)
+    p_generate.add_argument('--users', type=int, default=1000)
+    p_generate.add_argument('--start', type=date.fromisoformat, help='最初の日（既定: --days 日前）')
+    p_generate.add_argument('--seed', type=int, default=1)
+
+    queries = {
+        'retention': '分野 × 前回の間隔ごとの定着率',
+        'forgetting': '分野ごとの忘却曲線（安定度・半減期）',
+        'leeches': '何度も忘れる用語',
+        'daily': '日ごとの復習件数',
+        'export': 'イベントを CSV で書き出す',
+        'stats': 'ストアの件数と大きさ',
+    }
+    subcommands = {}
+    for name, help_text in queries.items():
+        p = subcommands[name] = sub.add_parser(name, help=help_text)
+        p.add_argument('--since', type=date.fromisoformat, help='この日から（YYYY-MM-DD, UTC）')
+        p.add_argument('--until', type=date.fromisoformat, help='この日まで（この日を含む）')
+        p.add_argument('--user', help='このユーザーだけ')
+        p.add_argument('--algorithm', choices=ALGORITHMS, help='このアルゴリズムでの復習だけ')
+    subcommands['leeches'].add_argument('--min-lapses', type=int, default=8, help='again の回数の下限')
+    subcommands['leeches'].add_argument('--limit', type=int, default=30)
+    subcommands['forgetting'].add_argument('--min-reviews', type=int, default=20, help='当てはめに使う区間の最小件数')
+    subcommands['export'].add_argument('-o', '--output', type=Path, help='出力先（既定: 標準出力）')
+    args = parser.parse_args()
+
+    store = ReviewEventStore(args.store)
+    start = time.perf_counter()
+
+    if args.command == 'import':
+        for path in args.files:
+            try:
+                added, skipped = import_tsv(store, path, args.user)
+            except (OSError, ValueError) as e:
+                sys.exit(f'エラー: {e}')
+            print(f'{path}: 追加 {added}件, 取り込み済み {skipped}件')
+        return
+
+    if args.command == 'generate':
+        start_day = args.start or (datetime.now(timezone.utc).date() - timedelta(days=args.days))
+        generate(store, args.events, args.days, args.users, args.seed, start_day)
+        elapsed = time.perf_counter() - start
+        print(f'生成: {args.events:,}件 / {args.days}日 ({elapsed:.1f}s, {args.events / elapsed:,.0f} events/s)')
+        return
+
+    where = Filter(store, args.user, args.algorithm) if args.user or args.algorithm else None
+    span = (args.since, args.until)
+
+    if args.command == 'stats':
+        partitions = store.partitions(*span)
+        size = sum(p.stat().st_size for _, p in partitions)
+        print(f'イベント: {store.count(*span):,}件, 日数: {len(partitions)}, {size / 1024 / 1024:.1f}MB, '
+              f'term: {len(store.terms)}件, ユーザー: {len(store.users)}人')
+        if partitions:
+            print(f'期間: {partitions[0][0]} 〜 {partitions[-1][0]}')
+        return
+
+    if args.command == 'export':
+        out = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+        try:
+            written = export_csv(store, out, *span, where=where)
+        finally:
+            if args.output:
+                out.close()
+        print(f'書き出し: {written:,}件', file=sys.stderr)
+        return
+
+    events = store.count(*span)
+    if args.command == 'retention':
+        topics, total, correct, _ = retention(store, *span, where=where)
+        print_retention(topics, total, correct)
+    elif args.command == 'forgetting':
+        topics, total, correct, interval_sum = retention(store, *span, where=where)
+        stability, used = fit_forgetting(total, correct, interval_sum, args.min_reviews)
+        print(f"{'topic':6} {'stability':>10} {'half-life':>10} {'buckets':>8} {'reviews':>12}")
+        for topic, s, n, row_total in zip(topics, stability, used, total):
+            if row_total.sum() == 0:
+                continue
+            cells = f'{s:>9.1f}d {s * np.log(2):>9.1f}d' if np.isfinite(s) else f"{'-':>10} {'-':>10}"
+            print(f'{topic:6} {cells} {n:>8} {row_total.sum():>12,}')
+    elif args.command == 'leeches':
+        reviews, lapses = lapses_by_term(store, *span, where=where)
+        order = np.argsort(-lapses, kind='stable')
+        order = order[lapses[order] >= args.min_lapses][:args.limit]
+        print(f"{'term_id':12} {'lapses':>8} {'reviews':>9} {'rate':>7}  term")
+        # 表示する用語だけをバンドルから引く
+        with open_bundle() as bundle:
+            for i in order:
+                term_id = store.terms[i]
+                term = bundle.term(term_id)
+                name = term.en_canonical if term else ''
+                print(f'{term_id:12} {lapses[i]:>8,} {reviews[i]:>9,} {lapses[i] / reviews[i]:>7.1%}  {name}')
+    elif args.command == 'daily':
+        print(f"{'day':10} {'reviews':>10} " + ' '.join(f'{b:>8}' for b in BUTTONS) + f" {'recall':>7}")
+        for day, counts in sorted(daily(store, *span, where=where).items()):
+            n = counts.sum()
+            if n:
+                recall = 1 - counts[0] / n
+                print(f'{day} {n:>10,} ' + ' '.join(f'{c:>8,}' for c in counts) + f' {recall:>7.1%}')
+
+    elapsed = time.perf_counter() - start
+    print(f'\n{events:,}件を集計 ({elapsed:.2f}s, {events / max(elapsed, 1e-9):,.0f} events/s)', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
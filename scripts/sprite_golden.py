@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+エフェクトスプライトのゴールデン画像による回帰チェック
+
+extract_effects_*.py の各世代が同じファイル名（assets/sprites/effects/hit_1.png など）に書いてきたため、
+現在のフレームが意図したものかを確かめる手段がなかった。tests/golden/effects/ に記録したフレームと比較する。
+- 比較は NumPy でまとめて行う。全フレームを共通の大きさのキャンバス（左上揃え、余白は透明）に積み、
+  チャンネルごとの許容差を超える画素の割合・最大差を一度に求める
+- どちらかで不透明な画素だけを数える（完全に透明な画素の RGB は無視）
+- 画像の大きさ・不透明部分の外接矩形（bbox）・不透明画素の数（アルファ被覆率）も確かめる
+- ファイルの内容がゴールデンと同一（SHA-256 が一致）なら画素の比較は省く
+- フレームは --jobs 個のプロセスに分けて読み込み・比較する
+不一致のフレームは「ゴールデン | 現在 | 差分のヒートマップ」を並べた PNG を書き出す。
+
+使い方:
+    python scripts/sprite_golden.py check                        # assets/sprites/effects を検査
+    python scripts/sprite_golden.py check /tmp/out               # 別の出力先（extract_effects_correct.py --output-dir）
+    python scripts/sprite_golden.py check --tolerance 8,8,8,16 --max-mismatch 0.01
+    python scripts/sprite_golden.py record                       # 現在のフレームをゴールデンとして記録
+    python scripts/sprite_golden.py record hit_1 hit_2           # 指定したフレームだけ記録し直す
+
+不一致があれば終了コード1（build_pipeline の check:sprite_golden ステージ）。
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from build_pipeline import EFFECT_NAMES
+from content_model import EFFECTS_DIR, ROOT_DIR
+
+GOLDEN_DIR = ROOT_DIR / 'tests' / 'golden' / 'effects'
+MANIFEST_FILE = GOLDEN_DIR / 'manifest.json'
+REPORT_FILE = ROOT_DIR / '.pipeline-reports' / 'sprite_golden.json'
+HEATMAP_DIR = ROOT_DIR / '.pipeline-reports' / 'sprite_golden'
+
+# build_pipeline.py の sprites:effects ステージが書くフレーム
+FRAMES = [f'{name}_{i}' for name in EFFECT_NAMES for i in range(1, 4)]
+
+DEFAULT_TOLERANCE = (8, 8, 8, 8)  # R, G, B, A の許容差
+DEFAULT_MAX_MISMATCH = 0.005      # 許容差を超えてよい画素の割合（不透明な画素に対して）
+DEFAULT_BBOX_TOLERANCE = 1        # 外接矩形の各辺のずれ（px）
+DEFAULT_COVERAGE_TOLERANCE = 0.01  # 不透明画素数の相対差
+HEATMAP_SCALE = 2
+
+
+def file_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_rgba(path):
+    with Image.open(path) as img:
+        return np.asarray(img.convert('RGBA'))
+
+
+def alpha_bbox(alpha):
+    """不透明部分の外接矩形 [left, top, right, bottom]（PIL の getbbox と同じ、なければ None）"""
+    rows = np.flatnonzero(alpha.any(axis=1))
+    cols = np.flatnonzero(alpha.any(axis=0))
+    if rows.size == 0:
+        return None
+    return [int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1]
+
+
+def frame_stats(pixels):
+    alpha = pixels[..., 3] > 0
+    return {
+        'size': [int(pixels.shape[1]), int(pixels.shape[0])],
+        'bbox': alpha_bbox(alpha),
+        'coverage': int(alpha.sum()),
+    }
+
+
+# ========== 比較 ==========
+
+def stack(images, height, width):
+    """大きさの違う画像を左上揃えで (N, H, W, 4) に積む（余白は透明）"""
+    out = np.zeros((len(images), height, width, 4), dtype=np.uint8)
+    for i, pixels in enumerate(images):
+        out[i, :pixels.shape[0], :pixels.shape[1]] = pixels
+    return out
+
+
+def checkerboard(height, width, cell=8):
+    ys, xs = np.indices((height, width))
+    return np.where(((ys // cell + xs // cell) % 2)[..., None] == 0, 200, 150).astype(np.float32)
+
+
+def composite(pixels):
+    """透明部分が分かるよう市松模様の上に合成した RGB"""
+    alpha = pixels[..., 3:4].astype(np.float32) / 255
+    background = checkerboard(*pixels.shape[:2])
+    return (pixels[..., :3] * alpha + background * (1 - alpha)).astype(np.uint8)
+
+
+def write_heatmap(path, golden, current, diff, exceed):
+    """ゴールデン | 現在 | ヒートマップ を横に並べて保存する
+
+    ヒートマップは最大チャンネル差の大きさを黒→赤で、許容差を超えた画素を黄色で示す。
+    """
+    magnitude = diff.max(axis=-1).astype(np.float32)
+    heat = np.zeros(magnitude.shape + (3,), dtype=np.uint8)
+    heat[..., 0] = np.clip(40 + magnitude * 4, 0, 255).astype(np.uint8)
+    heat[..., 1] = 24
+    heat[..., 2] = 24
+    heat[exceed] = (255, 230, 0)
+    gap = np.full((golden.shape[0], 4, 3), 255, dtype=np.uint8)
+    panel = np.concatenate([composite(golden), gap, composite(current), gap, heat], axis=1)
+    panel = panel.repeat(HEATMAP_SCALE, axis=0).repeat(HEATMAP_SCALE, axis=1)
+    Image.fromarray(panel).save(path)
+
+
+def compare_frames(task):
+    """フレームの組をまとめて比較する（プロセスプールの1タスク）
+
+    task: (frames, options) frames は [(フレーム名, 現在のパス, ゴールデンのパス)]
+    """
+    frames, options = task
+    names = [name for name, _, _ in frames]
+    currents = [load_rgba(current) for _, current, _ in frames]
+    goldens = [load_rgba(golden) for _, _, golden in frames]
+    height = max(p.shape[0] for p in currents + goldens)
+    width = max(p.shape[1] for p in currents + goldens)
+    current = stack(currents, height, width)
+    golden = stack(goldens, height, width)
+
+    tolerance = np.array(options['tolerance'], dtype=np.int16)
+    diff = np.abs(current.astype(np.int16) - golden.astype(np.int16))
+    visible = (current[..., 3] > 0) | (golden[..., 3] > 0)
+    exceed = (diff > tolerance).any(axis=-1) & visible
+    diff *= visible[..., None]
+    mismatched = exceed.sum(axis=(1, 2))
+    visible_count = np.maximum(visible.sum(axis=(1, 2)), 1)
+    max_diff = diff.max(axis=(1, 2))
+
+    results = []
+    for i, name in enumerate(names):
+        cur, gold = frame_stats(currents[i]), frame_stats(goldens[i])
+        ratio = float(mismatched[i] / visible_count[i])
+        reasons = []
+        if cur['size'] != gold['size']:
+            reasons.append(f"大きさ {gold['size'][0]}x{gold['size'][1]} → {cur['size'][0]}x{cur['size'][1]}")
+        if (cur['bbox'] is None) != (gold['bbox'] is None) or (
+            cur['bbox'] and max(abs(a - b) for a, b in zip(cur['bbox'], gold['bbox'])) > options['bbox_tolerance']
+        ):
+            reasons.append(f"外接矩形 {gold['bbox']} → {cur['bbox']}")
+        coverage_delta = abs(cur['coverage'] - gold['coverage']) / max(gold['coverage'], 1)
+        if coverage_delta > options['coverage_tolerance']:
+            reasons.append(f"被覆率 {coverage_delta:+.1%}（{gold['coverage']} → {cur['coverage']}画素）")
+        if ratio > options['max_mismatch']:
+            reasons.append(f'許容差超え {ratio:.2%}（{int(mismatched[i])}画素）')
+
+        result = {
+            'frame': name,
+            'status': 'fail' if reasons else 'ok',
+            'reasons': reasons,
+            'mismatch_ratio': round(ratio, 6),
+            'max_channel_diff': [int(v) for v in max_diff[i]],
+            'current': cur,
+            'golden': gold,
+        }
+        if reasons and options['heatmap_dir']:
+            path = os.path.join(options['heatmap_dir'], f'{name}.png')
+            write_heatmap(path, golden[i], current[i], diff[i], exceed[i])
+            result['heatmap'] = path
+        results.append(result)
+    return results
+
+
+def chunked(items, n):
+    size = -(-len(items) // n)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def check(frames_dir, options, jobs):
+    """frames_dir のフレームをゴールデンと比較した結果のリスト"""
+    with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    results = []
+    pending = []
+    for name, entry in manifest.items():
+        current = Path(frames_dir) / f'{name}.png'
+        golden = GOLDEN_DIR / f'{name}.png'
+        if not current.exists():
+            results.append({'frame': name, 'status': 'fail', 'reasons': ['フレームがない']})
+        elif not golden.exists():
+            results.append({'frame': name, 'status': 'fail', 'reasons': ['ゴールデン画像がない（record で記録）']})
+        elif file_digest(current) == entry['sha256']:
+            results.append({'frame': name, 'status': 'ok', 'reasons': [], 'identical': True})
+        else:
+            pending.append((name, str(current), str(golden)))
+
+    if options['heatmap_dir']:
+        # 前回の実行のヒートマップが残らないように
+        for stale in Path(options['heatmap_dir']).glob('*.png'):
+            stale.unlink()
+    if pending:
+        if options['heatmap_dir']:
+            os.makedirs(options['heatmap_dir'], exist_ok=True)
+        tasks = [(chunk, options) for chunk in chunked(pending, min(jobs, len(pending)))]
+        if len(tasks) == 1:
+            batches = map(compare_frames, tasks)
+        else:
+            with ProcessPoolExecutor(len(tasks)) as pool:
+                batches = list(pool.map(compare_frames, tasks))
+        for batch in batches:
+            results.extend(batch)
+
+    order = {name: i for i, name in enumerate(manifest)}
+    results.sort(key=lambda r: order[r['frame']])
+    return results
+
+
+def record(frames_dir, names):
+    """現在のフレームをゴールデンとして記録する（names を省略すると全フレーム）"""
+    manifest = {}
+    if MANIFEST_FILE.exists():
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    GOLDEN_DIR.mkdir(parents=True, exist_ok=True)
+    for name in names or FRAMES:
+        source = Path(frames_dir) / f'{name}.png'
+        if not source.exists():
+            print(f'警告: {source} がありません', file=sys.stderr)
+            continue
+        shutil.copyfile(source, GOLDEN_DIR / f'{name}.png')
+        manifest[name] = {**frame_stats(load_rgba(source)), 'sha256': file_digest(source)}
+        print(f'記録: {name} {manifest[name]["size"][0]}x{manifest[name]["size"][1]}')
+    manifest = {name: manifest[name] for name in FRAMES if name in manifest} | {
+        name: entry for name, entry in manifest.items() if name not in FRAMES
+    }
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def parse_tolerance(value):
+    parts = [int(v) for v in value.split(',')]
+    if len(parts) == 1:
+        parts *= 4
+    if len(parts) != 4:
+        raise argparse.ArgumentTypeError('R,G,B,A の4つ（または1つ）の整数で指定してください')
+    return parts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='エフェクトスプライトのゴールデン画像による回帰チェック')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_check = sub.add_parser('check', help='フレームをゴールデン画像と比較')
+    p_check.add_argument('frames_dir', nargs='?', type=Path, default=EFFECTS_DIR, help='検査するフレームのディレクトリ')
+    p_check.add_argument('--tolerance', type=parse_tolerance, default=list(DEFAULT_TOLERANCE),
+                         help='チャンネルごとの許容差 R,G,B,A（既定: %(default)s）')
+    p_check.add_argument('--max-mismatch', type=float, default=DEFAULT_MAX_MISMATCH,
+                         help='許容差を超えてよい画素の割合（既定: %(default)s）')
+    p_check.add_argument('--bbox-tolerance', type=int, default=DEFAULT_BBOX_TOLERANCE,
+                         help='外接矩形の各辺のずれの上限 px（既定: %(default)s）')
+    p_check.add_argument('--coverage-tolerance', type=float, default=DEFAULT_COVERAGE_TOLERANCE,
+                         help='不透明画素数の相対差の上限（既定: %(default)s）')
+    p_check.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='比較に使うプロセス数')
+    p_check.add_argument('--heatmaps', type=Path, default=HEATMAP_DIR, help='不一致フレームのヒートマップの出力先')
+    p_check.add_argument('--report', type=Path, default=REPORT_FILE, help='結果の JSON の出力先')
+
+    p_record = sub.add_parser('record', help='現在のフレームをゴールデン画像として記録')
+    p_record.add_argument('frames', nargs='*', help='記録するフレーム名（既定: 全フレーム）')
+    p_record.add_argument('--from', dest='frames_dir', type=Path, default=EFFECTS_DIR, help='フレームのディレクトリ')
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record(args.frames_dir, args.frames)
+        return
+
+    start = time.perf_counter()
+    options = {
+        'tolerance': args.tolerance,
+        'max_mismatch': args.max_mismatch,
+        'bbox_tolerance': args.bbox_tolerance,
+        'coverage_tolerance': args.coverage_tolerance,
+        'heatmap_dir': str(args.heatmaps) if args.heatmaps else None,
+    }
+    results = check(args.frames_dir, options, max(1, args.jobs))
+    elapsed = time.perf_counter() - start
+
+    failed = [r for r in results if r['status'] != 'ok']
+    for r in failed:
+        print(f"{r['frame']:14} " + '; '.join(r['reasons']))
+        if r.get('heatmap'):
+            print(f"{'':14} ヒートマップ: {r['heatmap']}")
+    identical = sum(1 for r in results if r.get('identical'))
+    print(f'{len(results)}フレーム: 一致 {len(results) - len(failed)}（同一ファイル {identical}）, '
+          f'不一致 {len(failed)}, {elapsed:.2f}s')
+
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump({
+            'frames_dir': str(args.frames_dir),
+            'options': options,
+            'elapsed_seconds': round(elapsed, 3),
+            'results': results,
+        }, f, ensure_ascii=False, indent=2)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
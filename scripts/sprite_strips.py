@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+巨大なスプライトシートを横帯（バンド）単位で読む
+
+8K〜16K角のシートを Image.open(...).load() で丸ごと展開すると、RGB だけで数百MB〜GB になり、
+切り出しを並列に走らせられない。ここでは PNG の IDAT を zlib で少しずつ展開し、
+band_height 行ずつ Pillow のデコーダーでフィルタを戻して横帯の画像にする。
+- グリッド線の検出: 帯ごとに行・列のグレー画素数を数えて足し合わせる
+- セルの切り出し: 各セルが重なる帯の部分だけを貼り合わせ、下端まで届いたセルから順に返す
+どちらもメモリのピークはシートの大きさではなく帯の大きさ（と仕掛かり中のセル）で決まる。
+
+帯ごとに読めるのは、インターレースなしで 8bit の L / LA / RGB / RGBA の PNG。
+それ以外（パレット・16bit・インターレース・PNG 以外）は従来どおり全体を読み込んでから帯に分ける。
+
+使い方:
+    python scripts/sprite_strips.py assets/sprites/effects/effects_spritesheet.png
+    python scripts/sprite_strips.py sheet_16k.png --band-height 128
+"""
+import argparse
+import resource
+import struct
+import time
+import zlib
+
+import numpy as np
+from PIL import Image
+
+DEFAULT_BAND_HEIGHT = 256
+STREAMABLE_MODES = {'L': 1, 'LA': 2, 'RGB': 3, 'RGBA': 4}
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+READ_SIZE = 1 << 16
+
+# グリッド線とみなす割合（extract_effects_v2.py の従来の判定と同じ）
+GRID_LINE_RATIO = 0.3
+
+
+class StripReader:
+    """画像ファイルを上から band_height 行ずつの PIL.Image として読む"""
+
+    def __init__(self, path, band_height=DEFAULT_BAND_HEIGHT):
+        self.path = str(path)
+        self.band_height = band_height
+        # ヘッダーだけ読む（Image.open はピクセルを展開しない）
+        with Image.open(self.path) as img:
+            self.size = img.size
+            self.mode = img.mode
+            self.streaming = (
+                img.format == 'PNG'
+                and not img.info.get('interlace')
+                and img.mode in STREAMABLE_MODES
+                and len(img.tile) == 1
+                and img.tile[0][0] == 'zip'
+                and img.tile[0][3] == img.mode
+            )
+
+    @property
+    def width(self):
+        return self.size[0]
+
+    @property
+    def height(self):
+        return self.size[1]
+
+    def bands(self):
+        """(帯の上端の y, 帯の画像) を上から順に返す"""
+        if self.streaming:
+            yield from self._png_bands()
+        else:
+            with Image.open(self.path) as img:
+                img.load()
+                yield from image_bands(img, self.band_height)
+
+    def _idat(self):
+        """IDAT チャンクのデータを READ_SIZE ずつ返す"""
+        with open(self.path, 'rb') as f:
+            if f.read(8) != PNG_SIGNATURE:
+                raise ValueError(f'PNG ではありません: {self.path}')
+            while True:
+                head = f.read(8)
+                if len(head) < 8:
+                    return
+                length, chunk_type = struct.unpack('>I4s', head)
+                if chunk_type == b'IEND':
+                    return
+                if chunk_type != b'IDAT':
+                    f.seek(length + 4, 1)
+                    continue
+                while length:
+                    data = f.read(min(length, READ_SIZE))
+                    if not data:
+                        raise ValueError(f'IDAT が途中で切れています: {self.path}')
+                    length -= len(data)
+                    yield data
+                f.seek(4, 1)  # CRC
+
+    def _png_bands(self):
+        width, height = self.size
+        row_bytes = 1 + width * STREAMABLE_MODES[self.mode]
+        chunks = self._idat()
+        inflater = zlib.decompressobj()
+        pending = b''
+        # 帯の先頭行の Up/Average/Paeth フィルタ用に、前の帯の最終行（フィルタなし）を持ち越す
+        prior = bytes(row_bytes)
+
+        for top in range(0, height, self.band_height):
+            rows = min(self.band_height, height - top)
+            need = rows * row_bytes
+            raw = bytearray()
+            while len(raw) < need:
+                if not pending:
+                    pending = next(chunks, b'')
+                    if not pending and inflater.eof:
+                        break
+                out = inflater.decompress(pending, need - len(raw))
+                pending = inflater.unconsumed_tail
+                if not out and not pending and inflater.eof:
+                    break
+                raw += out
+            if len(raw) < need:
+                raise ValueError(f'画像データが足りません: {self.path} (y={top})')
+
+            # 前の帯の最終行をフィルタ種別 0 で先頭に置き、非圧縮の zlib ストリームとして
+            # Pillow の PNG デコーダーに渡す（フィルタの復元は C 実装に任せる）
+            stream = zlib.compress(prior + bytes(raw), 0)
+            band = Image.frombytes(self.mode, (width, rows + 1), stream, 'zip', self.mode)
+            prior = b'\x00' + band.crop((0, rows, width, rows + 1)).tobytes()
+            yield top, band.crop((0, 1, width, rows + 1))
+
+
+def image_bands(img, band_height=DEFAULT_BAND_HEIGHT):
+    """読み込み済みの PIL.Image を帯に分ける"""
+    width, height = img.size
+    for top in range(0, height, band_height):
+        yield top, img.crop((0, top, width, min(top + band_height, height)))
+
+
+def iter_bands(source, band_height=DEFAULT_BAND_HEIGHT):
+    """source（ファイルパス / StripReader / PIL.Image）を帯に分けて返す: (サイズ, モード, 帯)"""
+    if isinstance(source, Image.Image):
+        return source.size, source.mode, image_bands(source, band_height)
+    if not isinstance(source, StripReader):
+        source = StripReader(source, band_height)
+    return source.size, source.mode, source.bands()
+
+
+def grid_mask(rgb):
+    """グリッド線の色（RGB値が近いグレー、R が 80〜200）の画素を True にする"""
+    r, g, b = (rgb[..., i].astype(np.int16) for i in range(3))
+    return (np.abs(r - g) < 15) & (np.abs(g - b) < 15) & (r > 80) & (r < 200)
+
+
+def grid_histograms(source, band_height=DEFAULT_BAND_HEIGHT):
+    """各列・各行のグリッド色の画素数を帯ごとに数えて返す: (列ごとの数, 行ごとの数)"""
+    (width, height), _, bands = iter_bands(source, band_height)
+    column_counts = np.zeros(width, dtype=np.int64)
+    row_counts = np.zeros(height, dtype=np.int64)
+    for top, band in bands:
+        mask = grid_mask(np.asarray(band.convert('RGB')))
+        column_counts += mask.sum(axis=0)
+        row_counts[top:top + mask.shape[0]] = mask.sum(axis=1)
+    return column_counts, row_counts
+
+
+def find_grid_lines(source, band_height=DEFAULT_BAND_HEIGHT, ratio=GRID_LINE_RATIO):
+    """グリッド線の位置を検出: (縦線の x のリスト, 横線の y のリスト)"""
+    column_counts, row_counts = grid_histograms(source, band_height)
+    height, width = len(row_counts), len(column_counts)
+    vertical_lines = np.flatnonzero(column_counts > height * ratio).tolist()
+    horizontal_lines = np.flatnonzero(row_counts > width * ratio).tolist()
+    return vertical_lines, horizontal_lines
+
+
+def crop_cells(source, boxes, band_height=DEFAULT_BAND_HEIGHT):
+    """boxes（キー → (left, top, right, bottom)）のセルを切り出して (キー, 画像) を返す
+
+    シートを上から一度だけ読み、各セルには重なる帯の部分だけを貼り付ける。
+    セルは下端まで読み終えた順に返す（boxes の順ではない）。
+    シートの外にはみ出した部分は Image.crop と同じく 0 で埋まる。
+    """
+    _, mode, bands = iter_bands(source, band_height)
+    waiting = sorted(boxes.items(), key=lambda item: item[1][1])
+    in_progress = {}
+
+    for top, band in bands:
+        bottom = top + band.height
+        # この帯に差しかかったセルの画像を用意する
+        while waiting and waiting[0][1][1] < bottom:
+            key, box = waiting.pop(0)
+            left, cell_top, right, cell_bottom = box
+            in_progress[key] = (box, Image.new(mode, (right - left, cell_bottom - cell_top)))
+
+        for key, (box, cell) in list(in_progress.items()):
+            left, cell_top, right, cell_bottom = box
+            y0, y1 = max(cell_top, top), min(cell_bottom, bottom)
+            if y0 < y1:
+                piece = band.crop((left, y0 - top, right, y1 - top))
+                cell.paste(piece, (0, y0 - cell_top))
+            if cell_bottom <= bottom:
+                del in_progress[key]
+                yield key, cell
+
+    # シートの下端より下にはみ出したセル・シートより下にあるセル
+    for key, (box, cell) in in_progress.items():
+        yield key, cell
+    for key, (left, top, right, bottom) in waiting:
+        yield key, Image.new(mode, (right - left, bottom - top))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='スプライトシートを横帯ごとに読んでグリッド線を検出')
+    parser.add_argument('sheet', help='スプライトシートの画像')
+    parser.add_argument('--band-height', type=int, default=DEFAULT_BAND_HEIGHT, help='一度に展開する行数')
+    args = parser.parse_args()
+
+    reader = StripReader(args.sheet, args.band_height)
+    start = time.perf_counter()
+    v_lines, h_lines = find_grid_lines(reader)
+    elapsed = time.perf_counter() - start
+
+    print(f"シート: {reader.width}x{reader.height} {reader.mode} "
+          f"({'帯ごとに展開' if reader.streaming else '全体を展開'}, 帯 {args.band_height}行)")
+    print(f"縦線: {len(v_lines)}本, 横線: {len(h_lines)}本")
+    print(f"縦線位置: {v_lines[:10]}...")
+    print(f"横線位置: {h_lines[:10]}...")
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"処理時間: {elapsed:.2f}s, 最大メモリ: {peak_mb:.0f}MB")
+
+
+if __name__ == '__main__':
+    main()
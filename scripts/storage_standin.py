@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+ストレージプロキシ（server/storage.ts が使う v1/storage/*）のローカル代用サーバー
+
+publish_assets.py の動作確認用。本物と同じエンドポイントだけを持つ:
+- POST v1/storage/upload?path=KEY       multipart/form-data の file を保存し {"key", "url"} を返す
+- GET  v1/storage/downloadUrl?path=KEY  {"url"} を返す
+- GET  files/KEY                        保存したファイル
+Authorization: Bearer <api-key> がなければ 401。keep-alive（HTTP/1.1）に対応する。
+
+本番の往復遅延や一時的な障害を再現するため、リクエストごとの遅延と 503 を返す確率を指定できる。
+
+使い方:
+    python scripts/storage_standin.py --port 8787 --dir /tmp/storage --api-key test
+    python scripts/storage_standin.py --latency-ms 80 --fail-rate 0.05   # 遠いリージョン・不安定な回線
+    BUILT_IN_FORGE_API_URL=http://127.0.0.1:8787 BUILT_IN_FORGE_API_KEY=test python scripts/publish_assets.py
+"""
+import argparse
+import json
+import random
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+
+def parse_multipart_file(body, content_type):
+    """multipart/form-data の最初の file パートの中身を返す"""
+    params = dict(
+        part.strip().split('=', 1) for part in content_type.split(';')[1:] if '=' in part
+    )
+    boundary = params.get('boundary', '').strip('"')
+    if not boundary:
+        raise ValueError('boundary がありません')
+    delimiter = b'--' + boundary.encode('latin-1')
+    for part in body.split(delimiter)[1:]:
+        if part.startswith(b'--'):
+            break
+        head, _, content = part.partition(b'\r\n\r\n')
+        if b'name="file"' in head:
+            # パートの末尾の CRLF は区切りの一部
+            return content[:-2] if content.endswith(b'\r\n') else content
+    raise ValueError('file パートがありません')
+
+
+class StorageHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'StorageStandIn/1.0'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self):
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def object_url(self, key):
+        host = self.headers.get('Host') or f'{self.server.server_address[0]}:{self.server.server_address[1]}'
+        return f'http://{host}/files/{quote(key)}'
+
+    def object_path(self, key):
+        path = (self.server.storage_dir / key).resolve()
+        if self.server.storage_dir not in path.parents:
+            raise ValueError(f'不正なパス: {key}')
+        return path
+
+    def prepare(self):
+        """遅延・障害の注入と認証。続けてよければ (パス, クエリ) を返す"""
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        url = urlsplit(self.path)
+        if self.server.fail_rate and random.random() < self.server.fail_rate:
+            self.read_body()
+            self.server.count('failed')
+            self.send_json(503, {'error': 'injected failure'})
+            return None
+        if url.path.startswith('/v1/') and self.headers.get('Authorization') != f'Bearer {self.server.api_key}':
+            self.read_body()
+            self.send_json(401, {'error': 'unauthorized'})
+            return None
+        return url.path, {k: v[0] for k, v in parse_qs(url.query).items()}
+
+    def do_POST(self):
+        request = self.prepare()
+        if request is None:
+            return
+        path, query = request
+        if path != '/v1/storage/upload' or not query.get('path'):
+            self.read_body()
+            self.send_json(404, {'error': 'not found'})
+            return
+        key = query['path'].lstrip('/')
+        try:
+            content = parse_multipart_file(self.read_body(), self.headers.get('Content-Type', ''))
+            target = self.object_path(key)
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f'.{target.name}.{threading.get_ident()}')
+        tmp.write_bytes(content)
+        tmp.replace(target)
+        self.server.count('uploaded', len(content))
+        self.send_json(200, {'key': key, 'url': self.object_url(key)})
+
+    def do_GET(self):
+        request = self.prepare()
+        if request is None:
+            return
+        path, query = request
+        if path == '/v1/storage/downloadUrl' and query.get('path'):
+            self.send_json(200, {'url': self.object_url(query['path'].lstrip('/'))})
+            return
+        if path.startswith('/files/'):
+            try:
+                target = self.object_path(unquote(path[len('/files/'):]))
+            except ValueError:
+                target = None
+            if target and target.is_file():
+                body = target.read_bytes()
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+        self.send_json(404, {'error': 'not found'})
+
+
+class StorageServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, storage_dir, api_key, latency=0.0, fail_rate=0.0, verbose=False):
+        super().__init__(address, StorageHandler)
+        self.storage_dir = Path(storage_dir).resolve()
+        self.api_key = api_key
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.verbose = verbose
+        self.stats = {'uploaded': 0, 'bytes': 0, 'failed': 0}
+        self._lock = threading.Lock()
+
+    def count(self, name, size=0):
+        with self._lock:
+            self.stats[name] += 1
+            self.stats['bytes'] += size
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ストレージプロキシのローカル代用サーバー')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--dir', help='保存先（既定: 一時ディレクトリ）')
+    parser.add_argument('--api-key', default='test', help='受け付ける Bearer トークン')
+    parser.add_argument('--latency-ms', type=float, default=0, help='リクエストごとに待つ時間（往復遅延の再現）')
+    parser.add_argument('--fail-rate', type=float, default=0, help='503 を返す確率（0〜1）')
+    parser.add_argument('-v', '--verbose', action='store_true', help='リクエストを1件ずつ表示')
+    args = parser.parse_args()
+
+    storage_dir = args.dir or tempfile.mkdtemp(prefix='storage-standin-')
+    server = StorageServer(
+        (args.host, args.port), storage_dir, args.api_key,
+        latency=args.latency_ms / 1000, fail_rate=args.fail_rate, verbose=args.verbose,
+    )
+    print(f'待ち受け: http://{args.host}:{server.server_address[1]} (保存先: {storage_dir})', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stats = server.stats
+        print(f"\nアップロード: {stats['uploaded']}件 ({stats['bytes'] / 1024 / 1024:.1f}MB), "
+              f"注入した障害: {stats['failed']}件")
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+progress.sync の負荷試験
+
+合成ユーザー（1人あたり --devices 台の端末）が復習して同期する流れを再生する:
+- 各端末は --rounds 回、--reviews 件ずつ復習し、そのたびに変更した進捗とレビューイベントを送る
+- 他の端末の変更（changes）を受け取り、version が新しければ手元の進捗を置き換える
+- 同時に使う接続は --concurrency 本まで（publish_assets.py の keep-alive 接続プールを使う）
+最後にレイテンシ（p50/p95/p99）と、1秒あたりに書き込んだ行数（進捗 + イベント）を表示する。
+--verify を付けると、全ユーザーの進捗を取り直し、各 term が全端末で最も新しい version になっているか確かめる。
+
+認証は server/_core/sdk.ts と同じ HS256 の JWT（Authorization: Bearer）。本物のサーバーに向けるときは
+JWT_SECRET と VITE_APP_ID を合わせ、--seed-sql で書き出した users の行を先に入れておく。
+
+使い方:
+    python scripts/sync_standin.py --port 3000 &                     # SQLite の代用サーバー
+    python scripts/sync_load_test.py --users 200 --devices 2 --rounds 5
+    python scripts/sync_load_test.py --users 50 --verify
+    python scripts/sync_load_test.py --url http://127.0.0.1:3000 --jwt-secret "$JWT_SECRET" \\
+        --app-id "$VITE_APP_ID" --seed-sql /tmp/loadtest-users.sql
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from content_model import load_content
+from publish_assets import ConnectionPool, HTTPError
+
+SYNC_PATH = '/api/trpc/progress.sync'
+
+# server/progress-sync.ts の上限と同じ
+MAX_PROGRESS_PER_SYNC = 500
+MAX_EVENTS_PER_SYNC = 2000
+
+RATINGS = ['again', 'hard', 'good', 'easy']
+RATING_WEIGHTS = [0.12, 0.15, 0.58, 0.15]
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+def b64url(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def session_token(open_id, app_id, secret, name):
+    """sdk.signSession と同じ形の HS256 JWT"""
+    header = b64url(json.dumps({'alg': 'HS256', 'typ': 'JWT'}, separators=(',', ':')).encode())
+    payload = b64url(json.dumps({
+        'openId': open_id, 'appId': app_id, 'name': name,
+        'exp': int(time.time()) + 24 * 60 * 60,
+    }, separators=(',', ':')).encode())
+    signature = hmac.new(secret.encode(), f'{header}.{payload}'.encode(), hashlib.sha256).digest()
+    return f'{header}.{payload}.{b64url(signature)}'
+
+
+def load_term_ids(count):
+    if count:
+        return [f'TERM{i:06d}' for i in range(1, count + 1)]
+    return [term.term_id for term in load_content().terms]
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))]
+
+
+class Device:
+    """1台の端末。lib/types.ts の LearningProgress に近い形の進捗を持ち、復習のたびに更新する"""
+
+    def __init__(self, user, index, term_ids, rng, clock):
+        self.user = user
+        self.index = index
+        self.term_ids = term_ids
+        self.rng = rng
+        self.clock = clock
+        self.progress = {}
+        self.dirty = set()
+        self.events = []
+        self.cursor = None
+        self.sequence = 0
+
+    def review(self, count):
+        for _ in range(count):
+            # 端末ごとの時計は単調に進む。version はこの時計（ms）
+            self.clock += self.rng.randint(2_000, 40_000)
+            term_id = self.rng.choice(self.term_ids)
+            rating = self.rng.choices(RATINGS, RATING_WEIGHTS)[0]
+            self.progress[term_id] = self.next_progress(self.progress.get(term_id), term_id, rating)
+            self.dirty.add(term_id)
+            self.sequence += 1
+            self.events.append({
+                'clientEventId': f'{self.user.open_id}-d{self.index}-{self.sequence}',
+                'termId': term_id,
+                'rating': rating,
+                'correct': rating != 'again',
+                'elapsedMs': self.rng.randint(800, 15_000),
+                'reviewedAt': self.clock,
+            })
+
+    def next_progress(self, current, term_id, rating):
+        """SM-2 風の簡略な更新（値の妥当さより、行の形と更新頻度を本物に近づけるのが目的）"""
+        p = dict(current) if current else {
+            'termId': term_id, 'easeFactor': 2.5, 'interval': 0, 'repetitions': 0,
+            'correctCount': 0, 'incorrectCount': 0, 'isBookmarked': False, 'isDifficult': False,
+            'userNotes': None, 'phase': 'new', 'learningStep': 0, 'stability': None, 'difficulty': None,
+        }
+        now = datetime.fromtimestamp(self.clock / 1000, timezone.utc)
+        if rating == 'again':
+            p.update(repetitions=0, interval=0, phase='relearning' if p['phase'] == 'review' else 'learning',
+                     easeFactor=max(1.3, p['easeFactor'] - 0.2), incorrectCount=p['incorrectCount'] + 1)
+        else:
+            step = {'hard': 1.2, 'good': p['easeFactor'], 'easy': p['easeFactor'] * 1.3}[rating]
+            interval = 1 if p['repetitions'] == 0 else round(max(1, p['interval']) * step, 1)
+            p.update(repetitions=p['repetitions'] + 1, interval=interval, phase='review',
+                     easeFactor=p['easeFactor'] + {'hard': -0.15, 'good': 0, 'easy': 0.15}[rating],
+                     correctCount=p['correctCount'] + 1)
+        p['isDifficult'] = p['incorrectCount'] >= 3
+        p['lastReview'] = now.date().isoformat()
+        p['nextReview'] = (now + timedelta(days=p['interval'])).date().isoformat()
+        p['nextReviewTime'] = (now + timedelta(days=p['interval'])).isoformat(timespec='seconds')
+        p['version'] = self.clock
+        return p
+
+    def take_batches(self):
+        """未送信の変更を上限ごとに分けて取り出す"""
+        progress = [self.progress[term_id] for term_id in sorted(self.dirty)]
+        events = self.events
+        self.dirty = set()
+        self.events = []
+        batches = []
+        while progress or events or not batches:
+            batches.append((progress[:MAX_PROGRESS_PER_SYNC], events[:MAX_EVENTS_PER_SYNC]))
+            progress = progress[MAX_PROGRESS_PER_SYNC:]
+            events = events[MAX_EVENTS_PER_SYNC:]
+        return batches
+
+    def apply_changes(self, changes):
+        applied = 0
+        for change in changes:
+            current = self.progress.get(change['termId'])
+            if current is None or change['version'] > current['version']:
+                self.progress[change['termId']] = change
+                applied += 1
+            # 受け取った変更より手元が新しければ、次の同期で送り直す
+            elif current['version'] > change['version']:
+                self.dirty.add(change['termId'])
+        return applied
+
+
+class User:
+    def __init__(self, index, args, term_ids, seed):
+        self.open_id = f'loadtest-{index:06d}'
+        self.name = f'Load Test {index}'
+        self.token = session_token(self.open_id, args.app_id, args.jwt_secret, self.name)
+        start = 1_760_000_000_000 + index * DAY_MS
+        self.devices = [
+            Device(self, d, term_ids, random.Random(seed * 1_000_003 + index * 31 + d), start + d)
+            for d in range(args.devices)
+        ]
+
+
+class LoadTest:
+    def __init__(self, pool, args):
+        self.pool = pool
+        self.args = args
+        # 接続の空き待ちをレイテンシに含めないよう、プールと同じ本数でここで絞る
+        self.slots = asyncio.Semaphore(args.concurrency)
+        self.latencies = []
+        self.errors = {}
+        self.rows_sent = 0
+        self.events_inserted = 0
+        self.changes_applied = 0
+        self.requests = 0
+
+    async def call(self, user, payload):
+        body = json.dumps({'json': payload}, separators=(',', ':')).encode('utf-8')
+        headers = {'Content-Type': 'application/json', 'Authorization': f'Bearer {user.token}'}
+        async with self.slots:
+            start = time.perf_counter()
+            response = await self.pool.request('POST', SYNC_PATH, headers, [body])
+            self.latencies.append(time.perf_counter() - start)
+        self.requests += 1
+        if response.status >= 400:
+            raise HTTPError(response.status, response.body)
+        return response.json()['result']['data']['json']
+
+    async def sync(self, device):
+        for progress, events in device.take_batches():
+            payload = {'progress': progress, 'events': events}
+            while True:
+                if device.cursor is not None:
+                    payload['since'] = device.cursor
+                try:
+                    result = await self.call(device.user, payload)
+                except (HTTPError, OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, KeyError) as e:
+                    key = f'HTTP {e.status}' if isinstance(e, HTTPError) else type(e).__name__
+                    self.errors[key] = self.errors.get(key, 0) + 1
+                    # 送れなかった分は次の同期に回す
+                    device.dirty.update(p['termId'] for p in payload['progress'])
+                    device.events.extend(payload['events'])
+                    return
+                self.rows_sent += len(payload['progress']) + len(payload['events'])
+                self.events_inserted += result['eventsInserted']
+                self.changes_applied += device.apply_changes(result['changes'])
+                advanced = result['cursor'] != device.cursor
+                device.cursor = result['cursor']
+                if not (result['hasMore'] and advanced):
+                    break
+                payload = {'progress': [], 'events': []}
+
+    async def run_device(self, device):
+        for _ in range(self.args.rounds):
+            device.review(self.args.reviews)
+            await self.sync(device)
+            if self.args.think_ms:
+                await asyncio.sleep(device.rng.uniform(0, 2) * self.args.think_ms / 1000)
+
+    async def pull_all(self, user):
+        """since なしで取り直した、サーバー上の term ごとの version"""
+        versions = {}
+        payload = {'progress': [], 'events': []}
+        while True:
+            result = await self.call(user, payload)
+            versions.update((change['termId'], change['version']) for change in result['changes'])
+            if not result['hasMore'] or result['cursor'] == payload.get('since'):
+                return versions
+            payload = {'progress': [], 'events': [], 'since': result['cursor']}
+
+
+async def verify(test, users):
+    mismatched = 0
+    for user in users:
+        expected = {}
+        for device in user.devices:
+            for term_id, p in device.progress.items():
+                expected[term_id] = max(expected.get(term_id, 0), p['version'])
+        if await test.pull_all(user) != expected:
+            mismatched += 1
+    return mismatched
+
+
+async def run(args, users):
+    pool = ConnectionPool(args.url, args.concurrency, timeout=args.timeout)
+    test = LoadTest(pool, args)
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(test.run_device(d) for user in users for d in user.devices))
+        elapsed = time.perf_counter() - start
+        report(test, elapsed, pool)
+        if args.verify:
+            mismatched = await verify(test, users)
+            print(f'検証: {len(users) - mismatched}/{len(users)}人の進捗が最新の version と一致')
+            return 1 if mismatched else 0
+        return 1 if test.errors else 0
+    finally:
+        pool.close()
+
+
+def report(test, elapsed, pool):
+    latencies = sorted(ms * 1000 for ms in test.latencies)
+    print(f'リクエスト: {test.requests}件 ({elapsed:.2f}s, {test.requests / elapsed:.0f} req/s), 接続: {pool.opened}本')
+    print(f'レイテンシ: p50 {percentile(latencies, 50):.1f}ms  p95 {percentile(latencies, 95):.1f}ms  '
+          f'p99 {percentile(latencies, 99):.1f}ms  max {percentile(latencies, 100):.1f}ms')
+    print(f'書き込み: {test.rows_sent}行 ({test.rows_sent / elapsed:.0f} rows/s), '
+          f'新規イベント: {test.events_inserted}件, 他端末からの変更: {test.changes_applied}件')
+    if test.errors:
+        print('エラー: ' + ', '.join(f'{key} x{count}' for key, count in sorted(test.errors.items())))
+
+
+def write_seed_sql(path, users):
+    """本物のサーバー用: 合成ユーザーの users 行（なければ OAuth への問い合わせになるため）"""
+    values = ',\n'.join(f"  ('{u.open_id}', '{u.name}', 'loadtest')" for u in users)
+    Path(path).write_text(
+        f'INSERT IGNORE INTO `users` (`openId`, `name`, `loginMethod`) VALUES\n{values};\n', encoding='utf-8'
+    )
+    print(f'保存: {path}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='progress.sync の負荷試験')
+    parser.add_argument('--url', default='http://127.0.0.1:3000', help='サーバーの URL（/api/trpc の手前まで）')
+    parser.add_argument('--users', type=int, default=100, help='合成ユーザー数')
+    parser.add_argument('--devices', type=int, default=2, help='1ユーザーあたりの端末数')
+    parser.add_argument('--rounds', type=int, default=5, help='端末ごとの同期回数')
+    parser.add_argument('--reviews', type=int, default=40, help='同期1回あたりの復習件数')
+    parser.add_argument('--terms', type=int, default=0, help='合成の term 数（既定: terms.json の term_id を使う）')
+    parser.add_argument('--think-ms', type=float, default=0, help='同期の間隔の平均（0 なら間隔なしで送り続ける）')
+    parser.add_argument('-c', '--concurrency', type=int, default=32, help='同時に使う接続数')
+    parser.add_argument('--timeout', type=float, default=30, help='1リクエストのタイムアウト（秒）')
+    parser.add_argument('--jwt-secret', default=os.environ.get('JWT_SECRET') or 'loadtest', help='セッション JWT の署名鍵')
+    parser.add_argument('--app-id', default=os.environ.get('VITE_APP_ID') or 'loadtest', help='セッション JWT の appId')
+    parser.add_argument('--seed', type=int, default=1, help='乱数のシード')
+    parser.add_argument('--seed-sql', help='合成ユーザーの users 行を書き出す SQL ファイル（書き出して終了）')
+    parser.add_argument('--verify', action='store_true', help='最後に全ユーザーの進捗を取り直して確かめる')
+    args = parser.parse_args()
+
+    term_ids = load_term_ids(args.terms)
+    users = [User(i, args, term_ids, args.seed) for i in range(1, args.users + 1)]
+    if args.seed_sql:
+        write_seed_sql(args.seed_sql, users)
+        return
+
+    print(f'ユーザー: {len(users)}人 x {args.devices}台, {args.rounds}回 x {args.reviews}件の復習, '
+          f'term: {len(term_ids)}件, 接続: {args.concurrency}本')
+    try:
+        status = asyncio.run(run(args, users))
+    except KeyboardInterrupt:
+        status = '中断しました'
+    except OSError as e:
+        status = f'エラー: {args.url} に接続できません ({e})'
+    sys.exit(status)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+progress.sync（server/routers.ts）のローカル代用サーバー
+
+sync_load_test.py の動作確認用に、Node サーバーと MySQL なしで同じ API を提供する。
+- POST /api/trpc/progress.sync  tRPC（superjson）の形式で受け取り、同じ形式で返す
+- テーブルは drizzle/schema.ts の termProgress / reviewEvents と同じ列を SQLite に作る
+- 進捗は一括 upsert で書き、version の大きい方を残す（MySQL の ON DUPLICATE KEY UPDATE と同じ結果）
+  ただし SQL は SQLite の ON CONFLICT ... WHERE なので、MySQL 側の代入順の問題
+  （lastWriterWinsSet）はここでは再現しない。そちらは tests/progress-sync.test.ts で確認する
+- レビューイベントは (userId, clientEventId) の重複を無視して一括挿入する
+- 変更の取得は (updatedAt, termId) が since より後のもの、最大 1000 件（server/progress-sync.ts と同じ）
+Authorization: Bearer <JWT> の openId ごとにユーザーを割り当てる（署名は検証しない）。
+
+使い方:
+    python scripts/sync_standin.py --port 3000 --db /tmp/sync.sqlite
+    python scripts/sync_standin.py --latency-ms 5        # DB までの往復遅延の再現
+"""
+import argparse
+import base64
+import json
+import sqlite3
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SYNC_PATH = '/api/trpc/progress.sync'
+
+# server/progress-sync.ts の上限と同じ
+MAX_PROGRESS_PER_SYNC = 500
+MAX_EVENTS_PER_SYNC = 2000
+MAX_CHANGES_PER_SYNC = 1000
+
+SYNCED_COLUMNS = [
+    'easeFactor', 'interval', 'repetitions', 'nextReview', 'nextReviewTime', 'lastReview',
+    'correctCount', 'incorrectCount', 'isBookmarked', 'isDifficult', 'userNotes', 'phase',
+    'learningStep', 'stability', 'difficulty',
+]
+BOOLEAN_COLUMNS = {'isBookmarked', 'isDifficult'}
+RATINGS = {'again', 'hard', 'good', 'easy'}
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    openId TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS termProgress (
+    userId INTEGER NOT NULL,
+    termId TEXT NOT NULL,
+    easeFactor REAL NOT NULL,
+    interval REAL NOT NULL,
+    repetitions INTEGER NOT NULL,
+    nextReview TEXT NOT NULL,
+    nextReviewTime TEXT,
+    lastReview TEXT,
+    correctCount INTEGER NOT NULL,
+    incorrectCount INTEGER NOT NULL,
+    isBookmarked INTEGER NOT NULL,
+    isDifficult INTEGER NOT NULL,
+    userNotes TEXT,
+    phase TEXT,
+    learningStep INTEGER,
+    stability REAL,
+    difficulty REAL,
+    version INTEGER NOT NULL,
+    updatedAt INTEGER NOT NULL,
+    PRIMARY KEY (userId, termId)
+);
+CREATE INDEX IF NOT EXISTS termProgress_userId_updatedAt_idx ON termProgress (userId, updatedAt);
+CREATE TABLE IF NOT EXISTS reviewEvents (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    userId INTEGER NOT NULL,
+    clientEventId TEXT NOT NULL,
+    termId TEXT NOT NULL,
+    rating TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    elapsedMs INTEGER,
+    reviewedAt INTEGER NOT NULL,
+    createdAt INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS reviewEvents_userId_clientEventId_unique ON reviewEvents (userId, clientEventId);
+CREATE INDEX IF NOT EXISTS reviewEvents_termId_reviewedAt_idx ON reviewEvents (termId, reviewedAt);
+'''
+
+PROGRESS_COLUMNS = ['userId', 'termId', *SYNCED_COLUMNS, 'version', 'updatedAt']
+UPSERT_PROGRESS = (
+    f"INSERT INTO termProgress ({', '.join(PROGRESS_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(PROGRESS_COLUMNS))}) "
+    f"ON CONFLICT (userId, termId) DO UPDATE SET "
+    + ', '.join(f'{c} = excluded.{c}' for c in [*SYNCED_COLUMNS, 'version', 'updatedAt'])
+    + ' WHERE excluded.version > termProgress.version'
+)
+INSERT_EVENT = (
+    'INSERT OR IGNORE INTO reviewEvents '
+    '(userId, clientEventId, termId, rating, correct, elapsedMs, reviewedAt, createdAt) '
+    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)'
+)
+
+
+class SyncError(Exception):
+    def __init__(self, code, status, message):
+        super().__init__(message)
+        self.code = code
+        self.status = status
+
+
+def session_open_id(authorization):
+    """Bearer トークン（JWT）のペイロードから openId を取り出す"""
+    if not authorization or not authorization.startswith('Bearer '):
+        raise SyncError('UNAUTHORIZED', 401, 'Please login (10001)')
+    try:
+        payload = authorization[len('Bearer '):].split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return str(claims['openId'])
+    except (IndexError, KeyError, ValueError):
+        raise SyncError('UNAUTHORIZED', 401, 'Invalid session cookie')
+
+
+def validate(data):
+    """syncInputSchema の主な制約（型と件数の上限）"""
+    if not isinstance(data, dict):
+        raise SyncError('BAD_REQUEST', 400, 'input must be an object')
+    progress = data.get('progress') or []
+    events = data.get('events') or []
+    if len(progress) > MAX_PROGRESS_PER_SYNC or len(events) > MAX_EVENTS_PER_SYNC:
+        raise SyncError('BAD_REQUEST', 400, 'too many records in one sync')
+    for delta in progress:
+        if not delta.get('termId') or not isinstance(delta.get('version'), int):
+            raise SyncError('BAD_REQUEST', 400, 'progress needs termId and an integer version')
+    for event in events:
+        if not event.get('clientEventId') or event.get('rating') not in RATINGS:
+            raise SyncError('BAD_REQUEST', 400, 'event needs clientEventId and a valid rating')
+    since = data.get('since')
+    if since is not None and not (
+        isinstance(since, dict) and isinstance(since.get('updatedAt'), int) and isinstance(since.get('termId'), str)
+    ):
+        raise SyncError('BAD_REQUEST', 400, 'since must be {updatedAt, termId}')
+    return progress, events, since
+
+
+class SyncStore:
+    """スレッドごとの SQLite 接続"""
+
+    def __init__(self, path, latency=0.0):
+        self.path = path
+        self.latency = latency
+        self.local = threading.local()
+        self.write_lock = threading.Lock()
+        with sqlite3.connect(path) as db:
+            db.execute('PRAGMA journal_mode=WAL')
+            db.executescript(SCHEMA)
+
+    @property
+    def db(self):
+        if not hasattr(self.local, 'db'):
+            self.local.db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self.local.db.execute('PRAGMA synchronous=NORMAL')
+        return self.local.db
+
+    def user_id(self, open_id):
+        db = self.db
+        db.execute('INSERT OR IGNORE INTO users (openId) VALUES (?)', (open_id,))
+        return db.execute('SELECT id FROM users WHERE openId = ?', (open_id,)).fetchone()[0]
+
+    def sync(self, user_id, progress, events, since):
+        if self.latency:
+            time.sleep(self.latency)
+
+        # 同じ term は version の大きいものだけ、同じイベントは最初の1件だけ（collapseBatch）
+        latest = {}
+        for delta in progress:
+            current = latest.get(delta['termId'])
+            if current is None or delta['version'] > current['version']:
+                latest[delta['termId']] = delta
+        unique_events = {}
+        for event in events:
+            unique_events.setdefault(event['clientEventId'], event)
+
+        now = int(time.time() * 1000)
+        db = self.db
+        with self.write_lock:
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                before = db.total_changes
+                db.executemany(INSERT_EVENT, [
+                    (user_id, e['clientEventId'], e['termId'], e['rating'], int(bool(e.get('correct'))),
+                     e.get('elapsedMs'), e.get('reviewedAt', now), now)
+                    for e in unique_events.values()
+                ])
+                inserted = db.total_changes - before
+                db.executemany(UPSERT_PROGRESS, [
+                    (user_id, d['termId'],
+                     *[int(bool(d.get(c))) if c in BOOLEAN_COLUMNS else d.get(c) for c in SYNCED_COLUMNS],
+                     d['version'], now)
+                    for d in latest.values()
+                ])
+                db.execute('COMMIT')
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+
+        after = (since['updatedAt'], since['updatedAt'], since['termId']) if since else (-1, -1, '')
+        cursor = db.execute(
+            f"SELECT termId, {', '.join(SYNCED_COLUMNS)}, version, updatedAt FROM termProgress "
+            'WHERE userId = ? AND (updatedAt > ? OR (updatedAt = ? AND termId > ?)) '
+            'ORDER BY updatedAt, termId LIMIT ?',
+            (user_id, *after, MAX_CHANGES_PER_SYNC),
+        )
+        rows = cursor.fetchall()
+        names = [column[0] for column in cursor.description]
+        sent = {term_id: d['version'] for term_id, d in latest.items()}
+        changes = []
+        next_cursor = since
+        for row in rows:
+            record = dict(zip(names, row))
+            next_cursor = {'updatedAt': record.pop('updatedAt'), 'termId': record['termId']}
+            for column in BOOLEAN_COLUMNS:
+                record[column] = bool(record[column])
+            if sent.get(record['termId']) != record['version']:
+                changes.append(record)
+        return {
+            'progressRows': len(latest),
+            'eventsInserted': inserted,
+            'changes': changes,
+            'cursor': next_cursor,
+            'hasMore': len(rows) == MAX_CHANGES_PER_SYNC,
+        }
+
+
+class SyncHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'SyncStandIn/1.0'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path.split('?')[0] != SYNC_PATH:
+            self.send_trpc_error(SyncError('NOT_FOUND', 404, f'No procedure found on path "{self.path}"'))
+            return
+        try:
+            open_id = session_open_id(self.headers.get('Authorization'))
+            try:
+                data = json.loads(body or b'{}').get('json', {})
+            except (ValueError, AttributeError):
+                raise SyncError('PARSE_ERROR', 400, 'invalid JSON body')
+            progress, events, since = validate(data)
+            store = self.server.store
+            result = store.sync(store.user_id(open_id), progress, events, since)
+        except SyncError as e:
+            self.send_trpc_error(e)
+            return
+        self.send_json(200, {'result': {'data': {'json': result}}})
+
+    def send_trpc_error(self, error):
+        self.send_json(error.status, {'error': {'json': {
+            'message': str(error), 'code': -32000,
+            'data': {'code': error.code, 'httpStatus': error.status, 'path': 'progress.sync'},
+        }}})
+
+
+class SyncServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, store, verbose=False):
+        super().__init__(address, SyncHandler)
+        self.store = store
+        self.verbose = verbose
+
+
+def main():
+    parser = argparse.ArgumentParser(description='progress.sync のローカル代用サーバー（SQLite）')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3000)
+    parser.add_argument('--db', help='SQLite ファイル（既定: 一時ファイル）')
+    parser.add_argument('--latency-ms', type=float, default=0, help='同期ごとに待つ時間（DB までの往復遅延の再現）')
+    parser.add_argument('-v', '--verbose', action='store_true', help='リクエストを1件ずつ表示')
+    args = parser.parse_args()
+
+    path = args.db or tempfile.mkstemp(prefix='sync-standin-', suffix='.sqlite')[1]
+    server = SyncServer((args.host, args.port), SyncStore(path, args.latency_ms / 1000), args.verbose)
+    print(f'待ち受け: http://{args.host}:{server.server_address[1]}{SYNC_PATH} (DB: {path})', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+ベンチマーク用の合成データ生成
+
+- terms.csv / examples.csv / relations.csv と同じ列構成の合成データ（384語〜100万語）
+- update_examples.py が読む貼り付け形式（Markdown）の単語集
+- グリッド線入りの合成スプライトシート（1K / 4K / 8K）
+
+同じ seed からは常に同じデータを生成する。
+
+使い方:
+    python scripts/synthetic_content.py --terms 100000 --out /tmp/synthetic
+    python scripts/synthetic_content.py --sheet 4096 --out /tmp/synthetic
+"""
+import argparse
+import csv
+import os
+import random
+
+TOPIC_CODES = ['ETH', 'QM', 'ECON', 'FSA', 'CI', 'EQ', 'FI', 'DER', 'AI', 'PM']
+
+EN_ADJECTIVES = [
+    'Adjusted', 'Effective', 'Expected', 'Forward', 'Implied', 'Marginal', 'Nominal', 'Real',
+    'Required', 'Residual', 'Sustainable', 'Terminal', 'Weighted', 'Diluted', 'Deferred', 'Net',
+]
+EN_NOUNS = [
+    'Return', 'Yield', 'Spread', 'Duration', 'Margin', 'Ratio', 'Premium', 'Value',
+    'Cost', 'Rate', 'Income', 'Growth', 'Risk', 'Exposure', 'Turnover', 'Coverage',
+]
+JP_WORDS = [
+    '調整', '実効', '期待', '先渡', '暗黙', '限界', '名目', '実質', '要求', '残余', '持続可能', '継続',
+    '加重', '希薄化', '繰延', '純', '収益率', '利回り', 'スプレッド', 'デュレーション', '利益率', '比率',
+]
+JP_KANA = 'あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわ'
+RELATION_TYPES = ['related', 'contrast', 'prerequisite']
+
+TERM_COLUMNS = [
+    'term_id', 'topic_code', 'en_canonical', 'en_aliases', 'abbreviations', 'jp_headword',
+    'jp_reading', 'jp_definition', 'key_points', 'pitfall', 'formula', 'notes',
+]
+
+
+def term_id(i, width):
+    return f'TERM{i:0{width}d}'
+
+
+def generate_terms(n, seed=0):
+    """terms.csv と同じ列を持つ行を n 件生成"""
+    rng = random.Random(seed)
+    width = max(4, len(str(n)))
+    terms = []
+    for i in range(1, n + 1):
+        en = f'{rng.choice(EN_ADJECTIVES)} {rng.choice(EN_NOUNS)} {i}'
+        abbrev = ''.join(w[0] for w in en.split()[:2]) + str(i) if rng.random() < 0.3 else ''
+        jp = ''.join(rng.choices(JP_WORDS, k=2))
+        terms.append({
+            'term_id': term_id(i, width),
+            'topic_code': rng.choice(TOPIC_CODES),
+            'en_canonical': en,
+            'en_aliases': f'{en} Measure' if rng.random() < 0.4 else '',
+            'abbreviations': abbrev,
+            'jp_headword': jp,
+            'jp_reading': ''.join(rng.choices(JP_KANA, k=8)),
+            'jp_definition': f'{jp}とは、' + '、'.join(rng.choices(JP_WORDS, k=12)) + 'を表す指標である。',
+            'key_points': ';'.join('・'.join(rng.choices(JP_WORDS, k=4)) for _ in range(rng.randint(1, 3))),
+            'pitfall': f'{jp}と' + ''.join(rng.choices(JP_WORDS, k=2)) + 'の混同。',
+            'formula': f'{en.split()[1]} = A / B' if rng.random() < 0.2 else '',
+            'notes': '',
+        })
+    return terms
+
+
+def generate_examples(terms, seed=0):
+    """各用語に1件ずつ例文を生成"""
+    rng = random.Random(seed + 1)
+    return [
+        {
+            'term_id': t['term_id'],
+            'example_en': f"The analyst estimated the {t['en_canonical'].lower()} using "
+                          f"{rng.randint(2, 12)} years of {rng.choice(EN_NOUNS).lower()} data.",
+            'example_jp': f"アナリストは{rng.randint(2, 12)}年分のデータを用いて{t['jp_headword']}を推定した。",
+        }
+        for t in terms
+    ]
+
+
+def generate_relations(terms, seed=0):
+    """おおよそ用語数と同数の関連語ペアを生成"""
+    rng = random.Random(seed + 2)
+    relations = []
+    for t in terms:
+        if len(terms) > 1 and rng.random() < 0.5:
+            other = rng.choice(terms)
+            if other['term_id'] != t['term_id']:
+                relations.append({
+                    'term_id': t['term_id'],
+                    'related_term_id': other['term_id'],
+                    'relation_type': rng.choice(RELATION_TYPES),
+                })
+    return relations
+
+
+def generate_pasted_markdown(terms, examples):
+    """update_examples.py が読む貼り付け形式の単語集を生成"""
+    entries = []
+    for i, (t, ex) in enumerate(zip(terms, examples), 1):
+        entries.append(
+            f"### {i}. {t['en_canonical']}（{t['jp_headword']}）\n\n"
+            f"**英語例文**: {ex['example_en']} This is the provided version.\n"
+            f"**日本語例文**: {ex['example_jp']}"
+        )
+    return '\n---\n'.join(entries)
+
+
+def write_csv(path, rows, columns):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_content(out_dir, n, seed=0):
+    """合成した terms/examples/relations のCSVと貼り付け形式ファイルを書き出す"""
+    os.makedirs(out_dir, exist_ok=True)
+    terms = generate_terms(n, seed)
+    examples = generate_examples(terms, seed)
+    relations = generate_relations(terms, seed)
+    write_csv(os.path.join(out_dir, 'terms.csv'), terms, TERM_COLUMNS)
+    write_csv(os.path.join(out_dir, 'examples.csv'), examples, ['term_id', 'example_en', 'example_jp'])
+    write_csv(os.path.join(out_dir, 'relations.csv'), relations, ['term_id', 'related_term_id', 'relation_type'])
+    with open(os.path.join(out_dir, 'Pasted_content.txt'), 'w', encoding='utf-8') as f:
+        f.write(generate_pasted_markdown(terms, examples))
+    return terms, examples, relations
+
+
+def generate_spritesheet(size, cell_size=None, line_width=6, seed=0):
+    """グリッド線で区切られたセルにエフェクト風の円を描いた size×size のスプライトシートを生成
+
+    実物と同様に、白背景・グレーのグリッド線・3×3セルのグループで構成する。
+    戻り値は (PIL.Image, グリッド線の位置 (縦, 横))。
+    """
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(seed)
+    cell_size = cell_size or max(32, size // 10)
+    data = np.full((size, size, 3), 255, dtype=np.uint8)
+
+    pitch = cell_size + line_width
+    lines = list(range(0, size - line_width, pitch))
+    for pos in lines:
+        data[pos:pos + line_width, :, :] = 140
+        data[:, pos:pos + line_width, :] = 140
+
+    yy, xx = np.ogrid[:cell_size, :cell_size]
+    center = cell_size / 2
+    for top in lines:
+        for left in lines:
+            y0, x0 = top + line_width, left + line_width
+            if y0 + cell_size > size or x0 + cell_size > size:
+                continue
+            radius = rng.uniform(0.15, 0.45) * cell_size
+            mask = (yy - center) ** 2 + (xx - center) ** 2 <= radius ** 2
+            color = rng.integers(0, 256, size=3, dtype=np.uint8)
+            # グリッド線の色と紛れないよう彩度のある色にする
+            color[rng.integers(0, 3)] = 255
+            color[rng.integers(0, 3)] //= 4
+            data[y0:y0 + cell_size, x0:x0 + cell_size][mask] = color
+
+    return Image.fromarray(data, 'RGB'), (lines, lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ベンチマーク用の合成データを生成')
+    parser.add_argument('--out', required=True, help='出力ディレクトリ')
+    parser.add_argument('--terms', type=int, default=0, help='生成する用語数')
+    parser.add_argument('--sheet', type=int, default=0, help='生成するスプライトシートの一辺（px）')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.terms:
+        terms, examples, relations = write_content(args.out, args.terms, args.seed)
+        print(f"生成: 用語{len(terms)}件, 例文{len(examples)}件, 関連語{len(relations)}件 -> {args.out}")
+    if args.sheet:
+        os.makedirs(args.out, exist_ok=True)
+        img, _ = generate_spritesheet(args.sheet, seed=args.seed)
+        path = os.path.join(args.out, f'spritesheet_{args.sheet}.png')
+        img.save(path)
+        print(f"生成: {path}")
+
+
+if __name__ == '__main__':
+    main()
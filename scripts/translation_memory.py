@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+例文・教科書段落の翻訳メモリ（英語 → 日本語）
+
+これまでに作った英日ペアをすべて SQLite に集め、新しい例文の日本語訳を埋めるときに再利用する。
+- 完全一致: 正規化した英文のハッシュで引く
+- あいまい一致: 文字3-gramの転置インデックスで候補を絞り、単語列の編集類似度で順位をつける
+同じ英文に複数の訳がある場合（add_eq_terms.py の example_ja と add_japanese_translations.py の
+example_jp など）はすべて出どころつきで保持し、conflicts で一覧できる。
+
+取り込むペア:
+- assets/data/examples.json の example_en ↔ example_jp / example_ja
+- assets/data/new_eq_examples.csv の example_en ↔ example_ja
+- add_japanese_translations.py の JAPANESE_TRANSLATIONS（term_id から英文を引く）
+- update_examples.py の貼り付け単語集（ファイルがあれば）
+- 教科書の段落（all_sections.json / textbook-sample.json）と、文の数が同じ段落の文単位のペア
+
+使い方:
+    python scripts/translation_memory.py build                   # 既存のペアを取り込む（何度実行してもよい）
+    python scripts/translation_memory.py lookup "The investor placed a market order to buy 200 shares."
+    python scripts/translation_memory.py conflicts               # 訳が食い違う英文の一覧
+    python scripts/translation_memory.py backfill                # examples.json の空の example_jp を完全一致で埋める
+    python scripts/translation_memory.py backfill --input new.csv --output filled.csv --min-score 0.8
+"""
+import argparse
+import csv
+import difflib
+import hashlib
+import importlib.util
+import json
+import re
+import sqlite3
+import sys
+import time
+import unicodedata
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+from content_model import (
+    DATA_DIR, EXAMPLES_FILE, ROOT_DIR, SECTIONS_FILE, Example, Section, load_content, read_records, write_records,
+)
+
+SCRIPTS_DIR = ROOT_DIR / 'scripts'
+DEFAULT_DB = ROOT_DIR / '.translation-memory.sqlite'
+
+GRAM_SIZE = 3
+# SQLite のパラメータ数の上限（古い版は999）に収まるように、長い文は n-gram を間引いて引く
+MAX_QUERY_GRAMS = 900
+CANDIDATES = 50
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    id INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL UNIQUE,
+    text TEXT NOT NULL,
+    gram_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS translations (
+    source_id INTEGER NOT NULL REFERENCES sources(id),
+    target TEXT NOT NULL,
+    origin TEXT NOT NULL,
+    PRIMARY KEY (source_id, target, origin)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS grams (
+    gram INTEGER NOT NULL,
+    source_id INTEGER NOT NULL,
+    PRIMARY KEY (gram, source_id)
+) WITHOUT ROWID;
+"""
+
+
+# ========== 正規化 ==========
+
+def normalize(text):
+    """照合用の正規化（NFKC・小文字・空白の統一・PDF由来の改行ハイフン）"""
+    text = unicodedata.normalize('NFKC', text).lower()
+    text = re.sub(r'(\w)- (\w)', r'\1\2', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def source_hash(normalized):
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=12).hexdigest()
+
+
+def grams(normalized):
+    padded = f' {normalized} '
+    return {zlib.crc32(padded[i:i + GRAM_SIZE].encode('utf-8')) for i in range(len(padded) - GRAM_SIZE + 1)}
+
+
+def words(normalized):
+    """語単位の比較用。文末の句点は落とし、小数点は残す"""
+    return re.findall(r"\d+(?:[.,]\d+)*%?|[\w$']+", normalized)
+
+
+# ========== 翻訳メモリ ==========
+
+@dataclass
+class Match:
+    score: float
+    source: str
+    target: str
+    origin: str
+
+    @property
+    def exact(self):
+        return self.score >= 1.0
+
+
+class TranslationMemory:
+    def __init__(self, path=DEFAULT_DB):
+        self.db = sqlite3.connect(str(path))
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def add(self, source, target, origin):
+        """英日ペアを1件追加（同じ英文・訳・出どころの組は1件だけ）。追加したら True"""
+        source, target = source.strip(), target.strip()
+        if not source or not target:
+            return False
+        normalized = normalize(source)
+        key = source_hash(normalized)
+        row = self.db.execute('SELECT id FROM sources WHERE hash = ?', (key,)).fetchone()
+        if row:
+            source_id = row[0]
+        else:
+            source_grams = grams(normalized)
+            source_id = self.db.execute(
+                'INSERT INTO sources (hash, text, gram_count) VALUES (?, ?, ?)',
+                (key, source, len(source_grams)),
+            ).lastrowid
+            self.db.executemany('INSERT INTO grams (gram, source_id) VALUES (?, ?)',
+                                ((gram, source_id) for gram in source_grams))
+        cursor = self.db.execute(
+            'INSERT OR IGNORE INTO translations (source_id, target, origin) VALUES (?, ?, ?)',
+            (source_id, target, origin),
+        )
+        return cursor.rowcount > 0
+
+    def commit(self):
+        self.db.commit()
+
+    def translations(self, source_id):
+        return self.db.execute(
+            'SELECT target, origin FROM translations WHERE source_id = ? ORDER BY origin', (source_id,)
+        ).fetchall()
+
+    def lookup(self, text, limit=3, min_score=0.7):
+        """
+        完全一致（score 1.0）と、類似度 min_score 以上のあいまい一致を返す
+        あいまい一致は n-gram の Dice 係数が高い英文を候補にし、単語列の編集類似度で順位をつける
+        """
+        normalized = normalize(text)
+        row = self.db.execute('SELECT id, text FROM sources WHERE hash = ?', (source_hash(normalized),)).fetchone()
+        if row:
+            return [Match(1.0, row[1], target, origin) for target, origin in self.translations(row[0])][:limit]
+
+        query_grams = sorted(grams(normalized))
+        if len(query_grams) > MAX_QUERY_GRAMS:
+            step = len(query_grams) / MAX_QUERY_GRAMS
+            query_grams = [query_grams[int(i * step)] for i in range(MAX_QUERY_GRAMS)]
+        placeholders = ','.join('?' * len(query_grams))
+        candidates = self.db.execute(
+            f'SELECT g.source_id, COUNT(*) AS shared, s.gram_count, s.text FROM grams g '
+            f'JOIN sources s ON s.id = g.source_id '
+            f'WHERE g.gram IN ({placeholders}) GROUP BY g.source_id '
+            f'ORDER BY 2.0 * shared / (? + s.gram_count) DESC LIMIT ?',
+            (*query_grams, len(query_grams), CANDIDATES),
+        ).fetchall()
+
+        query_words = words(normalized)
+        scored = []
+        for source_id, shared, gram_count, source in candidates:
+            # n-gram の Dice 係数が低すぎる候補は編集類似度を計算しない
+            if 2 * shared / (len(query_grams) + gram_count) < min_score * 0.7:
+                continue
+            score = difflib.SequenceMatcher(None, query_words, words(normalize(source)), autojunk=False).ratio()
+            if score >= min_score:
+                scored.append((score, source_id, source))
+        scored.sort(key=lambda s: -s[0])
+
+        matches = []
+        for score, source_id, source in scored:
+            for target, origin in self.translations(source_id):
+                matches.append(Match(min(score, 0.999), source, target, origin))
+        return matches[:limit]
+
+    def conflicts(self):
+        """訳が2つ以上ある英文"""
+        rows = self.db.execute(
+            'SELECT s.id, s.text FROM sources s JOIN translations t ON t.source_id = s.id '
+            'GROUP BY s.id HAVING COUNT(DISTINCT t.target) > 1 ORDER BY s.id'
+        ).fetchall()
+        return [(text, self.translations(source_id)) for source_id, text in rows]
+
+    def stats(self):
+        sources = self.db.execute('SELECT COUNT(*) FROM sources').fetchone()[0]
+        translations = self.db.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+        return sources, translations
+
+
+# ========== 既存ペアの取り込み ==========
+
+def read_json(path):
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def read_examples(path):
+    """例文の JSON・CSV を Example のリストとして読む（CSV の example_ja も example_jp に寄せる）"""
+    if path.suffix == '.csv':
+        if not path.exists():
+            return []
+        with open(path, 'r', encoding='utf-8') as f:
+            return [Example.from_dict(row) for row in csv.DictReader(f)]
+    return read_records(path, Example)
+
+
+def load_script(name):
+    """データ定数を読むためにスクリプトを import する（__main__ ガードのあるものだけ）"""
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / f'{name}.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def split_sentences(text, lang):
+    pattern = r'(?<=[.!?])\s+(?=[A-Z"“(])' if lang == 'en' else r'(?<=[。！？])'
+    return [s.strip() for s in re.split(pattern, text.strip()) if s.strip()]
+
+
+def legacy_example_pairs():
+    """example_jp と並んで残っている旧フィールド example_ja の訳
+
+    Example は旧名を正規の名前へ寄せるときに正規の名前の値を優先するので、両方ある例文の
+    example_ja はモデルからは見えない。訳の食い違いを conflicts に出すため、ここだけ旧名を直接読む。
+    """
+    for item in read_json(ROOT_DIR / EXAMPLES_FILE) or []:
+        if item.get('example_ja') and item.get('example_jp'):
+            yield item['example_en'], item['example_ja'], 'examples.json:example_ja'
+
+
+def example_pairs():
+    examples = load_content().examples
+    for example in examples:
+        if example.example_jp:
+            yield example.example_en, example.example_jp, 'examples.json:example_jp'
+    yield from legacy_example_pairs()
+
+    for example in read_examples(DATA_DIR / 'new_eq_examples.csv'):
+        yield example.example_en, example.example_jp, 'new_eq_examples.csv'
+
+    english = {example.term_id: example.example_en for example in examples}
+    for term_id, japanese in load_script('add_japanese_translations').JAPANESE_TRANSLATIONS.items():
+        if term_id in english:
+            yield english[term_id], japanese, 'add_japanese_translations.py'
+
+    update_examples = load_script('update_examples')
+    if update_examples.PROVIDED_FILE.exists():
+        for entry in update_examples.extract_examples_from_provided_file().values():
+            yield entry['en_example'], entry['jp_example'], 'update_examples.py'
+
+
+def paragraph_pairs(english, japanese, origin):
+    """段落のペアと、文の数が一致する場合は文単位のペア"""
+    if not english or not japanese:
+        return
+    yield english, japanese, origin
+    en_sentences = split_sentences(english, 'en')
+    ja_sentences = split_sentences(japanese, 'ja')
+    if len(en_sentences) > 1 and len(en_sentences) == len(ja_sentences):
+        for en, ja in zip(en_sentences, ja_sentences):
+            yield en, ja, f'{origin}:sentence'
+
+
+def textbook_pairs():
+    sources = [
+        (SECTIONS_FILE, load_content().sections),
+        ('translations/all_sections.json', read_records(ROOT_DIR / 'translations' / 'all_sections.json', Section)),
+    ]
+    for path, sections in sources:
+        for section in sections:
+            for paragraph in section.paragraphs:
+                yield from paragraph_pairs(paragraph.en, paragraph.jp, path)
+
+    sample = read_json(ROOT_DIR / 'data' / 'textbook-sample.json') or {}
+    for content in sample.get('textContents', []):
+        for en, ja in zip(content.get('content', '').split('\n\n'), content.get('contentJa', '').split('\n\n')):
+            yield from paragraph_pairs(en, ja, 'textbook-sample.json:textContents')
+    for example in sample.get('examples', []):
+        for field in ('problem', 'solution', 'explanation'):
+            yield from paragraph_pairs(example.get(field), example.get(f'{field}Ja'), 'textbook-sample.json:examples')
+
+
+def build(memory):
+    added = 0
+    for pairs in (example_pairs(), textbook_pairs()):
+        for source, target, origin in pairs:
+            added += memory.add(source, target, origin)
+    memory.commit()
+    return added
+
+
+# ========== 訳の埋め込み ==========
+
+def write_rows(path, rows):
+    if path.suffix == '.csv':
+        fields = list(dict.fromkeys(key for row in rows for key in row))
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+
+
+def annotated_rows(examples, matches):
+    """例文ごとの dict に、使った（または候補の）訳を tm_* 列として足したもの"""
+    rows = []
+    for example in examples:
+        row = example.to_dict()
+        best = matches.get(id(example))
+        if best:
+            row['tm_score'] = round(best.score, 3)
+            row['tm_source'] = best.source
+            row['tm_target'] = best.target
+            row['tm_origin'] = best.origin
+        rows.append(row)
+    return rows
+
+
+def backfill(memory, examples, min_score, accept_fuzzy):
+    """
+    example_jp が空の例文を翻訳メモリで埋める
+    完全一致は常に採用し、あいまい一致は accept_fuzzy のときだけ採用する
+    例文（id）ごとの最良の一致も返す（tm_* 列用）
+    """
+    filled = suggested = 0
+    start = time.perf_counter()
+    looked_up = 0
+    matches = {}
+    for example in examples:
+        if example.example_jp or not example.example_en:
+            continue
+        looked_up += 1
+        found = memory.lookup(example.example_en, limit=1, min_score=min_score)
+        if not found:
+            continue
+        best = matches[id(example)] = found[0]
+        if best.exact or accept_fuzzy:
+            example.example_jp = best.target
+            filled += 1
+        else:
+            suggested += 1
+    elapsed = time.perf_counter() - start
+    return looked_up, filled, suggested, elapsed, matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='例文・教科書段落の翻訳メモリ')
+    parser.add_argument('--db', type=Path, default=DEFAULT_DB, help='翻訳メモリのファイル（SQLite）')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('build', help='既存の英日ペアを取り込む')
+
+    p_lookup = sub.add_parser('lookup', help='英文の訳を引く')
+    p_lookup.add_argument('text')
+    p_lookup.add_argument('--limit', type=int, default=5)
+    p_lookup.add_argument('--min-score', type=float, default=0.6)
+
+    sub.add_parser('conflicts', help='訳が食い違う英文の一覧')
+
+    p_backfill = sub.add_parser('backfill', help='空の example_jp を埋める')
+    p_backfill.add_argument('--input', type=Path, default=ROOT_DIR / EXAMPLES_FILE, help='JSON または CSV（example_en 列）')
+    p_backfill.add_argument('--output', type=Path, help='出力先（tm_* 列つき）。省略時は --input の example_jp だけを上書き')
+    p_backfill.add_argument('--min-score', type=float, default=0.8)
+    p_backfill.add_argument('--accept-fuzzy', action='store_true', help='あいまい一致の訳も採用する')
+    args = parser.parse_args()
+
+    memory = TranslationMemory(args.db)
+    try:
+        if args.command == 'build':
+            start = time.perf_counter()
+            added = build(memory)
+            sources, translations = memory.stats()
+            print(f'追加: {added}件 / 英文 {sources}件, 訳 {translations}件 ({time.perf_counter() - start:.2f}s)')
+
+        elif args.command == 'lookup':
+            start = time.perf_counter()
+            matches = memory.lookup(args.text, args.limit, args.min_score)
+            elapsed = (time.perf_counter() - start) * 1000
+            if not matches:
+                print('一致なし')
+            for match in matches:
+                kind = '完全一致' if match.exact else f'{match.score:.0%}'
+                print(f'[{kind}] {match.target}  ({match.origin})')
+                if not match.exact:
+                    print(f'        原文: {match.source}')
+            print(f'({elapsed:.1f}ms)')
+
+        elif args.command == 'conflicts':
+            conflicts = memory.conflicts()
+            for source, targets in conflicts:
+                print(source)
+                for target, origin in targets:
+                    print(f'  {origin}: {target}')
+            print(f'\n訳が食い違う英文: {len(conflicts)}件')
+
+        elif args.command == 'backfill':
+            if not args.input.exists():
+                sys.exit(f'入力がありません: {args.input}')
+            examples = read_examples(args.input)
+            looked_up, filled, suggested, elapsed, matches = backfill(
+                memory, examples, args.min_score, args.accept_fuzzy)
+            per_sentence = elapsed / looked_up * 1000 if looked_up else 0
+            print(f'検索: {looked_up}文（{per_sentence:.2f}ms/文）, 埋めた訳: {filled}件, 候補のみ: {suggested}件')
+            # 上書きするときはアプリのデータに tm_* 列を残さない
+            if args.output is not None:
+                if filled or suggested:
+                    write_rows(args.output, annotated_rows(examples, matches))
+            elif filled:
+                if args.input.suffix == '.csv':
+                    write_rows(args.input, [example.to_dict() for example in examples])
+                else:
+                    write_records(args.input, examples)
+    finally:
+        memory.close()
+
+
+if __name__ == '__main__':
+    main()
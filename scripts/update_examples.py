@@ -4,12 +4,15 @@
 """
 import json
 import re
+import sys
 from pathlib import Path
 
-# ファイルパス
-PROVIDED_FILE = Path('/home/ubuntu/upload/Pasted_content.txt')
-TERMS_FILE = Path('/home/ubuntu/cfa-vocab-app/assets/data/terms.json')
-EXAMPLES_FILE = Path('/home/ubuntu/cfa-vocab-app/assets/data/examples.json')
+from content_model import DATA_DIR, PASTED_CONTENT_FILE
+
+# ファイルパス（単語集は引数で別のファイルも指定できる）
+PROVIDED_FILE = PASTED_CONTENT_FILE
+TERMS_FILE = DATA_DIR / 'terms.json'
+EXAMPLES_FILE = DATA_DIR / 'examples.json'
 
 def extract_examples_from_provided_file():
     """提供されたファイルから例文を抽出"""
@@ -52,6 +55,20 @@ def normalize_term(term):
     # 小文字化、記号削除
     return re.sub(r'[^a-z0-9]', '', term.lower())
 
+def build_term_mapping(terms):
+    """正規化した英語名・別名 → term_id（別名は他の用語の名前と重なれば先に登録したものを優先）"""
+    term_mapping = {}
+    for term in terms:
+        normalized = normalize_term(term['en_canonical'])
+        term_mapping[normalized] = term['term_id']
+        
+        # エイリアスもマッピング
+        for alias in term.get('en_aliases', []):
+            normalized_alias = normalize_term(alias)
+            if normalized_alias not in term_mapping:
+                term_mapping[normalized_alias] = term['term_id']
+    return term_mapping
+
 def update_examples():
     """例文データを更新"""
     # 提供されたファイルから例文を抽出
@@ -70,16 +87,7 @@ def update_examples():
         examples = json.load(f)
     
     # 用語IDと正規化された用語名のマッピングを作成
-    term_mapping = {}
-    for term in terms:
-        normalized = normalize_term(term['en_canonical'])
-        term_mapping[normalized] = term['term_id']
-        
-        # エイリアスもマッピング
-        for alias in term.get('en_aliases', []):
-            normalized_alias = normalize_term(alias)
-            if normalized_alias not in term_mapping:
-                term_mapping[normalized_alias] = term['term_id']
+    term_mapping = build_term_mapping(terms)
     
     # 例文を更新
     print("\nUpdating examples...")
@@ -122,4 +130,6 @@ def update_examples():
     print(f"✓ Total examples: {len(updated_examples)}")
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        PROVIDED_FILE = Path(sys.argv[1])
     update_examples()
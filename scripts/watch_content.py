@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+コンテンツ編集用の常駐ウォッチモード
+
+terms/examples/relations のCSV・JSONとエフェクトのスプライトシートを一度だけ読み込んで常駐させ、
+ファイル変更イベント（Linuxでは inotify、それ以外はポーリング）を受けて影響する部分だけを再計算する。
+- CSVの編集: 変更・追加・削除された行だけを変換し、対応するJSONレコードを差し替える
+  （JSONにしかないレコードはそのまま残す）。行・レコードは content_model の Term / Example / Relation で扱うので、
+  旧フィールド名の残っている JSON は最初の書き出しで正規の形に書き直される（起動時に表示する）
+- JSON が正本（build_pipeline.py の SOURCE_FILES）。常駐中に import_deck.py などが JSON に書き込んでいたら、
+  CSVの変更を反映する前に JSON を読み直すので、取り込まれたレコードを古い内容で上書きしない
+- extract_effects_correct.py のセル座標の編集: 座標が変わったセルだけを切り出し直す
+- スプライトシートの差し替え: 画素が変わったセルだけを切り出し直す
+
+使い方:
+    python scripts/watch_content.py
+    python scripts/watch_content.py --no-sprites   # データのみ監視
+    python scripts/watch_content.py --poll         # inotify を使わずポーリングで監視
+"""
+import argparse
+import csv
+import ctypes
+import ctypes.util
+import hashlib
+import importlib.util
+import json
+import os
+import select
+import struct
+import sys
+import textwrap
+import time
+
+from content_model import (
+    DATA_DIR, EFFECTS_DIR, EXAMPLES_FILE, RELATIONS_FILE, ROOT_DIR, TERMS_FILE, Example, Relation, Term, read_records,
+)
+
+SCRIPTS_DIR = ROOT_DIR / 'scripts'
+SHEET_PATH = EFFECTS_DIR / 'effects_spritesheet.png'
+EFFECTS_SCRIPT = SCRIPTS_DIR / 'extract_effects_correct.py'
+
+# 連続するイベント（エディタの保存で複数発生する）をまとめる待ち時間
+DEBOUNCE_SECONDS = 0.03
+
+
+def load_script(path):
+    """scripts/ 内のスクリプトをモジュールとして読み込む（ファイル名にハイフンがあってもよい）"""
+    spec = importlib.util.spec_from_file_location(path.stem.replace('-', '_'), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def term_key(record):
+    return record.term_id
+
+
+def relation_key(record):
+    return (record.term_id, record.related_term_id)
+
+
+# (CSV, JSON, レコードのクラス, キー)
+DATASETS = [
+    ('terms.csv', TERMS_FILE, Term, term_key),
+    ('examples.csv', EXAMPLES_FILE, Example, term_key),
+    ('relations.csv', RELATIONS_FILE, Relation, relation_key),
+]
+
+
+def write_atomic(path, text):
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class JsonTable:
+    """キー付きのJSON配列を常駐させ、レコード単位のシリアライズ結果をキャッシュする
+
+    書き出しはキャッシュ済みの断片を連結するだけなので、変更レコード数に比例したコストで済む。
+    出力は write_records()（json.dump(..., ensure_ascii=False, indent=2)）と同一。
+    """
+
+    def __init__(self, path, cls, key):
+        self.path = path
+        self.cls = cls
+        self.key = key
+        self.load()
+        # 旧フィールド名などで、読んだファイルと正規の形の書き出しが一致しない
+        self.normalizes = path.read_text(encoding='utf-8') != self._text()
+
+    def _stamp(self):
+        st = self.path.stat()
+        return (st.st_size, st.st_mtime_ns)
+
+    def load(self):
+        self.stamp = self._stamp()
+        records = read_records(self.path, self.cls)
+        self.records = {self.key(r): r for r in records}
+        self.fragments = {k: self._fragment(r) for k, r in self.records.items()}
+
+    def reload_if_changed(self):
+        """最後に読み書きしてからファイルが書き換えられていれば読み直す（読み直したら True）"""
+        if self._stamp() == self.stamp:
+            return False
+        self.load()
+        return True
+
+    @staticmethod
+    def _fragment(record):
+        return textwrap.indent(json.dumps(record.to_dict(), ensure_ascii=False, indent=2), '  ')
+
+    def upsert(self, record):
+        k = self.key(record)
+        self.records[k] = record
+        self.fragments[k] = self._fragment(record)
+
+    def delete(self, k):
+        self.records.pop(k, None)
+        self.fragments.pop(k, None)
+
+    def _text(self):
+        if self.fragments:
+            return '[\n' + ',\n'.join(self.fragments.values()) + '\n]'
+        return '[]'
+
+    def write(self):
+        write_atomic(self.path, self._text())
+        self.stamp = self._stamp()
+
+
+class CsvSource:
+    """CSVの行をキーごとに常駐させ、再読み込み時に差分だけを返す"""
+
+    def __init__(self, path, cls, key):
+        self.path = path
+        self.cls = cls
+        self.key = key
+        self.rows = self._read()
+
+    def _read(self):
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            records = (self.cls.from_dict(row) for row in csv.DictReader(f))
+            return {self.key(record): record for record in records}
+
+    def diff(self):
+        rows = self._read()
+        changed = [row for k, row in rows.items() if self.rows.get(k) != row]
+        removed = [k for k in self.rows if k not in rows]
+        self.rows = rows
+        return changed, removed
+
+
+class DataSet:
+    """CSVとJSONの組。CSVで変わった行だけをJSONに反映する"""
+
+    def __init__(self, csv_name, json_file, cls, key):
+        self.name = csv_name
+        self.source = CsvSource(DATA_DIR / csv_name, cls, key)
+        self.table = JsonTable(ROOT_DIR / json_file, cls, key)
+
+    def refresh(self):
+        changed, removed = self.source.diff()
+        if not changed and not removed:
+            return 0
+        if self.table.reload_if_changed():
+            print(f"{self.table.path.relative_to(ROOT_DIR)}: 外部で更新されていたため読み直しました")
+        for record in changed:
+            self.table.upsert(record)
+        for k in removed:
+            self.table.delete(k)
+        self.table.write()
+        return len(changed) + len(removed)
+
+
+class EffectSheet:
+    """スプライトシートを常駐させ、座標または画素が変わったセルだけを切り出し直す"""
+
+    def __init__(self):
+        from PIL import Image
+        self.Image = Image
+        self.module = load_script(EFFECTS_SCRIPT)
+        self.sheet = self._open_sheet()
+        self.cells = self._cells()
+        self.digests = {name: self._digest(bounds) for name, bounds in self.cells.items()}
+
+    def _open_sheet(self):
+        sheet = self.Image.open(SHEET_PATH)
+        sheet.load()
+        return sheet
+
+    def _cells(self):
+        return {
+            f'{effect_name}_{i+1}': tuple(bounds)
+            for effect_name, cells in self.module.EFFECT_CELLS.items()
+            for i, bounds in enumerate(cells)
+        }
+
+    def _digest(self, bounds):
+        return hashlib.blake2b(self.sheet.crop(bounds).tobytes(), digest_size=16).digest()
+
+    def _render(self, names):
+        for name in names:
+            bounds = self.cells[name]
+            cropped = self.module.trim_transparent(self.sheet.crop(bounds))
+            cropped.save(EFFECTS_DIR / f'{name}.png')
+            self.digests[name] = self._digest(bounds)
+        return len(names)
+
+    def refresh_cells(self):
+        """セル座標の定義（スクリプト）が変わったとき"""
+        self.module = load_script(EFFECTS_SCRIPT)
+        cells = self._cells()
+        changed = [name for name, bounds in cells.items() if self.cells.get(name) != bounds]
+        self.cells = cells
+        return self._render(changed)
+
+    def refresh_sheet(self):
+        """スプライトシート画像が変わったとき"""
+        self.sheet = self._open_sheet()
+        changed = [name for name, bounds in self.cells.items() if self._digest(bounds) != self.digests.get(name)]
+        return self._render(changed)
+
+
+class InotifyWatcher:
+    """inotify でディレクトリを監視し、書き込みが完了したファイルのパスを返す"""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, paths):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 に失敗しました')
+        self.dirs = {}
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        for directory in {p.parent for p in paths}:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), mask)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f'inotify_add_watch に失敗しました: {directory}')
+            self.dirs[wd] = directory
+
+    def wait(self, timeout=None):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        try:
+            buf = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(buf):
+            wd, _mask, _cookie, length = self.EVENT_HEADER.unpack_from(buf, offset)
+            offset += self.EVENT_HEADER.size
+            name = buf[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if name and wd in self.dirs:
+                changed.add(self.dirs[wd] / os.fsdecode(name))
+        return changed
+
+
+class PollingWatcher:
+    """inotify が使えない環境向けに mtime をポーリングする"""
+
+    INTERVAL = 0.05
+
+    def __init__(self, paths):
+        self.mtimes = {p: self._mtime(p) for p in paths}
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path, before in self.mtimes.items():
+                now = self._mtime(path)
+                if now != before:
+                    self.mtimes[path] = now
+                    changed.add(path)
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+            time.sleep(self.INTERVAL)
+
+
+def make_watcher(paths, poll=False):
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError) as e:
+            print(f"inotify を使用できないためポーリングで監視します: {e}")
+    return PollingWatcher(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='コンテンツの常駐ウォッチモード')
+    parser.add_argument('--no-sprites', action='store_true', help='スプライトシートを監視しない')
+    parser.add_argument('--poll', action='store_true', help='inotify を使わずポーリングで監視')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    handlers = {}
+    for csv_name, json_file, cls, key in DATASETS:
+        dataset = DataSet(csv_name, json_file, cls, key)
+        handlers[dataset.source.path] = (csv_name, dataset.refresh)
+        if dataset.table.normalizes:
+            print(f"{json_file}: 旧フィールド名などがあり、最初の更新で正規の形に書き直します"
+                  f"（python scripts/content_model.py check で確認）")
+
+    if not args.no_sprites:
+        try:
+            sheet = EffectSheet()
+        except ImportError:
+            print("Pillow がないためスプライトシートは監視しません")
+        else:
+            handlers[EFFECTS_SCRIPT] = ('セル座標', sheet.refresh_cells)
+            handlers[SHEET_PATH] = ('スプライトシート', sheet.refresh_sheet)
+
+    watcher = make_watcher(list(handlers), poll=args.poll)
+    print(f"読み込み完了 ({(time.perf_counter() - start) * 1000:.0f}ms)。監視中: {len(handlers)}ファイル（Ctrl+Cで終了）")
+
+    try:
+        while True:
+            changed = watcher.wait()
+            # 保存直後に続くイベントをまとめて1回の再計算にする
+            while True:
+                more = watcher.wait(DEBOUNCE_SECONDS)
+                if not more:
+                    break
+                changed |= more
+
+            for path in sorted(changed & handlers.keys()):
+                label, refresh = handlers[path]
+                t0 = time.perf_counter()
+                try:
+                    count = refresh()
+                except Exception as e:  # 編集途中の不完全なファイルでは監視を止めない
+                    print(f"エラー: {label}: {e}")
+                    continue
+                print(f"更新: {label} {count}件 ({(time.perf_counter() - t0) * 1000:.1f}ms)")
+    except KeyboardInterrupt:
+        print("\n終了")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,20 @@
-import { eq } from "drizzle-orm";
+import { asc, eq } from "drizzle-orm";
 import { drizzle } from "drizzle-orm/mysql2";
-import { InsertUser, users } from "../drizzle/schema";
+import { InsertUser, reviewEvents, termProgress, users } from "../drizzle/schema";
 import { ENV } from "./_core/env";
+import {
+  MAX_CHANGES_PER_SYNC,
+  changedSince,
+  changesForClient,
+  collapseBatch,
+  cursorOf,
+  fromProgressRow,
+  lastWriterWinsSet,
+  toProgressRow,
+  toReviewEventRow,
+  type SyncInput,
+  type SyncResult,
+} from "./progress-sync";
 
 let _db: ReturnType<typeof drizzle> | null = null;
 
@@ -89,4 +102,51 @@ export async function getUserByOpenId(openId: string) {
   return result.length > 0 ? result[0] : undefined;
 }
 
-// TODO: add feature queries here as your schema grows.
+/**
+ * Apply one batch of progress deltas and review events for a user, then return the records
+ * changed on the server since the client's cursor (e.g. by another device).
+ * Progress is written with a single bulk upsert that keeps whichever side has the higher version;
+ * review events are bulk-inserted and duplicates (retried uploads) are ignored.
+ */
+export async function syncProgress(userId: number, input: SyncInput): Promise<SyncResult> {
+  const db = await getDb();
+  if (!db) {
+    throw new Error("Database not available");
+  }
+
+  const { progress, events } = collapseBatch(input);
+
+  let eventsInserted = 0;
+  if (events.length > 0) {
+    const [result] = await db
+      .insert(reviewEvents)
+      .ignore()
+      .values(events.map(event => toReviewEventRow(userId, event)));
+    eventsInserted = result.affectedRows;
+  }
+
+  if (progress.length > 0) {
+    await db
+      .insert(termProgress)
+      .values(progress.map(delta => toProgressRow(userId, delta)))
+      .onDuplicateKeyUpdate({ set: lastWriterWinsSet() });
+  }
+
+  // Keyset on (updatedAt, termId): a bulk upsert gives many rows the same updatedAt, so paging
+  // on the time alone would either skip them (>) or return the same page forever (>=).
+  const rows = await db
+    .select()
+    .from(termProgress)
+    .where(changedSince(userId, input.since))
+    .orderBy(asc(termProgress.updatedAt), asc(termProgress.termId))
+    .limit(MAX_CHANGES_PER_SYNC);
+
+  const cursor = rows.length > 0 ? cursorOf(rows[rows.length - 1]) : (input.since ?? null);
+  return {
+    progressRows: progress.length,
+    eventsInserted,
+    changes: changesForClient(rows.map(fromProgressRow), progress),
+    cursor,
+    hasMore: rows.length === MAX_CHANGES_PER_SYNC,
+  };
+}
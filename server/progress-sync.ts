@@ -0,0 +1,222 @@
+import { and, eq, gt, or, sql, type SQL } from "drizzle-orm";
+import { z } from "zod";
+import { termProgress, type InsertReviewEvent, type InsertTermProgress } from "../drizzle/schema";
+
+/** Upper bounds per sync call; clients split larger backlogs into several calls. */
+export const MAX_PROGRESS_PER_SYNC = 500;
+export const MAX_EVENTS_PER_SYNC = 2000;
+export const MAX_CHANGES_PER_SYNC = 1000;
+
+const termId = z.string().min(1).max(32);
+
+/** One changed LearningProgress record (camelCase mirror of lib/types.ts). */
+export const progressDeltaSchema = z.object({
+  termId,
+  /** Client-side modification time (ms). The higher version wins on conflict. */
+  version: z.number().int().nonnegative(),
+  easeFactor: z.number(),
+  interval: z.number(),
+  repetitions: z.number().int(),
+  nextReview: z.string().max(32),
+  nextReviewTime: z.string().max(32).nullish(),
+  lastReview: z.string().max(32).nullish(),
+  correctCount: z.number().int().nonnegative(),
+  incorrectCount: z.number().int().nonnegative(),
+  isBookmarked: z.boolean(),
+  isDifficult: z.boolean(),
+  userNotes: z.string().max(10_000).nullish(),
+  phase: z.enum(["new", "learning", "review", "relearning"]).nullish(),
+  learningStep: z.number().int().nullish(),
+  stability: z.number().nullish(),
+  difficulty: z.number().nullish(),
+});
+
+export const reviewEventSchema = z.object({
+  /** Generated on the device; retried uploads of the same event are ignored. */
+  clientEventId: z.string().min(1).max(64),
+  termId,
+  rating: z.enum(["again", "hard", "good", "easy"]),
+  correct: z.boolean(),
+  elapsedMs: z.number().int().nonnegative().nullish(),
+  reviewedAt: z.number().int().nonnegative(),
+});
+
+/**
+ * Position in the (updatedAt, termId) order of a user's rows. One bulk upsert stamps many rows
+ * with the same updatedAt, so the time alone cannot say where a page ended.
+ */
+export const syncCursorSchema = z.object({
+  updatedAt: z.number().int().nonnegative(),
+  termId,
+});
+
+export const syncInputSchema = z.object({
+  /** Cursor returned by the previous sync; omit to pull everything. */
+  since: syncCursorSchema.optional(),
+  progress: z.array(progressDeltaSchema).max(MAX_PROGRESS_PER_SYNC).default([]),
+  events: z.array(reviewEventSchema).max(MAX_EVENTS_PER_SYNC).default([]),
+});
+
+export type ProgressDelta = z.infer<typeof progressDeltaSchema>;
+export type ReviewEventInput = z.infer<typeof reviewEventSchema>;
+export type SyncCursor = z.infer<typeof syncCursorSchema>;
+export type SyncInput = z.infer<typeof syncInputSchema>;
+
+export type SyncResult = {
+  /** Progress rows sent to the bulk upsert (after collapsing duplicates in the batch). */
+  progressRows: number;
+  /** Review events newly stored (duplicates of earlier uploads are not counted). */
+  eventsInserted: number;
+  /** Records changed on the server since `since` that the client did not just send. */
+  changes: ProgressDelta[];
+  /** Pass as `since` on the next sync (null until the user has any rows). */
+  cursor: SyncCursor | null;
+  /** More changes are waiting; sync again with the new cursor. */
+  hasMore: boolean;
+};
+
+/**
+ * Collapse a batch to one delta per term (highest version wins) and one event per clientEventId,
+ * so the bulk statements never carry the same key twice.
+ */
+export function collapseBatch(input: Pick<SyncInput, "progress" | "events">): {
+  progress: ProgressDelta[];
+  events: ReviewEventInput[];
+} {
+  const latest = new Map<string, ProgressDelta>();
+  for (const delta of input.progress) {
+    const current = latest.get(delta.termId);
+    if (!current || delta.version > current.version) {
+      latest.set(delta.termId, delta);
+    }
+  }
+
+  const events = new Map<string, ReviewEventInput>();
+  for (const event of input.events) {
+    if (!events.has(event.clientEventId)) {
+      events.set(event.clientEventId, event);
+    }
+  }
+
+  return { progress: Array.from(latest.values()), events: Array.from(events.values()) };
+}
+
+export function toProgressRow(userId: number, delta: ProgressDelta): InsertTermProgress {
+  return {
+    userId,
+    termId: delta.termId,
+    easeFactor: delta.easeFactor,
+    interval: delta.interval,
+    repetitions: delta.repetitions,
+    nextReview: delta.nextReview,
+    nextReviewTime: delta.nextReviewTime ?? null,
+    lastReview: delta.lastReview ?? null,
+    correctCount: delta.correctCount,
+    incorrectCount: delta.incorrectCount,
+    isBookmarked: delta.isBookmarked,
+    isDifficult: delta.isDifficult,
+    userNotes: delta.userNotes ?? null,
+    phase: delta.phase ?? null,
+    learningStep: delta.learningStep ?? null,
+    stability: delta.stability ?? null,
+    difficulty: delta.difficulty ?? null,
+    version: delta.version,
+  };
+}
+
+export function toReviewEventRow(userId: number, event: ReviewEventInput): InsertReviewEvent {
+  return {
+    userId,
+    clientEventId: event.clientEventId,
+    termId: event.termId,
+    rating: event.rating,
+    correct: event.correct,
+    elapsedMs: event.elapsedMs ?? null,
+    reviewedAt: new Date(event.reviewedAt),
+  };
+}
+
+export function fromProgressRow(row: typeof termProgress.$inferSelect): ProgressDelta {
+  return {
+    termId: row.termId,
+    version: row.version,
+    easeFactor: row.easeFactor,
+    interval: row.interval,
+    repetitions: row.repetitions,
+    nextReview: row.nextReview,
+    nextReviewTime: row.nextReviewTime,
+    lastReview: row.lastReview,
+    correctCount: row.correctCount,
+    incorrectCount: row.incorrectCount,
+    isBookmarked: row.isBookmarked,
+    isDifficult: row.isDifficult,
+    userNotes: row.userNotes,
+    phase: row.phase,
+    learningStep: row.learningStep,
+    stability: row.stability,
+    difficulty: row.difficulty,
+  };
+}
+
+const SYNCED_COLUMNS = [
+  "easeFactor",
+  "interval",
+  "repetitions",
+  "nextReview",
+  "nextReviewTime",
+  "lastReview",
+  "correctCount",
+  "incorrectCount",
+  "isBookmarked",
+  "isDifficult",
+  "userNotes",
+  "phase",
+  "learningStep",
+  "stability",
+  "difficulty",
+] as const;
+
+/**
+ * ON DUPLICATE KEY UPDATE assignments implementing last-writer-wins.
+ * MySQL applies assignments left to right, so `version` must be assigned last: every other
+ * comparison has to see the stored version, not the incoming one. Drizzle emits the assignments
+ * in table-column order (not the order of this object), which is why `version` is the last
+ * column of termProgress in drizzle/schema.ts.
+ */
+export function lastWriterWinsSet(): Record<string, SQL> {
+  const newer = sql`VALUES(${termProgress.version}) > ${termProgress.version}`;
+  const set: Record<string, SQL> = {};
+  for (const column of SYNCED_COLUMNS) {
+    const target = termProgress[column];
+    set[column] = sql`IF(${newer}, VALUES(${target}), ${target})`;
+  }
+  set.updatedAt = sql`IF(${newer}, NOW(3), ${termProgress.updatedAt})`;
+  set.version = sql`GREATEST(${termProgress.version}, VALUES(${termProgress.version}))`;
+  return set;
+}
+
+/** Drop server changes the client already has (it sent that exact version in this batch). */
+export function changesForClient(rows: ProgressDelta[], sent: ProgressDelta[]): ProgressDelta[] {
+  const sentVersions = new Map(sent.map(delta => [delta.termId, delta.version]));
+  return rows.filter(row => sentVersions.get(row.termId) !== row.version);
+}
+
+/** Rows of the user after `since` in (updatedAt, termId) order; pair with orderBy(updatedAt, termId). */
+export function changedSince(userId: number, since: SyncCursor | undefined): SQL | undefined {
+  const owned = eq(termProgress.userId, userId);
+  if (!since) {
+    return owned;
+  }
+  const at = new Date(since.updatedAt);
+  return and(
+    owned,
+    or(
+      gt(termProgress.updatedAt, at),
+      and(eq(termProgress.updatedAt, at), gt(termProgress.termId, since.termId)),
+    ),
+  );
+}
+
+export function cursorOf(row: Pick<typeof termProgress.$inferSelect, "updatedAt" | "termId">): SyncCursor {
+  return { updatedAt: row.updatedAt.getTime(), termId: row.termId };
+}
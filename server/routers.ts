@@ -1,7 +1,9 @@
 import { COOKIE_NAME } from "../shared/const.js";
 import { getSessionCookieOptions } from "./_core/cookies";
 import { systemRouter } from "./_core/systemRouter";
-import { publicProcedure, router } from "./_core/trpc";
+import { protectedProcedure, publicProcedure, router } from "./_core/trpc";
+import * as db from "./db";
+import { syncInputSchema } from "./progress-sync";
 
 export const appRouter = router({
   // if you need to use socket.io, read and register route in server/_core/index.ts, all api should start with '/api/' so that the gateway can route correctly
@@ -17,6 +19,13 @@ export const appRouter = router({
     }),
   }),
 
+  progress: router({
+    // Batched, last-writer-wins sync of learning progress plus the review event log
+    sync: protectedProcedure
+      .input(syncInputSchema)
+      .mutation(({ ctx, input }) => db.syncProgress(ctx.user.id, input)),
+  }),
+
   // TODO: add feature routers here, e.g.
   // todo: router({
   //   list: protectedProcedure.query(({ ctx }) =>
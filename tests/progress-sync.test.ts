@@ -0,0 +1,127 @@
+import { asc } from "drizzle-orm";
+import { drizzle } from "drizzle-orm/mysql2";
+import { describe, expect, it } from "vitest";
+import { termProgress } from "../drizzle/schema";
+import { appRouter } from "../server/routers";
+import type { TrpcContext } from "../server/_core/context";
+import {
+  MAX_PROGRESS_PER_SYNC,
+  changedSince,
+  changesForClient,
+  collapseBatch,
+  lastWriterWinsSet,
+  syncInputSchema,
+  toProgressRow,
+  type ProgressDelta,
+  type ReviewEventInput,
+} from "../server/progress-sync";
+
+function delta(termId: string, version: number, overrides: Partial<ProgressDelta> = {}): ProgressDelta {
+  return {
+    termId,
+    version,
+    easeFactor: 2.5,
+    interval: 1,
+    repetitions: 1,
+    nextReview: "2026-01-02",
+    correctCount: 1,
+    incorrectCount: 0,
+    isBookmarked: false,
+    isDifficult: false,
+    ...overrides,
+  };
+}
+
+function event(clientEventId: string, termId = "TERM0001"): ReviewEventInput {
+  return { clientEventId, termId, rating: "good", correct: true, reviewedAt: 1_700_000_000_000 };
+}
+
+describe("collapseBatch", () => {
+  it("keeps the highest version per term", () => {
+    const { progress } = collapseBatch({
+      progress: [delta("TERM0001", 10, { repetitions: 1 }), delta("TERM0001", 30, { repetitions: 3 }), delta("TERM0001", 20, { repetitions: 2 }), delta("TERM0002", 5)],
+      events: [],
+    });
+
+    expect(progress).toHaveLength(2);
+    expect(progress.find(d => d.termId === "TERM0001")).toMatchObject({ version: 30, repetitions: 3 });
+  });
+
+  it("drops repeated review events by clientEventId", () => {
+    const { events } = collapseBatch({ progress: [], events: [event("a"), event("b"), event("a")] });
+
+    expect(events.map(e => e.clientEventId)).toEqual(["a", "b"]);
+  });
+});
+
+describe("changesForClient", () => {
+  it("omits records the client just sent at the same version", () => {
+    const server = [delta("TERM0001", 30), delta("TERM0002", 50), delta("TERM0003", 7)];
+    const sent = [delta("TERM0001", 30), delta("TERM0002", 40)];
+
+    // TERM0002 was overwritten by a newer write from another device, so it comes back
+    expect(changesForClient(server, sent).map(d => d.termId)).toEqual(["TERM0002", "TERM0003"]);
+  });
+});
+
+describe("syncInputSchema", () => {
+  it("defaults empty batches and rejects oversized ones", () => {
+    expect(syncInputSchema.parse({})).toEqual({ progress: [], events: [] });
+
+    const tooMany = Array.from({ length: MAX_PROGRESS_PER_SYNC + 1 }, (_, i) => delta(`T${i}`, 1));
+    expect(syncInputSchema.safeParse({ progress: tooMany }).success).toBe(false);
+  });
+
+  it("takes a keyset cursor, not a bare timestamp", () => {
+    expect(syncInputSchema.safeParse({ since: { updatedAt: 1_700_000_000_000, termId: "TERM0001" } }).success).toBe(true);
+    expect(syncInputSchema.safeParse({ since: 1_700_000_000_000 }).success).toBe(false);
+  });
+
+  it("rejects unknown ratings", () => {
+    const result = syncInputSchema.safeParse({ events: [{ ...event("a"), rating: "perfect" }] });
+    expect(result.success).toBe(false);
+  });
+});
+
+describe("generated SQL", () => {
+  const db = drizzle.mock();
+
+  it("assigns version after every column whose IF compares against it", () => {
+    const { sql } = db
+      .insert(termProgress)
+      .values(toProgressRow(1, delta("TERM0001", 10)))
+      .onDuplicateKeyUpdate({ set: lastWriterWinsSet() })
+      .toSQL();
+    const update = sql.slice(sql.toLowerCase().indexOf("on duplicate key update"));
+    const assigned = Array.from(update.matchAll(/`(\w+)` = /g), match => match[1]);
+
+    // MySQL evaluates the assignments left to right; an IF after `version` would see the new
+    // version and never bump updatedAt, so other devices would not pull the change.
+    expect(assigned).toContain("updatedAt");
+    expect(assigned).toContain("easeFactor");
+    expect(assigned[assigned.length - 1]).toBe("version");
+  });
+
+  it("pages on (updatedAt, termId) after the cursor", () => {
+    const { sql, params } = db
+      .select()
+      .from(termProgress)
+      .where(changedSince(1, { updatedAt: 1_700_000_000_000, termId: "TERM0002" }))
+      .orderBy(asc(termProgress.updatedAt), asc(termProgress.termId))
+      .toSQL();
+
+    expect(sql).toMatch(/`updatedAt` > \?/);
+    expect(sql).toMatch(/`termId` > \?/);
+    expect(sql).toMatch(/order by `termProgress`.`updatedAt` asc, `termProgress`.`termId` asc/);
+    expect(params).toContain("TERM0002");
+  });
+});
+
+describe("progress.sync", () => {
+  it("requires a signed-in user", async () => {
+    const ctx = { user: null, req: { headers: {} }, res: {} } as unknown as TrpcContext;
+    const caller = appRouter.createCaller(ctx);
+
+    await expect(caller.progress.sync({ progress: [], events: [] })).rejects.toMatchObject({ code: "UNAUTHORIZED" });
+  });
+});